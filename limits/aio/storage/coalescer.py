@@ -0,0 +1,114 @@
+"""
+Coalescing of concurrent storage operations into batches
+"""
+
+from __future__ import annotations
+
+import asyncio
+
+from deprecated.sphinx import versionadded
+
+from limits.errors import ConfigurationError
+from limits.typing import Awaitable, Callable, R, Sequence, TypeVar, cast
+
+T = TypeVar("T")
+
+Batch = Callable[[list[object]], Awaitable[Sequence[object]]]
+
+
+@versionadded(version="4.7")
+class Coalescer:
+    """
+    Collects the operations submitted by concurrent coroutines and executes
+    them as batches, handing the result of each entry back to the coroutine
+    that submitted it.
+
+    Entries submitted with the same batch function are flushed together
+    once the event loop has run all the coroutines that are ready to run
+    (if :paramref:`window` is ``0``) or :paramref:`window` seconds after the
+    first entry of the batch was submitted. A batch that reaches
+    :paramref:`max_batch_size` entries is flushed immediately.
+    """
+
+    def __init__(self, window: float = 0, max_batch_size: int = 1000) -> None:
+        """
+        :param window: how long (in seconds) to wait for more entries
+         before flushing a batch
+        :param max_batch_size: the number of entries that results in a
+         batch being flushed immediately
+        :raise ConfigurationError: if :paramref:`window` is negative or
+         :paramref:`max_batch_size` is not positive
+        """
+        if window < 0:
+            raise ConfigurationError("The coalescing window can't be negative")
+        if max_batch_size < 1:
+            raise ConfigurationError("max_batch_size must be positive")
+        self.window = window
+        self.max_batch_size = max_batch_size
+        self.pending: dict[Batch, list[tuple[object, asyncio.Future[object]]]] = {}
+        self.handles: dict[Batch, asyncio.Handle] = {}
+        self.tasks: set[asyncio.Task[None]] = set()
+
+    async def submit(
+        self, batch: Callable[[list[T]], Awaitable[Sequence[R]]], entry: T
+    ) -> R:
+        """
+        Add :paramref:`entry` to the next call of :paramref:`batch`
+
+        :param batch: coroutine function that accepts a list of entries and
+         returns the result of each of them in the same order. If it doesn't
+         return as many results as entries, all the entries fail with a
+         :exc:`ValueError`.
+        :param entry: the entry to add to the batch
+        :return: the result of the entry
+        """
+        loop = asyncio.get_running_loop()
+        key = cast(Batch, batch)
+        future: asyncio.Future[object] = loop.create_future()
+        pending = self.pending.setdefault(key, [])
+        pending.append((entry, future))
+        if len(pending) >= self.max_batch_size:
+            self.flush(key)
+        elif key not in self.handles:
+            self.handles[key] = (
+                loop.call_later(self.window, self.flush, key)
+                if self.window
+                else loop.call_soon(self.flush, key)
+            )
+
+        return cast(R, await future)
+
+    def flush(self, batch: Batch) -> None:
+        """
+        Execute the pending entries of :paramref:`batch`
+        """
+        if handle := self.handles.pop(batch, None):
+            handle.cancel()
+        if entries := self.pending.pop(batch, None):
+            task = asyncio.ensure_future(self.__execute(batch, entries))
+            self.tasks.add(task)
+            task.add_done_callback(self.tasks.discard)
+
+    async def __execute(
+        self, batch: Batch, entries: list[tuple[object, asyncio.Future[object]]]
+    ) -> None:
+        try:
+            results = await batch([entry for entry, _ in entries])
+            if len(results) != len(entries):
+                # the results can't be matched with the entries
+                raise ValueError(
+                    f"The batch returned {len(results)} results"
+                    f" for {len(entries)} entries"
+                )
+        except asyncio.CancelledError:
+            for _, future in entries:
+                future.cancel()
+            raise
+        except Exception as exc:  # noqa: BLE001
+            for _, future in entries:
+                if not future.done():
+                    future.set_exception(exc)
+        else:
+            for (_, future), result in zip(entries, results):
+                if not future.done():
+                    future.set_result(result)
@@ -5,15 +5,34 @@ import urllib.parse
 from collections.abc import Iterable
 from math import ceil, floor
 
-from deprecated.sphinx import versionadded
-
-from limits.aio.storage.base import SlidingWindowCounterSupport, Storage
+from deprecated.sphinx import versionadded, versionchanged
+
+from limits.aio.storage.base import (
+    GCRASupport,
+    MovingWindowSupport,
+    SlidingWindowCounterSupport,
+    Storage,
+)
+from limits.aio.storage.coalescer import Coalescer
+from limits.errors import ConfigurationError
 from limits.storage.base import TimestampedSlidingWindow
-from limits.typing import EmcacheClientP, ItemP
+from limits.storage.memcached import BucketRing, exptime_for
+from limits.typing import EmcacheClientP, ItemP, Sequence
 
 
 @versionadded(version="2.1")
-class MemcachedStorage(Storage, SlidingWindowCounterSupport, TimestampedSlidingWindow):
+@versionchanged(
+    version="4.7",
+    reason="Added the :paramref:`coalesce_window` & :paramref:`moving_window_buckets`"
+    " arguments and support for the :ref:`strategies:moving window` strategy",
+)
+class MemcachedStorage(
+    Storage,
+    MovingWindowSupport,
+    SlidingWindowCounterSupport,
+    GCRASupport,
+    TimestampedSlidingWindow,
+):
     """
     Rate limit storage with memcached as backend.
 
@@ -29,6 +48,8 @@ class MemcachedStorage(Storage, SlidingWindowCounterSupport, TimestampedSlidingW
         self,
         uri: str,
         wrap_exceptions: bool = False,
+        coalesce_window: float | None = None,
+        moving_window_buckets: int = 60,
         **options: float | str | bool,
     ) -> None:
         """
@@ -36,9 +57,17 @@ class MemcachedStorage(Storage, SlidingWindowCounterSupport, TimestampedSlidingW
          ``async+memcached://host:port,host:port``
         :param wrap_exceptions: Whether to wrap storage exceptions in
          :exc:`limits.errors.StorageError` before raising it.
+        :param coalesce_window: If set, the keys read by concurrent calls
+         are collected for this many seconds (``0`` for the current iteration
+         of the event loop) and fetched with a single ``get_many``
+         (refer to :ref:`storage:coalescing`)
+        :param moving_window_buckets: The number of buckets the hits of a
+         :ref:`strategies:moving window` are counted in
+         (refer to :class:`~limits.storage.MemcachedStorage`)
         :param options: all remaining keyword arguments are passed
          directly to the constructor of :class:`emcache.Client`
-        :raise ConfigurationError: when :pypi:`emcache` is not available
+        :raise ConfigurationError: when :pypi:`emcache` is not available or
+         :paramref:`moving_window_buckets` is not positive
         """
         parsed = urllib.parse.urlparse(uri)
         self.hosts = []
@@ -50,6 +79,17 @@ class MemcachedStorage(Storage, SlidingWindowCounterSupport, TimestampedSlidingW
 
         self._options = options
         self._storage = None
+        self.coalescer = (
+            Coalescer(coalesce_window) if coalesce_window is not None else None
+        )
+        if moving_window_buckets < 1:
+            raise ConfigurationError("moving_window_buckets must be positive")
+        self.moving_window_buckets = moving_window_buckets
+        self.cas_retries = 0
+        """
+        The number of ``gets``/``cas`` updates retried because the value
+        was updated concurrently
+        """
         super().__init__(uri, wrap_exceptions=wrap_exceptions, **options)
         self.dependency = self.dependencies["emcache"].module
 
@@ -75,6 +115,8 @@ class MemcachedStorage(Storage, SlidingWindowCounterSupport, TimestampedSlidingW
         """
         :param key: the key to get the counter value for
         """
+        if self.coalescer:
+            return (await self.get_counts([key]))[0]
         item = await (await self.get_storage()).get(key.encode("utf-8"))
 
         return item and int(item.value) or 0
@@ -85,10 +127,41 @@ class MemcachedStorage(Storage, SlidingWindowCounterSupport, TimestampedSlidingW
 
         :param keys: the keys to get the counter values for
         """
+        if self.coalescer:
+            return await self.coalescer.submit(self._get_many_batch, list(keys))
         return await (await self.get_storage()).get_many(
             [k.encode("utf-8") for k in keys]
         )
 
+    async def _get_many_batch(self, batch: list[list[str]]) -> list[dict[bytes, ItemP]]:
+        """
+        Fetch the keys of multiple :meth:`get_many` calls at once
+        """
+        result = await (await self.get_storage()).get_many(
+            list({k.encode("utf-8") for keys in batch for k in keys})
+        )
+        return [
+            {
+                key: result[key]
+                for key in (k.encode("utf-8") for k in keys)
+                if key in result
+            }
+            for keys in batch
+        ]
+
+    async def get_counts(self, keys: Sequence[str]) -> list[int]:
+        """
+        :param keys: the keys to get the counter values for
+        """
+        if not keys:
+            return []
+        result = await self.get_many(keys)
+        counts = []
+        for key in keys:
+            item = result.get(key.encode("utf-8"))
+            counts.append(item and int(item.value) or 0)
+        return counts
+
     async def clear(self, key: str) -> None:
         """
         :param key: the key to clear rate limits for
@@ -188,6 +261,174 @@ class MemcachedStorage(Storage, SlidingWindowCounterSupport, TimestampedSlidingW
     async def reset(self) -> int | None:
         raise NotImplementedError
 
+    async def acquire_gcra_entry(
+        self, key: str, limit: int, expiry: int, amount: int = 1
+    ) -> bool:
+        """
+        Memcached doesn't support conditional updates, so the theoretical
+        arrival time is read with ``gets`` and written back with ``cas``
+        (or ``add`` if the key doesn't exist yet), retrying until no
+        concurrent update came in between.
+
+        :param key: rate limit key to acquire an entry in
+        :param limit: amount of entries allowed
+        :param expiry: expiry of the entry
+        :param amount: the number of entries to acquire
+        """
+        storage = await self.get_storage()
+        limit_key = key.encode("utf-8")
+        interval = self.emission_interval(limit, expiry)
+        while True:
+            item = await storage.gets(limit_key)
+            now = time.time_ns() // 1000
+            tat = max(int(item.value) if item else now, now) + amount * interval
+            if tat - now > limit * interval:
+                return False
+            # entries given back (negative amount) can move the arrival time
+            # into the past and an expiry of 0 would never expire the key
+            exptime = exptime_for(max(1, ceil((tat - now) / 1_000_000)))
+            try:
+                if item is None or item.cas is None:
+                    await storage.add(limit_key, f"{tat}".encode(), exptime=exptime)
+                else:
+                    await storage.cas(
+                        limit_key, f"{tat}".encode(), item.cas, exptime=exptime
+                    )
+                return True
+            except self.dependency.StorageCommandError:
+                # the key was added, updated or expired concurrently
+                self.cas_retries += 1
+
+    async def get_gcra_tat(self, key: str) -> int:
+        """
+        :param key: the rate limit key
+        :return: the theoretical arrival time of :paramref:`key` in
+         microseconds since the epoch or ``0`` if the key does not exist
+        """
+        return await self.get(key)
+
+    async def acquire_entry(
+        self, key: str, limit: int, expiry: int, amount: int = 1
+    ) -> bool:
+        """
+        :param key: rate limit key to acquire an entry in
+        :param limit: amount of entries allowed
+        :param expiry: expiry of the entry
+        :param amount: the number of entries to acquire
+        """
+        return (await self.acquire_entry_with_window(key, limit, expiry, amount))[0]
+
+    async def acquire_entry_with_window(
+        self, key: str, limit: int, expiry: int, amount: int = 1
+    ) -> tuple[bool, float, int]:
+        """
+        The window is read with ``gets`` and written back with ``cas``
+        (or ``add`` if the key doesn't exist yet), retrying until no
+        concurrent update came in between (refer to
+        :class:`~limits.storage.memcached.BucketRing` for the layout of
+        the value).
+
+        :param key: rate limit key to acquire an entry in
+        :param limit: amount of entries allowed
+        :param expiry: expiry of the entry
+        :param amount: the number of entries to acquire
+        :return: (whether the entries were acquired, start of window,
+         number of acquired entries)
+        """
+        storage = await self.get_storage()
+        limit_key = key.encode("utf-8")
+        width = expiry / self.moving_window_buckets
+        while True:
+            item = await storage.gets(limit_key)
+            now = time.time()
+            window = BucketRing.load(item.value if item else None, width, now, expiry)
+            if amount > limit or not window.acquire(now, limit, amount):
+                return (False, *window.window(now))
+            exptime = exptime_for(expiry + width)
+            try:
+                if item is None or item.cas is None:
+                    await storage.add(
+                        limit_key, window.dump().encode(), exptime=exptime
+                    )
+                else:
+                    await storage.cas(
+                        limit_key, window.dump().encode(), item.cas, exptime=exptime
+                    )
+                return (True, *window.window(now))
+            except self.dependency.StorageCommandError:
+                # the key was added, updated or expired concurrently
+                self.cas_retries += 1
+
+    async def release_entry(self, key: str, expiry: int, amount: int = 1) -> None:
+        """
+        The window is read with ``gets`` and written back with ``cas``,
+        retrying until no concurrent update came in between.
+
+        :param key: rate limit key to release the entries of
+        :param expiry: expiry of the entries
+        :param amount: the number of entries to release
+        """
+        storage = await self.get_storage()
+        limit_key = key.encode("utf-8")
+        width = expiry / self.moving_window_buckets
+        while True:
+            item = await storage.gets(limit_key)
+            if item is None or item.cas is None:
+                return
+            window = BucketRing.load(item.value, width, time.time(), expiry)
+            window.release(amount)
+            try:
+                await storage.cas(
+                    limit_key,
+                    window.dump().encode(),
+                    item.cas,
+                    exptime=exptime_for(expiry + width),
+                )
+                return
+            except self.dependency.NotStoredStorageCommandError:
+                # the key was updated concurrently
+                self.cas_retries += 1
+            except self.dependency.StorageCommandError:
+                # the key expired concurrently
+                return
+
+    async def get_moving_window(
+        self, key: str, limit: int, expiry: int
+    ) -> tuple[float, int]:
+        """
+        returns the starting point and the number of entries in the moving
+        window
+
+        :param key: rate limit key
+        :param expiry: expiry of entry
+        :return: (start of window, number of acquired entries)
+        """
+        return (await self.get_moving_windows([(key, limit, expiry)]))[0]
+
+    async def get_moving_windows(
+        self, entries: Sequence[tuple[str, int, int]]
+    ) -> list[tuple[float, int]]:
+        """
+        :param entries: ``(key, limit, expiry)`` tuples
+        :return: (start of window, number of acquired entries) for each entry
+        """
+        if not entries:
+            return []
+        now = time.time()
+        result = await self.get_many({key for key, _, _ in entries})
+        windows = []
+        for key, _, expiry in entries:
+            item = result.get(key.encode("utf-8"))
+            windows.append(
+                BucketRing.load(
+                    item.value if item else None,
+                    expiry / self.moving_window_buckets,
+                    now,
+                    expiry,
+                ).window(now)
+            )
+        return windows
+
     async def acquire_sliding_window_entry(
         self,
         key: str,
@@ -229,6 +470,17 @@ class MemcachedStorage(Storage, SlidingWindowCounterSupport, TimestampedSlidingW
                 return False
             return True
 
+    async def release_sliding_window_entry(
+        self, key: str, expiry: int, amount: int = 1
+    ) -> None:
+        """
+        :param key: rate limit key to release the entries of
+        :param expiry: expiry of the entries
+        :param amount: the number of entries to release
+        """
+        _, current_key = self.sliding_window_keys(key, expiry, time.time())
+        await self.decr(current_key, amount)
+
     async def get_sliding_window(
         self, key: str, expiry: int
     ) -> tuple[int, float, int, float]:
@@ -238,11 +490,35 @@ class MemcachedStorage(Storage, SlidingWindowCounterSupport, TimestampedSlidingW
             previous_key, current_key, expiry, now
         )
 
+    async def get_sliding_windows(
+        self, entries: Sequence[tuple[str, int]]
+    ) -> list[tuple[int, float, int, float]]:
+        if not entries:
+            return []
+        now = time.time()
+        window_keys = [
+            self.sliding_window_keys(key, expiry, now) for key, expiry in entries
+        ]
+        result = await self.get_many({key for keys in window_keys for key in keys})
+        return [
+            self._sliding_window_info(result, previous_key, current_key, expiry, now)
+            for (previous_key, current_key), (_, expiry) in zip(window_keys, entries)
+        ]
+
     async def _get_sliding_window_info(
         self, previous_key: str, current_key: str, expiry: int, now: float
     ) -> tuple[int, float, int, float]:
         result = await self.get_many([previous_key, current_key])
+        return self._sliding_window_info(result, previous_key, current_key, expiry, now)
 
+    def _sliding_window_info(
+        self,
+        result: dict[bytes, ItemP],
+        previous_key: str,
+        current_key: str,
+        expiry: int,
+        now: float,
+    ) -> tuple[int, float, int, float]:
         raw_previous_count = result.get(previous_key.encode("utf-8"))
         raw_current_count = result.get(current_key.encode("utf-8"))
 
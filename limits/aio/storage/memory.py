@@ -1,35 +1,40 @@
 from __future__ import annotations
 
 import asyncio
-import time
-from collections import Counter, defaultdict
+import heapq
+from collections import Counter, OrderedDict
+from collections.abc import AsyncIterator, Iterable
+from contextlib import AsyncExitStack, asynccontextmanager
 from math import floor
 
 from deprecated.sphinx import versionadded
 
 import limits.typing
 from limits.aio.storage.base import (
+    GCRASupport,
     MovingWindowSupport,
     SlidingWindowCounterSupport,
     Storage,
 )
 from limits.storage.base import TimestampedSlidingWindow
-
-
-class Entry:
-    def __init__(self, expiry: int) -> None:
-        self.atime = time.time()
-        self.expiry = self.atime + expiry
+from limits.storage.memory import TimestampRing, parse_option
+from limits.util import Clock, SystemClock
 
 
 @versionadded(version="2.1")
 class MemoryStorage(
-    Storage, MovingWindowSupport, SlidingWindowCounterSupport, TimestampedSlidingWindow
+    Storage,
+    MovingWindowSupport,
+    SlidingWindowCounterSupport,
+    GCRASupport,
+    TimestampedSlidingWindow,
 ):
     """
     rate limit storage using :class:`collections.Counter`
     as an in memory storage for fixed & sliding window strategies,
-    and a simple list to implement moving window strategy.
+    a compact array of timestamps per key to implement the
+    moving window strategy and a single theoretical arrival time
+    per key for the gcra strategy.
     """
 
     STORAGE_SCHEME = ["async+memory"]
@@ -38,47 +43,158 @@ class MemoryStorage(
     async context
     """
 
+    DEFAULT_LOCK_STRIPES = 64
+    """The default number of locks shared by all keys of the storage"""
+
     def __init__(
-        self, uri: str | None = None, wrap_exceptions: bool = False, **_: str
+        self,
+        uri: str | None = None,
+        wrap_exceptions: bool = False,
+        lock_stripes: int = DEFAULT_LOCK_STRIPES,
+        max_keys: int | None = None,
+        clock: Clock | None = None,
+        **_: str,
     ) -> None:
+        """
+        :param uri: ``async+memory://``, optionally with the ``lock_stripes``
+         and ``max_keys`` query parameters
+         (e.g. ``async+memory://?max_keys=100000``)
+        :param wrap_exceptions: Whether to wrap storage exceptions in
+         :exc:`limits.errors.StorageError` before raising it.
+        :param lock_stripes: The size of the fixed table of locks that keys
+         are mapped to by hash.
+        :param max_keys: If set, the maximum number of rate limit keys
+         held by the storage. Once the limit is reached the least recently
+         used keys are evicted (and counted in :attr:`evictions`) to make
+         room for new ones.
+        :param clock: The source of the current time of the storage, which
+         defaults to the system time
+        :raise ConfigurationError: if :paramref:`lock_stripes` or
+         :paramref:`max_keys` are not positive integers
+        """
         self.storage: limits.typing.Counter[str] = Counter()
-        self.locks: defaultdict[str, asyncio.Lock] = defaultdict(asyncio.Lock)
+        self.lock_stripes = (
+            parse_option(uri, "lock_stripes", lock_stripes) or lock_stripes
+        )
+        self.max_keys = parse_option(uri, "max_keys", max_keys)
+        self.clock: Clock = clock or SystemClock()
+        self.evictions = 0
+        """The number of keys evicted because :attr:`max_keys` was reached"""
+        self._recency: OrderedDict[str, None] = OrderedDict()
+        self.locks: tuple[asyncio.Lock, ...] = tuple(
+            asyncio.Lock() for _ in range(self.lock_stripes)
+        )
         self.expirations: dict[str, float] = {}
-        self.events: dict[str, list[Entry]] = {}
-        self.timer: asyncio.Task[None] | None = None
+        self.events: dict[str, TimestampRing] = {}
+        self.tats: dict[str, int] = {}
+        self.timer: asyncio.TimerHandle | None = None
+        self._timer_loop: asyncio.AbstractEventLoop | None = None
+        self._expiry_heap: list[tuple[float, str]] = []
         super().__init__(uri, wrap_exceptions=wrap_exceptions, **_)
 
     def __getstate__(self) -> dict[str, limits.typing.Any]:  # type: ignore[explicit-any]
         state = self.__dict__.copy()
         del state["timer"]
+        del state["_timer_loop"]
         del state["locks"]
         return state
 
     def __setstate__(self, state: dict[str, limits.typing.Any]) -> None:  # type: ignore[explicit-any]
         self.__dict__.update(state)
         self.timer = None
-        self.locks = defaultdict(asyncio.Lock)
-        asyncio.ensure_future(self.__schedule_expiry())
-
-    async def __expire_events(self) -> None:
-        for key in list(self.events.keys()):
-            async with self.locks[key]:
-                for event in list(self.events[key]):
-                    if event.expiry <= time.time() and event in self.events[key]:
-                        self.events[key].remove(event)
-                if not self.events.get(key, None):
-                    self.events.pop(key, None)
-                    self.locks.pop(key, None)
+        self._timer_loop = None
+        self.locks = tuple(asyncio.Lock() for _ in range(self.lock_stripes))
 
-        for key in list(self.expirations.keys()):
-            if self.expirations[key] <= time.time():
+    def __expire_events(self) -> None:
+        self.timer = None
+        now = self.clock.time()
+        while self._expiry_heap and self._expiry_heap[0][0] <= now:
+            _, key = heapq.heappop(self._expiry_heap)
+            if key in self.events:
+                events = self.events[key]
+                events.trim(now - events.expiry)
+                if events:
+                    heapq.heappush(
+                        self._expiry_heap, (events.oldest + events.expiry, key)
+                    )
+                else:
+                    self.events.pop(key, None)
+            if self.expirations.get(key, now + 1) <= now:
                 self.storage.pop(key, None)
                 self.expirations.pop(key, None)
-                self.locks.pop(key, None)
+            if key in self.tats:
+                if self.tats[key] <= now * 1_000_000:
+                    self.tats.pop(key)
+                else:
+                    heapq.heappush(self._expiry_heap, (self.tats[key] / 1_000_000, key))
+            if (
+                key not in self.events
+                and key not in self.expirations
+                and key not in self.tats
+            ):
+                self._recency.pop(key, None)
+        if self._expiry_heap:
+            self.__schedule_timer()
+
+    def __schedule_expiry(self, key: str, expiry: float) -> None:
+        """
+        Add :paramref:`key` to the expiry index so that it is revisited
+        at :paramref:`expiry` (a timestamp)
+        """
+        entry = (expiry, key)
+        heapq.heappush(self._expiry_heap, entry)
+        if (
+            self._expiry_heap[0] is entry
+            or not self.timer
+            or self._timer_loop is not asyncio.get_running_loop()
+        ):
+            self.__schedule_timer()
+
+    def __schedule_timer(self) -> None:
+        """
+        (Re)arm a single event loop timer for the earliest deadline in
+        the expiry index
+        """
+        if self.timer:
+            self.timer.cancel()
+        self._timer_loop = asyncio.get_running_loop()
+        self.timer = self._timer_loop.call_later(
+            max(0, self._expiry_heap[0][0] - self.clock.time()), self.__expire_events
+        )
+
+    def _lock_for(self, key: str) -> asyncio.Lock:
+        return self.locks[hash(key) % self.lock_stripes]
 
-    async def __schedule_expiry(self) -> None:
-        if not self.timer or self.timer.done():
-            self.timer = asyncio.create_task(self.__expire_events())
+    @asynccontextmanager
+    async def _locks_for(self, keys: Iterable[str]) -> AsyncIterator[None]:
+        """
+        Hold the locks of all of :paramref:`keys` at once. The stripes are
+        acquired in index order so that concurrent multi key operations
+        can't deadlock.
+        """
+        async with AsyncExitStack() as stack:
+            for stripe in sorted({hash(key) % self.lock_stripes for key in keys}):
+                await stack.enter_async_context(self.locks[stripe])
+            yield
+
+    def __track(self, key: str) -> None:
+        """
+        Mark :paramref:`key` as the most recently used key and evict the
+        least recently used keys if there are more than :attr:`max_keys`.
+        """
+        if self.max_keys is None:
+            return
+        if key in self._recency:
+            self._recency.move_to_end(key)
+            return
+        self._recency[key] = None
+        while len(self._recency) > self.max_keys:
+            victim, _ = self._recency.popitem(last=False)
+            self.storage.pop(victim, None)
+            self.expirations.pop(victim, None)
+            self.events.pop(victim, None)
+            self.tats.pop(victim, None)
+            self.evictions += 1
 
     @property
     def base_exceptions(
@@ -95,13 +211,40 @@ class MemoryStorage(
         :param amount: the number to increment by
         """
         await self.get(key)
-        await self.__schedule_expiry()
-        async with self.locks[key]:
-            self.storage[key] += amount
-            if self.storage[key] == amount:
-                self.expirations[key] = time.time() + expiry
+        self.__track(key)
+        async with self._lock_for(key):
+            self.__incr(key, expiry, amount)
         return self.storage.get(key, amount)
 
+    def __incr(self, key: str, expiry: float, amount: int) -> None:
+        self.storage[key] += amount
+        if self.storage[key] == amount:
+            self.expirations[key] = self.clock.time() + expiry
+            self.__schedule_expiry(key, self.expirations[key])
+
+    async def incr_all(
+        self, entries: limits.typing.Sequence[tuple[str, int, int]], amount: int = 1
+    ) -> bool:
+        """
+        increments the counters for multiple rate limit keys only if none
+        of them would exceed its limit, while holding the locks of all the
+        keys
+
+        :param entries: ``(key, limit, expiry)`` tuples
+        :param amount: the number to increment each counter by
+        :return: ``True`` if all the counters were incremented
+        """
+        async with self._locks_for(key for key, _, _ in entries):
+            pending: limits.typing.Counter[str] = Counter()
+            for key, limit, _ in entries:
+                pending[key] += amount
+                if await self.get(key) + pending[key] > limit:
+                    return False
+            for key, _, expiry in entries:
+                self.__track(key)
+                self.__incr(key, expiry, amount)
+        return True
+
     async def decr(self, key: str, amount: int = 1) -> int:
         """
         decrements the counter for a given rate limit key. 0 is the minimum allowed value.
@@ -109,8 +252,7 @@ class MemoryStorage(
         :param amount: the number to increment by
         """
         await self.get(key)
-        await self.__schedule_expiry()
-        async with self.locks[key]:
+        async with self._lock_for(key):
             self.storage[key] = max(self.storage[key] - amount, 0)
 
         return self.storage.get(key, amount)
@@ -119,10 +261,9 @@ class MemoryStorage(
         """
         :param key: the key to get the counter value for
         """
-        if self.expirations.get(key, 0) <= time.time():
+        if self.expirations.get(key, 0) <= self.clock.time():
             self.storage.pop(key, None)
             self.expirations.pop(key, None)
-            self.locks.pop(key, None)
 
         return self.storage.get(key, 0)
 
@@ -133,7 +274,8 @@ class MemoryStorage(
         self.storage.pop(key, None)
         self.expirations.pop(key, None)
         self.events.pop(key, None)
-        self.locks.pop(key, None)
+        self.tats.pop(key, None)
+        self._recency.pop(key, None)
 
     async def acquire_entry(
         self, key: str, limit: int, expiry: int, amount: int = 1
@@ -147,28 +289,59 @@ class MemoryStorage(
         if amount > limit:
             return False
 
-        await self.__schedule_expiry()
-        async with self.locks[key]:
-            self.events.setdefault(key, [])
-            timestamp = time.time()
-            try:
-                entry: Entry | None = self.events[key][limit - amount]
-            except IndexError:
-                entry = None
+        self.__track(key)
+        async with self._lock_for(key):
+            if key not in self.events:
+                self.events[key] = TimestampRing(expiry)
+                self.__schedule_expiry(key, self.clock.time() + expiry)
+            return self.events[key].acquire(self.clock.time(), limit, amount)
 
-            if entry and entry.atime >= timestamp - expiry:
-                return False
-            else:
-                self.events[key][:0] = [Entry(expiry) for _ in range(amount)]
+    async def acquire_all_entries(
+        self, entries: limits.typing.Sequence[tuple[str, int, int]], amount: int = 1
+    ) -> bool:
+        """
+        Acquire :paramref:`amount` entries in multiple moving windows only
+        if all of them have room for them, while holding the locks of all
+        the keys
 
-            return True
+        :param entries: ``(key, limit, expiry)`` tuples
+        :param amount: the number of entries to acquire in each window
+        :return: ``True`` if the entries were acquired in all the windows
+        """
+        async with self._locks_for(key for key, _, _ in entries):
+            timestamp = self.clock.time()
+            pending: limits.typing.Counter[str] = Counter()
+            for key, limit, _ in entries:
+                pending[key] += amount
+                if pending[key] > limit or (
+                    key in self.events
+                    and not self.events[key].admits(timestamp, limit, pending[key])
+                ):
+                    return False
+            for key, limit, expiry in entries:
+                self.__track(key)
+                if key not in self.events:
+                    self.events[key] = TimestampRing(expiry)
+                    self.__schedule_expiry(key, timestamp + expiry)
+                self.events[key].acquire(timestamp, limit, amount)
+        return True
+
+    async def release_entry(self, key: str, expiry: int, amount: int = 1) -> None:
+        """
+        :param key: rate limit key to release the entries of
+        :param expiry: expiry of the entries
+        :param amount: the number of entries to release
+        """
+        async with self._lock_for(key):
+            if events := self.events.get(key):
+                events.release(amount)
 
     async def get_expiry(self, key: str) -> float:
         """
         :param key: the key to get the expiry for
         """
 
-        return self.expirations.get(key, time.time())
+        return self.expirations.get(key, self.clock.time())
 
     async def get_num_acquired(self, key: str, expiry: int) -> int:
         """
@@ -177,15 +350,10 @@ class MemoryStorage(
         :param key: rate limit key to acquire an entry in
         :param expiry: expiry of the entry
         """
-        timestamp = time.time()
-
-        return (
-            len([k for k in self.events.get(key, []) if k.atime >= timestamp - expiry])
-            if self.events.get(key)
-            else 0
-        )
+        if not (events := self.events.get(key)):
+            return 0
+        return events.window(self.clock.time() - expiry)[1]
 
-    # FIXME: arg limit is not used
     async def get_moving_window(
         self, key: str, limit: int, expiry: int
     ) -> tuple[float, int]:
@@ -197,14 +365,13 @@ class MemoryStorage(
         :param expiry: expiry of entry
         :return: (start of window, number of acquired entries)
         """
-        timestamp = time.time()
-        acquired = await self.get_num_acquired(key, expiry)
+        timestamp = self.clock.time()
+        if events := self.events.get(key):
+            oldest, acquired = events.window(timestamp - expiry)
+            if oldest is not None:
+                return oldest, acquired
 
-        for item in self.events.get(key, [])[::-1]:
-            if item.atime >= timestamp - expiry:
-                return item.atime, acquired
-
-        return timestamp, acquired
+        return timestamp, 0
 
     async def acquire_sliding_window_entry(
         self,
@@ -215,7 +382,7 @@ class MemoryStorage(
     ) -> bool:
         if amount > limit:
             return False
-        now = time.time()
+        now = self.clock.time()
         previous_key, current_key = self.sliding_window_keys(key, expiry, now)
         (
             previous_count,
@@ -239,15 +406,64 @@ class MemoryStorage(
                 return False
             return True
 
+    async def acquire_all_sliding_window_entries(
+        self, entries: limits.typing.Sequence[tuple[str, int, int]], amount: int = 1
+    ) -> bool:
+        """
+        Acquire :paramref:`amount` entries in multiple sliding windows only
+        if the weighted count of every window stays within its limit, while
+        holding the locks of all the keys
+
+        :param entries: ``(key, limit, expiry)`` tuples
+        :param amount: the number of entries to acquire in each window
+        :return: ``True`` if the entries were acquired in all the windows
+        """
+        now = self.clock.time()
+        window_keys = [
+            self.sliding_window_keys(key, expiry, now) for key, _, expiry in entries
+        ]
+        async with self._locks_for(key for keys in window_keys for key in keys):
+            pending: limits.typing.Counter[str] = Counter()
+            for (previous_key, current_key), (_, limit, expiry) in zip(
+                window_keys, entries
+            ):
+                pending[current_key] += amount
+                (
+                    previous_count,
+                    previous_ttl,
+                    current_count,
+                    _,
+                ) = await self._get_sliding_window_info(
+                    previous_key, current_key, expiry, now
+                )
+                weighted_count = previous_count * previous_ttl / expiry + current_count
+                if floor(weighted_count) + pending[current_key] > limit:
+                    return False
+            for (_, current_key), (_, _, expiry) in zip(window_keys, entries):
+                self.__track(current_key)
+                self.__incr(current_key, 2 * expiry, amount)
+        return True
+
     async def get_sliding_window(
         self, key: str, expiry: int
     ) -> tuple[int, float, int, float]:
-        now = time.time()
+        now = self.clock.time()
         previous_key, current_key = self.sliding_window_keys(key, expiry, now)
         return await self._get_sliding_window_info(
             previous_key, current_key, expiry, now
         )
 
+    async def release_sliding_window_entry(
+        self, key: str, expiry: int, amount: int = 1
+    ) -> None:
+        """
+        :param key: rate limit key to release the entries of
+        :param expiry: expiry of the entries
+        :param amount: the number of entries to release
+        """
+        _, current_key = self.sliding_window_keys(key, expiry, self.clock.time())
+        await self.decr(current_key, amount)
+
     async def _get_sliding_window_info(
         self,
         previous_key: str,
@@ -264,6 +480,83 @@ class MemoryStorage(
         current_ttl = (1 - ((now / expiry) % 1)) * expiry + expiry
         return previous_count, previous_ttl, current_count, current_ttl
 
+    async def acquire_gcra_entry(
+        self, key: str, limit: int, expiry: int, amount: int = 1
+    ) -> bool:
+        """
+        :param key: rate limit key to acquire an entry in
+        :param limit: amount of entries allowed
+        :param expiry: expiry of the entry
+        :param amount: the number of entries to acquire
+        """
+        acquired, _ = await self.acquire_gcra_entry_with_tat(key, limit, expiry, amount)
+        return acquired
+
+    async def acquire_gcra_entry_with_tat(
+        self, key: str, limit: int, expiry: int, amount: int = 1
+    ) -> tuple[bool, int]:
+        """
+        :param key: rate limit key to acquire an entry in
+        :param limit: amount of entries allowed
+        :param expiry: expiry of the entry
+        :param amount: the number of entries to acquire
+        :return: whether the entries were acquired and the theoretical
+         arrival time of :paramref:`key` after the attempt
+        """
+        interval = self.emission_interval(limit, expiry)
+        self.__track(key)
+        async with self._lock_for(key):
+            now = int(self.clock.time() * 1_000_000)
+            tat = max(self.tats.get(key, now), now) + amount * interval
+            if tat - now > limit * interval:
+                return False, self.tats.get(key, 0)
+            self.__set_tat(key, tat)
+            return True, tat
+
+    async def acquire_all_gcra_entries(
+        self, entries: limits.typing.Sequence[tuple[str, int, int]], amount: int = 1
+    ) -> bool:
+        """
+        Acquire :paramref:`amount` entries for multiple keys only if all of
+        them allow it, while holding the locks of all the keys
+
+        :param entries: ``(key, limit, expiry)`` tuples
+        :param amount: the number of entries to acquire for each key
+        :return: ``True`` if the entries were acquired for all the keys
+        """
+        async with self._locks_for(key for key, _, _ in entries):
+            now = int(self.clock.time() * 1_000_000)
+            tats: dict[str, int] = {}
+            for key, limit, expiry in entries:
+                interval = self.emission_interval(limit, expiry)
+                tat = max(tats.get(key, self.tats.get(key, now)), now) + (
+                    amount * interval
+                )
+                if tat - now > limit * interval:
+                    return False
+                tats[key] = tat
+            for key, tat in tats.items():
+                self.__set_tat(key, tat)
+        for key in tats:
+            self.__track(key)
+        return True
+
+    def __set_tat(self, key: str, tat: int) -> None:
+        if key not in self.tats:
+            # the expiry timer reschedules the key if its arrival
+            # time has moved on by the time it is revisited
+            self.__schedule_expiry(key, tat / 1_000_000)
+        self.tats[key] = tat
+
+    async def get_gcra_tat(self, key: str) -> int:
+        """
+        :param key: the rate limit key
+        :return: the theoretical arrival time of :paramref:`key` in
+         microseconds since the epoch or ``0`` if the key does not exist
+        """
+        tat = self.tats.get(key, 0)
+        return tat if tat > int(self.clock.time() * 1_000_000) else 0
+
     async def check(self) -> bool:
         """
         check if storage is healthy
@@ -272,10 +565,12 @@ class MemoryStorage(
         return True
 
     async def reset(self) -> int | None:
-        num_items = max(len(self.storage), len(self.events))
+        num_items = max(len(self.storage), len(self.events), len(self.tats))
         self.storage.clear()
         self.expirations.clear()
         self.events.clear()
-        self.locks.clear()
+        self.tats.clear()
+        self._expiry_heap.clear()
+        self._recency.clear()
 
         return num_items
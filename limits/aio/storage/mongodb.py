@@ -3,16 +3,23 @@ from __future__ import annotations
 import asyncio
 import datetime
 import time
+from functools import cached_property
 
 from deprecated.sphinx import versionadded, versionchanged
 
 from limits.aio.storage.base import (
+    GCRASupport,
     MovingWindowSupport,
     SlidingWindowCounterSupport,
     Storage,
 )
+from limits.aio.storage.coalescer import Coalescer
+from limits.errors import ConfigurationError
+from limits.storage.mongodb import MongoOperation
 from limits.typing import (
+    Literal,
     ParamSpec,
+    Sequence,
     TypeVar,
     cast,
 )
@@ -27,7 +34,17 @@ R = TypeVar("R")
     version="3.14.0",
     reason="Added option to select custom collection names for windows & counters",
 )
-class MongoDBStorage(Storage, MovingWindowSupport, SlidingWindowCounterSupport):
+@versionchanged(
+    version="4.7",
+    reason=(
+        "Added the :paramref:`coalesce_window`,"
+        " :paramref:`moving_window_engine`, :paramref:`clock`,"
+        " :paramref:`write_concern` & :paramref:`read_preference` arguments"
+    ),
+)
+class MongoDBStorage(
+    Storage, MovingWindowSupport, SlidingWindowCounterSupport, GCRASupport
+):
     """
     Rate limit storage with MongoDB as backend.
 
@@ -48,6 +65,11 @@ class MongoDBStorage(Storage, MovingWindowSupport, SlidingWindowCounterSupport):
         counter_collection_name: str = "counters",
         window_collection_name: str = "windows",
         wrap_exceptions: bool = False,
+        coalesce_window: float | None = None,
+        moving_window_engine: Literal["array", "pairs"] = "array",
+        clock: Literal["client", "server"] = "client",
+        write_concern: dict[str, int | str | bool] | None = None,
+        read_preference: str | None = None,
         **options: float | str | bool,
     ) -> None:
         """
@@ -58,13 +80,35 @@ class MongoDBStorage(Storage, MovingWindowSupport, SlidingWindowCounterSupport):
         :param counter_collection_name: The collection name to use for individual counters
          used in fixed window strategies
         :param window_collection_name: The collection name to use for sliding & moving window
-         storage
+         and gcra storage
         :param wrap_exceptions: Whether to wrap storage exceptions in
          :exc:`limits.errors.StorageError` before raising it.
+        :param coalesce_window: If set, the operations issued by concurrent
+         calls are collected for this many seconds (``0`` for the current
+         iteration of the event loop) and executed with a single query or
+         ``bulkWrite`` command
+         (refer to :ref:`storage:coalescing`)
+        :param moving_window_engine: How the entries of the
+         :ref:`strategies:moving window` strategy are stored in the window
+         documents, either ``array`` or ``pairs``
+         (refer to :class:`~limits.storage.MongoDBStorage`)
+        :param clock: The clock used for the timestamps stored in the
+         documents, either ``client`` or ``server``
+         (refer to :class:`~limits.storage.MongoDBStorage`)
+        :param write_concern: The arguments of the
+         :class:`~pymongo.write_concern.WriteConcern` used by the updates,
+         which must be acknowledged
+         (refer to :class:`~limits.storage.MongoDBStorage`)
+        :param read_preference: The name of the
+         :class:`~pymongo.read_preferences.ReadPreference` used by the queries
+         that don't update the documents
+         (refer to :class:`~limits.storage.MongoDBStorage`)
         :param options: all remaining keyword arguments are passed
          to the constructor of :class:`~motor.motor_asyncio.AsyncIOMotorClient`
         :raise ConfigurationError: when the :pypi:`motor` or :pypi:`pymongo` are
-         not available
+         not available or :paramref:`moving_window_engine`, :paramref:`clock`,
+         :paramref:`write_concern` or :paramref:`read_preference` are not
+         supported
         """
 
         uri = uri.replace("async+mongodb", "mongodb", 1)
@@ -87,6 +131,40 @@ class MongoDBStorage(Storage, MovingWindowSupport, SlidingWindowCounterSupport):
             "windows": window_collection_name,
         }
         self.__indices_created = False
+        if moving_window_engine not in ("array", "pairs"):
+            raise ConfigurationError(
+                f"Unsupported moving window engine: {moving_window_engine}"
+            )
+        self.moving_window_engine = moving_window_engine
+        if clock not in ("client", "server"):
+            raise ConfigurationError(f"Unsupported clock: {clock}")
+        self.clock = clock
+        self.coalescer = (
+            Coalescer(coalesce_window) if coalesce_window is not None else None
+        )
+        pymongo = self.proxy_dependency.module
+        try:
+            self.__write_concern = (
+                pymongo.WriteConcern(**write_concern) if write_concern else None
+            )
+        except (TypeError, ValueError, self.lib_errors.ConfigurationError) as err:
+            raise ConfigurationError(f"Unsupported write concern: {err}") from err
+        if self.__write_concern is not None and not self.__write_concern.acknowledged:
+            # the limits are enforced by the errors returned for the updates
+            raise ConfigurationError("Unacknowledged write concerns are not supported")
+        try:
+            self.__read_preference = (
+                pymongo.read_preferences.make_read_preference(
+                    pymongo.read_preferences.read_pref_mode_from_name(read_preference),
+                    None,
+                )
+                if read_preference
+                else None
+            )
+        except ValueError as err:
+            raise ConfigurationError(
+                f"Unsupported read preference: {read_preference}"
+            ) from err
 
     @property
     def base_exceptions(
@@ -98,15 +176,31 @@ class MongoDBStorage(Storage, MovingWindowSupport, SlidingWindowCounterSupport):
     def database(self):  # type: ignore
         return self.storage.get_database(self.__database_name)
 
+    @cached_property
+    def counters(self):  # type: ignore
+        return self.database.get_collection(
+            self.__collection_mapping["counters"], write_concern=self.__write_concern
+        )
+
+    @cached_property
+    def windows(self):  # type: ignore
+        return self.database.get_collection(
+            self.__collection_mapping["windows"], write_concern=self.__write_concern
+        )
+
+    @cached_property
+    def _counters_for_reads(self):  # type: ignore
+        return self.counters.with_options(read_preference=self.__read_preference)
+
+    @cached_property
+    def _windows_for_reads(self):  # type: ignore
+        return self.windows.with_options(read_preference=self.__read_preference)
+
     async def create_indices(self) -> None:
         if not self.__indices_created:
             await asyncio.gather(
-                self.database[self.__collection_mapping["counters"]].create_index(
-                    "expireAt", expireAfterSeconds=0
-                ),
-                self.database[self.__collection_mapping["windows"]].create_index(
-                    "expireAt", expireAfterSeconds=0
-                ),
+                self.counters.create_index("expireAt", expireAfterSeconds=0),
+                self.windows.create_index("expireAt", expireAfterSeconds=0),
             )
         self.__indices_created = True
 
@@ -116,15 +210,13 @@ class MongoDBStorage(Storage, MovingWindowSupport, SlidingWindowCounterSupport):
         """
         num_keys = sum(
             await asyncio.gather(
-                self.database[self.__collection_mapping["counters"]].count_documents(
-                    {}
-                ),
-                self.database[self.__collection_mapping["windows"]].count_documents({}),
+                self.counters.count_documents({}),
+                self.windows.count_documents({}),
             )
         )
         await asyncio.gather(
-            self.database[self.__collection_mapping["counters"]].drop(),
-            self.database[self.__collection_mapping["windows"]].drop(),
+            self.counters.drop(),
+            self.windows.drop(),
         )
 
         return cast(int, num_keys)
@@ -134,21 +226,15 @@ class MongoDBStorage(Storage, MovingWindowSupport, SlidingWindowCounterSupport):
         :param key: the key to clear rate limits for
         """
         await asyncio.gather(
-            self.database[self.__collection_mapping["counters"]].find_one_and_delete(
-                {"_id": key}
-            ),
-            self.database[self.__collection_mapping["windows"]].find_one_and_delete(
-                {"_id": key}
-            ),
+            self.counters.find_one_and_delete({"_id": key}),
+            self.windows.find_one_and_delete({"_id": key}),
         )
 
     async def get_expiry(self, key: str) -> float:
         """
         :param key: the key to get the expiry for
         """
-        counter = await self.database[self.__collection_mapping["counters"]].find_one(
-            {"_id": key}
-        )
+        counter = await self._counters_for_reads.find_one({"_id": key})
         return (
             (counter["expireAt"] if counter else datetime.datetime.now())
             .replace(tzinfo=datetime.timezone.utc)
@@ -159,16 +245,63 @@ class MongoDBStorage(Storage, MovingWindowSupport, SlidingWindowCounterSupport):
         """
         :param key: the key to get the counter value for
         """
-        counter = await self.database[self.__collection_mapping["counters"]].find_one(
+        if self.coalescer:
+            return await self.coalescer.submit(self.get_counts, key)
+        counter = await self._counters_for_reads.find_one(
             {
                 "_id": key,
-                "expireAt": {"$gte": datetime.datetime.now(datetime.timezone.utc)},
+                **self._unexpired(),
             },
             projection=["count"],
         )
 
         return counter and counter["count"] or 0
 
+    async def get_counts(self, keys: Sequence[str]) -> list[int]:
+        """
+        :param keys: the keys to get the counter values for
+        """
+        counters = await self._counters_for_reads.find(
+            {
+                "_id": {"$in": list(keys)},
+                **self._unexpired(),
+            },
+            projection=["count"],
+        ).to_list(length=None)
+        counts = {counter["_id"]: counter["count"] for counter in counters}
+        return [counts.get(key, 0) for key in keys]
+
+    def _unexpired(self) -> dict[str, object]:
+        """
+        The filter matching the counters that haven't expired
+        """
+        if self.clock == "server":
+            return {"$expr": {"$gte": ["$expireAt", "$$NOW"]}}
+        return {"expireAt": {"$gte": datetime.datetime.now(datetime.timezone.utc)}}
+
+    def _expiration(self, expiry: int) -> datetime.datetime | dict[str, object]:
+        """
+        The expiry time of a document written now (an aggregation
+        expression with the ``server`` :paramref:`clock`)
+        """
+        if self.clock == "server":
+            return {"$add": ["$$NOW", expiry * 1000]}
+        return datetime.datetime.now(datetime.timezone.utc) + datetime.timedelta(
+            seconds=expiry
+        )
+
+    def _timestamp(
+        self, timestamp: float, offset: float = 0
+    ) -> float | dict[str, object]:
+        """
+        :paramref:`timestamp` (in seconds) shifted by :paramref:`offset`, or an
+        aggregation expression evaluating to the time of the server shifted by
+        :paramref:`offset` with the ``server`` :paramref:`clock`
+        """
+        if self.clock == "server":
+            return {"$add": [{"$divide": [{"$toLong": "$$NOW"}, 1000]}, offset]}
+        return timestamp + offset
+
     async def incr(self, key: str, expiry: int, amount: int = 1) -> int:
         """
         increments the counter for a given rate limit key
@@ -177,42 +310,93 @@ class MongoDBStorage(Storage, MovingWindowSupport, SlidingWindowCounterSupport):
         :param expiry: amount in seconds for the key to expire in
         :param amount: the number to increment by
         """
-        await self.create_indices()
+        return (await self.incr_with_expiry(key, expiry, amount))[0]
 
-        expiration = datetime.datetime.now(datetime.timezone.utc) + datetime.timedelta(
-            seconds=expiry
+    async def incr_many(self, entries: Sequence[tuple[str, int, int]]) -> list[int]:
+        """
+        increments the counters for multiple rate limit keys with concurrent
+        ``findOneAndUpdate`` commands, each of which returns its counter
+        atomically
+
+        :param entries: ``(key, expiry, amount)`` tuples
+        :return: the value of each counter after it was incremented
+        """
+        return await asyncio.gather(
+            *(self.incr(key, expiry, amount) for key, expiry, amount in entries)
         )
 
-        response = await self.database[
-            self.__collection_mapping["counters"]
-        ].find_one_and_update(
+    async def incr_with_expiry(
+        self, key: str, expiry: int, amount: int = 1
+    ) -> tuple[int, float]:
+        """
+        increments the counter for a given rate limit key and returns it
+        along with the time at which it expires, in a single
+        ``findOneAndUpdate`` command
+
+        :param key: the key to increment
+        :param expiry: amount in seconds for the key to expire in
+        :param amount: the number to increment by
+        :return: (value of the counter after the increment, expiry time)
+        """
+        await self.create_indices()
+
+        response = await self.counters.find_one_and_update(
             {"_id": key},
-            [
-                {
-                    "$set": {
-                        "count": {
-                            "$cond": {
-                                "if": {"$lt": ["$expireAt", "$$NOW"]},
-                                "then": amount,
-                                "else": {"$add": ["$count", amount]},
-                            }
-                        },
-                        "expireAt": {
-                            "$cond": {
-                                "if": {"$lt": ["$expireAt", "$$NOW"]},
-                                "then": expiration,
-                                "else": "$expireAt",
-                            }
-                        },
-                    }
-                },
-            ],
+            self._incr_update(expiry, amount),
             upsert=True,
+            projection=["count", "expireAt"],
+            return_document=self.proxy_dependency.module.ReturnDocument.AFTER,
+        )
+
+        return int(response["count"]), response["expireAt"].replace(
+            tzinfo=datetime.timezone.utc
+        ).timestamp()
+
+    def _incr_update(self, expiry: int, amount: int) -> list[dict[str, object]]:
+        """
+        The update pipeline incrementing a counter, or restarting it if it
+        has expired
+        """
+        expiration = self._expiration(expiry)
+        return [
+            {
+                "$set": {
+                    "count": {
+                        "$cond": {
+                            "if": {"$lt": ["$expireAt", "$$NOW"]},
+                            "then": amount,
+                            "else": {"$add": ["$count", amount]},
+                        }
+                    },
+                    "expireAt": {
+                        "$cond": {
+                            "if": {"$lt": ["$expireAt", "$$NOW"]},
+                            "then": expiration,
+                            "else": "$expireAt",
+                        }
+                    },
+                }
+            },
+        ]
+
+    @versionadded(version="4.7")
+    async def decr(self, key: str, amount: int = 1) -> int:
+        """
+        decrements the counter for a given rate limit key without going
+        below zero or changing its expiry. A counter that doesn't exist
+        or has expired is left as is.
+
+        :param key: the key to decrement
+        :param amount: the number to decrement by
+        """
+        counter = await self.counters.find_one_and_update(
+            {"_id": key, **self._unexpired()},
+            [{"$set": {"count": {"$max": [0, {"$subtract": ["$count", amount]}]}}}],
             projection=["count"],
             return_document=self.proxy_dependency.module.ReturnDocument.AFTER,
         )
 
-        return int(response["count"])
+        return counter and counter["count"] or 0
 
     async def check(self) -> bool:
         """
@@ -238,35 +422,37 @@ class MongoDBStorage(Storage, MovingWindowSupport, SlidingWindowCounterSupport):
         :return: (start of window, number of acquired entries)
         """
         timestamp = time.time()
-        if result := (
-            await self.database[self.__collection_mapping["windows"]]
-            .aggregate(
-                [
-                    {"$match": {"_id": key}},
-                    {
-                        "$project": {
-                            "entries": {
-                                "$filter": {
-                                    "input": "$entries",
-                                    "as": "entry",
-                                    "cond": {"$gte": ["$$entry", timestamp - expiry]},
-                                }
-                            }
-                        }
-                    },
-                    {"$unwind": "$entries"},
-                    {
-                        "$group": {
-                            "_id": "$_id",
-                            "min": {"$min": "$entries"},
-                            "count": {"$sum": 1},
-                        }
-                    },
-                ]
-            )
-            .to_list(length=1)
-        ):
-            return result[0]["min"], result[0]["count"]
+        start = self._timestamp(timestamp, -expiry)
+        if self.moving_window_engine == "pairs":
+            entries = {
+                "$filter": {
+                    "input": {"$ifNull": ["$entries", []]},
+                    "cond": {"$gte": ["$$this.t", start]},
+                }
+            }
+            window = {
+                "start": {"$min": "$$entries.t"},
+                "count": {"$sum": "$$entries.n"},
+            }
+        else:
+            entries = {
+                "$filter": {
+                    "input": {"$ifNull": ["$entries", []]},
+                    "cond": {"$gte": ["$$this", start]},
+                }
+            }
+            window = {"start": {"$min": "$$entries"}, "count": {"$size": "$$entries"}}
+        result = await self._windows_for_reads.find_one(
+            {"_id": key},
+            projection={
+                "_id": False,
+                "window": {"$let": {"vars": {"entries": entries}, "in": window}},
+            },
+        )
+
+        if result and result["window"]["count"]:
+            return result["window"]["start"], result["window"]["count"]
+
         return timestamp, 0
 
     async def acquire_entry(
@@ -278,17 +464,151 @@ class MongoDBStorage(Storage, MovingWindowSupport, SlidingWindowCounterSupport):
         :param expiry: expiry of the entry
         :param amount: the number of entries to acquire
         """
+        if self.coalescer:
+            return await self.coalescer.submit(
+                self.acquire_entries, (key, limit, expiry, amount)
+            )
         await self.create_indices()
 
         if amount > limit:
             return False
 
-        timestamp = time.time()
         try:
-            updates: dict[
-                str,
-                dict[str, datetime.datetime | dict[str, list[float] | int]],
-            ] = {
+            await self.windows.update_one(
+                *self._acquire_entry_operation(key, limit, expiry, amount, time.time()),
+                upsert=True,
+            )
+
+            return True
+        except self.proxy_dependency.module.errors.DuplicateKeyError:
+            return False
+
+    async def acquire_entries(
+        self, entries: Sequence[tuple[str, int, int, int]]
+    ) -> list[bool]:
+        """
+        acquires the entries in multiple moving windows with a single
+        unordered ``bulkWrite`` command
+
+        :param entries: ``(key, limit, expiry, amount)`` tuples
+        :return: whether each entry was acquired
+        """
+        timestamp = time.time()
+        return await self._bulk_acquire(
+            [
+                self._acquire_entry_operation(key, limit, expiry, amount, timestamp)
+                if amount <= limit
+                else None
+                for key, limit, expiry, amount in entries
+            ]
+        )
+
+    def _acquire_entry_operation(
+        self, key: str, limit: int, expiry: int, amount: int, timestamp: float
+    ) -> MongoOperation:
+        """
+        The update acquiring :paramref:`amount` entries in the window of
+        :paramref:`key`. Its filter doesn't match a window without room for
+        them, in which case the upsert is rejected with a duplicate key error.
+
+        With the ``array`` :paramref:`moving_window_engine` the entries are
+        prepended to the window (by an update pipeline with the ``server``
+        :paramref:`clock` since ``$$NOW`` can't be used with the update
+        operators). With the ``pairs`` engine a ``{t: timestamp, n: amount}``
+        pair is appended and the expired pairs are removed.
+        """
+        if self.moving_window_engine == "pairs":
+            start = self._timestamp(timestamp, -expiry)
+            return (
+                {
+                    "_id": key,
+                    "$expr": {
+                        "$lte": [
+                            {
+                                "$reduce": {
+                                    "input": {"$ifNull": ["$entries", []]},
+                                    "initialValue": amount,
+                                    "in": {
+                                        "$add": [
+                                            "$$value",
+                                            {
+                                                "$cond": {
+                                                    "if": {"$gte": ["$$this.t", start]},
+                                                    "then": "$$this.n",
+                                                    "else": 0,
+                                                }
+                                            },
+                                        ]
+                                    },
+                                }
+                            },
+                            limit,
+                        ]
+                    },
+                },
+                [
+                    {
+                        "$set": {
+                            "entries": {
+                                "$concatArrays": [
+                                    {
+                                        "$filter": {
+                                            "input": {"$ifNull": ["$entries", []]},
+                                            "as": "entry",
+                                            "cond": {"$gte": ["$$entry.t", start]},
+                                        }
+                                    },
+                                    [{"t": self._timestamp(timestamp), "n": amount}],
+                                ]
+                            },
+                            "expireAt": self._expiration(expiry),
+                        }
+                    }
+                ],
+            )
+        if self.clock == "server":
+            return (
+                {
+                    "_id": key,
+                    "$expr": {
+                        "$not": {
+                            "$gte": [
+                                {"$arrayElemAt": ["$entries", limit - amount]},
+                                self._timestamp(0, -expiry),
+                            ]
+                        }
+                    },
+                },
+                [
+                    {
+                        "$set": {
+                            "entries": {
+                                "$slice": [
+                                    {
+                                        "$concatArrays": [
+                                            {
+                                                "$map": {
+                                                    "input": {"$range": [0, amount]},
+                                                    "in": self._timestamp(0),
+                                                }
+                                            },
+                                            {"$ifNull": ["$entries", []]},
+                                        ]
+                                    },
+                                    limit,
+                                ]
+                            },
+                            "expireAt": self._expiration(expiry),
+                        }
+                    }
+                ],
+            )
+        return (
+            {
+                "_id": key,
+                f"entries.{limit - amount}": {"$not": {"$gte": timestamp - expiry}},
+            },
+            {
                 "$push": {
                     "entries": {
                         "$each": [timestamp] * amount,
@@ -296,20 +616,161 @@ class MongoDBStorage(Storage, MovingWindowSupport, SlidingWindowCounterSupport):
                         "$slice": limit,
                     }
                 },
-                "$set": {
-                    "expireAt": (
-                        datetime.datetime.now(datetime.timezone.utc)
-                        + datetime.timedelta(seconds=expiry)
-                    )
-                },
+                "$set": {"expireAt": self._expiration(expiry)},
+            },
+        )
+
+    async def _bulk_acquire(
+        self, operations: Sequence[MongoOperation | None]
+    ) -> list[bool]:
+        """
+        Execute the acquiring :paramref:`operations` (``None`` for an entry
+        that can't be acquired) with a single unordered ``bulkWrite`` command
+        and map the duplicate key errors of the rejected ones back to their
+        entries
+        """
+        requests = [
+            (index, operation)
+            for index, operation in enumerate(operations)
+            if operation is not None
+        ]
+        acquired = [operation is not None for operation in operations]
+        if not requests:
+            return acquired
+        await self.create_indices()
+        try:
+            await self.windows.bulk_write(
+                [
+                    self.proxy_dependency.module.UpdateOne(*operation, upsert=True)
+                    for _, operation in requests
+                ],
+                ordered=False,
+            )
+        except self.proxy_dependency.module.errors.BulkWriteError as error:
+            if error.details["writeConcernErrors"] or any(
+                write_error["code"] != 11000
+                for write_error in error.details["writeErrors"]
+            ):
+                raise
+            for write_error in error.details["writeErrors"]:
+                acquired[requests[write_error["index"]][0]] = False
+        return acquired
+
+    async def release_entry(self, key: str, expiry: int, amount: int = 1) -> None:
+        """
+        Give back the :paramref:`amount` newest entries of a moving window.
+        With the ``pairs`` :paramref:`moving_window_engine` the counts of the
+        newest pairs are reduced (and the emptied pairs removed), with the
+        ``array`` engine the newest timestamps are sliced off the window.
+
+        :param key: rate limit key to release the entries of
+        :param expiry: expiry of the entries
+        :param amount: the number of entries to release
+        """
+        entries = {"$ifNull": ["$entries", []]}
+        if self.moving_window_engine == "pairs":
+            released: dict[str, object] = {
+                "$let": {
+                    "vars": {
+                        "released": {
+                            "$reduce": {
+                                "input": {"$reverseArray": entries},
+                                "initialValue": {"remaining": amount, "entries": []},
+                                "in": {
+                                    "remaining": {
+                                        "$max": [
+                                            0,
+                                            {
+                                                "$subtract": [
+                                                    "$$value.remaining",
+                                                    "$$this.n",
+                                                ]
+                                            },
+                                        ]
+                                    },
+                                    "entries": {
+                                        "$cond": {
+                                            "if": {
+                                                "$gt": ["$$this.n", "$$value.remaining"]
+                                            },
+                                            "then": {
+                                                "$concatArrays": [
+                                                    [
+                                                        {
+                                                            "t": "$$this.t",
+                                                            "n": {
+                                                                "$subtract": [
+                                                                    "$$this.n",
+                                                                    "$$value.remaining",
+                                                                ]
+                                                            },
+                                                        }
+                                                    ],
+                                                    "$$value.entries",
+                                                ]
+                                            },
+                                            "else": "$$value.entries",
+                                        }
+                                    },
+                                },
+                            }
+                        }
+                    },
+                    "in": "$$released.entries",
+                }
             }
+        else:
+            released = {"$slice": [entries, amount, {"$max": [1, {"$size": entries}]}]}
+        await self.windows.update_one({"_id": key}, [{"$set": {"entries": released}}])
 
-            await self.database[self.__collection_mapping["windows"]].update_one(
-                {
-                    "_id": key,
-                    f"entries.{limit - amount}": {"$not": {"$gte": timestamp - expiry}},
+    async def acquire_gcra_entry(
+        self, key: str, limit: int, expiry: int, amount: int = 1
+    ) -> bool:
+        """
+        :param key: rate limit key to acquire an entry in
+        :param limit: amount of entries allowed
+        :param expiry: expiry of the entry
+        :param amount: the number of entries to acquire
+        """
+        await self.create_indices()
+
+        if amount > limit:
+            return False
+
+        interval = self.emission_interval(limit, expiry)
+        now: int | dict[str, object]
+        if self.clock == "server":
+            now = {"$multiply": [{"$toLong": "$$NOW"}, 1000]}
+            query: dict[str, object] = {
+                "_id": key,
+                "$expr": {
+                    "$not": {
+                        "$gt": ["$tat", {"$add": [now, (limit - amount) * interval]}]
+                    }
                 },
-                updates,
+            }
+        else:
+            now = time.time_ns() // 1000
+            query = {
+                "_id": key,
+                "tat": {"$not": {"$gt": now + (limit - amount) * interval}},
+            }
+        try:
+            await self.windows.update_one(
+                query,
+                [
+                    {
+                        "$set": {
+                            "tat": {
+                                "$add": [
+                                    {"$max": [{"$ifNull": ["$tat", now]}, now]},
+                                    amount * interval,
+                                ]
+                            }
+                        }
+                    },
+                    {"$set": {"expireAt": {"$toDate": {"$divide": ["$tat", 1000]}}}},
+                ],
                 upsert=True,
             )
 
@@ -317,54 +778,132 @@ class MongoDBStorage(Storage, MovingWindowSupport, SlidingWindowCounterSupport):
         except self.proxy_dependency.module.errors.DuplicateKeyError:
             return False
 
+    async def get_gcra_tat(self, key: str) -> int:
+        """
+        :param key: the rate limit key
+        :return: the theoretical arrival time of :paramref:`key` in
+         microseconds since the epoch or ``0`` if the key does not exist
+        """
+        await self.create_indices()
+        window = await self._windows_for_reads.find_one(
+            {"_id": key}, projection=["tat"]
+        )
+
+        return window and window.get("tat") or 0
+
     async def acquire_sliding_window_entry(
         self, key: str, limit: int, expiry: int, amount: int = 1
     ) -> bool:
+        if self.coalescer:
+            return await self.coalescer.submit(
+                self.acquire_sliding_window_entries, (key, limit, expiry, amount)
+            )
         await self.create_indices()
+
+        if amount > limit:
+            return False
+
+        try:
+            await self.windows.update_one(
+                *self._acquire_sliding_window_operation(key, limit, expiry, amount),
+                upsert=True,
+            )
+
+            return True
+        except self.proxy_dependency.module.errors.DuplicateKeyError:
+            return False
+
+    async def acquire_sliding_window_entries(
+        self, entries: Sequence[tuple[str, int, int, int]]
+    ) -> list[bool]:
+        """
+        acquires the entries in multiple sliding windows with a single
+        unordered ``bulkWrite`` command
+
+        :param entries: ``(key, limit, expiry, amount)`` tuples
+        :return: whether each entry was acquired
+        """
+        return await self._bulk_acquire(
+            [
+                self._acquire_sliding_window_operation(key, limit, expiry, amount)
+                if amount <= limit
+                else None
+                for key, limit, expiry, amount in entries
+            ]
+        )
+
+    def _acquire_sliding_window_operation(
+        self, key: str, limit: int, expiry: int, amount: int
+    ) -> MongoOperation:
+        """
+        The update adding :paramref:`amount` to the current window of
+        :paramref:`key` (shifting the windows first if the current one has
+        ended). Its filter doesn't match a window whose weighted count leaves
+        no room for :paramref:`amount`, in which case the upsert is rejected
+        with a duplicate key error.
+        """
         expiry_ms = expiry * 1000
-        result = await self.database[
-            self.__collection_mapping["windows"]
-        ].find_one_and_update(
-            {"_id": key},
+        ttl = {"$subtract": ["$expireAt", "$$NOW"]}
+        shift = {"$lte": [ttl, expiry_ms]}
+        weighted_count = {
+            "$floor": {
+                "$cond": {
+                    "if": shift,
+                    "then": {
+                        "$multiply": [
+                            {"$ifNull": ["$currentCount", 0]},
+                            {"$divide": [{"$max": [0, ttl]}, expiry_ms]},
+                        ]
+                    },
+                    "else": {
+                        "$add": [
+                            {
+                                "$multiply": [
+                                    {"$ifNull": ["$previousCount", 0]},
+                                    {
+                                        "$divide": [
+                                            {"$subtract": [ttl, expiry_ms]},
+                                            expiry_ms,
+                                        ]
+                                    },
+                                ]
+                            },
+                            {"$ifNull": ["$currentCount", 0]},
+                        ]
+                    },
+                }
+            }
+        }
+        return (
+            {
+                "_id": key,
+                "$expr": {"$lte": [{"$add": [weighted_count, amount]}, limit]},
+            },
             [
                 {
                     "$set": {
                         "previousCount": {
                             "$cond": {
-                                "if": {
-                                    "$lte": [
-                                        {"$subtract": ["$expireAt", "$$NOW"]},
-                                        expiry_ms,
-                                    ]
-                                },
+                                "if": shift,
                                 "then": {"$ifNull": ["$currentCount", 0]},
                                 "else": {"$ifNull": ["$previousCount", 0]},
                             }
                         },
-                    }
-                },
-                {
-                    "$set": {
                         "currentCount": {
-                            "$cond": {
-                                "if": {
-                                    "$lte": [
-                                        {"$subtract": ["$expireAt", "$$NOW"]},
-                                        expiry_ms,
-                                    ]
+                            "$add": [
+                                {
+                                    "$cond": {
+                                        "if": shift,
+                                        "then": 0,
+                                        "else": {"$ifNull": ["$currentCount", 0]},
+                                    }
                                 },
-                                "then": 0,
-                                "else": {"$ifNull": ["$currentCount", 0]},
-                            }
+                                amount,
+                            ]
                         },
                         "expireAt": {
                             "$cond": {
-                                "if": {
-                                    "$lte": [
-                                        {"$subtract": ["$expireAt", "$$NOW"]},
-                                        expiry_ms,
-                                    ]
-                                },
+                                "if": shift,
                                 "then": {
                                     "$cond": {
                                         "if": {"$gt": ["$expireAt", 0]},
@@ -377,81 +916,43 @@ class MongoDBStorage(Storage, MovingWindowSupport, SlidingWindowCounterSupport):
                         },
                     }
                 },
-                {
-                    "$set": {
-                        "curWeightedCount": {
-                            "$floor": {
-                                "$add": [
-                                    {
-                                        "$multiply": [
-                                            "$previousCount",
-                                            {
-                                                "$divide": [
-                                                    {
-                                                        "$max": [
-                                                            0,
-                                                            {
-                                                                "$subtract": [
-                                                                    "$expireAt",
-                                                                    {
-                                                                        "$add": [
-                                                                            "$$NOW",
-                                                                            expiry_ms,
-                                                                        ]
-                                                                    },
-                                                                ]
-                                                            },
-                                                        ]
-                                                    },
-                                                    expiry_ms,
-                                                ]
-                                            },
-                                        ]
-                                    },
-                                    "$currentCount",
-                                ]
-                            }
-                        }
-                    }
-                },
+            ],
+        )
+
+    async def release_sliding_window_entry(
+        self, key: str, expiry: int, amount: int = 1
+    ) -> None:
+        """
+        :param key: rate limit key to release the entries of
+        :param expiry: expiry of the entries
+        :param amount: the number of entries to release
+        """
+        await self.windows.update_one(
+            {"_id": key},
+            [
                 {
                     "$set": {
                         "currentCount": {
-                            "$cond": {
-                                "if": {
-                                    "$lte": [
-                                        {"$add": ["$curWeightedCount", amount]},
-                                        limit,
+                            "$max": [
+                                0,
+                                {
+                                    "$subtract": [
+                                        {"$ifNull": ["$currentCount", 0]},
+                                        amount,
                                     ]
                                 },
-                                "then": {"$add": ["$currentCount", amount]},
-                                "else": "$currentCount",
-                            }
+                            ]
                         }
                     }
-                },
-                {
-                    "$set": {
-                        "_acquired": {
-                            "$lte": [{"$add": ["$curWeightedCount", amount]}, limit]
-                        }
-                    }
-                },
-                {"$unset": ["curWeightedCount"]},
+                }
             ],
-            return_document=self.proxy_dependency.module.ReturnDocument.AFTER,
-            upsert=True,
         )
 
-        return cast(bool, result["_acquired"])
-
     async def get_sliding_window(
         self, key: str, expiry: int
     ) -> tuple[int, float, int, float]:
         expiry_ms = expiry * 1000
-        if result := await self.database[
-            self.__collection_mapping["windows"]
-        ].find_one_and_update(
+        if result := await self.windows.find_one_and_update(
             {"_id": key},
             [
                 {
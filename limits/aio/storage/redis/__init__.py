@@ -1,14 +1,22 @@
 from __future__ import annotations
 
+from collections.abc import AsyncIterator
+
 from deprecated.sphinx import versionadded, versionchanged
 from packaging.version import Version
 
-from limits.aio.storage import MovingWindowSupport, SlidingWindowCounterSupport, Storage
+from limits.aio.storage import (
+    GCRASupport,
+    MovingWindowSupport,
+    SlidingWindowCounterSupport,
+    Storage,
+)
+from limits.aio.storage.coalescer import Coalescer
 from limits.aio.storage.redis.bridge import RedisBridge
 from limits.aio.storage.redis.coredis import CoredisBridge
 from limits.aio.storage.redis.redispy import RedispyBridge
 from limits.aio.storage.redis.valkey import ValkeyBridge
-from limits.typing import Literal
+from limits.typing import Literal, Sequence
 
 
 @versionadded(version="2.1")
@@ -27,7 +35,16 @@ from limits.typing import Literal
         " ``async+valkey`` schema"
     ),
 )
-class RedisStorage(Storage, MovingWindowSupport, SlidingWindowCounterSupport):
+@versionchanged(
+    version="4.7",
+    reason=(
+        "Added the :paramref:`moving_window_engine`, :paramref:`coalesce_window`,"
+        " :paramref:`use_functions` & :paramref:`clock` arguments"
+    ),
+)
+class RedisStorage(
+    Storage, MovingWindowSupport, SlidingWindowCounterSupport, GCRASupport
+):
     """
     Rate limit storage with redis as backend.
 
@@ -60,6 +77,10 @@ class RedisStorage(Storage, MovingWindowSupport, SlidingWindowCounterSupport):
         uri: str,
         wrap_exceptions: bool = False,
         implementation: Literal["redispy", "coredis", "valkey"] = "coredis",
+        moving_window_engine: Literal["list", "zset", "packed"] = "list",
+        coalesce_window: float | None = None,
+        use_functions: bool = False,
+        clock: Literal["client", "server"] = "client",
         **options: float | str | bool,
     ) -> None:
         """
@@ -86,9 +107,41 @@ class RedisStorage(Storage, MovingWindowSupport, SlidingWindowCounterSupport):
          - ``redispy``: :class:`redis.asyncio.client.Redis`
          - ``valkey``: :class:`valkey.asyncio.client.Valkey`
 
+        :param moving_window_engine: How the entries of the
+         :ref:`strategies:moving window` strategy are stored:
+
+         - ``list``: one list element per unit of cost, trimmed to the limit
+         - ``zset``: one sorted set member per hit scored by its timestamp,
+           which keeps large limits and costs cheap.
+         - ``packed``: a single string of fixed width pairs of millisecond
+           offsets (from a base timestamp stored with the key) and counts,
+           which takes 8 bytes per hit (or less if several hits happen in
+           the same millisecond) regardless of their cost.
+
+         Keys written by one engine can't be read by the others.
+        :param coalesce_window: If set, concurrent calls to :meth:`incr`,
+         :meth:`acquire_entry` & :meth:`acquire_sliding_window_entry` are
+         collected for this many seconds (``0`` for the current iteration
+         of the event loop) and executed as a single pipeline
+         (refer to :ref:`storage:coalescing`)
+        :param use_functions: Whether to install the lua scripts as a
+         versioned library of functions with ``FUNCTION LOAD`` (requires
+         redis 7 or higher) and execute them with ``FCALL``. The library is
+         loaded the first time a function is reported missing. The scripts
+         that don't write any keys are executed with ``FCALL_RO`` on a replica
+         if the storage is configured to read from replicas.
+        :param clock: Where the timestamps of the :ref:`strategies:moving window`
+         & :ref:`strategies:gcra` strategies are read from:
+
+         - ``client``: the clock of the host running the rate limiter
+         - ``server``: the clock of the redis server (with ``TIME`` in the
+           lua scripts), which keeps the windows consistent when the clocks
+           of the hosts sharing the rate limits are skewed
         :param options: all remaining keyword arguments are passed
          directly to the constructor of :class:`coredis.Redis` or :class:`redis.asyncio.client.Redis`
         :raise ConfigurationError: when the redis library is not available
+         or :paramref:`moving_window_engine` or :paramref:`clock` are not
+         supported
         """
         uri = uri.removeprefix("async+")
         self.target_server = "redis" if uri.startswith("redis") else "valkey"
@@ -96,13 +149,34 @@ class RedisStorage(Storage, MovingWindowSupport, SlidingWindowCounterSupport):
 
         super().__init__(uri, wrap_exceptions=wrap_exceptions)
         self.options = options
+        self.coalescer = (
+            Coalescer(coalesce_window) if coalesce_window is not None else None
+        )
         if self.target_server == "valkey" or implementation == "valkey":
-            self.bridge = ValkeyBridge(uri, self.dependencies["valkey"].module)
+            self.bridge = ValkeyBridge(
+                uri,
+                self.dependencies["valkey"].module,
+                moving_window_engine,
+                use_functions,
+                clock,
+            )
         else:
             if implementation == "redispy":
-                self.bridge = RedispyBridge(uri, self.dependencies["redis"].module)
+                self.bridge = RedispyBridge(
+                    uri,
+                    self.dependencies["redis"].module,
+                    moving_window_engine,
+                    use_functions,
+                    clock,
+                )
             else:
-                self.bridge = CoredisBridge(uri, self.dependencies["coredis"].module)
+                self.bridge = CoredisBridge(
+                    uri,
+                    self.dependencies["coredis"].module,
+                    moving_window_engine,
+                    use_functions,
+                    clock,
+                )
         self.configure_bridge()
         self.bridge.register_scripts()
 
@@ -148,8 +222,62 @@ class RedisStorage(Storage, MovingWindowSupport, SlidingWindowCounterSupport):
         :param amount: the number to increment by
         """
 
+        if self.coalescer:
+            return await self.coalescer.submit(self.incr_many, (key, expiry, amount))
         return await self.bridge.incr(key, expiry, amount)
 
+    async def incr_many(self, entries: Sequence[tuple[str, int, int]]) -> list[int]:
+        """
+        increments the counters for multiple rate limit keys in a single
+        pipeline
+
+        :param entries: ``(key, expiry, amount)`` tuples
+        """
+
+        return await self.bridge.incr_many(entries)
+
+    async def incr_all(
+        self, entries: Sequence[tuple[str, int, int]], amount: int = 1
+    ) -> bool:
+        """
+        increments the counters for multiple rate limit keys only if none
+        of them would exceed its limit, in a single lua script
+
+        :param entries: ``(key, limit, expiry)`` tuples
+        :param amount: the number to increment each counter by
+        :return: ``True`` if all the counters were incremented
+        """
+
+        return await self.bridge.incr_all(entries, amount)
+
+    async def incr_with_expiry(
+        self, key: str, expiry: int, amount: int = 1
+    ) -> tuple[int, float]:
+        """
+        increments the counter for a given rate limit key and returns it
+        along with the time at which it expires, in a single round trip
+
+        :param key: the key to increment
+        :param expiry: amount in seconds for the key to expire in
+        :param amount: the number to increment by
+        :return: (value of the counter after the increment, expiry time)
+        """
+
+        return await self.bridge.incr_with_expiry(key, expiry, amount)
+
+    @versionadded(version="4.7")
+    async def decr(self, key: str, amount: int = 1) -> int:
+        """
+        decrements the counter for a given rate limit key without going
+        below zero or changing its expiry. A key that doesn't exist is
+        left as is.
+
+        :param key: the key to decrement
+        :param amount: the number to decrement by
+        """
+
+        return await self.bridge.decr(key, amount)
+
     async def get(self, key: str) -> int:
         """
         :param key: the key to get the counter value for
@@ -157,6 +285,13 @@ class RedisStorage(Storage, MovingWindowSupport, SlidingWindowCounterSupport):
 
         return await self.bridge.get(key)
 
+    async def get_counts(self, keys: Sequence[str]) -> list[int]:
+        """
+        :param keys: the keys to get the counter values for
+        """
+
+        return await self.bridge.get_counts(keys)
+
     async def clear(self, key: str) -> None:
         """
         :param key: the key to clear rate limits for
@@ -174,8 +309,58 @@ class RedisStorage(Storage, MovingWindowSupport, SlidingWindowCounterSupport):
         :param amount: the number of entries to acquire
         """
 
+        if self.coalescer:
+            return await self.coalescer.submit(
+                self.acquire_entries, (key, limit, expiry, amount)
+            )
         return await self.bridge.acquire_entry(key, limit, expiry, amount)
 
+    async def acquire_entry_with_window(
+        self, key: str, limit: int, expiry: int, amount: int = 1
+    ) -> tuple[bool, float, int]:
+        """
+        :param key: rate limit key to acquire an entry in
+        :param limit: amount of entries allowed
+        :param expiry: expiry of the entry
+        :param amount: the number of entries to acquire
+        :return: (whether the entries were acquired, start of window,
+         number of acquired entries)
+        """
+
+        return await self.bridge.acquire_entry_with_window(key, limit, expiry, amount)
+
+    async def acquire_entries(
+        self, entries: Sequence[tuple[str, int, int, int]]
+    ) -> list[bool]:
+        """
+        :param entries: ``(key, limit, expiry, amount)`` tuples
+        :return: whether each entry was acquired
+        """
+
+        return await self.bridge.acquire_entries(entries)
+
+    async def acquire_all_entries(
+        self, entries: Sequence[tuple[str, int, int]], amount: int = 1
+    ) -> bool:
+        """
+        Acquire :paramref:`amount` entries in multiple moving windows only
+        if all of them have room for them, in a single lua script
+
+        :param entries: ``(key, limit, expiry)`` tuples
+        :param amount: the number of entries to acquire in each window
+        :return: ``True`` if the entries were acquired in all the windows
+        """
+
+        return await self.bridge.acquire_all_entries(entries, amount)
+
+    async def release_entry(self, key: str, expiry: int, amount: int = 1) -> None:
+        """
+        :param key: rate limit key to release the entries of
+        :param expiry: expiry of the entries
+        :param amount: the number of entries to release
+        """
+        await self.bridge.release_entry(key, amount)
+
     async def get_moving_window(
         self, key: str, limit: int, expiry: int
     ) -> tuple[float, int]:
@@ -189,6 +374,15 @@ class RedisStorage(Storage, MovingWindowSupport, SlidingWindowCounterSupport):
         """
         return await self.bridge.get_moving_window(key, limit, expiry)
 
+    async def get_moving_windows(
+        self, entries: Sequence[tuple[str, int, int]]
+    ) -> list[tuple[float, int]]:
+        """
+        :param entries: ``(key, limit, expiry)`` tuples
+        :return: (start of window, number of acquired entries) for each entry
+        """
+        return await self.bridge.get_moving_windows(entries)
+
     async def acquire_sliding_window_entry(
         self,
         key: str,
@@ -196,12 +390,76 @@ class RedisStorage(Storage, MovingWindowSupport, SlidingWindowCounterSupport):
         expiry: int,
         amount: int = 1,
     ) -> bool:
+        if self.coalescer:
+            return await self.coalescer.submit(
+                self.acquire_sliding_window_entries, (key, limit, expiry, amount)
+            )
         current_key = self._current_window_key(key)
         previous_key = self._previous_window_key(key)
         return await self.bridge.acquire_sliding_window_entry(
             previous_key, current_key, limit, expiry, amount
         )
 
+    async def acquire_sliding_window_entry_with_window(
+        self, key: str, limit: int, expiry: int, amount: int = 1
+    ) -> tuple[bool, int, float, int, float]:
+        current_key = self._current_window_key(key)
+        previous_key = self._previous_window_key(key)
+        return await self.bridge.acquire_sliding_window_entry_with_window(
+            previous_key, current_key, limit, expiry, amount
+        )
+
+    async def acquire_sliding_window_entries(
+        self, entries: Sequence[tuple[str, int, int, int]]
+    ) -> list[bool]:
+        return await self.bridge.acquire_sliding_window_entries(
+            [
+                (
+                    self._previous_window_key(key),
+                    self._current_window_key(key),
+                    limit,
+                    expiry,
+                    amount,
+                )
+                for key, limit, expiry, amount in entries
+            ]
+        )
+
+    async def acquire_all_sliding_window_entries(
+        self, entries: Sequence[tuple[str, int, int]], amount: int = 1
+    ) -> bool:
+        """
+        Acquire :paramref:`amount` entries in multiple sliding windows only
+        if the weighted count of every window stays within its limit, in a
+        single lua script
+
+        :param entries: ``(key, limit, expiry)`` tuples
+        :param amount: the number of entries to acquire in each window
+        :return: ``True`` if the entries were acquired in all the windows
+        """
+        return await self.bridge.acquire_all_sliding_window_entries(
+            [
+                (
+                    self._previous_window_key(key),
+                    self._current_window_key(key),
+                    limit,
+                    expiry,
+                )
+                for key, limit, expiry in entries
+            ],
+            amount,
+        )
+
+    async def release_sliding_window_entry(
+        self, key: str, expiry: int, amount: int = 1
+    ) -> None:
+        """
+        :param key: rate limit key to release the entries of
+        :param expiry: expiry of the entries
+        :param amount: the number of entries to release
+        """
+        await self.bridge.decr(self._current_window_key(key), amount)
+
     async def get_sliding_window(
         self, key: str, expiry: int
     ) -> tuple[int, float, int, float]:
@@ -209,6 +467,91 @@ class RedisStorage(Storage, MovingWindowSupport, SlidingWindowCounterSupport):
         current_key = self._current_window_key(key)
         return await self.bridge.get_sliding_window(previous_key, current_key, expiry)
 
+    async def get_sliding_windows(
+        self, entries: Sequence[tuple[str, int]]
+    ) -> list[tuple[int, float, int, float]]:
+        return await self.bridge.get_sliding_windows(
+            [
+                (self._previous_window_key(key), self._current_window_key(key), expiry)
+                for key, expiry in entries
+            ]
+        )
+
+    async def acquire_gcra_entry(
+        self, key: str, limit: int, expiry: int, amount: int = 1
+    ) -> bool:
+        """
+        :param key: rate limit key to acquire an entry in
+        :param limit: amount of entries allowed
+        :param expiry: expiry of the entry
+        :param amount: the number of entries to acquire
+        """
+
+        return await self.bridge.acquire_gcra_entry(
+            key, limit, self.emission_interval(limit, expiry), amount
+        )
+
+    async def acquire_gcra_entries(
+        self, entries: Sequence[tuple[str, int, int, int]]
+    ) -> list[bool]:
+        """
+        :param entries: ``(key, limit, expiry, amount)`` tuples
+        :return: whether each entry was acquired
+        """
+
+        return await self.bridge.acquire_gcra_entries(
+            [
+                (key, limit, self.emission_interval(limit, expiry), amount)
+                for key, limit, expiry, amount in entries
+            ]
+        )
+
+    async def acquire_all_gcra_entries(
+        self, entries: Sequence[tuple[str, int, int]], amount: int = 1
+    ) -> bool:
+        """
+        Acquire :paramref:`amount` entries for multiple keys only if all of
+        them allow it, in a single lua script
+
+        :param entries: ``(key, limit, expiry)`` tuples
+        :param amount: the number of entries to acquire for each key
+        :return: ``True`` if the entries were acquired for all the keys
+        """
+
+        return await self.bridge.acquire_all_gcra_entries(
+            [
+                (key, limit, self.emission_interval(limit, expiry))
+                for key, limit, expiry in entries
+            ],
+            amount,
+        )
+
+    async def acquire_gcra_entry_with_tat(
+        self, key: str, limit: int, expiry: int, amount: int = 1
+    ) -> tuple[bool, int]:
+        """
+        Acquire entries and return the theoretical arrival time of
+        :paramref:`key` after the attempt, in a single lua script
+
+        :param key: rate limit key to acquire an entry in
+        :param limit: amount of entries allowed
+        :param expiry: expiry of the entry
+        :param amount: the number of entries to acquire
+        """
+
+        return await self.bridge.acquire_gcra_entry_with_tat(
+            key, limit, self.emission_interval(limit, expiry), amount
+        )
+
+    async def get_gcra_tat(self, key: str) -> int:
+        """
+        :param key: the rate limit key
+        :return: the theoretical arrival time of :paramref:`key` in
+         microseconds since the epoch or ``0`` if the key does not exist
+        """
+
+        return await self.bridge.get(key)
+
     async def get_expiry(self, key: str) -> float:
         """
         :param key: the key to get the expiry for
@@ -223,17 +566,35 @@ class RedisStorage(Storage, MovingWindowSupport, SlidingWindowCounterSupport):
 
         return await self.bridge.check()
 
+    @versionchanged(
+        version="4.7",
+        reason="Keys are iterated over with ``SCAN`` instead of ``KEYS``",
+    )
     async def reset(self) -> int | None:
         """
-        This function calls a Lua Script to delete keys prefixed with
-        ``self.PREFIX`` in blocks of 5000.
-
-        .. warning:: This operation was designed to be fast, but was not tested
-           on a large production based system. Be careful with its usage as it
-           could be slow on very large data sets.
+        Deletes the keys prefixed with ``self.PREFIX``
+        (see :meth:`reset_iter`)
         """
 
-        return await self.bridge.lua_reset()
+        return sum([deleted async for deleted in self.reset_iter()])
+
+    @versionadded(version="4.7")
+    async def reset_iter(self, count: int = 1000) -> AsyncIterator[int]:
+        """
+        Deletes the keys prefixed with ``self.PREFIX`` incrementally,
+        iterating over them with ``SCAN`` and deleting each batch with
+        ``UNLINK`` so that the server is never blocked for long, even with a
+        very large number of keys. In a cluster each batch scans the next
+        page of every primary concurrently and deletes the keys found with a
+        pipeline of ``UNLINK`` commands.
+
+        :param count: the ``COUNT`` hint passed to ``SCAN`` (the approximate
+         number of keys inspected per batch on each node)
+        :return: an asynchronous iterator over the number of keys deleted by
+         each batch
+        """
+        async for deleted in self.bridge.reset_iter(count):
+            yield deleted
 
 
 @versionadded(version="2.1")
@@ -249,6 +610,14 @@ class RedisStorage(Storage, MovingWindowSupport, SlidingWindowCounterSupport):
         " ``async+valkey+cluster`` schema"
     ),
 )
+@versionchanged(
+    version="4.7",
+    reason=(
+        "Added the :paramref:`moving_window_engine`, :paramref:`coalesce_window`,"
+        " :paramref:`use_functions`, :paramref:`use_replicas`,"
+        " :paramref:`max_replica_lag` & :paramref:`clock` arguments"
+    ),
+)
 class RedisClusterStorage(RedisStorage):
     """
     Rate limit storage with redis cluster as backend
@@ -268,6 +637,12 @@ class RedisClusterStorage(RedisStorage):
         uri: str,
         wrap_exceptions: bool = False,
         implementation: Literal["redispy", "coredis", "valkey"] = "coredis",
+        moving_window_engine: Literal["list", "zset", "packed"] = "list",
+        coalesce_window: float | None = None,
+        use_functions: bool = False,
+        use_replicas: bool = False,
+        max_replica_lag: float | None = None,
+        clock: Literal["client", "server"] = "client",
         **options: float | str | bool,
     ) -> None:
         """
@@ -283,35 +658,87 @@ class RedisClusterStorage(RedisStorage):
          - ``coredis``: :class:`coredis.RedisCluster`
          - ``redispy``: :class:`redis.asyncio.cluster.RedisCluster`
          - ``valkey``: :class:`valkey.asyncio.cluster.ValkeyCluster`
+        :param moving_window_engine: How the entries of the
+         :ref:`strategies:moving window` strategy are stored, either ``list``,
+         ``zset`` or ``packed`` (refer to :class:`~limits.aio.storage.RedisStorage`)
+        :param coalesce_window: If set, concurrent limiter operations are
+         collected for this many seconds and executed as a single pipeline
+         (refer to :class:`~limits.aio.storage.RedisStorage`)
+        :param use_functions: Whether to install the lua scripts as a library
+         of functions and execute them with ``FCALL``
+         (refer to :class:`~limits.aio.storage.RedisStorage`)
+        :param use_replicas: Whether to send read only operations to the
+         replicas of the cluster (in ``READONLY`` mode) through a second
+         cluster client
+        :param max_replica_lag: If set (along with :paramref:`use_replicas`),
+         the moving & sliding window reads are sent to the replicas as well,
+         and read only operations are sent to the primaries instead of the
+         replicas while any replica lags behind its primary by more than this
+         many seconds
+        :param clock: Where the timestamps of the :ref:`strategies:moving window`
+         & :ref:`strategies:gcra` strategies are read from, either ``client``
+         or ``server`` (refer to :class:`~limits.aio.storage.RedisStorage`)
         :param options: all remaining keyword arguments are passed
          directly to the constructor of :class:`coredis.RedisCluster` or
          :class:`redis.asyncio.RedisCluster`
         :raise ConfigurationError: when the redis library is not
          available or if the redis host cannot be pinged.
         """
+        self.use_replicas = use_replicas
+        self.max_replica_lag = max_replica_lag
         super().__init__(
             uri,
             wrap_exceptions=wrap_exceptions,
             implementation=implementation,
+            moving_window_engine=moving_window_engine,
+            coalesce_window=coalesce_window,
+            use_functions=use_functions,
+            clock=clock,
             **options,
         )
 
     def configure_bridge(self) -> None:
-        self.bridge.use_cluster(**self.options)
+        self.bridge.use_cluster(self.use_replicas, **self.options)
+        self.bridge.max_replica_lag = self.max_replica_lag
 
-    async def reset(self) -> int | None:
+    async def incr_all(
+        self, entries: Sequence[tuple[str, int, int]], amount: int = 1
+    ) -> bool:
         """
-        Redis Clusters are sharded and deleting across shards
-        can't be done atomically. Because of this, this reset loops over all
-        keys that are prefixed with ``self.PREFIX`` and calls delete on them,
-        one at a time.
+        The keys of different limits are usually owned by different nodes
+        and can't be updated by a single lua script, so this check and
+        increment is not atomic (see :meth:`limits.aio.storage.Storage.incr_all`)
+        """
+        return await Storage.incr_all(self, entries, amount)
 
-        .. warning:: This operation was not tested with extremely large data sets.
-           On a large production based system, care should be taken with its
-           usage as it could be slow on very large data sets
+    async def acquire_all_entries(
+        self, entries: Sequence[tuple[str, int, int]], amount: int = 1
+    ) -> bool:
+        """
+        Not atomic in a cluster (see
+        :meth:`limits.aio.storage.MovingWindowSupport.acquire_all_entries`)
+        """
+        return await MovingWindowSupport.acquire_all_entries(self, entries, amount)
+
+    async def acquire_all_sliding_window_entries(
+        self, entries: Sequence[tuple[str, int, int]], amount: int = 1
+    ) -> bool:
         """
+        Not atomic in a cluster (see
+        :meth:`limits.aio.storage.SlidingWindowCounterSupport.acquire_all_sliding_window_entries`)
+        """
+        return await SlidingWindowCounterSupport.acquire_all_sliding_window_entries(
+            self, entries, amount
+        )
 
-        return await self.bridge.reset()
+    async def acquire_all_gcra_entries(
+        self, entries: Sequence[tuple[str, int, int]], amount: int = 1
+    ) -> bool:
+        """
+        Not atomic in a cluster (see
+        :meth:`limits.aio.storage.GCRASupport.acquire_all_gcra_entries`)
+        """
+        return await GCRASupport.acquire_all_gcra_entries(self, entries, amount)
 
 
 @versionadded(version="2.1")
@@ -327,6 +754,14 @@ class RedisClusterStorage(RedisStorage):
         " ``async+valkey+sentinel`` schema"
     ),
 )
+@versionchanged(
+    version="4.7",
+    reason=(
+        "Added the :paramref:`moving_window_engine`, :paramref:`coalesce_window`,"
+        " :paramref:`use_functions`, :paramref:`max_replica_lag` &"
+        " :paramref:`clock` arguments"
+    ),
+)
 class RedisSentinelStorage(RedisStorage):
     """
     Rate limit storage with redis sentinel as backend
@@ -357,6 +792,11 @@ class RedisSentinelStorage(RedisStorage):
         service_name: str | None = None,
         use_replicas: bool = True,
         sentinel_kwargs: dict[str, float | str | bool] | None = None,
+        moving_window_engine: Literal["list", "zset", "packed"] = "list",
+        coalesce_window: float | None = None,
+        use_functions: bool = False,
+        max_replica_lag: float | None = None,
+        clock: Literal["client", "server"] = "client",
         **options: float | str | bool,
     ):
         """
@@ -377,6 +817,23 @@ class RedisSentinelStorage(RedisStorage):
         :param sentinel_kwargs: optional arguments to pass as
          `sentinel_kwargs`` to :class:`coredis.sentinel.Sentinel` or
          :class:`redis.asyncio.Sentinel`
+        :param moving_window_engine: How the entries of the
+         :ref:`strategies:moving window` strategy are stored, either ``list``,
+         ``zset`` or ``packed`` (refer to :class:`~limits.aio.storage.RedisStorage`)
+        :param coalesce_window: If set, concurrent limiter operations are
+         collected for this many seconds and executed as a single pipeline
+         (refer to :class:`~limits.aio.storage.RedisStorage`)
+        :param use_functions: Whether to install the lua scripts as a library
+         of functions and execute them with ``FCALL``
+         (refer to :class:`~limits.aio.storage.RedisStorage`)
+        :param max_replica_lag: If set (along with :paramref:`use_replicas`),
+         the moving & sliding window reads are sent to the replicas as well,
+         and read only operations are sent to the primary instead of the
+         replicas while any replica lags behind the primary by more than this
+         many seconds
+        :param clock: Where the timestamps of the :ref:`strategies:moving window`
+         & :ref:`strategies:gcra` strategies are read from, either ``client``
+         or ``server`` (refer to :class:`~limits.aio.storage.RedisStorage`)
         :param options: all remaining keyword arguments are passed
          directly to the constructor of :class:`coredis.sentinel.Sentinel` or
          :class:`redis.asyncio.sentinel.Sentinel`
@@ -386,11 +843,16 @@ class RedisSentinelStorage(RedisStorage):
 
         self.service_name = service_name
         self.use_replicas = use_replicas
+        self.max_replica_lag = max_replica_lag
         self.sentinel_kwargs = sentinel_kwargs
         super().__init__(
             uri,
             wrap_exceptions=wrap_exceptions,
             implementation=implementation,
+            moving_window_engine=moving_window_engine,
+            coalesce_window=coalesce_window,
+            use_functions=use_functions,
+            clock=clock,
             **options,
         )
 
@@ -398,3 +860,4 @@ class RedisSentinelStorage(RedisStorage):
         self.bridge.use_sentinel(
             self.service_name, self.use_replicas, self.sentinel_kwargs, **self.options
         )
+        self.bridge.max_replica_lag = self.max_replica_lag
@@ -1,10 +1,19 @@
 from __future__ import annotations
 
+import time
 import urllib
 from abc import ABC, abstractmethod
+from collections.abc import AsyncIterator
 from types import ModuleType
 
-from limits.util import get_package_data
+from limits.errors import ConfigurationError
+from limits.typing import Any, Literal, Sequence
+from limits.util import (
+    RedisFunctionLibrary,
+    get_package_data,
+    get_redis_function_library,
+    get_replication_lag,
+)
 
 
 class RedisBridge(ABC):
@@ -15,19 +24,76 @@ class RedisBridge(ABC):
     SCRIPT_ACQUIRE_MOVING_WINDOW = get_package_data(
         f"{RES_DIR}/acquire_moving_window.lua"
     )
-    SCRIPT_CLEAR_KEYS = get_package_data(f"{RES_DIR}/clear_keys.lua")
     SCRIPT_INCR_EXPIRE = get_package_data(f"{RES_DIR}/incr_expire.lua")
     SCRIPT_SLIDING_WINDOW = get_package_data(f"{RES_DIR}/sliding_window.lua")
     SCRIPT_ACQUIRE_SLIDING_WINDOW = get_package_data(
         f"{RES_DIR}/acquire_sliding_window.lua"
     )
+    SCRIPT_INCR_EXPIRE_ALL = get_package_data(f"{RES_DIR}/incr_expire_all.lua")
+    SCRIPT_ACQUIRE_MOVING_WINDOW_ALL = get_package_data(
+        f"{RES_DIR}/acquire_moving_window_all.lua"
+    )
+    SCRIPT_RELEASE_MOVING_WINDOW = get_package_data(
+        f"{RES_DIR}/release_moving_window.lua"
+    )
+    SCRIPT_ACQUIRE_SLIDING_WINDOW_ALL = get_package_data(
+        f"{RES_DIR}/acquire_sliding_window_all.lua"
+    )
+    SCRIPT_MOVING_WINDOW_ZSET = get_package_data(f"{RES_DIR}/moving_window_zset.lua")
+    SCRIPT_ACQUIRE_MOVING_WINDOW_ZSET = get_package_data(
+        f"{RES_DIR}/acquire_moving_window_zset.lua"
+    )
+    SCRIPT_ACQUIRE_MOVING_WINDOW_ALL_ZSET = get_package_data(
+        f"{RES_DIR}/acquire_moving_window_all_zset.lua"
+    )
+    SCRIPT_RELEASE_MOVING_WINDOW_ZSET = get_package_data(
+        f"{RES_DIR}/release_moving_window_zset.lua"
+    )
+    SCRIPT_MOVING_WINDOW_PACKED = get_package_data(
+        f"{RES_DIR}/moving_window_packed.lua"
+    )
+    SCRIPT_ACQUIRE_MOVING_WINDOW_PACKED = get_package_data(
+        f"{RES_DIR}/acquire_moving_window_packed.lua"
+    )
+    SCRIPT_ACQUIRE_MOVING_WINDOW_ALL_PACKED = get_package_data(
+        f"{RES_DIR}/acquire_moving_window_all_packed.lua"
+    )
+    SCRIPT_RELEASE_MOVING_WINDOW_PACKED = get_package_data(
+        f"{RES_DIR}/release_moving_window_packed.lua"
+    )
+    SCRIPT_ACQUIRE_GCRA = get_package_data(f"{RES_DIR}/acquire_gcra.lua")
+    SCRIPT_ACQUIRE_GCRA_ALL = get_package_data(f"{RES_DIR}/acquire_gcra_all.lua")
+    SCRIPT_DECR = get_package_data(f"{RES_DIR}/decr.lua")
+
+    READONLY_SCRIPTS = (
+        "moving_window",
+        "moving_window_zset",
+        "moving_window_packed",
+    )
+
+    use_replicas: bool = False
+    max_replica_lag: float | None = None
+    _replica_lag_checked_at = float("-inf")
+    _replicas_in_sync = False
 
     def __init__(
         self,
         uri: str,
         dependency: ModuleType,
+        moving_window_engine: Literal["list", "zset", "packed"] = "list",
+        use_functions: bool = False,
+        clock: Literal["client", "server"] = "client",
     ) -> None:
+        if moving_window_engine not in ("list", "zset", "packed"):
+            raise ConfigurationError(
+                f"Unsupported moving window engine: {moving_window_engine}"
+            )
+        if clock not in ("client", "server"):
+            raise ConfigurationError(f"Unsupported clock: {clock}")
         self.uri = uri
+        self.moving_window_engine = moving_window_engine
+        self.use_functions = use_functions
+        self.clock = clock
         self.parsed_uri = urllib.parse.urlparse(self.uri)
         self.dependency = dependency
         self.parsed_auth = {}
@@ -39,9 +105,127 @@ class RedisBridge(ABC):
     def prefixed_key(self, key: str) -> str:
         return f"{self.PREFIX}:{key}"
 
+    def _script_timestamp(
+        self, timestamp: float | None = None, microseconds: bool = False
+    ) -> float:
+        """
+        The current time passed to the lua scripts (in seconds, or in
+        microseconds for the gcra strategy), or ``0`` if the scripts read
+        it from the clock of the server
+
+        :param timestamp: the current time if it was already read
+        """
+        if self.clock == "server":
+            return 0
+        if microseconds:
+            return time.time_ns() // 1000
+        return time.time() if timestamp is None else timestamp
+
+    @property
+    def moving_window_scripts(self) -> tuple[bytes, bytes, bytes, bytes]:
+        """
+        The moving window, acquire, acquire all and release scripts for the
+        configured :attr:`moving_window_engine`
+        """
+        if self.moving_window_engine == "zset":
+            return (
+                self.SCRIPT_MOVING_WINDOW_ZSET,
+                self.SCRIPT_ACQUIRE_MOVING_WINDOW_ZSET,
+                self.SCRIPT_ACQUIRE_MOVING_WINDOW_ALL_ZSET,
+                self.SCRIPT_RELEASE_MOVING_WINDOW_ZSET,
+            )
+        if self.moving_window_engine == "packed":
+            return (
+                self.SCRIPT_MOVING_WINDOW_PACKED,
+                self.SCRIPT_ACQUIRE_MOVING_WINDOW_PACKED,
+                self.SCRIPT_ACQUIRE_MOVING_WINDOW_ALL_PACKED,
+                self.SCRIPT_RELEASE_MOVING_WINDOW_PACKED,
+            )
+        return (
+            self.SCRIPT_MOVING_WINDOW,
+            self.SCRIPT_ACQUIRE_MOVING_WINDOW,
+            self.SCRIPT_ACQUIRE_MOVING_WINDOW_ALL,
+            self.SCRIPT_RELEASE_MOVING_WINDOW,
+        )
+
+    @property
+    def function_library(self) -> RedisFunctionLibrary:
+        """
+        The library of functions used if :attr:`use_functions` is set
+        """
+        return get_redis_function_library(self.RES_DIR, self.READONLY_SCRIPTS)
+
+    def is_missing_function(self, error: Exception) -> bool:
+        """
+        Whether :paramref:`error` was raised because the library of
+        functions isn't loaded (for example after a restart or
+        ``FUNCTION FLUSH``)
+        """
+        return self.use_functions and "function not found" in str(error).lower()
+
+    async def reads_from_replicas(self) -> bool:
+        """
+        Whether read only operations are currently sent to replicas
+        (refer to :meth:`limits.storage.RedisStorage.reads_from_replicas`)
+        """
+        if not self.use_replicas:
+            return False
+        if self.max_replica_lag is None:
+            return True
+        if time.monotonic() - self._replica_lag_checked_at >= 1:
+            self._replica_lag_checked_at = time.monotonic()
+            try:
+                self._replicas_in_sync = (
+                    max(
+                        get_replication_lag(info)
+                        for info in await self.replication_info()
+                    )
+                    <= self.max_replica_lag
+                )
+            except self.base_exceptions:
+                self._replicas_in_sync = False
+        return self._replicas_in_sync
+
+    async def _reads_windows_from_replicas(self) -> bool:
+        """
+        Whether the moving & sliding window reads are sent to replicas as
+        well, which is only the case if their staleness is bounded by
+        :attr:`max_replica_lag`
+        """
+        return self.max_replica_lag is not None and await self.reads_from_replicas()
+
+    @staticmethod
+    def shift_sliding_window(
+        expiry: int,
+        previous_count: int | str | bytes | None,
+        previous_ttl: int,
+        current_count: int | str | bytes | None,
+        current_ttl: int,
+    ) -> tuple[int, float, int, float]:
+        """
+        Convert the counters & ttls (in milliseconds) of a sliding window read
+        with read only commands to the result of the sliding window script,
+        by shifting the current window if it has expired
+        """
+        if 0 < current_ttl < expiry * 1000:
+            previous_count, previous_ttl = current_count, current_ttl
+            current_count, current_ttl = 0, current_ttl + expiry * 1000
+        return (
+            int(previous_count or 0),
+            max(0, previous_ttl) / 1000,
+            int(current_count or 0),
+            max(0, current_ttl) / 1000,
+        )
+
+    @abstractmethod
+    async def replication_info(self) -> list[dict[str, Any]]: ...  # type: ignore[explicit-any]
+
     @abstractmethod
     def register_scripts(self) -> None: ...
 
+    @abstractmethod
+    async def load_functions(self) -> None: ...
+
     @abstractmethod
     def use_sentinel(
         self,
@@ -55,7 +239,9 @@ class RedisBridge(ABC):
     def use_basic(self, **options: str | float | bool) -> None: ...
 
     @abstractmethod
-    def use_cluster(self, **options: str | float | bool) -> None: ...
+    def use_cluster(
+        self, use_replicas: bool = False, **options: str | float | bool
+    ) -> None: ...
 
     @property
     @abstractmethod
@@ -71,22 +257,71 @@ class RedisBridge(ABC):
         amount: int = 1,
     ) -> int: ...
 
+    @abstractmethod
+    async def incr_many(self, entries: Sequence[tuple[str, int, int]]) -> list[int]: ...
+
+    @abstractmethod
+    async def incr_all(
+        self, entries: Sequence[tuple[str, int, int]], amount: int = 1
+    ) -> bool: ...
+
+    @abstractmethod
+    async def incr_with_expiry(
+        self, key: str, expiry: int, amount: int = 1
+    ) -> tuple[int, float]: ...
+
+    @abstractmethod
+    async def decr(self, key: str, amount: int = 1) -> int: ...
+
     @abstractmethod
     async def get(self, key: str) -> int: ...
 
+    @abstractmethod
+    async def get_counts(self, keys: Sequence[str]) -> list[int]: ...
+
     @abstractmethod
     async def clear(self, key: str) -> None: ...
 
+    @abstractmethod
+    async def acquire_gcra_entry(
+        self, key: str, limit: int, interval: int, amount: int = 1
+    ) -> bool: ...
+
+    @abstractmethod
+    async def acquire_gcra_entries(
+        self, entries: Sequence[tuple[str, int, int, int]]
+    ) -> list[bool]: ...
+
+    @abstractmethod
+    async def acquire_all_gcra_entries(
+        self, entries: Sequence[tuple[str, int, int]], amount: int = 1
+    ) -> bool: ...
+
+    @abstractmethod
+    async def acquire_gcra_entry_with_tat(
+        self, key: str, limit: int, interval: int, amount: int = 1
+    ) -> tuple[bool, int]: ...
+
     @abstractmethod
     async def get_moving_window(
         self, key: str, limit: int, expiry: int
     ) -> tuple[float, int]: ...
 
+    @abstractmethod
+    async def get_moving_windows(
+        self, entries: Sequence[tuple[str, int, int]]
+    ) -> list[tuple[float, int]]: ...
+
     @abstractmethod
     async def get_sliding_window(
         self, previous_key: str, current_key: str, expiry: int
     ) -> tuple[int, float, int, float]: ...
 
+    @abstractmethod
+    async def get_sliding_windows(
+        self, entries: Sequence[tuple[str, str, int]]
+    ) -> list[tuple[int, float, int, float]]: ...
+
     @abstractmethod
     async def acquire_entry(
         self,
@@ -96,6 +331,24 @@ class RedisBridge(ABC):
         amount: int = 1,
     ) -> bool: ...
 
+    @abstractmethod
+    async def acquire_entries(
+        self, entries: Sequence[tuple[str, int, int, int]]
+    ) -> list[bool]: ...
+
+    @abstractmethod
+    async def acquire_all_entries(
+        self, entries: Sequence[tuple[str, int, int]], amount: int = 1
+    ) -> bool: ...
+
+    @abstractmethod
+    async def acquire_entry_with_window(
+        self, key: str, limit: int, expiry: int, amount: int = 1
+    ) -> tuple[bool, float, int]: ...
+
+    @abstractmethod
+    async def release_entry(self, key: str, amount: int = 1) -> None: ...
+
     @abstractmethod
     async def acquire_sliding_window_entry(
         self,
@@ -107,13 +360,30 @@ class RedisBridge(ABC):
     ) -> bool: ...
 
     @abstractmethod
-    async def get_expiry(self, key: str) -> float: ...
+    async def acquire_sliding_window_entries(
+        self, entries: Sequence[tuple[str, str, int, int, int]]
+    ) -> list[bool]: ...
 
     @abstractmethod
-    async def check(self) -> bool: ...
+    async def acquire_all_sliding_window_entries(
+        self, entries: Sequence[tuple[str, str, int, int]], amount: int = 1
+    ) -> bool: ...
 
     @abstractmethod
-    async def reset(self) -> int | None: ...
+    async def acquire_sliding_window_entry_with_window(
+        self,
+        previous_key: str,
+        current_key: str,
+        limit: int,
+        expiry: int,
+        amount: int = 1,
+    ) -> tuple[bool, int, float, int, float]: ...
+
+    @abstractmethod
+    async def get_expiry(self, key: str) -> float: ...
+
+    @abstractmethod
+    async def check(self) -> bool: ...
 
     @abstractmethod
-    async def lua_reset(self) -> int | None: ...
+    def reset_iter(self, count: int = 1000) -> AsyncIterator[int]: ...
@@ -1,14 +1,56 @@
 from __future__ import annotations
 
+import asyncio
 import time
+from collections.abc import AsyncIterator
 from typing import TYPE_CHECKING, cast
 
 from limits.aio.storage.redis.bridge import RedisBridge
 from limits.errors import ConfigurationError
-from limits.typing import AsyncCoRedisClient, Callable
+from limits.typing import Any, AsyncCoRedisClient, Callable, Sequence
 
 if TYPE_CHECKING:
     import coredis
+    import coredis.pipeline
+    import coredis.typing
+
+
+class CoredisFunction:
+    """
+    A lua script installed as a function of the library loaded by
+    :meth:`CoredisBridge.load_functions` and executed with ``FCALL``, or
+    ``FCALL_RO`` if the script doesn't write any keys.
+    """
+
+    def __init__(self, bridge: CoredisBridge, name: str, readonly: bool) -> None:
+        self.bridge = bridge
+        self.name = name
+        self.readonly = readonly
+
+    async def execute(  # type: ignore[explicit-any]
+        self,
+        keys: coredis.typing.Parameters[coredis.typing.KeyT] = (),
+        args: coredis.typing.Parameters[coredis.typing.ValueT] = (),
+        client: AsyncCoRedisClient | coredis.pipeline.Pipeline[bytes] | None = None,
+    ) -> Any:
+        connection = client or self.bridge.get_connection()
+        try:
+            return await self._call(connection, keys, args)
+        except self.bridge.base_exceptions as error:
+            if not self.bridge.is_missing_function(error):
+                raise
+            await self.bridge.load_functions()
+            return await self._call(connection, keys, args)
+
+    async def _call(  # type: ignore[explicit-any]
+        self,
+        connection: AsyncCoRedisClient | coredis.pipeline.Pipeline[bytes],
+        keys: coredis.typing.Parameters[coredis.typing.KeyT],
+        args: coredis.typing.Parameters[coredis.typing.ValueT],
+    ) -> Any:
+        if self.readonly:
+            return await connection.fcall_ro(self.name, keys, args)
+        return await connection.fcall(self.name, keys, args)
 
 
 class CoredisBridge(RedisBridge):
@@ -52,6 +94,7 @@ class CoredisBridge(RedisBridge):
         )
         self.storage = self.sentinel.primary_for(service_name)
         self.storage_replica = self.sentinel.replica_for(service_name)
+        self.use_replicas = use_replicas
         self.connection_getter = lambda readonly: (
             self.storage_replica if readonly and use_replicas else self.storage
         )
@@ -66,7 +109,9 @@ class CoredisBridge(RedisBridge):
 
         self.connection_getter = lambda _: self.storage
 
-    def use_cluster(self, **options: str | float | bool) -> None:
+    def use_cluster(
+        self, use_replicas: bool = False, **options: str | float | bool
+    ) -> None:
         sep = self.parsed_uri.netloc.find("@") + 1
         cluster_hosts: list[dict[str, int | str]] = []
         cluster_hosts.extend(
@@ -75,41 +120,202 @@ class CoredisBridge(RedisBridge):
             if loc
             for host, port in [loc.split(":")]
         )
+        cluster_options = {
+            **self.DEFAULT_CLUSTER_OPTIONS,
+            **self.parsed_auth,
+            **options,
+        }
         self.storage = self.dependency.RedisCluster(
-            startup_nodes=cluster_hosts,
-            **{**self.DEFAULT_CLUSTER_OPTIONS, **self.parsed_auth, **options},
+            startup_nodes=cluster_hosts, **cluster_options
+        )
+        if use_replicas:
+            self.storage_replica = self.dependency.RedisCluster(
+                startup_nodes=cluster_hosts,
+                **{**cluster_options, "read_from_replicas": True},
+            )
+        self.use_replicas = use_replicas
+        self.connection_getter = lambda readonly: (
+            self.storage_replica if readonly and use_replicas else self.storage
         )
-        self.connection_getter = lambda _: self.storage
 
-    lua_moving_window: coredis.commands.Script[bytes]
-    lua_acquire_moving_window: coredis.commands.Script[bytes]
-    lua_sliding_window: coredis.commands.Script[bytes]
-    lua_acquire_sliding_window: coredis.commands.Script[bytes]
-    lua_clear_keys: coredis.commands.Script[bytes]
-    lua_incr_expire: coredis.commands.Script[bytes]
+    lua_moving_window: coredis.commands.Script[bytes] | CoredisFunction
+    lua_acquire_moving_window: coredis.commands.Script[bytes] | CoredisFunction
+    lua_sliding_window: coredis.commands.Script[bytes] | CoredisFunction
+    lua_acquire_sliding_window: coredis.commands.Script[bytes] | CoredisFunction
+    lua_incr_expire: coredis.commands.Script[bytes] | CoredisFunction
+    lua_incr_expire_all: coredis.commands.Script[bytes] | CoredisFunction
+    lua_acquire_moving_window_all: coredis.commands.Script[bytes] | CoredisFunction
+    lua_acquire_sliding_window_all: coredis.commands.Script[bytes] | CoredisFunction
+    lua_release_moving_window: coredis.commands.Script[bytes] | CoredisFunction
+    lua_acquire_gcra: coredis.commands.Script[bytes] | CoredisFunction
+    lua_acquire_gcra_all: coredis.commands.Script[bytes] | CoredisFunction
+    lua_decr: coredis.commands.Script[bytes] | CoredisFunction
     connection_getter: Callable[[bool], AsyncCoRedisClient]
 
     def get_connection(self, readonly: bool = False) -> AsyncCoRedisClient:
         return self.connection_getter(readonly)
 
+    async def read_connection(self) -> AsyncCoRedisClient:
+        """
+        The connection to use for read only operations
+        """
+        return self.get_connection(await self.reads_from_replicas())
+
+    async def replication_info(self) -> list[dict[str, Any]]:  # type: ignore[explicit-any]
+        if isinstance(self.storage, self.dependency.RedisCluster):
+            return [
+                await primary.info("replication") for primary in self.storage.primaries
+            ]
+        return [await self.storage.info("replication")]
+
     def register_scripts(self) -> None:
-        self.lua_moving_window = self.get_connection().register_script(
-            self.SCRIPT_MOVING_WINDOW
-        )
-        self.lua_acquire_moving_window = self.get_connection().register_script(
-            self.SCRIPT_ACQUIRE_MOVING_WINDOW
+        (
+            moving_window,
+            acquire_moving_window,
+            acquire_moving_window_all,
+            release_moving_window,
+        ) = self.moving_window_scripts
+        self.lua_moving_window = self._register_script(moving_window)
+        self.lua_acquire_moving_window = self._register_script(acquire_moving_window)
+        self.lua_incr_expire = self._register_script(self.SCRIPT_INCR_EXPIRE)
+        self.lua_sliding_window = self._register_script(self.SCRIPT_SLIDING_WINDOW)
+        self.lua_acquire_sliding_window = self._register_script(
+            self.SCRIPT_ACQUIRE_SLIDING_WINDOW
         )
-        self.lua_clear_keys = self.get_connection().register_script(
-            self.SCRIPT_CLEAR_KEYS
+        self.lua_incr_expire_all = self._register_script(self.SCRIPT_INCR_EXPIRE_ALL)
+        self.lua_acquire_moving_window_all = self._register_script(
+            acquire_moving_window_all
         )
-        self.lua_incr_expire = self.get_connection().register_script(
-            self.SCRIPT_INCR_EXPIRE
+        self.lua_acquire_sliding_window_all = self._register_script(
+            self.SCRIPT_ACQUIRE_SLIDING_WINDOW_ALL
         )
-        self.lua_sliding_window = self.get_connection().register_script(
-            self.SCRIPT_SLIDING_WINDOW
+        self.lua_release_moving_window = self._register_script(release_moving_window)
+        self.lua_acquire_gcra = self._register_script(self.SCRIPT_ACQUIRE_GCRA)
+        self.lua_acquire_gcra_all = self._register_script(self.SCRIPT_ACQUIRE_GCRA_ALL)
+        self.lua_decr = self._register_script(self.SCRIPT_DECR)
+
+    def _register_script(
+        self, script: bytes
+    ) -> coredis.commands.Script[bytes] | CoredisFunction:
+        if not self.use_functions:
+            return self.get_connection().register_script(script)
+        name = self.function_library.functions[script]
+        return CoredisFunction(self, name, name in self.function_library.readonly)
+
+    async def load_functions(self) -> None:
+        await self.get_connection().function_load(
+            self.function_library.code, replace=True
         )
-        self.lua_acquire_sliding_window = self.get_connection().register_script(
-            self.SCRIPT_ACQUIRE_SLIDING_WINDOW
+
+    async def _run_script_batch(  # type: ignore[explicit-any]
+        self,
+        script: coredis.commands.Script[bytes] | CoredisFunction,
+        calls: Sequence[tuple[list[coredis.typing.KeyT], list[coredis.typing.ValueT]]],
+        readonly: bool = False,
+    ) -> list[Any]:
+        """
+        Run :paramref:`script` once for each ``(keys, args)`` pair in
+        :paramref:`calls` using a single non transactional pipeline, or
+        concurrently when connected to a cluster (cluster pipelines can't
+        load scripts). If :paramref:`readonly` is set the script doesn't
+        write and is run on the connection used for read only operations.
+        """
+        if isinstance(self.storage, self.dependency.RedisCluster):
+            if readonly and await self.reads_from_replicas():
+                return list(
+                    await asyncio.gather(
+                        *(
+                            self._run_readonly_script(script, keys, args)
+                            for keys, args in calls
+                        )
+                    )
+                )
+            return await self._cluster_script_batch(script, calls)
+        connection = await self.read_connection() if readonly else self.get_connection()
+        try:
+            return await self._pipeline_script_batch(script, calls, connection)
+        except self.base_exceptions as error:
+            if not self.is_missing_function(error):
+                raise
+        # every function is part of the same library, so none of the
+        # calls were executed
+        await self.load_functions()
+        return await self._pipeline_script_batch(script, calls, connection)
+
+    async def _pipeline_script_batch(  # type: ignore[explicit-any]
+        self,
+        script: coredis.commands.Script[bytes] | CoredisFunction,
+        calls: Sequence[tuple[list[coredis.typing.KeyT], list[coredis.typing.ValueT]]],
+        connection: AsyncCoRedisClient,
+    ) -> list[Any]:
+        pipeline = await connection.pipeline(transaction=False)
+        for keys, args in calls:
+            await script.execute(keys, args, client=pipeline)
+        return list(await pipeline.execute())
+
+    async def _cluster_script_batch(  # type: ignore[explicit-any]
+        self,
+        script: coredis.commands.Script[bytes] | CoredisFunction,
+        calls: Sequence[tuple[list[coredis.typing.KeyT], list[coredis.typing.ValueT]]],
+    ) -> list[Any]:
+        """
+        Run the calls with a cluster pipeline, which groups them by the
+        primary owning the slot of their keys and sends one pipeline to each
+        of those nodes. Cluster pipelines can't load scripts, so a missing
+        script is loaded on all the primaries and only the calls that weren't
+        executed are retried.
+        """
+        pipeline = await self.storage.pipeline(transaction=False)
+        for keys, args in calls:
+            if not isinstance(script, CoredisFunction):
+                await pipeline.evalsha(script.sha, keys, args)
+            elif script.readonly:
+                await pipeline.fcall_ro(script.name, keys, args)
+            else:
+                await pipeline.fcall(script.name, keys, args)
+        results = list(await pipeline.execute(raise_on_error=False))
+        if missing := [
+            idx
+            for idx, result in enumerate(results)
+            if isinstance(result, self.dependency.exceptions.NoScriptError)
+            or (isinstance(result, Exception) and self.is_missing_function(result))
+        ]:
+            if isinstance(script, CoredisFunction):
+                await self.load_functions()
+            else:
+                await self.storage.script_load(script.script)
+            for idx, result in zip(
+                missing,
+                await self._cluster_script_batch(
+                    script, [calls[idx] for idx in missing]
+                ),
+            ):
+                results[idx] = result
+        for result in results:
+            if isinstance(result, Exception):
+                raise result
+        return results
+
+    async def _run_readonly_script(  # type: ignore[explicit-any]
+        self,
+        script: coredis.commands.Script[bytes] | CoredisFunction,
+        keys: list[coredis.typing.KeyT],
+        args: list[coredis.typing.ValueT],
+    ) -> Any:
+        """
+        Run :paramref:`script`, which only reads a window, on a replica if the
+        window reads are sent to the replicas. Cluster clients only send
+        ``EVALSHA_RO`` (redis 7 or higher) to replicas.
+        """
+        connection = self.get_connection(await self._reads_windows_from_replicas())
+        if isinstance(script, CoredisFunction):
+            return await script.execute(keys, args, client=connection)
+        return await script.execute(
+            keys,
+            args,
+            client=connection,
+            readonly=connection is not self.storage
+            and isinstance(connection, self.dependency.RedisCluster),
         )
 
     async def incr(self, key: str, expiry: int, amount: int = 1) -> int:
@@ -118,32 +324,106 @@ class CoredisBridge(RedisBridge):
             await self.get_connection().expire(key, expiry)
         return value
 
+    async def incr_with_expiry(
+        self, key: str, expiry: int, amount: int = 1
+    ) -> tuple[int, float]:
+        value, ttl = cast(
+            list[int],
+            await self.lua_incr_expire.execute(
+                [self.prefixed_key(key)], [expiry, amount]
+            ),
+        )
+        return value, max(ttl, 0) / 1000 + time.time()
+
+    async def incr_many(self, entries: Sequence[tuple[str, int, int]]) -> list[int]:
+        return [
+            int(value)
+            for value, _ in await self._run_script_batch(
+                self.lua_incr_expire,
+                [
+                    ([self.prefixed_key(key)], [expiry, amount])
+                    for key, expiry, amount in entries
+                ],
+            )
+        ]
+
+    async def incr_all(
+        self, entries: Sequence[tuple[str, int, int]], amount: int = 1
+    ) -> bool:
+        if not entries:
+            return True
+        args: list[coredis.typing.ValueT] = [amount]
+        for _, limit, expiry in entries:
+            args.extend((limit, expiry))
+        return bool(
+            await self.lua_incr_expire_all.execute(
+                [self.prefixed_key(key) for key, _, _ in entries], args
+            )
+        )
+
+    async def decr(self, key: str, amount: int = 1) -> int:
+        key = self.prefixed_key(key)
+        return cast(int, await self.lua_decr.execute([key], [amount]))
+
     async def get(self, key: str) -> int:
         key = self.prefixed_key(key)
-        return int(await self.get_connection(readonly=True).get(key) or 0)
+        return int(await (await self.read_connection()).get(key) or 0)
+
+    async def get_counts(self, keys: Sequence[str]) -> list[int]:
+        if not keys:
+            return []
+        if isinstance(self.storage, self.dependency.RedisCluster):
+            return list(await asyncio.gather(*(self.get(key) for key in keys)))
+        values = await (await self.read_connection()).mget(
+            [self.prefixed_key(key) for key in keys]
+        )
+        return [int(value or 0) for value in values]
 
     async def clear(self, key: str) -> None:
         key = self.prefixed_key(key)
         await self.get_connection().delete([key])
 
-    async def lua_reset(self) -> int | None:
-        return cast(int, await self.lua_clear_keys.execute([self.prefixed_key("*")]))
-
     async def get_moving_window(
         self, key: str, limit: int, expiry: int
     ) -> tuple[float, int]:
         key = self.prefixed_key(key)
         timestamp = time.time()
-        window = await self.lua_moving_window.execute(
-            [key], [timestamp - expiry, limit]
+        window = await self._run_readonly_script(
+            self.lua_moving_window,
+            [key],
+            [self._script_timestamp(timestamp), limit, expiry],
         )
         if window:
-            return float(window[0]), window[1]  # type: ignore
+            return float(window[0]), window[1]
         return timestamp, 0
 
+    async def get_moving_windows(
+        self, entries: Sequence[tuple[str, int, int]]
+    ) -> list[tuple[float, int]]:
+        timestamp = time.time()
+        windows = await self._run_script_batch(
+            self.lua_moving_window,
+            [
+                (
+                    [self.prefixed_key(key)],
+                    [self._script_timestamp(timestamp), limit, expiry],
+                )
+                for key, limit, expiry in entries
+            ],
+            readonly=await self._reads_windows_from_replicas(),
+        )
+        return [
+            (float(window[0]), window[1]) if window else (timestamp, 0)
+            for window in windows
+        ]
+
     async def get_sliding_window(
         self, previous_key: str, current_key: str, expiry: int
     ) -> tuple[int, float, int, float]:
+        if await self._reads_windows_from_replicas():
+            return (
+                await self._read_sliding_windows([(previous_key, current_key, expiry)])
+            )[0]
         previous_key = self.prefixed_key(previous_key)
         current_key = self.prefixed_key(current_key)
 
@@ -158,17 +438,174 @@ class CoredisBridge(RedisBridge):
             )
         return 0, 0.0, 0, 0.0
 
+    async def get_sliding_windows(
+        self, entries: Sequence[tuple[str, str, int]]
+    ) -> list[tuple[int, float, int, float]]:
+        if await self._reads_windows_from_replicas():
+            return await self._read_sliding_windows(entries)
+        windows = await self._run_script_batch(
+            self.lua_sliding_window,
+            [
+                (
+                    [self.prefixed_key(previous_key), self.prefixed_key(current_key)],
+                    [expiry],
+                )
+                for previous_key, current_key, expiry in entries
+            ],
+        )
+        return [
+            (
+                int(window[0] or 0),
+                max(0, float(window[1] or 0)) / 1000,
+                int(window[2] or 0),
+                max(0, float(window[3] or 0)) / 1000,
+            )
+            if window
+            else (0, 0.0, 0, 0.0)
+            for window in windows
+        ]
+
+    async def _read_sliding_windows(
+        self, entries: Sequence[tuple[str, str, int]]
+    ) -> list[tuple[int, float, int, float]]:
+        """
+        Read the sliding windows with read only commands, so that they can
+        be served by a replica
+        """
+        connection = await self.read_connection()
+        keys = [
+            self.prefixed_key(key)
+            for previous_key, current_key, _ in entries
+            for key in (previous_key, current_key)
+        ]
+        results: list[Any]  # type: ignore[explicit-any]
+        if isinstance(connection, self.dependency.RedisCluster):
+            results = list(
+                await asyncio.gather(
+                    *(
+                        command
+                        for key in keys
+                        for command in (connection.get(key), connection.pttl(key))
+                    )
+                )
+            )
+        else:
+            pipeline = await connection.pipeline(transaction=False)
+            for key in keys:
+                await pipeline.get(key)
+                await pipeline.pttl(key)
+            results = list(await pipeline.execute())
+        return [
+            self.shift_sliding_window(expiry, *results[idx * 4 : idx * 4 + 4])
+            for idx, (_, _, expiry) in enumerate(entries)
+        ]
+
     async def acquire_entry(
         self, key: str, limit: int, expiry: int, amount: int = 1
     ) -> bool:
         key = self.prefixed_key(key)
-        timestamp = time.time()
         acquired = await self.lua_acquire_moving_window.execute(
-            [key], [timestamp, limit, expiry, amount]
+            [key], [self._script_timestamp(), limit, expiry, amount]
         )
 
         return bool(acquired)
 
+    async def acquire_gcra_entry(
+        self, key: str, limit: int, interval: int, amount: int = 1
+    ) -> bool:
+        acquired, _ = await self.acquire_gcra_entry_with_tat(
+            key, limit, interval, amount
+        )
+        return acquired
+
+    async def acquire_gcra_entry_with_tat(
+        self, key: str, limit: int, interval: int, amount: int = 1
+    ) -> tuple[bool, int]:
+        acquired, tat = cast(
+            list[int | bytes],
+            await self.lua_acquire_gcra.execute(
+                [self.prefixed_key(key)],
+                [self._script_timestamp(microseconds=True), limit, interval, amount],
+            ),
+        )
+        return bool(acquired), int(tat)
+
+    async def acquire_gcra_entries(
+        self, entries: Sequence[tuple[str, int, int, int]]
+    ) -> list[bool]:
+        timestamp = self._script_timestamp(microseconds=True)
+        return [
+            bool(acquired)
+            for acquired, _ in await self._run_script_batch(
+                self.lua_acquire_gcra,
+                [
+                    ([self.prefixed_key(key)], [timestamp, limit, interval, amount])
+                    for key, limit, interval, amount in entries
+                ],
+            )
+        ]
+
+    async def acquire_all_gcra_entries(
+        self, entries: Sequence[tuple[str, int, int]], amount: int = 1
+    ) -> bool:
+        if not entries:
+            return True
+        args: list[coredis.typing.ValueT] = [
+            self._script_timestamp(microseconds=True),
+            amount,
+        ]
+        for _, limit, interval in entries:
+            args.extend((limit, interval))
+        return bool(
+            await self.lua_acquire_gcra_all.execute(
+                [self.prefixed_key(key) for key, _, _ in entries], args
+            )
+        )
+
+    async def acquire_entry_with_window(
+        self, key: str, limit: int, expiry: int, amount: int = 1
+    ) -> tuple[bool, float, int]:
+        acquired, window_start, window_items = cast(
+            list[int | bytes],
+            await self.lua_acquire_moving_window.execute(
+                [self.prefixed_key(key)],
+                [self._script_timestamp(), limit, expiry, amount, 1],
+            ),
+        )
+        return bool(acquired), float(window_start), int(window_items)
+
+    async def acquire_entries(
+        self, entries: Sequence[tuple[str, int, int, int]]
+    ) -> list[bool]:
+        timestamp = self._script_timestamp()
+        return [
+            bool(acquired)
+            for acquired in await self._run_script_batch(
+                self.lua_acquire_moving_window,
+                [
+                    ([self.prefixed_key(key)], [timestamp, limit, expiry, amount])
+                    for key, limit, expiry, amount in entries
+                ],
+            )
+        ]
+
+    async def acquire_all_entries(
+        self, entries: Sequence[tuple[str, int, int]], amount: int = 1
+    ) -> bool:
+        if not entries:
+            return True
+        args: list[coredis.typing.ValueT] = [self._script_timestamp(), amount]
+        for _, limit, expiry in entries:
+            args.extend((limit, expiry))
+        return bool(
+            await self.lua_acquire_moving_window_all.execute(
+                [self.prefixed_key(key) for key, _, _ in entries], args
+            )
+        )
+
+    async def release_entry(self, key: str, amount: int = 1) -> None:
+        await self.lua_release_moving_window.execute([self.prefixed_key(key)], [amount])
+
     async def acquire_sliding_window_entry(
         self,
         previous_key: str,
@@ -179,14 +616,75 @@ class CoredisBridge(RedisBridge):
     ) -> bool:
         previous_key = self.prefixed_key(previous_key)
         current_key = self.prefixed_key(current_key)
-        acquired = await self.lua_acquire_sliding_window.execute(
-            [previous_key, current_key], [limit, expiry, amount]
+        acquired, *_ = cast(
+            list[int],
+            await self.lua_acquire_sliding_window.execute(
+                [previous_key, current_key], [limit, expiry, amount]
+            ),
         )
         return bool(acquired)
 
+    async def acquire_sliding_window_entry_with_window(
+        self,
+        previous_key: str,
+        current_key: str,
+        limit: int,
+        expiry: int,
+        amount: int = 1,
+    ) -> tuple[bool, int, float, int, float]:
+        previous_key = self.prefixed_key(previous_key)
+        current_key = self.prefixed_key(current_key)
+        acquired, *window = cast(
+            list[int],
+            await self.lua_acquire_sliding_window.execute(
+                [previous_key, current_key], [limit, expiry, amount]
+            ),
+        )
+        return (
+            bool(acquired),
+            window[0],
+            max(0, window[1]) / 1000,
+            window[2],
+            max(0, window[3]) / 1000,
+        )
+
+    async def acquire_sliding_window_entries(
+        self, entries: Sequence[tuple[str, str, int, int, int]]
+    ) -> list[bool]:
+        return [
+            bool(acquired)
+            for acquired, *_ in await self._run_script_batch(
+                self.lua_acquire_sliding_window,
+                [
+                    (
+                        [
+                            self.prefixed_key(previous_key),
+                            self.prefixed_key(current_key),
+                        ],
+                        [limit, expiry, amount],
+                    )
+                    for previous_key, current_key, limit, expiry, amount in entries
+                ],
+            )
+        ]
+
+    async def acquire_all_sliding_window_entries(
+        self, entries: Sequence[tuple[str, str, int, int]], amount: int = 1
+    ) -> bool:
+        if not entries:
+            return True
+        keys: list[coredis.typing.KeyT] = []
+        args: list[coredis.typing.ValueT] = [amount]
+        for previous_key, current_key, limit, expiry in entries:
+            keys.extend(
+                (self.prefixed_key(previous_key), self.prefixed_key(current_key))
+            )
+            args.extend((limit, expiry))
+        return bool(await self.lua_acquire_sliding_window_all.execute(keys, args))
+
     async def get_expiry(self, key: str) -> float:
         key = self.prefixed_key(key)
-        return max(await self.get_connection().ttl(key), 0) + time.time()
+        return max(await (await self.read_connection()).ttl(key), 0) + time.time()
 
     async def check(self) -> bool:
         try:
@@ -196,10 +694,44 @@ class CoredisBridge(RedisBridge):
         except:  # noqa
             return False
 
-    async def reset(self) -> int | None:
+    async def reset_iter(self, count: int = 1000) -> AsyncIterator[int]:
         prefix = self.prefixed_key("*")
-        keys = await self.storage.keys(prefix)
-        count = 0
+        if not isinstance(self.storage, self.dependency.RedisCluster):
+            connection = self.get_connection()
+            cursor = 0
+            while True:
+                cursor, keys = await connection.scan(cursor, match=prefix, count=count)
+                if keys:
+                    yield await connection.unlink(keys)
+                if not cursor:
+                    return
+        cursors = dict.fromkeys(self.storage.primaries, 0)
+        while cursors:
+            pages = await asyncio.gather(
+                *(
+                    primary.scan(cursor, match=prefix, count=count)
+                    for primary, cursor in cursors.items()
+                )
+            )
+            unlinks = []
+            for primary, (cursor, keys) in zip(list(cursors), pages):
+                if cursor:
+                    cursors[primary] = cursor
+                else:
+                    cursors.pop(primary)
+                if keys:
+                    unlinks.append(self._unlink_keys(primary, keys))
+            if unlinks:
+                yield sum(await asyncio.gather(*unlinks))
+
+    async def _unlink_keys(
+        self, primary: coredis.Redis[bytes], keys: Sequence[bytes]
+    ) -> int:
+        """
+        Delete :paramref:`keys`, which may belong to different slots of
+        :paramref:`primary`, with one pipeline of ``UNLINK`` commands
+        """
+        pipeline = await primary.pipeline(transaction=False)
         for key in keys:
-            count += await self.storage.delete([key])
-        return count
+            await pipeline.unlink([key])
+        return sum(await pipeline.execute())
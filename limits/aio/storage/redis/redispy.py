@@ -1,16 +1,54 @@
 from __future__ import annotations
 
+import asyncio
 import time
+from collections.abc import AsyncIterator
 from typing import TYPE_CHECKING, cast
 
 from limits.aio.storage.redis.bridge import RedisBridge
 from limits.errors import ConfigurationError
-from limits.typing import AsyncRedisClient, Callable
+from limits.typing import Any, AsyncRedisClient, Callable, Sequence
 
 if TYPE_CHECKING:
+    import redis.asyncio.client
     import redis.commands
 
 
+class RedispyFunction:
+    """
+    A lua script installed as a function of the library loaded by
+    :meth:`RedispyBridge.load_functions` and executed with ``FCALL``, or
+    ``FCALL_RO`` if the script doesn't write any keys.
+    """
+
+    def __init__(self, bridge: RedispyBridge, name: str, readonly: bool) -> None:
+        self.bridge = bridge
+        self.name = name
+        self.readonly = readonly
+
+    async def __call__(  # type: ignore[explicit-any]
+        self,
+        keys: Sequence[str] = (),
+        args: Sequence[float] = (),
+        client: AsyncRedisClient | redis.asyncio.client.Pipeline | None = None,
+    ) -> Any:
+        connection = cast(AsyncRedisClient, client or self.bridge.get_connection())
+        try:
+            return await self.execute(connection, keys, args)
+        except self.bridge.base_exceptions as error:
+            if not self.bridge.is_missing_function(error):
+                raise
+            await self.bridge.load_functions()
+            return await self.execute(connection, keys, args)
+
+    async def execute(  # type: ignore[explicit-any]
+        self, connection: AsyncRedisClient, keys: Sequence[str], args: Sequence[float]
+    ) -> Any:
+        if self.readonly:
+            return await connection.fcall_ro(self.name, len(keys), *keys, *args)
+        return await connection.fcall(self.name, len(keys), *keys, *args)
+
+
 class RedispyBridge(RedisBridge):
     DEFAULT_CLUSTER_OPTIONS: dict[str, float | str | bool] = {
         "max_connections": 1000,
@@ -53,6 +91,7 @@ class RedispyBridge(RedisBridge):
         )
         self.storage = self.sentinel.master_for(service_name)
         self.storage_replica = self.sentinel.slave_for(service_name)
+        self.use_replicas = use_replicas
         self.connection_getter = lambda readonly: (
             self.storage_replica if readonly and use_replicas else self.storage
         )
@@ -67,7 +106,9 @@ class RedispyBridge(RedisBridge):
 
         self.connection_getter = lambda _: self.storage
 
-    def use_cluster(self, **options: str | float | bool) -> None:
+    def use_cluster(
+        self, use_replicas: bool = False, **options: str | float | bool
+    ) -> None:
         sep = self.parsed_uri.netloc.find("@") + 1
         cluster_hosts = []
 
@@ -77,43 +118,220 @@ class RedispyBridge(RedisBridge):
                 self.dependency.asyncio.cluster.ClusterNode(host=host, port=int(port))
             )
 
+        cluster_options = {
+            **self.DEFAULT_CLUSTER_OPTIONS,
+            **self.parsed_auth,
+            **options,
+        }
         self.storage = self.dependency.asyncio.RedisCluster(
-            startup_nodes=cluster_hosts,
-            **{**self.DEFAULT_CLUSTER_OPTIONS, **self.parsed_auth, **options},
+            startup_nodes=cluster_hosts, **cluster_options
+        )
+        if use_replicas:
+            if hasattr(self.dependency.asyncio.cluster, "LoadBalancingStrategy"):
+                cluster_options["load_balancing_strategy"] = (
+                    self.dependency.asyncio.cluster.LoadBalancingStrategy.ROUND_ROBIN_REPLICAS
+                )
+            else:
+                cluster_options["read_from_replicas"] = True
+            self.storage_replica = self.dependency.asyncio.RedisCluster(
+                startup_nodes=cluster_hosts, **cluster_options
+            )
+        self.use_replicas = use_replicas
+        self.connection_getter = lambda readonly: (
+            self.storage_replica if readonly and use_replicas else self.storage
         )
-        self.connection_getter = lambda _: self.storage
 
-    lua_moving_window: redis.commands.core.Script
-    lua_acquire_moving_window: redis.commands.core.Script
-    lua_sliding_window: redis.commands.core.Script
-    lua_acquire_sliding_window: redis.commands.core.Script
-    lua_clear_keys: redis.commands.core.Script
-    lua_incr_expire: redis.commands.core.Script
+    lua_moving_window: redis.commands.core.Script | RedispyFunction
+    lua_acquire_moving_window: redis.commands.core.Script | RedispyFunction
+    lua_sliding_window: redis.commands.core.Script | RedispyFunction
+    lua_acquire_sliding_window: redis.commands.core.Script | RedispyFunction
+    lua_incr_expire: redis.commands.core.Script | RedispyFunction
+    lua_incr_expire_all: redis.commands.core.Script | RedispyFunction
+    lua_acquire_moving_window_all: redis.commands.core.Script | RedispyFunction
+    lua_acquire_sliding_window_all: redis.commands.core.Script | RedispyFunction
+    lua_release_moving_window: redis.commands.core.Script | RedispyFunction
+    lua_acquire_gcra: redis.commands.core.Script | RedispyFunction
+    lua_acquire_gcra_all: redis.commands.core.Script | RedispyFunction
+    lua_decr: redis.commands.core.Script | RedispyFunction
     connection_getter: Callable[[bool], AsyncRedisClient]
 
     def get_connection(self, readonly: bool = False) -> AsyncRedisClient:
         return self.connection_getter(readonly)
 
+    async def read_connection(self) -> AsyncRedisClient:
+        """
+        The connection to use for read only operations
+        """
+        return self.get_connection(await self.reads_from_replicas())
+
+    async def replication_info(self) -> list[dict[str, Any]]:  # type: ignore[explicit-any]
+        if isinstance(self.storage, self.dependency.asyncio.RedisCluster):
+            return [
+                await self.storage.info("replication", target_nodes=primary)
+                for primary in self.storage.get_primaries()
+            ]
+        return [await self.storage.info("replication")]
+
     def register_scripts(self) -> None:
         # Redis-py uses a slightly different script registration
-        self.lua_moving_window = self.get_connection().register_script(
-            self.SCRIPT_MOVING_WINDOW
-        )
-        self.lua_acquire_moving_window = self.get_connection().register_script(
-            self.SCRIPT_ACQUIRE_MOVING_WINDOW
+        (
+            moving_window,
+            acquire_moving_window,
+            acquire_moving_window_all,
+            release_moving_window,
+        ) = self.moving_window_scripts
+        self.lua_moving_window = self._register_script(moving_window)
+        self.lua_acquire_moving_window = self._register_script(acquire_moving_window)
+        self.lua_incr_expire = self._register_script(self.SCRIPT_INCR_EXPIRE)
+        self.lua_sliding_window = self._register_script(self.SCRIPT_SLIDING_WINDOW)
+        self.lua_acquire_sliding_window = self._register_script(
+            self.SCRIPT_ACQUIRE_SLIDING_WINDOW
         )
-        self.lua_clear_keys = self.get_connection().register_script(
-            self.SCRIPT_CLEAR_KEYS
+        self.lua_incr_expire_all = self._register_script(self.SCRIPT_INCR_EXPIRE_ALL)
+        self.lua_acquire_moving_window_all = self._register_script(
+            acquire_moving_window_all
         )
-        self.lua_incr_expire = self.get_connection().register_script(
-            self.SCRIPT_INCR_EXPIRE
+        self.lua_acquire_sliding_window_all = self._register_script(
+            self.SCRIPT_ACQUIRE_SLIDING_WINDOW_ALL
         )
-        self.lua_sliding_window = self.get_connection().register_script(
-            self.SCRIPT_SLIDING_WINDOW
+        self.lua_release_moving_window = self._register_script(release_moving_window)
+        self.lua_acquire_gcra = self._register_script(self.SCRIPT_ACQUIRE_GCRA)
+        self.lua_acquire_gcra_all = self._register_script(self.SCRIPT_ACQUIRE_GCRA_ALL)
+        self.lua_decr = self._register_script(self.SCRIPT_DECR)
+
+    def _register_script(
+        self, script: bytes
+    ) -> redis.commands.core.Script | RedispyFunction:
+        if not self.use_functions:
+            return self.get_connection().register_script(script)
+        name = self.function_library.functions[script]
+        return RedispyFunction(self, name, name in self.function_library.readonly)
+
+    async def load_functions(self) -> None:
+        await self.get_connection().function_load(
+            self.function_library.code, replace=True
         )
-        self.lua_acquire_sliding_window = self.get_connection().register_script(
-            self.SCRIPT_ACQUIRE_SLIDING_WINDOW
+
+    async def _run_script_batch(  # type: ignore[explicit-any]
+        self,
+        script: redis.commands.core.Script | RedispyFunction,
+        calls: Sequence[tuple[list[str], list[float]]],
+        readonly: bool = False,
+    ) -> list[Any]:
+        """
+        Run :paramref:`script` once for each ``(keys, args)`` pair in
+        :paramref:`calls` using a single non transactional pipeline, or
+        concurrently when connected to a cluster (cluster pipelines can't
+        load scripts). If :paramref:`readonly` is set the script doesn't
+        write and is run on the connection used for read only operations.
+        """
+        if isinstance(self.storage, self.dependency.asyncio.RedisCluster):
+            if readonly and await self.reads_from_replicas():
+                return list(
+                    await asyncio.gather(
+                        *(
+                            self._run_readonly_script(script, keys, args)
+                            for keys, args in calls
+                        )
+                    )
+                )
+            return await self._cluster_script_batch(script, calls)
+        connection = await self.read_connection() if readonly else self.get_connection()
+        try:
+            return await self._pipeline_script_batch(script, calls, connection)
+        except self.base_exceptions as error:
+            if not self.is_missing_function(error):
+                raise
+        # every function is part of the same library, so none of the
+        # calls were executed
+        await self.load_functions()
+        return await self._pipeline_script_batch(script, calls, connection)
+
+    async def _pipeline_script_batch(  # type: ignore[explicit-any]
+        self,
+        script: redis.commands.core.Script | RedispyFunction,
+        calls: Sequence[tuple[list[str], list[float]]],
+        connection: AsyncRedisClient,
+    ) -> list[Any]:
+        async with connection.pipeline(transaction=False) as pipeline:
+            for keys, args in calls:
+                await script(keys, args, client=pipeline)  # type: ignore[arg-type]
+            return await pipeline.execute()
+
+    async def _cluster_script_batch(  # type: ignore[explicit-any]
+        self,
+        script: redis.commands.core.Script | RedispyFunction,
+        calls: Sequence[tuple[list[str], list[float]]],
+    ) -> list[Any]:
+        """
+        Run the calls with a cluster pipeline, which groups them by the
+        primary owning the slot of their keys and sends one pipeline to each
+        of those nodes concurrently. Cluster pipelines can't load scripts, so
+        a missing script is loaded on all the primaries and only the calls
+        that weren't executed are retried.
+        """
+        cluster = self.storage
+        await cluster.initialize()
+        command = (
+            ("FCALL_RO" if script.readonly else "FCALL", script.name)
+            if isinstance(script, RedispyFunction)
+            else ("EVALSHA", script.sha)
         )
+        async with cluster.pipeline() as pipeline:
+            for keys, args in calls:
+                pipeline.execute_command(
+                    *command,
+                    len(keys),
+                    *keys,
+                    *args,
+                    target_nodes=cluster.get_node_from_key(keys[0]),
+                )
+            results = list(await pipeline.execute(raise_on_error=False))
+        if missing := [
+            idx
+            for idx, result in enumerate(results)
+            if isinstance(result, self.dependency.exceptions.NoScriptError)
+            or (isinstance(result, Exception) and self.is_missing_function(result))
+        ]:
+            if isinstance(script, RedispyFunction):
+                await self.load_functions()
+            else:
+                await cluster.script_load(script.script)
+            for idx, result in zip(
+                missing,
+                await self._cluster_script_batch(
+                    script, [calls[idx] for idx in missing]
+                ),
+            ):
+                results[idx] = result
+        for result in results:
+            if isinstance(result, Exception):
+                raise result
+        return results
+
+    async def _run_readonly_script(  # type: ignore[explicit-any]
+        self,
+        script: redis.commands.core.Script | RedispyFunction,
+        keys: list[str],
+        args: list[float],
+    ) -> Any:
+        """
+        Run :paramref:`script`, which only reads a window, on a replica if the
+        window reads are sent to the replicas. Cluster clients only send
+        ``EVALSHA_RO`` & ``EVAL_RO`` (redis 7 or higher) to replicas, whose
+        script cache is separate from the one of their primary.
+        """
+        connection = self.get_connection(await self._reads_windows_from_replicas())
+        if (
+            connection is self.storage
+            or isinstance(script, RedispyFunction)
+            or not isinstance(connection, self.dependency.asyncio.RedisCluster)
+        ):
+            return await script(keys, args, client=connection)  # type: ignore[arg-type]
+        try:
+            return await connection.evalsha_ro(script.sha, len(keys), *keys, *args)
+        except self.dependency.exceptions.NoScriptError:
+            return await connection.eval_ro(script.script, len(keys), *keys, *args)
 
     async def incr(
         self,
@@ -130,7 +348,44 @@ class RedispyBridge(RedisBridge):
         :param amount: the number to increment by
         """
         key = self.prefixed_key(key)
-        return cast(int, await self.lua_incr_expire([key], [expiry, amount]))
+        return int((await self.lua_incr_expire([key], [expiry, amount]))[0])
+
+    async def incr_with_expiry(
+        self, key: str, expiry: int, amount: int = 1
+    ) -> tuple[int, float]:
+        key = self.prefixed_key(key)
+        value, ttl = await self.lua_incr_expire([key], [expiry, amount])
+        return int(value), max(int(ttl), 0) / 1000 + time.time()
+
+    async def incr_many(self, entries: Sequence[tuple[str, int, int]]) -> list[int]:
+        return [
+            int(value)
+            for value, _ in await self._run_script_batch(
+                self.lua_incr_expire,
+                [
+                    ([self.prefixed_key(key)], [expiry, amount])
+                    for key, expiry, amount in entries
+                ],
+            )
+        ]
+
+    async def incr_all(
+        self, entries: Sequence[tuple[str, int, int]], amount: int = 1
+    ) -> bool:
+        if not entries:
+            return True
+        args: list[float] = [amount]
+        for _, limit, expiry in entries:
+            args.extend((limit, expiry))
+        return bool(
+            await self.lua_incr_expire_all(
+                [self.prefixed_key(key) for key, _, _ in entries], args
+            )
+        )
+
+    async def decr(self, key: str, amount: int = 1) -> int:
+        key = self.prefixed_key(key)
+        return int(await self.lua_decr([key], [amount]))
 
     async def get(self, key: str) -> int:
         """
@@ -139,7 +394,18 @@ class RedispyBridge(RedisBridge):
         """
 
         key = self.prefixed_key(key)
-        return int(await self.get_connection(readonly=True).get(key) or 0)
+        return int(await (await self.read_connection()).get(key) or 0)
+
+    async def get_counts(self, keys: Sequence[str]) -> list[int]:
+        if not keys:
+            return []
+        prefixed_keys = [self.prefixed_key(key) for key in keys]
+        connection = await self.read_connection()
+        if isinstance(connection, self.dependency.asyncio.RedisCluster):
+            values = await connection.mget_nonatomic(prefixed_keys)
+        else:
+            values = await connection.mget(prefixed_keys)
+        return [int(value or 0) for value in values]
 
     async def clear(self, key: str) -> None:
         """
@@ -149,9 +415,6 @@ class RedispyBridge(RedisBridge):
         key = self.prefixed_key(key)
         await self.get_connection().delete(key)
 
-    async def lua_reset(self) -> int | None:
-        return cast(int, await self.lua_clear_keys([self.prefixed_key("*")]))
-
     async def get_moving_window(
         self, key: str, limit: int, expiry: int
     ) -> tuple[float, int]:
@@ -165,14 +428,42 @@ class RedispyBridge(RedisBridge):
         """
         key = self.prefixed_key(key)
         timestamp = time.time()
-        window = await self.lua_moving_window([key], [timestamp - expiry, limit])
+        window = await self._run_readonly_script(
+            self.lua_moving_window,
+            [key],
+            [self._script_timestamp(timestamp), limit, expiry],
+        )
         if window:
             return float(window[0]), window[1]
         return timestamp, 0
 
+    async def get_moving_windows(
+        self, entries: Sequence[tuple[str, int, int]]
+    ) -> list[tuple[float, int]]:
+        timestamp = time.time()
+        windows = await self._run_script_batch(
+            self.lua_moving_window,
+            [
+                (
+                    [self.prefixed_key(key)],
+                    [self._script_timestamp(timestamp), limit, expiry],
+                )
+                for key, limit, expiry in entries
+            ],
+            readonly=await self._reads_windows_from_replicas(),
+        )
+        return [
+            (float(window[0]), window[1]) if window else (timestamp, 0)
+            for window in windows
+        ]
+
     async def get_sliding_window(
         self, previous_key: str, current_key: str, expiry: int
     ) -> tuple[int, float, int, float]:
+        if await self._reads_windows_from_replicas():
+            return (
+                await self._read_sliding_windows([(previous_key, current_key, expiry)])
+            )[0]
         if window := await self.lua_sliding_window(
             [self.prefixed_key(previous_key), self.prefixed_key(current_key)], [expiry]
         ):
@@ -184,6 +475,52 @@ class RedispyBridge(RedisBridge):
             )
         return 0, 0.0, 0, 0.0
 
+    async def get_sliding_windows(
+        self, entries: Sequence[tuple[str, str, int]]
+    ) -> list[tuple[int, float, int, float]]:
+        if await self._reads_windows_from_replicas():
+            return await self._read_sliding_windows(entries)
+        windows = await self._run_script_batch(
+            self.lua_sliding_window,
+            [
+                (
+                    [self.prefixed_key(previous_key), self.prefixed_key(current_key)],
+                    [expiry],
+                )
+                for previous_key, current_key, expiry in entries
+            ],
+        )
+        return [
+            (
+                int(window[0] or 0),
+                max(0, float(window[1] or 0)) / 1000,
+                int(window[2] or 0),
+                max(0, float(window[3] or 0)) / 1000,
+            )
+            if window
+            else (0, 0.0, 0, 0.0)
+            for window in windows
+        ]
+
+    async def _read_sliding_windows(
+        self, entries: Sequence[tuple[str, str, int]]
+    ) -> list[tuple[int, float, int, float]]:
+        """
+        Read the sliding windows with read only commands, so that they can
+        be served by a replica
+        """
+        connection = await self.read_connection()
+        async with connection.pipeline(transaction=False) as pipeline:
+            for previous_key, current_key, _ in entries:
+                for key in (previous_key, current_key):
+                    pipeline.get(self.prefixed_key(key))
+                    pipeline.pttl(self.prefixed_key(key))
+            results = await pipeline.execute()
+        return [
+            self.shift_sliding_window(expiry, *results[idx * 4 : idx * 4 + 4])
+            for idx, (_, _, expiry) in enumerate(entries)
+        ]
+
     async def acquire_entry(
         self,
         key: str,
@@ -198,13 +535,99 @@ class RedispyBridge(RedisBridge):
 
         """
         key = self.prefixed_key(key)
-        timestamp = time.time()
         acquired = await self.lua_acquire_moving_window(
-            [key], [timestamp, limit, expiry, amount]
+            [key], [self._script_timestamp(), limit, expiry, amount]
         )
 
         return bool(acquired)
 
+    async def acquire_gcra_entry(
+        self, key: str, limit: int, interval: int, amount: int = 1
+    ) -> bool:
+        acquired, _ = await self.acquire_gcra_entry_with_tat(
+            key, limit, interval, amount
+        )
+        return acquired
+
+    async def acquire_gcra_entry_with_tat(
+        self, key: str, limit: int, interval: int, amount: int = 1
+    ) -> tuple[bool, int]:
+        acquired, tat = await self.lua_acquire_gcra(
+            [self.prefixed_key(key)],
+            [self._script_timestamp(microseconds=True), limit, interval, amount],
+        )
+        return bool(acquired), int(tat)
+
+    async def acquire_gcra_entries(
+        self, entries: Sequence[tuple[str, int, int, int]]
+    ) -> list[bool]:
+        timestamp = self._script_timestamp(microseconds=True)
+        return [
+            bool(acquired)
+            for acquired, _ in await self._run_script_batch(
+                self.lua_acquire_gcra,
+                [
+                    ([self.prefixed_key(key)], [timestamp, limit, interval, amount])
+                    for key, limit, interval, amount in entries
+                ],
+            )
+        ]
+
+    async def acquire_all_gcra_entries(
+        self, entries: Sequence[tuple[str, int, int]], amount: int = 1
+    ) -> bool:
+        if not entries:
+            return True
+        args: list[float] = [self._script_timestamp(microseconds=True), amount]
+        for _, limit, interval in entries:
+            args.extend((limit, interval))
+        return bool(
+            await self.lua_acquire_gcra_all(
+                [self.prefixed_key(key) for key, _, _ in entries], args
+            )
+        )
+
+    async def acquire_entry_with_window(
+        self, key: str, limit: int, expiry: int, amount: int = 1
+    ) -> tuple[bool, float, int]:
+        key = self.prefixed_key(key)
+        acquired, window_start, window_items = await self.lua_acquire_moving_window(
+            [key], [self._script_timestamp(), limit, expiry, amount, 1]
+        )
+        return bool(acquired), float(window_start), int(window_items)
+
+    async def acquire_entries(
+        self, entries: Sequence[tuple[str, int, int, int]]
+    ) -> list[bool]:
+        timestamp = self._script_timestamp()
+        return [
+            bool(acquired)
+            for acquired in await self._run_script_batch(
+                self.lua_acquire_moving_window,
+                [
+                    ([self.prefixed_key(key)], [timestamp, limit, expiry, amount])
+                    for key, limit, expiry, amount in entries
+                ],
+            )
+        ]
+
+    async def acquire_all_entries(
+        self, entries: Sequence[tuple[str, int, int]], amount: int = 1
+    ) -> bool:
+        if not entries:
+            return True
+        args: list[float] = [self._script_timestamp(), amount]
+        for _, limit, expiry in entries:
+            args.extend((limit, expiry))
+        return bool(
+            await self.lua_acquire_moving_window_all(
+                [self.prefixed_key(key) for key, _, _ in entries], args
+            )
+        )
+
+    async def release_entry(self, key: str, amount: int = 1) -> None:
+        await self.lua_release_moving_window([self.prefixed_key(key)], [amount])
+
     async def acquire_sliding_window_entry(
         self,
         previous_key: str,
@@ -215,18 +638,73 @@ class RedispyBridge(RedisBridge):
     ) -> bool:
         previous_key = self.prefixed_key(previous_key)
         current_key = self.prefixed_key(current_key)
-        acquired = await self.lua_acquire_sliding_window(
+        acquired, *_ = await self.lua_acquire_sliding_window(
             [previous_key, current_key], [limit, expiry, amount]
         )
         return bool(acquired)
 
+    async def acquire_sliding_window_entry_with_window(
+        self,
+        previous_key: str,
+        current_key: str,
+        limit: int,
+        expiry: int,
+        amount: int = 1,
+    ) -> tuple[bool, int, float, int, float]:
+        previous_key = self.prefixed_key(previous_key)
+        current_key = self.prefixed_key(current_key)
+        acquired, *window = await self.lua_acquire_sliding_window(
+            [previous_key, current_key], [limit, expiry, amount]
+        )
+        return (
+            bool(acquired),
+            int(window[0] or 0),
+            max(0, float(window[1] or 0)) / 1000,
+            int(window[2] or 0),
+            max(0, float(window[3] or 0)) / 1000,
+        )
+
+    async def acquire_sliding_window_entries(
+        self, entries: Sequence[tuple[str, str, int, int, int]]
+    ) -> list[bool]:
+        return [
+            bool(acquired)
+            for acquired, *_ in await self._run_script_batch(
+                self.lua_acquire_sliding_window,
+                [
+                    (
+                        [
+                            self.prefixed_key(previous_key),
+                            self.prefixed_key(current_key),
+                        ],
+                        [limit, expiry, amount],
+                    )
+                    for previous_key, current_key, limit, expiry, amount in entries
+                ],
+            )
+        ]
+
+    async def acquire_all_sliding_window_entries(
+        self, entries: Sequence[tuple[str, str, int, int]], amount: int = 1
+    ) -> bool:
+        if not entries:
+            return True
+        keys: list[str] = []
+        args: list[float] = [amount]
+        for previous_key, current_key, limit, expiry in entries:
+            keys.extend(
+                (self.prefixed_key(previous_key), self.prefixed_key(current_key))
+            )
+            args.extend((limit, expiry))
+        return bool(await self.lua_acquire_sliding_window_all(keys, args))
+
     async def get_expiry(self, key: str) -> float:
         """
         :param key: the key to get the expiry for
         """
 
         key = self.prefixed_key(key)
-        return max(await self.get_connection().ttl(key), 0) + time.time()
+        return max(await (await self.read_connection()).ttl(key), 0) + time.time()
 
     async def check(self) -> bool:
         """
@@ -239,12 +717,40 @@ class RedispyBridge(RedisBridge):
         except:  # noqa
             return False
 
-    async def reset(self) -> int | None:
+    async def reset_iter(self, count: int = 1000) -> AsyncIterator[int]:
         prefix = self.prefixed_key("*")
-        keys = await self.storage.keys(
-            prefix, target_nodes=self.dependency.asyncio.cluster.RedisCluster.ALL_NODES
-        )
-        count = 0
-        for key in keys:
-            count += await self.storage.delete(key)
-        return count
+        if not isinstance(self.storage, self.dependency.asyncio.RedisCluster):
+            connection = self.get_connection()
+            cursor = 0
+            while True:
+                cursor, keys = await connection.scan(cursor, match=prefix, count=count)
+                if keys:
+                    yield await connection.unlink(*keys)
+                if not cursor:
+                    return
+        cluster = self.storage
+        cursors = {primary.name: 0 for primary in cluster.get_primaries()}
+        while cursors:
+            pages = await asyncio.gather(
+                *(
+                    cluster.scan(
+                        cursor,
+                        match=prefix,
+                        count=count,
+                        target_nodes=cluster.get_node(node_name=name),
+                    )
+                    for name, cursor in cursors.items()
+                )
+            )
+            keys = []
+            for name, (next_cursors, found) in zip(list(cursors), pages):
+                keys.extend(found)
+                if next_cursors[name]:
+                    cursors[name] = next_cursors[name]
+                else:
+                    cursors.pop(name)
+            if keys:
+                async with cluster.pipeline() as pipeline:
+                    for key in keys:
+                        pipeline.unlink(key)
+                    yield sum(await pipeline.execute())
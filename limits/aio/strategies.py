@@ -4,24 +4,33 @@ Asynchronous rate limiting strategies
 
 from __future__ import annotations
 
-import time
 from abc import ABC, abstractmethod
 from math import floor, inf
 
-from deprecated.sphinx import versionadded
+from deprecated.sphinx import versionadded, versionchanged
 
+from ..errors import ConfigurationError
 from ..limits import RateLimitItem
 from ..storage import StorageTypes
-from ..typing import cast
-from ..util import WindowStats
+from ..strategies import Lease
+from ..typing import Sequence, cast
+from ..util import Clock, SystemClock, WindowStats
 from .storage import MovingWindowSupport, Storage
-from .storage.base import SlidingWindowCounterSupport
+from .storage.base import GCRASupport, SlidingWindowCounterSupport
 
 
+@versionchanged(version="4.7", reason="Added the :paramref:`clock` argument")
 class RateLimiter(ABC):
-    def __init__(self, storage: StorageTypes):
+    def __init__(self, storage: StorageTypes, clock: Clock | None = None):
+        """
+        :param storage: The storage to use for the rate limits
+        :param clock: The source of the current time used for the times
+         computed by the rate limiter (e.g. the reset time of the windows).
+         Defaults to the system time.
+        """
         assert isinstance(storage, Storage)
         self.storage: Storage = storage
+        self.clock: Clock = clock or SystemClock()
 
     @abstractmethod
     async def hit(self, item: RateLimitItem, *identifiers: str, cost: int = 1) -> bool:
@@ -61,6 +70,117 @@ class RateLimiter(ABC):
         """
         raise NotImplementedError
 
+    @versionadded(version="4.7")
+    async def hit_many(
+        self, requests: Sequence[tuple[RateLimitItem, Sequence[str], int]]
+    ) -> list[bool]:
+        """
+        Consume multiple rate limits, using a single round trip to the
+        storage where the storage supports it.
+
+        Each entry is consumed independently of the others, i.e. an entry
+        that is rejected does not prevent the remaining entries from
+        being consumed.
+
+        :param requests: ``(item, identifiers, cost)`` tuples where
+         ``identifiers`` is a sequence of strings that would otherwise be
+         passed as the variable list of identifiers to :meth:`hit`
+        :return: whether each entry was allowed, in the order of
+         :paramref:`requests`
+        """
+        return [
+            await self.hit(item, *identifiers, cost=cost)
+            for item, identifiers, cost in requests
+        ]
+
+    @versionadded(version="4.7")
+    async def test_many(
+        self, requests: Sequence[tuple[RateLimitItem, Sequence[str], int]]
+    ) -> list[bool]:
+        """
+        Check multiple rate limits without consuming from them, using a
+        single round trip to the storage where the storage supports it.
+
+        :param requests: ``(item, identifiers, cost)`` tuples where
+         ``identifiers`` is a sequence of strings that would otherwise be
+         passed as the variable list of identifiers to :meth:`test`
+        :return: whether each entry could be consumed, in the order of
+         :paramref:`requests`
+        """
+        return [
+            await self.test(item, *identifiers, cost=cost)
+            for item, identifiers, cost in requests
+        ]
+
+    @versionadded(version="4.7")
+    async def hit_all(
+        self, items: Sequence[RateLimitItem], *identifiers: str, cost: int = 1
+    ) -> bool:
+        """
+        Consume all the rate limits in :paramref:`items` only if every one
+        of them allows the hit, e.g. for the limits returned by
+        :func:`~limits.parse_many`.
+
+        Storages that support it check and consume the limits atomically
+        in a single round trip (a lua script for redis, a single lock
+        acquisition for the in memory storage), otherwise the limits are
+        tested before being consumed and, if a concurrent hit exhausted one
+        of them in between, the limits that were consumed are given back.
+
+        :param items: The rate limit items
+        :param identifiers: variable list of strings to uniquely identify this
+         instance of the limits
+        :param cost: The cost of this hit for each limit, default 1
+        :return: ``True`` if all the limits were consumed
+        """
+        requests = [(item, identifiers, cost) for item in items]
+        if not all(await self.test_many(requests)):
+            return False
+        hits = await self.hit_many(requests)
+        if all(hits):
+            return True
+        for (item, _, _), hit in zip(requests, hits):
+            if hit:
+                await self._refund(item, *identifiers, cost=cost)
+        return False
+
+    async def _refund(
+        self, item: RateLimitItem, *identifiers: str, cost: int = 1
+    ) -> None:
+        """
+        Give back a hit consumed by :meth:`hit_all` for a group of limits
+        that was rejected. Rate limiters that can't give hits back leave
+        them consumed.
+
+        :param item: The rate limit item
+        :param identifiers: variable list of strings to uniquely identify this
+         instance of the limit
+        :param cost: The cost of the hit to give back
+        """
+
+    @versionadded(version="4.7")
+    async def hit_with_stats(
+        self, item: RateLimitItem, *identifiers: str, cost: int = 1
+    ) -> tuple[bool, WindowStats]:
+        """
+        Consume the rate limit and return the state of the limit after the
+        hit, e.g. to populate rate limit response headers.
+
+        Storages that support it consume the limit and return its state in
+        a single round trip, otherwise this is equivalent to calling
+        :meth:`hit` followed by :meth:`get_window_stats`.
+
+        :param item: The rate limit item
+        :param identifiers: variable list of strings to uniquely identify this
+         instance of the limit
+        :param cost: The cost of this hit, default 1
+        :return: whether the hit was allowed and (reset time, remaining)
+        """
+        return (
+            await self.hit(item, *identifiers, cost=cost),
+            await self.get_window_stats(item, *identifiers),
+        )
+
     async def clear(self, item: RateLimitItem, *identifiers: str) -> None:
         return await self.storage.clear(item.key_for(*identifiers))
 
@@ -70,7 +190,7 @@ class MovingWindowRateLimiter(RateLimiter):
     Reference: :ref:`strategies:moving window`
     """
 
-    def __init__(self, storage: StorageTypes) -> None:
+    def __init__(self, storage: StorageTypes, clock: Clock | None = None) -> None:
         if not (
             hasattr(storage, "acquire_entry") or hasattr(storage, "get_moving_window")
         ):
@@ -78,7 +198,7 @@ class MovingWindowRateLimiter(RateLimiter):
                 "MovingWindowRateLimiting is not implemented for storage "
                 f"of type {storage.__class__}"
             )
-        super().__init__(storage)
+        super().__init__(storage, clock)
 
     async def hit(self, item: RateLimitItem, *identifiers: str, cost: int = 1) -> bool:
         """
@@ -112,6 +232,83 @@ class MovingWindowRateLimiter(RateLimiter):
 
         return amount <= item.amount - cost
 
+    async def hit_many(
+        self, requests: Sequence[tuple[RateLimitItem, Sequence[str], int]]
+    ) -> list[bool]:
+        """
+        Consume multiple rate limits
+
+        :param requests: ``(item, identifiers, cost)`` tuples
+        :return: whether each entry was allowed
+        """
+        return await cast(MovingWindowSupport, self.storage).acquire_entries(
+            [
+                (item.key_for(*identifiers), item.amount, item.get_expiry(), cost)
+                for item, identifiers, cost in requests
+            ]
+        )
+
+    async def test_many(
+        self, requests: Sequence[tuple[RateLimitItem, Sequence[str], int]]
+    ) -> list[bool]:
+        """
+        Check if multiple rate limits can be consumed
+
+        :param requests: ``(item, identifiers, cost)`` tuples
+        :return: whether each entry could be consumed
+        """
+        windows = await cast(MovingWindowSupport, self.storage).get_moving_windows(
+            [
+                (item.key_for(*identifiers), item.amount, item.get_expiry())
+                for item, identifiers, _ in requests
+            ]
+        )
+        return [
+            window_items <= item.amount - cost
+            for (_, window_items), (item, _, cost) in zip(windows, requests)
+        ]
+
+    async def hit_all(
+        self, items: Sequence[RateLimitItem], *identifiers: str, cost: int = 1
+    ) -> bool:
+        """
+        Consume all the rate limits only if every one of them allows the hit
+
+        :param items: The rate limit items
+        :param identifiers: variable list of strings to uniquely identify this
+         instance of the limits
+        :param cost: The cost of this hit for each limit, default 1
+        """
+        return await cast(MovingWindowSupport, self.storage).acquire_all_entries(
+            [
+                (item.key_for(*identifiers), item.amount, item.get_expiry())
+                for item in items
+            ],
+            cost,
+        )
+
+    async def hit_with_stats(
+        self, item: RateLimitItem, *identifiers: str, cost: int = 1
+    ) -> tuple[bool, WindowStats]:
+        """
+        Consume the rate limit and return the state of the limit after the hit
+
+        :param item: The rate limit item
+        :param identifiers: variable list of strings to uniquely identify this
+         instance of the limit
+        :param cost: The cost of this hit, default 1
+        :return: whether the hit was allowed and (reset time, remaining)
+        """
+        acquired, window_start, window_items = await cast(
+            MovingWindowSupport, self.storage
+        ).acquire_entry_with_window(
+            item.key_for(*identifiers), item.amount, item.get_expiry(), amount=cost
+        )
+
+        return acquired, WindowStats(
+            window_start + item.get_expiry(), item.amount - window_items
+        )
+
     async def get_window_stats(
         self, item: RateLimitItem, *identifiers: str
     ) -> WindowStats:
@@ -169,6 +366,77 @@ class FixedWindowRateLimiter(RateLimiter):
             await self.storage.get(item.key_for(*identifiers)) < item.amount - cost + 1
         )
 
+    async def hit_many(
+        self, requests: Sequence[tuple[RateLimitItem, Sequence[str], int]]
+    ) -> list[bool]:
+        """
+        Consume multiple rate limits
+
+        :param requests: ``(item, identifiers, cost)`` tuples
+        :return: whether each entry was allowed
+        """
+        counts = await self.storage.incr_many(
+            [
+                (item.key_for(*identifiers), item.get_expiry(), cost)
+                for item, identifiers, cost in requests
+            ]
+        )
+        return [count <= item.amount for count, (item, _, _) in zip(counts, requests)]
+
+    async def test_many(
+        self, requests: Sequence[tuple[RateLimitItem, Sequence[str], int]]
+    ) -> list[bool]:
+        """
+        Check if multiple rate limits can be consumed
+
+        :param requests: ``(item, identifiers, cost)`` tuples
+        :return: whether each entry could be consumed
+        """
+        counts = await self.storage.get_counts(
+            [item.key_for(*identifiers) for item, identifiers, _ in requests]
+        )
+        return [
+            count < item.amount - cost + 1
+            for count, (item, _, cost) in zip(counts, requests)
+        ]
+
+    async def hit_all(
+        self, items: Sequence[RateLimitItem], *identifiers: str, cost: int = 1
+    ) -> bool:
+        """
+        Consume all the rate limits only if every one of them allows the hit
+
+        :param items: The rate limit items
+        :param identifiers: variable list of strings to uniquely identify this
+         instance of the limits
+        :param cost: The cost of this hit for each limit, default 1
+        """
+        return await self.storage.incr_all(
+            [
+                (item.key_for(*identifiers), item.amount, item.get_expiry())
+                for item in items
+            ],
+            cost,
+        )
+
+    async def hit_with_stats(
+        self, item: RateLimitItem, *identifiers: str, cost: int = 1
+    ) -> tuple[bool, WindowStats]:
+        """
+        Consume the rate limit and return the state of the limit after the hit
+
+        :param item: The rate limit item
+        :param identifiers: variable list of strings to uniquely identify this
+         instance of the limit
+        :param cost: The cost of this hit, default 1
+        :return: whether the hit was allowed and (reset time, remaining)
+        """
+        count, reset = await self.storage.incr_with_expiry(
+            item.key_for(*identifiers), item.get_expiry(), amount=cost
+        )
+
+        return count <= item.amount, WindowStats(reset, max(0, item.amount - count))
+
     async def get_window_stats(
         self, item: RateLimitItem, *identifiers: str
     ) -> WindowStats:
@@ -180,11 +448,9 @@ class FixedWindowRateLimiter(RateLimiter):
          limit
         :return: reset time, remaining
         """
-        remaining = max(
-            0,
-            item.amount - await self.storage.get(item.key_for(*identifiers)),
-        )
-        reset = await self.storage.get_expiry(item.key_for(*identifiers))
+        key = item.key_for(*identifiers)
+        remaining = max(0, item.amount - await self.storage.get(key))
+        reset = await self.storage.get_expiry(key)
 
         return WindowStats(reset, remaining)
 
@@ -195,7 +461,7 @@ class SlidingWindowCounterRateLimiter(RateLimiter):
     Reference: :ref:`strategies:sliding window counter`
     """
 
-    def __init__(self, storage: StorageTypes):
+    def __init__(self, storage: StorageTypes, clock: Clock | None = None):
         if not hasattr(storage, "get_sliding_window") or not hasattr(
             storage, "acquire_sliding_window_entry"
         ):
@@ -203,7 +469,7 @@ class SlidingWindowCounterRateLimiter(RateLimiter):
                 "SlidingWindowCounterRateLimiting is not implemented for storage "
                 f"of type {storage.__class__}"
             )
-        super().__init__(storage)
+        super().__init__(storage, clock)
 
     def _weighted_count(
         self,
@@ -217,6 +483,45 @@ class SlidingWindowCounterRateLimiter(RateLimiter):
         """
         return previous_count * previous_expires_in / item.get_expiry() + current_count
 
+    def _window_stats(
+        self,
+        item: RateLimitItem,
+        previous_count: int,
+        previous_expires_in: float,
+        current_count: int,
+        current_expires_in: float,
+    ) -> WindowStats:
+        """
+        Return the reset time and remaining amount from the state of the
+        previous and current windows.
+        """
+        remaining = max(
+            0,
+            item.amount
+            - floor(
+                self._weighted_count(
+                    item, previous_count, previous_expires_in, current_count
+                )
+            ),
+        )
+
+        now = self.clock.time()
+
+        if not (previous_count or current_count):
+            return WindowStats(now, remaining)
+
+        expiry = item.get_expiry()
+
+        previous_reset_in, current_reset_in = inf, inf
+        if previous_count:
+            previous_reset_in = previous_expires_in % (expiry / previous_count)
+        if current_count:
+            # a current window that was just created expires in exactly
+            # twice the expiry, which is a full window away from shifting
+            current_reset_in = current_expires_in % expiry or expiry
+
+        return WindowStats(now + min(previous_reset_in, current_reset_in), remaining)
+
     async def hit(self, item: RateLimitItem, *identifiers: str, cost: int = 1) -> bool:
         """
         Consume the rate limit
@@ -256,6 +561,102 @@ class SlidingWindowCounterRateLimiter(RateLimiter):
             < item.amount - cost + 1
         )
 
+    async def hit_many(
+        self, requests: Sequence[tuple[RateLimitItem, Sequence[str], int]]
+    ) -> list[bool]:
+        """
+        Consume multiple rate limits
+
+        :param requests: ``(item, identifiers, cost)`` tuples
+        :return: whether each entry was allowed
+        """
+        return await cast(
+            SlidingWindowCounterSupport, self.storage
+        ).acquire_sliding_window_entries(
+            [
+                (item.key_for(*identifiers), item.amount, item.get_expiry(), cost)
+                for item, identifiers, cost in requests
+            ]
+        )
+
+    async def test_many(
+        self, requests: Sequence[tuple[RateLimitItem, Sequence[str], int]]
+    ) -> list[bool]:
+        """
+        Check if multiple rate limits can be consumed
+
+        :param requests: ``(item, identifiers, cost)`` tuples
+        :return: whether each entry could be consumed
+        """
+        windows = await cast(
+            SlidingWindowCounterSupport, self.storage
+        ).get_sliding_windows(
+            [
+                (item.key_for(*identifiers), item.get_expiry())
+                for item, identifiers, _ in requests
+            ]
+        )
+        return [
+            self._weighted_count(
+                item, previous_count, previous_expires_in, current_count
+            )
+            < item.amount - cost + 1
+            for (previous_count, previous_expires_in, current_count, _), (
+                item,
+                _,
+                cost,
+            ) in zip(windows, requests)
+        ]
+
+    async def hit_all(
+        self, items: Sequence[RateLimitItem], *identifiers: str, cost: int = 1
+    ) -> bool:
+        """
+        Consume all the rate limits only if every one of them allows the hit
+
+        :param items: The rate limit items
+        :param identifiers: variable list of strings to uniquely identify this
+         instance of the limits
+        :param cost: The cost of this hit for each limit, default 1
+        """
+        return await cast(
+            SlidingWindowCounterSupport, self.storage
+        ).acquire_all_sliding_window_entries(
+            [
+                (item.key_for(*identifiers), item.amount, item.get_expiry())
+                for item in items
+            ],
+            cost,
+        )
+
+    async def hit_with_stats(
+        self, item: RateLimitItem, *identifiers: str, cost: int = 1
+    ) -> tuple[bool, WindowStats]:
+        """
+        Consume the rate limit and return the state of the limit after the hit
+
+        :param item: The rate limit item
+        :param identifiers: variable list of strings to uniquely identify this
+         instance of the limit
+        :param cost: The cost of this hit, default 1
+        :return: whether the hit was allowed and (reset time, remaining)
+        """
+        (
+            acquired,
+            previous_count,
+            previous_expires_in,
+            current_count,
+            current_expires_in,
+        ) = await cast(
+            SlidingWindowCounterSupport, self.storage
+        ).acquire_sliding_window_entry_with_window(
+            item.key_for(*identifiers), item.amount, item.get_expiry(), cost
+        )
+
+        return acquired, self._window_stats(
+            item, previous_count, previous_expires_in, current_count, current_expires_in
+        )
+
     async def get_window_stats(
         self, item: RateLimitItem, *identifiers: str
     ) -> WindowStats:
@@ -277,34 +678,362 @@ class SlidingWindowCounterRateLimiter(RateLimiter):
             item.key_for(*identifiers), item.get_expiry()
         )
 
-        remaining = max(
-            0,
-            item.amount
-            - floor(
-                self._weighted_count(
-                    item, previous_count, previous_expires_in, current_count
-                )
+        return self._window_stats(
+            item, previous_count, previous_expires_in, current_count, current_expires_in
+        )
+
+
+@versionadded(version="4.7")
+class GCRARateLimiter(RateLimiter):
+    """
+    Reference: :ref:`strategies:gcra`
+    """
+
+    def __init__(self, storage: StorageTypes, clock: Clock | None = None):
+        if not hasattr(storage, "acquire_gcra_entry") or not hasattr(
+            storage, "get_gcra_tat"
+        ):
+            raise NotImplementedError(
+                "GCRARateLimiting is not implemented for storage "
+                f"of type {storage.__class__}"
+            )
+        super().__init__(storage, clock)
+
+    def _window_stats(self, item: RateLimitItem, tat: int) -> WindowStats:
+        """
+        Return the reset time and remaining amount from the theoretical
+        arrival time of the limit. The reset time is when the next entry
+        becomes available again.
+        """
+        now = int(self.clock.time() * 1_000_000)
+        interval = GCRASupport.emission_interval(item.amount, item.get_expiry())
+        used = min(item.amount, -(-max(0, tat - now) // interval))
+
+        if not used:
+            return WindowStats(now / 1_000_000, item.amount)
+
+        return WindowStats(
+            (tat - (used - 1) * interval) / 1_000_000, item.amount - used
+        )
+
+    async def hit(self, item: RateLimitItem, *identifiers: str, cost: int = 1) -> bool:
+        """
+        Consume the rate limit
+
+        :param item: The rate limit item
+        :param identifiers: variable list of strings to uniquely identify this
+         instance of the limit
+        :param cost: The cost of this hit, default 1
+        """
+        return await cast(GCRASupport, self.storage).acquire_gcra_entry(
+            item.key_for(*identifiers), item.amount, item.get_expiry(), cost
+        )
+
+    async def test(self, item: RateLimitItem, *identifiers: str, cost: int = 1) -> bool:
+        """
+        Check if the rate limit can be consumed
+
+        :param item: The rate limit item
+        :param identifiers: variable list of strings to uniquely identify this
+         instance of the limit
+        :param cost: The expected cost to be consumed, default 1
+        """
+        tat = await cast(GCRASupport, self.storage).get_gcra_tat(
+            item.key_for(*identifiers)
+        )
+        now = int(self.clock.time() * 1_000_000)
+        interval = GCRASupport.emission_interval(item.amount, item.get_expiry())
+
+        return max(tat, now) + cost * interval - now <= item.amount * interval
+
+    async def hit_many(
+        self, requests: Sequence[tuple[RateLimitItem, Sequence[str], int]]
+    ) -> list[bool]:
+        """
+        Consume multiple rate limits
+
+        :param requests: ``(item, identifiers, cost)`` tuples
+        :return: whether each entry was allowed
+        """
+        return await cast(GCRASupport, self.storage).acquire_gcra_entries(
+            [
+                (item.key_for(*identifiers), item.amount, item.get_expiry(), cost)
+                for item, identifiers, cost in requests
+            ]
+        )
+
+    async def hit_all(
+        self, items: Sequence[RateLimitItem], *identifiers: str, cost: int = 1
+    ) -> bool:
+        """
+        Consume all the rate limits only if every one of them allows the hit
+
+        :param items: The rate limit items
+        :param identifiers: variable list of strings to uniquely identify this
+         instance of the limits
+        :param cost: The cost of this hit for each limit, default 1
+        """
+        return await cast(GCRASupport, self.storage).acquire_all_gcra_entries(
+            [
+                (item.key_for(*identifiers), item.amount, item.get_expiry())
+                for item in items
+            ],
+            cost,
+        )
+
+    async def hit_with_stats(
+        self, item: RateLimitItem, *identifiers: str, cost: int = 1
+    ) -> tuple[bool, WindowStats]:
+        """
+        Consume the rate limit and return the state of the limit after the hit
+
+        :param item: The rate limit item
+        :param identifiers: variable list of strings to uniquely identify this
+         instance of the limit
+        :param cost: The cost of this hit, default 1
+        :return: whether the hit was allowed and (reset time, remaining)
+        """
+        acquired, tat = await cast(
+            GCRASupport, self.storage
+        ).acquire_gcra_entry_with_tat(
+            item.key_for(*identifiers), item.amount, item.get_expiry(), cost
+        )
+
+        return acquired, self._window_stats(item, tat)
+
+    async def get_window_stats(
+        self, item: RateLimitItem, *identifiers: str
+    ) -> WindowStats:
+        """
+        Query the reset time and remaining amount for the limit.
+
+        :param item: The rate limit item
+        :param identifiers: variable list of strings to uniquely identify this
+         instance of the limit
+        :return: WindowStats(reset time, remaining)
+        """
+        return self._window_stats(
+            item,
+            await cast(GCRASupport, self.storage).get_gcra_tat(
+                item.key_for(*identifiers)
             ),
         )
 
-        now = time.time()
 
-        if not (previous_count or current_count):
-            return WindowStats(now, remaining)
+@versionadded(version="4.7")
+class LeasingRateLimiter(RateLimiter):
+    """
+    Wraps a :class:`FixedWindowRateLimiter` or a
+    :class:`SlidingWindowCounterRateLimiter` and serves hits from blocks of
+    quota leased from the storage into process memory.
+
+    Reference: :ref:`strategies:quota leasing`
+    """
+
+    def __init__(
+        self,
+        limiter: FixedWindowRateLimiter | SlidingWindowCounterRateLimiter,
+        lease_duration: float = 1,
+        max_lease_ratio: float = 0.01,
+    ):
+        """
+        :param limiter: The rate limiter to lease quota through
+        :param lease_duration: The maximum number of seconds a leased block
+         is served locally before its unused entries are returned
+        :param max_lease_ratio: The largest block that can be leased at once
+         as a ratio of the limit.
+        :raise ConfigurationError: if :paramref:`lease_duration` is not
+         positive or :paramref:`max_lease_ratio` is not in ``(0, 1]``
+        """
+        if not isinstance(
+            limiter, (FixedWindowRateLimiter, SlidingWindowCounterRateLimiter)
+        ):
+            raise NotImplementedError(
+                "LeasingRateLimiting is not implemented for rate limiter "
+                f"of type {limiter.__class__}"
+            )
+        if lease_duration <= 0:
+            raise ConfigurationError("lease_duration must be positive")
+        if not 0 < max_lease_ratio <= 1:
+            raise ConfigurationError("max_lease_ratio must be in (0, 1]")
+        self.limiter = limiter
+        self.lease_duration = lease_duration
+        self.max_lease_ratio = max_lease_ratio
+        self.leases: dict[str, Lease] = {}
+        super().__init__(limiter.storage, limiter.clock)
+
+    def _lease_size(self, item: RateLimitItem, lease: Lease | None, cost: int) -> int:
+        """
+        Return the size of the next block to lease, doubling it if the
+        previous block ran out before its deadline and halving it if most
+        of it expired unused.
+        """
+        size = 1
+        if lease and lease.granted == lease.size:
+            if lease.deadline > self.clock.time():
+                size = lease.size * 2
+            elif lease.tokens > lease.size // 2:
+                size = lease.size // 2
+            else:
+                size = lease.size
+
+        return max(cost, min(size, max(1, floor(item.amount * self.max_lease_ratio))))
+
+    async def _lease(
+        self, item: RateLimitItem, key: str, size: int, cost: int
+    ) -> Lease:
+        """
+        Lease a block of :paramref:`size` entries (or at least :paramref:`cost`
+        entries for the sliding window counter) from the storage
+        """
+        now = self.clock.time()
+        if isinstance(self.limiter, FixedWindowRateLimiter):
+            count, reset = await self.storage.incr_with_expiry(
+                key, item.get_expiry(), amount=size
+            )
+            granted = min(size, max(0, item.amount - (count - size)))
+            if granted < size and (decr := getattr(self.storage, "decr", None)):
+                # the entries that weren't granted would otherwise hold the
+                # counter above the limit until the window resets
+                await decr(key, size - granted)
 
+            return Lease(
+                size,
+                granted,
+                granted,
+                min(now + self.lease_duration, reset),
+                reset,
+                item.get_expiry(),
+            )
         expiry = item.get_expiry()
+        for amount in sorted({size, cost}, reverse=True):
+            acquired, _, _, _, current_expires_in = await cast(
+                SlidingWindowCounterSupport, self.storage
+            ).acquire_sliding_window_entry_with_window(key, item.amount, expiry, amount)
+            if acquired:
+                # the entries can be given back until the current window shifts
+                return Lease(
+                    size,
+                    amount,
+                    amount,
+                    now + min(self.lease_duration, expiry),
+                    now + (current_expires_in % expiry or expiry),
+                    expiry,
+                )
 
-        previous_reset_in, current_reset_in = inf, inf
-        if previous_count:
-            previous_reset_in = previous_expires_in % (expiry / previous_count)
-        if current_count:
-            current_reset_in = current_expires_in % expiry
+        return Lease(size, 0, 0, now + min(self.lease_duration, expiry), None, expiry)
 
-        return WindowStats(now + min(previous_reset_in, current_reset_in), remaining)
+    async def _release(self, key: str, lease: Lease) -> None:
+        """
+        Return the unused entries of :paramref:`lease` to the storage if the
+        window they were leased from hasn't reset yet
+        """
+        if not (
+            lease.tokens
+            and lease.reset_time is not None
+            and lease.reset_time > self.clock.time()
+        ):
+            return
+        if isinstance(self.limiter, SlidingWindowCounterRateLimiter):
+            try:
+                await cast(
+                    SlidingWindowCounterSupport, self.storage
+                ).release_sliding_window_entry(key, lease.expiry, lease.tokens)
+            except NotImplementedError:
+                pass
+        elif decr := getattr(self.storage, "decr", None):
+            await decr(key, lease.tokens)
+
+    async def hit(self, item: RateLimitItem, *identifiers: str, cost: int = 1) -> bool:
+        """
+        Consume the rate limit from the local lease, leasing a new block
+        from the storage if it is exhausted or expired
+
+        :param item: The rate limit item
+        :param identifiers: variable list of strings to uniquely identify this
+         instance of the limit
+        :param cost: The cost of this hit, default 1
+        """
+        key = item.key_for(*identifiers)
+        lease = self.leases.get(key)
+        if lease and lease.deadline > self.clock.time() and lease.tokens >= cost:
+            lease.tokens -= cost
+            return True
+        self.leases.pop(key, None)
+        if lease:
+            await self._release(key, lease)
+        lease = await self._lease(item, key, self._lease_size(item, lease, cost), cost)
+        if acquired := lease.tokens >= cost:
+            lease.tokens -= cost
+        replaced, self.leases[key] = self.leases.get(key), lease
+        if replaced:
+            # another task leased a block for the same key concurrently
+            await self._release(key, replaced)
+
+        return acquired
+
+    async def _refund(
+        self, item: RateLimitItem, *identifiers: str, cost: int = 1
+    ) -> None:
+        """
+        Give the hit back to the local lease it was served from
+        """
+        if lease := self.leases.get(item.key_for(*identifiers)):
+            lease.tokens = min(lease.granted, lease.tokens + cost)
+
+    async def test(self, item: RateLimitItem, *identifiers: str, cost: int = 1) -> bool:
+        """
+        Check if the rate limit can be consumed
+
+        :param item: The rate limit item
+        :param identifiers: variable list of strings to uniquely identify this
+         instance of the limit
+        :param cost: The expected cost to be consumed, default 1
+        """
+        lease = self.leases.get(item.key_for(*identifiers))
+        if lease and lease.deadline > self.clock.time() and lease.tokens >= cost:
+            return True
+
+        return await self.limiter.test(item, *identifiers, cost=cost)
+
+    async def get_window_stats(
+        self, item: RateLimitItem, *identifiers: str
+    ) -> WindowStats:
+        """
+        Query the reset time and remaining amount for the limit, counting
+        the unused entries of the local lease as remaining
+
+        :param item: The rate limit item
+        :param identifiers: variable list of strings to uniquely identify this
+         instance of the limit
+        :return: WindowStats(reset time, remaining)
+        """
+        stats = await self.limiter.get_window_stats(item, *identifiers)
+        lease = self.leases.get(item.key_for(*identifiers))
+        if lease and lease.deadline > self.clock.time():
+            return WindowStats(
+                stats.reset_time, min(item.amount, stats.remaining + lease.tokens)
+            )
+
+        return stats
+
+    async def clear(self, item: RateLimitItem, *identifiers: str) -> None:
+        self.leases.pop(item.key_for(*identifiers), None)
+        await self.limiter.clear(item, *identifiers)
+
+    async def release(self) -> None:
+        """
+        Return the unused entries of all the leases to the storage, e.g.
+        before the process exits
+        """
+        leases, self.leases = self.leases, {}
+        for key, lease in leases.items():
+            await self._release(key, lease)
 
 
 STRATEGIES = {
     "sliding-window-counter": SlidingWindowCounterRateLimiter,
     "fixed-window": FixedWindowRateLimiter,
     "moving-window": MovingWindowRateLimiter,
+    "gcra": GCRARateLimiter,
 }
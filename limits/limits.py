@@ -4,6 +4,8 @@ from __future__ import annotations
 
 from functools import total_ordering
 
+from deprecated.sphinx import versionchanged
+
 from limits.typing import ClassVar, NamedTuple, cast
 
 
@@ -67,7 +69,7 @@ class RateLimitItem(metaclass=RateLimitItemMeta):
     :param namespace: category for the specific rate limit
     """
 
-    __slots__ = ["namespace", "amount", "multiples"]
+    __slots__ = ["namespace", "_amount", "_multiples", "_key_suffix"]
 
     GRANULARITY: ClassVar[Granularity]
     """
@@ -79,8 +81,39 @@ class RateLimitItem(metaclass=RateLimitItemMeta):
         self, amount: int, multiples: int | None = 1, namespace: str = "LIMITER"
     ):
         self.namespace = namespace
-        self.amount = int(amount)
-        self.multiples = int(multiples or 1)
+        self._amount = int(amount)
+        self._multiples = int(multiples or 1)
+        self._update_key_suffix()
+
+    @property
+    def amount(self) -> int:
+        """
+        The rate limit amount
+        """
+        return self._amount
+
+    @amount.setter
+    def amount(self, amount: int) -> None:
+        self._amount = int(amount)
+        self._update_key_suffix()
+
+    @property
+    def multiples(self) -> int:
+        """
+        The multiple of the 'per' :attr:`GRANULARITY`
+        """
+        return self._multiples
+
+    @multiples.setter
+    def multiples(self, multiples: int | None) -> None:
+        self._multiples = int(multiples or 1)
+        self._update_key_suffix()
+
+    def _update_key_suffix(self) -> None:
+        """
+        Precompute the part of the keys that only depends on the limit
+        """
+        self._key_suffix = f"{self._amount}/{self._multiples}/{self.GRANULARITY.name}"
 
     @classmethod
     def check_granularity_string(cls, granularity_string: str) -> bool:
@@ -100,26 +133,36 @@ class RateLimitItem(metaclass=RateLimitItemMeta):
 
         return self.GRANULARITY.seconds * self.multiples
 
-    def key_for(self, *identifiers: bytes | str | int | float) -> str:
+    @versionchanged(version="4.7", reason="Added the :paramref:`hash_tag` argument")
+    def key_for(
+        self, *identifiers: bytes | str | int | float, hash_tag: bool = False
+    ) -> str:
         """
         Constructs a key for the current limit and any additional
         identifiers provided.
 
         :param identifiers: a list of strings to append to the key
+        :param hash_tag: Whether to wrap the identifiers in a redis cluster
+         hash tag (``{...}``) so that the keys of all the limits for the same
+         identifiers are owned by the same slot (and node) of the cluster
         :return: a string key identifying this resource with
          each identifier separated with a '/' delimiter.
         """
-        remainder = "/".join(
-            [safe_string(k) for k in identifiers]
-            + [
-                safe_string(self.amount),
-                safe_string(self.multiples),
-                self.GRANULARITY.name,
-            ]
+        if hash_tag:
+            return (
+                f"{self.namespace}/{{{'/'.join(map(safe_string, identifiers))}}}"
+                f"/{self._key_suffix}"
+            )
+        if not identifiers:
+            return f"{self.namespace}/{self._key_suffix}"
+        if len(identifiers) == 1 and isinstance(identifiers[0], str):
+            return f"{self.namespace}/{identifiers[0]}/{self._key_suffix}"
+
+        return (
+            f"{self.namespace}/{'/'.join(map(safe_string, identifiers))}"
+            f"/{self._key_suffix}"
         )
 
-        return f"{self.namespace}/{remainder}"
-
     def __eq__(self, other: object) -> bool:
         if isinstance(other, RateLimitItem):
             return (
@@ -0,0 +1,28 @@
+local timestamp = tonumber(ARGV[1])
+local limit = tonumber(ARGV[2])
+local interval = tonumber(ARGV[3])
+local amount = tonumber(ARGV[4])
+
+-- The timestamp (in microseconds) is read from the clock of the server if it is 0
+if timestamp == 0 then
+    local now = redis.call('time')
+    timestamp = tonumber(now[1]) * 1000000 + tonumber(now[2])
+end
+
+local stored = tonumber(redis.call('get', KEYS[1]))
+local tat = math.max(stored or timestamp, timestamp) + amount * interval
+
+-- lua numbers are rendered with 14 significant digits which would
+-- truncate the arrival times (in microseconds) so they are returned
+-- and stored as explicitly formatted strings
+if tat - timestamp > limit * interval then
+    return {0, string.format('%d', stored or 0)}
+end
+
+if tat > timestamp then
+    redis.call('set', KEYS[1], string.format('%d', tat), 'px', math.ceil((tat - timestamp) / 1000))
+else
+    -- entries that were given back (negative amount) emptied the bucket
+    redis.call('del', KEYS[1])
+end
+return {1, string.format('%d', tat)}
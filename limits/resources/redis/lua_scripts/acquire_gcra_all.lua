@@ -0,0 +1,31 @@
+-- Acquires ARGV[2] entries for all the keys in KEYS only if the
+-- theoretical arrival time of every key stays within its limit.
+-- ARGV[2 * i + 1] and ARGV[2 * i + 2] are the limit and the emission
+-- interval (in microseconds) of the i-th key
+local timestamp = tonumber(ARGV[1])
+local amount = tonumber(ARGV[2])
+local tats = {}
+
+-- The timestamp (in microseconds) is read from the clock of the server if it is 0
+if timestamp == 0 then
+    local now = redis.call('time')
+    timestamp = tonumber(now[1]) * 1000000 + tonumber(now[2])
+end
+
+for i, key in ipairs(KEYS) do
+    local limit = tonumber(ARGV[2 * i + 1])
+    local interval = tonumber(ARGV[2 * i + 2])
+    local tat = tats[key] or tonumber(redis.call('get', key)) or timestamp
+
+    tat = math.max(tat, timestamp) + amount * interval
+    if tat - timestamp > limit * interval then
+        return false
+    end
+    tats[key] = tat
+end
+
+for key, tat in pairs(tats) do
+    redis.call('set', key, string.format('%d', tat), 'px', math.ceil((tat - timestamp) / 1000))
+end
+
+return true
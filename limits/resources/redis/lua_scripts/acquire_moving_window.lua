@@ -2,15 +2,47 @@ local timestamp = tonumber(ARGV[1])
 local limit = tonumber(ARGV[2])
 local expiry = tonumber(ARGV[3])
 local amount = tonumber(ARGV[4])
+local with_window = ARGV[5] == "1"
+
+-- The timestamp is read from the clock of the server if it is 0
+if timestamp == 0 then
+    local now = redis.call('time')
+    timestamp = tonumber(now[1]) + tonumber(now[2]) / 1000000
+end
+
+-- Return the decision, and if requested the start of the window and the
+-- number of entries in it after the entries were (or not) acquired
+local function result(acquired)
+    if not with_window then
+        return acquired
+    end
+
+    local items = redis.call('lrange', KEYS[1], 0, limit - 1)
+    local count = 0
+    local oldest = nil
+
+    for idx = 1, #items do
+        local value = tonumber(items[idx])
+        if value < timestamp - expiry then
+            break
+        end
+        count = count + 1
+        if oldest == nil or value < oldest then
+            oldest = value
+        end
+    end
+
+    return {acquired and 1 or 0, tostring(oldest or timestamp), count}
+end
 
 if amount > limit then
-    return false
+    return result(false)
 end
 
 local entry = redis.call('lindex', KEYS[1], limit - amount)
 
 if entry and tonumber(entry) >= timestamp - expiry then
-    return false
+    return result(false)
 end
 
 for i = 1, amount do
@@ -20,4 +52,4 @@ end
 redis.call('ltrim', KEYS[1], 0, limit - 1)
 redis.call('expire', KEYS[1], expiry)
 
-return true
+return result(true)
@@ -0,0 +1,42 @@
+-- Acquires ARGV[2] entries in all the moving windows in KEYS only if
+-- all of them have room for them. ARGV[2 * i + 1] and ARGV[2 * i + 2]
+-- are the limit and expiry of KEYS[i]
+local timestamp = tonumber(ARGV[1])
+local amount = tonumber(ARGV[2])
+
+-- The timestamp is read from the clock of the server if it is 0
+if timestamp == 0 then
+    local now = redis.call('time')
+    timestamp = tonumber(now[1]) + tonumber(now[2]) / 1000000
+end
+
+local pending = {}
+
+for i = 1, #KEYS do
+    local limit = tonumber(ARGV[i * 2 + 1])
+    local expiry = tonumber(ARGV[i * 2 + 2])
+    pending[KEYS[i]] = (pending[KEYS[i]] or 0) + amount
+
+    if pending[KEYS[i]] > limit then
+        return false
+    end
+
+    local entry = redis.call('lindex', KEYS[i], limit - pending[KEYS[i]])
+
+    if entry and tonumber(entry) >= timestamp - expiry then
+        return false
+    end
+end
+
+for i = 1, #KEYS do
+    local limit = tonumber(ARGV[i * 2 + 1])
+
+    for _ = 1, amount do
+        redis.call('lpush', KEYS[i], timestamp)
+    end
+
+    redis.call('ltrim', KEYS[i], 0, limit - 1)
+    redis.call('expire', KEYS[i], ARGV[i * 2 + 2])
+end
+
+return true
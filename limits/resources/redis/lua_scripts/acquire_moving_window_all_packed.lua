@@ -0,0 +1,88 @@
+-- Acquires ARGV[2] entries in all the packed moving windows in KEYS only
+-- if all of them have room for them. ARGV[2 * i + 1] and ARGV[2 * i + 2]
+-- are the limit and expiry of KEYS[i]
+local timestamp = tonumber(ARGV[1])
+local amount = tonumber(ARGV[2])
+
+-- The timestamp is read from the clock of the server if it is 0
+if timestamp == 0 then
+    local now = redis.call('time')
+    timestamp = tonumber(now[1]) + tonumber(now[2]) / 1000000
+end
+
+local MAX_COUNT = 16777215
+local now = math.floor(timestamp * 1000)
+local pending = {}
+
+-- Returns the base timestamp of the window, its pairs that haven't
+-- expired, the sum of their counts and the newest pair
+local function window(key, expiry)
+    local value = redis.call('get', key) or ''
+
+    if #value == 0 then
+        return now, '', 0, nil, 0
+    end
+
+    local base = struct.unpack('>I6', value)
+    local start = math.floor((timestamp - expiry) * 1000) - base
+    local low, high = 0, (#value - 6) / 8
+
+    while low < high do
+        local mid = math.floor((low + high) / 2)
+        if struct.unpack('>I5', value, 7 + mid * 8) < start then
+            low = mid + 1
+        else
+            high = mid
+        end
+    end
+
+    local entries = string.sub(value, 7 + low * 8)
+    local count, newest, newest_count = 0, nil, 0
+
+    for pos = 1, #entries, 8 do
+        local offset, weight = struct.unpack('>I5I3', entries, pos)
+        count = count + weight
+        newest, newest_count = offset, weight
+    end
+
+    if #entries == 0 then
+        base = now
+    end
+
+    return base, entries, count, newest, newest_count
+end
+
+for i = 1, #KEYS do
+    local limit = tonumber(ARGV[i * 2 + 1])
+    local expiry = tonumber(ARGV[i * 2 + 2])
+    pending[KEYS[i]] = (pending[KEYS[i]] or 0) + amount
+
+    local _, _, count = window(KEYS[i], expiry)
+
+    if count + pending[KEYS[i]] > limit then
+        return false
+    end
+end
+
+for i = 1, #KEYS do
+    local expiry = tonumber(ARGV[i * 2 + 2])
+    local base, entries, _, newest, newest_count = window(KEYS[i], expiry)
+    local offset = math.max(now - base, newest or 0)
+    local remaining = amount
+
+    if offset == newest and newest_count < MAX_COUNT then
+        local merged = math.min(newest_count + remaining, MAX_COUNT)
+        entries = string.sub(entries, 1, -9) .. struct.pack('>I5I3', offset, merged)
+        remaining = remaining - merged + newest_count
+    end
+
+    while remaining > 0 do
+        local weight = math.min(remaining, MAX_COUNT)
+        entries = entries .. struct.pack('>I5I3', offset, weight)
+        remaining = remaining - weight
+    end
+
+    redis.call('set', KEYS[i], struct.pack('>I6', base) .. entries, 'EX', expiry)
+end
+
+return true
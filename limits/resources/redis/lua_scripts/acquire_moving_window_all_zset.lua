@@ -0,0 +1,48 @@
+-- Acquires ARGV[2] entries in all the sorted set moving windows in KEYS
+-- only if all of them have room for them. ARGV[2 * i + 1] and
+-- ARGV[2 * i + 2] are the limit and expiry of KEYS[i]
+local timestamp = tonumber(ARGV[1])
+local amount = tonumber(ARGV[2])
+
+-- The timestamp is read from the clock of the server if it is 0
+if timestamp == 0 then
+    local now = redis.call('time')
+    timestamp = tonumber(now[1]) + tonumber(now[2]) / 1000000
+end
+
+local pending = {}
+
+local function window(key)
+    local first = redis.call('zrange', key, 0, 0)
+
+    if #first == 0 then
+        return 0, 0, nil
+    end
+
+    local last = redis.call('zrange', key, -1, -1, 'WITHSCORES')
+    local first_total, first_weight = string.match(first[1], '(%d+):(%d+)')
+    local last_total = tonumber(string.match(last[1], '(%d+):'))
+
+    return last_total - tonumber(first_total) + tonumber(first_weight), last_total, tonumber(last[2])
+end
+
+for i = 1, #KEYS do
+    local limit = tonumber(ARGV[i * 2 + 1])
+    local expiry = tonumber(ARGV[i * 2 + 2])
+    pending[KEYS[i]] = (pending[KEYS[i]] or 0) + amount
+
+    redis.call('zremrangebyscore', KEYS[i], '-inf', string.format('(%.6f', timestamp - expiry))
+
+    if window(KEYS[i]) + pending[KEYS[i]] > limit then
+        return false
+    end
+end
+
+for i = 1, #KEYS do
+    local _, total, newest = window(KEYS[i])
+
+    redis.call('zadd', KEYS[i], math.max(timestamp, newest or timestamp), string.format('%016d:%d', total + amount, amount))
+    redis.call('expire', KEYS[i], ARGV[i * 2 + 2])
+end
+
+return true
@@ -0,0 +1,83 @@
+local timestamp = tonumber(ARGV[1])
+local limit = tonumber(ARGV[2])
+local expiry = tonumber(ARGV[3])
+local amount = tonumber(ARGV[4])
+local with_window = ARGV[5] == "1"
+
+-- The timestamp is read from the clock of the server if it is 0
+if timestamp == 0 then
+    local now = redis.call('time')
+    timestamp = tonumber(now[1]) + tonumber(now[2]) / 1000000
+end
+
+-- The value is the base timestamp of the window in milliseconds (6 bytes)
+-- followed by (offset from the base in milliseconds, count) pairs (5 + 3
+-- bytes) ordered from the oldest to the newest. Hits in the same
+-- millisecond share a pair as long as its count fits in 3 bytes.
+local MAX_COUNT = 16777215
+local now = math.floor(timestamp * 1000)
+local value = redis.call('get', KEYS[1]) or ''
+local base, entries, count, oldest, newest, newest_count = now, '', 0, nil, nil, 0
+
+if #value > 0 then
+    base = struct.unpack('>I6', value)
+
+    local start = math.floor((timestamp - expiry) * 1000) - base
+    local low, high = 0, (#value - 6) / 8
+
+    while low < high do
+        local mid = math.floor((low + high) / 2)
+        if struct.unpack('>I5', value, 7 + mid * 8) < start then
+            low = mid + 1
+        else
+            high = mid
+        end
+    end
+
+    entries = string.sub(value, 7 + low * 8)
+
+    for pos = 1, #entries, 8 do
+        local offset, weight = struct.unpack('>I5I3', entries, pos)
+        count = count + weight
+        oldest = oldest or offset
+        newest, newest_count = offset, weight
+    end
+
+    if #entries == 0 then
+        base = now
+    end
+end
+
+local function result(acquired)
+    if not with_window then
+        return acquired
+    end
+
+    return {acquired and 1 or 0, oldest and tostring((base + oldest) / 1000) or tostring(timestamp), count}
+end
+
+if amount > limit or count + amount > limit then
+    return result(false)
+end
+
+-- The offsets never go back so that the pairs stay sorted
+local offset = math.max(now - base, newest or 0)
+local remaining = amount
+
+if offset == newest and newest_count < MAX_COUNT then
+    local merged = math.min(newest_count + remaining, MAX_COUNT)
+    entries = string.sub(entries, 1, -9) .. struct.pack('>I5I3', offset, merged)
+    remaining = remaining - merged + newest_count
+end
+
+while remaining > 0 do
+    local weight = math.min(remaining, MAX_COUNT)
+    entries = entries .. struct.pack('>I5I3', offset, weight)
+    remaining = remaining - weight
+end
+
+redis.call('set', KEYS[1], struct.pack('>I6', base) .. entries, 'EX', expiry)
+count = count + amount
+oldest = oldest or offset
+
+return result(true)
@@ -0,0 +1,57 @@
+local timestamp = tonumber(ARGV[1])
+local limit = tonumber(ARGV[2])
+local expiry = tonumber(ARGV[3])
+local amount = tonumber(ARGV[4])
+local with_window = ARGV[5] == "1"
+
+-- The timestamp is read from the clock of the server if it is 0
+if timestamp == 0 then
+    local now = redis.call('time')
+    timestamp = tonumber(now[1]) + tonumber(now[2]) / 1000000
+end
+
+-- Members of the sorted set are "<cumulative weight>:<weight>" scored by
+-- their timestamp. Once the expired members are removed, the weight of the
+-- window is computed from the first and last members.
+local function window()
+    local first = redis.call('zrange', KEYS[1], 0, 0, 'WITHSCORES')
+
+    if #first == 0 then
+        return 0, nil, 0, nil
+    end
+
+    local last = redis.call('zrange', KEYS[1], -1, -1, 'WITHSCORES')
+    local first_total, first_weight = string.match(first[1], '(%d+):(%d+)')
+    local last_total = tonumber(string.match(last[1], '(%d+):'))
+
+    return last_total - tonumber(first_total) + tonumber(first_weight), first[2], last_total, tonumber(last[2])
+end
+
+local function result(acquired)
+    if not with_window then
+        return acquired
+    end
+
+    local count, oldest = window()
+
+    return {acquired and 1 or 0, oldest or tostring(timestamp), count}
+end
+
+redis.call('zremrangebyscore', KEYS[1], '-inf', string.format('(%.6f', timestamp - expiry))
+
+if amount > limit then
+    return result(false)
+end
+
+local count, _, total, newest = window()
+
+if count + amount > limit then
+    return result(false)
+end
+
+-- The cumulative weight is zero padded and the timestamp never goes back
+-- so that members sort the same way by score and lexicographically
+redis.call('zadd', KEYS[1], math.max(timestamp, newest or timestamp), string.format('%016d:%d', total + amount, amount))
+redis.call('expire', KEYS[1], expiry)
+
+return result(true)
@@ -4,10 +4,6 @@ local limit = tonumber(ARGV[1])
 local expiry = tonumber(ARGV[2]) * 1000
 local amount = tonumber(ARGV[3])
 
-if amount > limit then
-    return false
-end
-
 local current_ttl = tonumber(redis.call('pttl', KEYS[2]))
 
 if current_ttl > 0 and current_ttl < expiry then
@@ -30,16 +26,19 @@ if current_ttl <= 0 then
 end
 local weighted_count = math.floor(previous_count * previous_ttl / expiry) + current_count
 
+-- The decision is returned along with the state of both windows
 if (weighted_count + amount) > limit then
-    return false
+    return {0, previous_count, previous_ttl, current_count, current_ttl}
 end
 
 -- If the current counter exists, increase its value
 if redis.call('exists', KEYS[2]) == 1 then
-    redis.call('incrby', KEYS[2], amount)
+    current_count = redis.call('incrby', KEYS[2], amount)
 else
     -- Otherwise, set the value with twice the expiry time
     redis.call('set', KEYS[2], amount, 'PX', expiry * 2)
+    current_count = amount
+    current_ttl = expiry * 2
 end
 
-return true
+return {1, previous_count, previous_ttl, current_count, current_ttl}
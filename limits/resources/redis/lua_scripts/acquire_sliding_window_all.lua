@@ -0,0 +1,53 @@
+-- Time is in milliseconds in this script: TTL, expiry...
+
+-- Acquires ARGV[1] entries in all the sliding windows in KEYS only if the
+-- weighted count of every window stays within its limit. KEYS[2 * i - 1]
+-- and KEYS[2 * i] are the previous and current window of the i-th limit
+-- and ARGV[2 * i] and ARGV[2 * i + 1] are its limit and expiry
+local amount = tonumber(ARGV[1])
+local pending = {}
+
+for i = 1, #KEYS / 2 do
+    local previous_key = KEYS[2 * i - 1]
+    local current_key = KEYS[2 * i]
+    local limit = tonumber(ARGV[i * 2])
+    local expiry = tonumber(ARGV[i * 2 + 1]) * 1000
+
+    local current_ttl = tonumber(redis.call('pttl', current_key))
+
+    if current_ttl > 0 and current_ttl < expiry then
+        -- Current window expired, shift it to the previous window
+        redis.call('rename', current_key, previous_key)
+        redis.call('set', current_key, 0, 'PX', current_ttl + expiry)
+    end
+
+    local previous_count = tonumber(redis.call('get', previous_key)) or 0
+    local previous_ttl = tonumber(redis.call('pttl', previous_key)) or 0
+    local current_count = tonumber(redis.call('get', current_key)) or 0
+
+    -- If the values don't exist yet, consider the TTL is 0
+    if previous_ttl <= 0 then
+        previous_ttl = 0
+    end
+    local weighted_count = math.floor(previous_count * previous_ttl / expiry) + current_count
+    pending[current_key] = (pending[current_key] or 0) + amount
+
+    if (weighted_count + pending[current_key]) > limit then
+        return false
+    end
+end
+
+for i = 1, #KEYS / 2 do
+    local current_key = KEYS[2 * i]
+    local expiry = tonumber(ARGV[i * 2 + 1]) * 1000
+
+    -- If the current counter exists, increase its value
+    if redis.call('exists', current_key) == 1 then
+        redis.call('incrby', current_key, amount)
+    else
+        -- Otherwise, set the value with twice the expiry time
+        redis.call('set', current_key, amount, 'PX', expiry * 2)
+    end
+end
+
+return true
@@ -0,0 +1,12 @@
+if redis.call('exists', KEYS[1]) == 0 then
+    return 0
+end
+
+local current = redis.call('decrby', KEYS[1], ARGV[1])
+
+if current < 0 then
+    -- never go below zero, using incrby to keep the ttl of the key
+    current = redis.call('incrby', KEYS[1], -current)
+end
+
+return current
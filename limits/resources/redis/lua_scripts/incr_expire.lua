@@ -6,4 +6,4 @@ if tonumber(current) == amount then
     redis.call("expire", KEYS[1], ARGV[1])
 end
 
-return current
+return {current, redis.call("pttl", KEYS[1])}
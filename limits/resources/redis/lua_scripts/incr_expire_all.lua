@@ -0,0 +1,23 @@
+-- Increments all the counters in KEYS by ARGV[1] only if none of them
+-- would exceed its limit. ARGV[2 * i] and ARGV[2 * i + 1] are the limit
+-- and expiry of KEYS[i]
+local amount = tonumber(ARGV[1])
+local pending = {}
+
+for i = 1, #KEYS do
+    local limit = tonumber(ARGV[i * 2])
+    pending[KEYS[i]] = (pending[KEYS[i]] or 0) + amount
+    local current = tonumber(redis.call('get', KEYS[i])) or 0
+
+    if current + pending[KEYS[i]] > limit then
+        return false
+    end
+end
+
+for i = 1, #KEYS do
+    if redis.call('incrby', KEYS[i], amount) == amount then
+        redis.call('expire', KEYS[i], ARGV[i * 2 + 1])
+    end
+end
+
+return true
@@ -1,5 +1,13 @@
+local timestamp = tonumber(ARGV[1])
+
+-- The timestamp is read from the clock of the server if it is 0
+if timestamp == 0 then
+    local now = redis.call('time')
+    timestamp = tonumber(now[1]) + tonumber(now[2]) / 1000000
+end
+
 local items = redis.call('lrange', KEYS[1], 0, tonumber(ARGV[2]))
-local expiry = tonumber(ARGV[1])
+local expiry = timestamp - tonumber(ARGV[3])
 local a = 0
 local oldest = nil
 
@@ -0,0 +1,43 @@
+-- The value is the base timestamp of the window in milliseconds (6 bytes)
+-- followed by (offset from the base in milliseconds, count) pairs (5 + 3
+-- bytes) ordered from the oldest to the newest
+local timestamp = tonumber(ARGV[1])
+
+-- The timestamp is read from the clock of the server if it is 0
+if timestamp == 0 then
+    local now = redis.call('time')
+    timestamp = tonumber(now[1]) + tonumber(now[2]) / 1000000
+end
+
+local value = redis.call('get', KEYS[1])
+
+if not value then
+    return
+end
+
+local base = struct.unpack('>I6', value)
+local start = math.floor((timestamp - tonumber(ARGV[3])) * 1000) - base
+
+-- The pairs have a fixed width so the oldest one in the window is
+-- found with a binary search
+local low, high = 0, (#value - 6) / 8
+
+while low < high do
+    local mid = math.floor((low + high) / 2)
+    if struct.unpack('>I5', value, 7 + mid * 8) < start then
+        low = mid + 1
+    else
+        high = mid
+    end
+end
+
+local count = 0
+
+for pos = 7 + low * 8, #value, 8 do
+    local _, weight = struct.unpack('>I5I3', value, pos)
+    count = count + weight
+end
+
+if count > 0 then
+    return {tostring((base + struct.unpack('>I5', value, 7 + low * 8)) / 1000), count}
+end
@@ -0,0 +1,21 @@
+-- Members of the sorted set are "<cumulative weight>:<weight>" scored by
+-- their timestamp, so the weight of the window is computed from its first
+-- and last members instead of iterating over all of them
+local timestamp = tonumber(ARGV[1])
+
+-- The timestamp is read from the clock of the server if it is 0
+if timestamp == 0 then
+    local now = redis.call('time')
+    timestamp = tonumber(now[1]) + tonumber(now[2]) / 1000000
+end
+
+local start = string.format('%.6f', timestamp - tonumber(ARGV[3]))
+local first = redis.call('zrangebyscore', KEYS[1], start, '+inf', 'WITHSCORES', 'LIMIT', 0, 1)
+
+if #first > 0 then
+    local last = redis.call('zrange', KEYS[1], -1, -1)
+    local first_total, first_weight = string.match(first[1], '(%d+):(%d+)')
+    local last_total = string.match(last[1], '(%d+):')
+
+    return {first[2], tonumber(last_total) - tonumber(first_total) + tonumber(first_weight)}
+end
@@ -0,0 +1,6 @@
+-- The newest entries are at the head of the list
+for i = 1, tonumber(ARGV[1]) do
+    if not redis.call('lpop', KEYS[1]) then
+        break
+    end
+end
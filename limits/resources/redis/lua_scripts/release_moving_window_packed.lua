@@ -0,0 +1,30 @@
+-- The value is the base timestamp of the window in milliseconds (6 bytes)
+-- followed by (offset from the base in milliseconds, count) pairs (5 + 3
+-- bytes) ordered from the oldest to the newest. The counts of the newest
+-- pairs are reduced until the weight to release is reached.
+local value = redis.call('get', KEYS[1])
+
+if not value then
+    return
+end
+
+local remaining = tonumber(ARGV[1])
+
+while remaining > 0 and #value > 6 do
+    local offset, weight = struct.unpack('>I5I3', value, #value - 7)
+    value = string.sub(value, 1, -9)
+
+    if weight > remaining then
+        value = value .. struct.pack('>I5I3', offset, weight - remaining)
+    end
+
+    remaining = remaining - weight
+end
+
+local ttl = redis.call('pttl', KEYS[1])
+
+if ttl > 0 then
+    redis.call('set', KEYS[1], value, 'PX', ttl)
+else
+    redis.call('set', KEYS[1], value)
+end
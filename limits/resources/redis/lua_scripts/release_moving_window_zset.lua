@@ -0,0 +1,23 @@
+-- Members of the sorted set are "<cumulative weight>:<weight>" scored by
+-- their timestamp. The newest members are removed until the weight to
+-- release is reached, the last one being re-added with a reduced weight
+-- if it is only partially released.
+local remaining = tonumber(ARGV[1])
+
+while remaining > 0 do
+    local last = redis.call('zrange', KEYS[1], -1, -1, 'WITHSCORES')
+
+    if #last == 0 then
+        break
+    end
+
+    local total, weight = string.match(last[1], '(%d+):(%d+)')
+    total, weight = tonumber(total), tonumber(weight)
+    redis.call('zrem', KEYS[1], last[1])
+
+    if weight > remaining then
+        redis.call('zadd', KEYS[1], last[2], string.format('%016d:%d', total - remaining, weight - remaining))
+    end
+
+    remaining = remaining - weight
+end
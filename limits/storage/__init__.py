@@ -11,7 +11,12 @@ import limits  # noqa
 
 from ..errors import ConfigurationError
 from ..typing import TypeAlias, cast
-from .base import MovingWindowSupport, SlidingWindowCounterSupport, Storage
+from .base import (
+    GCRASupport,
+    MovingWindowSupport,
+    SlidingWindowCounterSupport,
+    Storage,
+)
 from .memcached import MemcachedStorage
 from .memory import MemoryStorage
 from .mongodb import MongoDBStorage, MongoDBStorageBase
@@ -66,6 +71,7 @@ def storage_from_string(
 
 
 __all__ = [
+    "GCRASupport",
     "MemcachedStorage",
     "MemoryStorage",
     "MongoDBStorage",
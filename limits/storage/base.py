@@ -2,6 +2,9 @@ from __future__ import annotations
 
 import functools
 from abc import ABC, abstractmethod
+from math import floor
+
+from deprecated.sphinx import versionadded
 
 from limits import errors
 from limits.storage.registry import StorageRegistry
@@ -10,6 +13,7 @@ from limits.typing import (
     Callable,
     P,
     R,
+    Sequence,
     cast,
 )
 from limits.util import LazyDependency
@@ -42,7 +46,11 @@ class Storage(LazyDependency, metaclass=StorageRegistry):
     def __init_subclass__(cls, **kwargs: Any) -> None:  # type: ignore[explicit-any]
         for method in {
             "incr",
+            "incr_many",
+            "incr_all",
+            "incr_with_expiry",
             "get",
+            "get_counts",
             "get_expiry",
             "check",
             "reset",
@@ -88,6 +96,78 @@ class Storage(LazyDependency, metaclass=StorageRegistry):
         """
         raise NotImplementedError
 
+    @versionadded(version="4.7")
+    def incr_many(self, entries: Sequence[tuple[str, int, int]]) -> list[int]:
+        """
+        increments the counters for multiple rate limit keys
+
+        The default implementation calls :meth:`incr` for each entry.
+        Storages that can increment several counters in one round trip
+        override it.
+
+        :param entries: ``(key, expiry, amount)`` tuples
+        :return: the value of each counter after it was incremented
+        """
+        return [self.incr(key, expiry, amount) for key, expiry, amount in entries]
+
+    @versionadded(version="4.7")
+    def get_counts(self, keys: Sequence[str]) -> list[int]:
+        """
+        :param keys: the keys to get the counter values for
+        :return: the value of each counter, in the order of :paramref:`keys`
+        """
+        return [self.get(key) for key in keys]
+
+    @versionadded(version="4.7")
+    def incr_all(
+        self, entries: Sequence[tuple[str, int, int]], amount: int = 1
+    ) -> bool:
+        """
+        increments the counters for multiple rate limit keys only if none
+        of them would exceed its limit
+
+        The default implementation checks the counters with
+        :meth:`get_counts` before incrementing them with :meth:`incr_many`
+        and is therefore not atomic: if concurrent increments push one of
+        the counters over its limit in between, all the counters are
+        decremented again (with ``decr`` if the storage implements it)
+        and ``False`` is returned. Storages that can check and increment
+        the counters atomically override it.
+
+        :param entries: ``(key, limit, expiry)`` tuples
+        :param amount: the number to increment each counter by
+        :return: ``True`` if all the counters were incremented
+        """
+        counts = self.get_counts([key for key, _, _ in entries])
+        if any(count + amount > limit for count, (_, limit, _) in zip(counts, entries)):
+            return False
+        counts = self.incr_many([(key, expiry, amount) for key, _, expiry in entries])
+        if all(count <= limit for count, (_, limit, _) in zip(counts, entries)):
+            return True
+        if decr := getattr(self, "decr", None):
+            for key, _, _ in entries:
+                decr(key, amount)
+        return False
+
+    @versionadded(version="4.7")
+    def incr_with_expiry(
+        self, key: str, expiry: int, amount: int = 1
+    ) -> tuple[int, float]:
+        """
+        increments the counter for a given rate limit key and returns it
+        along with the time at which it expires
+
+        The default implementation calls :meth:`incr` followed by
+        :meth:`get_expiry`. Storages that can return both in a single
+        round trip override it.
+
+        :param key: the key to increment
+        :param expiry: amount in seconds for the key to expire in
+        :param amount: the number to increment by
+        :return: (value of the counter after the increment, expiry time)
+        """
+        return self.incr(key, expiry, amount), self.get_expiry(key)
+
     @abstractmethod
     def get_expiry(self, key: str) -> float:
         """
@@ -128,7 +208,12 @@ class MovingWindowSupport(ABC):
     def __init_subclass__(cls, **kwargs: Any) -> None:  # type: ignore[explicit-any]
         for method in {
             "acquire_entry",
+            "acquire_entries",
+            "acquire_all_entries",
+            "acquire_entry_with_window",
+            "release_entry",
             "get_moving_window",
+            "get_moving_windows",
         }:
             setattr(
                 cls,
@@ -159,6 +244,106 @@ class MovingWindowSupport(ABC):
         """
         raise NotImplementedError
 
+    @versionadded(version="4.7")
+    def acquire_entries(
+        self, entries: Sequence[tuple[str, int, int, int]]
+    ) -> list[bool]:
+        """
+        The default implementation calls :meth:`acquire_entry` for each entry.
+        Storages that can acquire entries in several moving windows in one
+        round trip override it.
+
+        :param entries: ``(key, limit, expiry, amount)`` tuples
+        :return: whether each entry was acquired
+        """
+        return [
+            self.acquire_entry(key, limit, expiry, amount)
+            for key, limit, expiry, amount in entries
+        ]
+
+    @versionadded(version="4.7")
+    def get_moving_windows(
+        self, entries: Sequence[tuple[str, int, int]]
+    ) -> list[tuple[float, int]]:
+        """
+        :param entries: ``(key, limit, expiry)`` tuples
+        :return: (start of window, number of acquired entries) for each entry
+        """
+        return [
+            self.get_moving_window(key, limit, expiry) for key, limit, expiry in entries
+        ]
+
+    @versionadded(version="4.7")
+    def acquire_all_entries(
+        self, entries: Sequence[tuple[str, int, int]], amount: int = 1
+    ) -> bool:
+        """
+        Acquire :paramref:`amount` entries in multiple moving windows only
+        if all of them have room for them
+
+        The default implementation checks the windows with
+        :meth:`get_moving_windows` before acquiring the entries with
+        :meth:`acquire_entries` and is therefore not atomic: if concurrent
+        hits fill up one of the windows in between, the entries acquired
+        in the other windows are given back with :meth:`release_entry`
+        and ``False`` is returned. Storages that can check and acquire the
+        entries atomically override it.
+
+        :param entries: ``(key, limit, expiry)`` tuples
+        :param amount: the number of entries to acquire in each window
+        :return: ``True`` if the entries were acquired in all the windows
+        """
+        windows = self.get_moving_windows(entries)
+        if any(
+            acquired + amount > limit
+            for (_, acquired), (_, limit, _) in zip(windows, entries)
+        ):
+            return False
+        acquired = self.acquire_entries(
+            [(key, limit, expiry, amount) for key, limit, expiry in entries]
+        )
+        if all(acquired):
+            return True
+        for (key, _, expiry), entry_acquired in zip(entries, acquired):
+            if entry_acquired:
+                self.release_entry(key, expiry, amount)
+        return False
+
+    @versionadded(version="4.7")
+    def release_entry(self, key: str, expiry: int, amount: int = 1) -> None:
+        """
+        Give back the :paramref:`amount` newest entries of a moving window,
+        e.g. entries acquired by :meth:`acquire_all_entries` for a group of
+        limits that was rejected
+
+        :param key: rate limit key to release the entries of
+        :param expiry: expiry of the entries
+        :param amount: the number of entries to release
+        """
+        raise NotImplementedError
+
+    @versionadded(version="4.7")
+    def acquire_entry_with_window(
+        self, key: str, limit: int, expiry: int, amount: int = 1
+    ) -> tuple[bool, float, int]:
+        """
+        Acquire :paramref:`amount` entries and return the state of the
+        moving window after the attempt
+
+        The default implementation calls :meth:`acquire_entry` followed by
+        :meth:`get_moving_window`. Storages that can return both in a
+        single round trip override it.
+
+        :param key: rate limit key to acquire an entry in
+        :param limit: amount of entries allowed
+        :param expiry: expiry of the entry
+        :param amount: the number of entries to acquire
+        :return: (whether the entries were acquired, start of window,
+         number of acquired entries)
+        """
+        acquired = self.acquire_entry(key, limit, expiry, amount)
+        return (acquired, *self.get_moving_window(key, limit, expiry))
+
 
 class SlidingWindowCounterSupport(ABC):
     """
@@ -167,7 +352,15 @@ class SlidingWindowCounterSupport(ABC):
     """
 
     def __init_subclass__(cls, **kwargs: Any) -> None:  # type: ignore[explicit-any]
-        for method in {"acquire_sliding_window_entry", "get_sliding_window"}:
+        for method in {
+            "acquire_sliding_window_entry",
+            "acquire_sliding_window_entries",
+            "acquire_all_sliding_window_entries",
+            "acquire_sliding_window_entry_with_window",
+            "release_sliding_window_entry",
+            "get_sliding_window",
+            "get_sliding_windows",
+        }:
             setattr(
                 cls,
                 method,
@@ -207,6 +400,241 @@ class SlidingWindowCounterSupport(ABC):
         """
         raise NotImplementedError
 
+    @versionadded(version="4.7")
+    def acquire_sliding_window_entries(
+        self, entries: Sequence[tuple[str, int, int, int]]
+    ) -> list[bool]:
+        """
+        The default implementation calls :meth:`acquire_sliding_window_entry`
+        for each entry. Storages that can acquire entries in several sliding
+        windows in one round trip override it.
+
+        :param entries: ``(key, limit, expiry, amount)`` tuples
+        :return: whether each entry was acquired
+        """
+        return [
+            self.acquire_sliding_window_entry(key, limit, expiry, amount)
+            for key, limit, expiry, amount in entries
+        ]
+
+    @versionadded(version="4.7")
+    def get_sliding_windows(
+        self, entries: Sequence[tuple[str, int]]
+    ) -> list[tuple[int, float, int, float]]:
+        """
+        :param entries: ``(key, expiry)`` tuples
+        :return: the result of :meth:`get_sliding_window` for each entry
+        """
+        return [self.get_sliding_window(key, expiry) for key, expiry in entries]
+
+    @versionadded(version="4.7")
+    def acquire_all_sliding_window_entries(
+        self, entries: Sequence[tuple[str, int, int]], amount: int = 1
+    ) -> bool:
+        """
+        Acquire :paramref:`amount` entries in multiple sliding windows only
+        if the weighted count of every window stays within its limit
+
+        The default implementation checks the windows with
+        :meth:`get_sliding_windows` before acquiring the entries with
+        :meth:`acquire_sliding_window_entries` and is therefore not atomic:
+        if concurrent hits fill up one of the windows in between, the
+        entries acquired in the other windows are given back with
+        :meth:`release_sliding_window_entry` and ``False`` is returned.
+        Storages that can check and acquire the entries atomically
+        override it.
+
+        :param entries: ``(key, limit, expiry)`` tuples
+        :param amount: the number of entries to acquire in each window
+        :return: ``True`` if the entries were acquired in all the windows
+        """
+        windows = self.get_sliding_windows(
+            [(key, expiry) for key, _, expiry in entries]
+        )
+        if any(
+            floor(previous_count * previous_ttl / expiry + current_count) + amount
+            > limit
+            for (previous_count, previous_ttl, current_count, _), (
+                _,
+                limit,
+                expiry,
+            ) in zip(windows, entries)
+        ):
+            return False
+        acquired = self.acquire_sliding_window_entries(
+            [(key, limit, expiry, amount) for key, limit, expiry in entries]
+        )
+        if all(acquired):
+            return True
+        for (key, _, expiry), entry_acquired in zip(entries, acquired):
+            if entry_acquired:
+                self.release_sliding_window_entry(key, expiry, amount)
+        return False
+
+    @versionadded(version="4.7")
+    def release_sliding_window_entry(
+        self, key: str, expiry: int, amount: int = 1
+    ) -> None:
+        """
+        Give back :paramref:`amount` entries of the current window, e.g.
+        entries acquired by :meth:`acquire_all_sliding_window_entries` for
+        a group of limits that was rejected
+
+        :param key: rate limit key to release the entries of
+        :param expiry: expiry of the entries
+        :param amount: the number of entries to release
+        """
+        raise NotImplementedError
+
+    @versionadded(version="4.7")
+    def acquire_sliding_window_entry_with_window(
+        self, key: str, limit: int, expiry: int, amount: int = 1
+    ) -> tuple[bool, int, float, int, float]:
+        """
+        Acquire :paramref:`amount` entries and return the previous and
+        current window information after the attempt
+
+        The default implementation calls :meth:`acquire_sliding_window_entry`
+        followed by :meth:`get_sliding_window`. Storages that can return both
+        in a single round trip override it.
+
+        :param key: rate limit key to acquire an entry in
+        :param limit: amount of entries allowed
+        :param expiry: expiry of the entry
+        :param amount: the number of entries to acquire
+        :return: whether the entries were acquired followed by the result
+         of :meth:`get_sliding_window`
+        """
+        acquired = self.acquire_sliding_window_entry(key, limit, expiry, amount)
+        return (acquired, *self.get_sliding_window(key, expiry))
+
+
+@versionadded(version="4.7")
+class GCRASupport(ABC):
+    """
+    Abstract base class for storages that support
+    the :ref:`strategies:gcra` (token bucket) strategy.
+
+    The state of a limit is a single value per key: its theoretical
+    arrival time (TAT), stored as an integer number of microseconds
+    since the epoch so that it can be updated without accumulating
+    floating point errors.
+    """
+
+    def __init_subclass__(cls, **kwargs: Any) -> None:  # type: ignore[explicit-any]
+        for method in {
+            "acquire_gcra_entry",
+            "acquire_gcra_entries",
+            "acquire_all_gcra_entries",
+            "acquire_gcra_entry_with_tat",
+            "get_gcra_tat",
+        }:
+            setattr(
+                cls,
+                method,
+                _wrap_errors(getattr(cls, method)),
+            )
+        super().__init_subclass__(**kwargs)
+
+    @staticmethod
+    def emission_interval(limit: int, expiry: int) -> int:
+        """
+        :param limit: amount of entries allowed
+        :param expiry: the rate limit expiry in seconds
+        :return: the number of microseconds it takes for one entry
+         to become available again
+        """
+        return max(1, expiry * 1_000_000 // limit)
+
+    @abstractmethod
+    def acquire_gcra_entry(
+        self, key: str, limit: int, expiry: int, amount: int = 1
+    ) -> bool:
+        """
+        Advance the theoretical arrival time of :paramref:`key` by
+        :paramref:`amount` emission intervals if it stays within
+        :paramref:`limit` intervals of the current time
+
+        :param key: rate limit key to acquire an entry in
+        :param limit: amount of entries allowed
+        :param expiry: expiry of the entry
+        :param amount: the number of entries to acquire
+        :return: ``True`` if the entries were acquired
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def get_gcra_tat(self, key: str) -> int:
+        """
+        :param key: the rate limit key
+        :return: the theoretical arrival time of :paramref:`key` in
+         microseconds since the epoch or ``0`` if the key does not exist
+        """
+        raise NotImplementedError
+
+    def acquire_gcra_entries(
+        self, entries: Sequence[tuple[str, int, int, int]]
+    ) -> list[bool]:
+        """
+        The default implementation calls :meth:`acquire_gcra_entry` for each
+        entry. Storages that can acquire entries for several keys in one
+        round trip override it.
+
+        :param entries: ``(key, limit, expiry, amount)`` tuples
+        :return: whether each entry was acquired
+        """
+        return [
+            self.acquire_gcra_entry(key, limit, expiry, amount)
+            for key, limit, expiry, amount in entries
+        ]
+
+    def acquire_all_gcra_entries(
+        self, entries: Sequence[tuple[str, int, int]], amount: int = 1
+    ) -> bool:
+        """
+        Acquire :paramref:`amount` entries for multiple keys only if all of
+        them allow it
+
+        The default implementation acquires the entries one key at a time
+        with :meth:`acquire_gcra_entry` and, as soon as one of them is
+        rejected, gives back the entries acquired so far by moving their
+        theoretical arrival times back. It is therefore not atomic:
+        concurrent hits can be rejected because of entries that end up
+        being given back. Storages that can check and acquire the entries
+        atomically override it.
+
+        :param entries: ``(key, limit, expiry)`` tuples
+        :param amount: the number of entries to acquire for each key
+        :return: ``True`` if the entries were acquired for all the keys
+        """
+        for idx, (key, limit, expiry) in enumerate(entries):
+            if not self.acquire_gcra_entry(key, limit, expiry, amount):
+                for acquired in entries[:idx]:
+                    self.acquire_gcra_entry(*acquired, -amount)
+                return False
+        return True
+
+    def acquire_gcra_entry_with_tat(
+        self, key: str, limit: int, expiry: int, amount: int = 1
+    ) -> tuple[bool, int]:
+        """
+        Acquire :paramref:`amount` entries and return the theoretical
+        arrival time of :paramref:`key` after the attempt
+
+        The default implementation calls :meth:`acquire_gcra_entry`
+        followed by :meth:`get_gcra_tat`. Storages that can return both
+        in a single round trip override it.
+
+        :param key: rate limit key to acquire an entry in
+        :param limit: amount of entries allowed
+        :param expiry: expiry of the entry
+        :param amount: the number of entries to acquire
+        :return: whether the entries were acquired and the result of
+         :meth:`get_gcra_tat`
+        """
+        acquired = self.acquire_gcra_entry(key, limit, expiry, amount)
+        return acquired, self.get_gcra_tat(key)
+
 
 class TimestampedSlidingWindow:
     """Helper class for storage that support the sliding window counter, with timestamp based keys."""
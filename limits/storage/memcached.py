@@ -8,8 +8,12 @@ from collections.abc import Iterable
 from math import ceil, floor
 from types import ModuleType
 
+from deprecated.sphinx import versionadded, versionchanged
+
 from limits.errors import ConfigurationError
 from limits.storage.base import (
+    GCRASupport,
+    MovingWindowSupport,
     SlidingWindowCounterSupport,
     Storage,
     TimestampedSlidingWindow,
@@ -20,12 +24,157 @@ from limits.typing import (
     MemcachedClientP,
     P,
     R,
+    Sequence,
     cast,
 )
 from limits.util import get_dependency
 
+#: The largest time to live memcached accepts in seconds, larger values are
+#: read as a unix timestamp
+MAX_RELATIVE_EXPTIME = 30 * 24 * 60 * 60
+
+
+def exptime_for(ttl: float) -> int:
+    """
+    The expiration time to store a value with for it to expire in
+    :paramref:`ttl` seconds, which is converted to a unix timestamp when
+    it is longer than memcached accepts (e.g. for monthly limits)
+
+    :param ttl: the time to live of the value in seconds
+    """
+    if ceil(ttl) > MAX_RELATIVE_EXPTIME:
+        return int(time.time()) + ceil(ttl)
+    return ceil(ttl)
+
+
+class BucketRing:
+    """
+    Compact representation of a moving window that fits in a single
+    memcached value, for storages that can only replace whole values.
+
+    Hits are counted in buckets of :attr:`width` seconds anchored at
+    :attr:`base` (the time of the first hit of the window): bucket ``0``
+    holds the hits at :attr:`base` and bucket ``n`` the hits in
+    ``(base + (n - 1) * width, base + n * width]``. A bucket is counted
+    until its end leaves the window, so a hit is never counted for less
+    than the expiry of the window (and for at most one bucket longer).
+
+    :attr:`counts` holds the counts of the buckets starting at
+    :attr:`first`, which is always the oldest bucket with hits in the
+    window.
+    """
+
+    __slots__ = ("base", "counts", "first", "width")
+
+    def __init__(
+        self, width: float, base: float, first: int = 0, counts: list[int] | None = None
+    ) -> None:
+        self.width = width
+        self.base = base
+        self.first = first
+        self.counts = counts or []
+
+    @classmethod
+    def load(
+        cls, value: bytes | str | None, width: float, now: float, expiry: float
+    ) -> BucketRing:
+        """
+        Parse a value written by :meth:`dump` and drop the buckets that left
+        the window ending at :paramref:`now`
+
+        :param value: the value read from memcached (``None`` if the key
+         doesn't exist)
+        :param width: the duration of a bucket
+        :param now: the current time
+        :param expiry: the duration of the window
+        """
+        if not value:
+            return cls(width, now)
+        if isinstance(value, bytes):
+            value = value.decode()
+        base, first, counts = value.split(":")
+        ring = cls(
+            width,
+            float(base),
+            int(first),
+            [int(count or 0) for count in counts.split(",")],
+        )
+        ring.trim(now - expiry)
+        if not ring.counts:
+            ring.base, ring.first = now, 0
+        return ring
+
+    def dump(self) -> str:
+        """
+        Serialize the window as ``base:first:count,count,...`` (omitting the
+        counts of empty buckets)
+        """
+        return (
+            f"{self.base!r}:{self.first}:"
+            f"{','.join(str(count) if count else '' for count in self.counts)}"
+        )
+
+    def trim(self, start: float) -> None:
+        """
+        Drop the buckets that ended before :paramref:`start` along with the
+        empty buckets at the start of the window
+        """
+        drop = 0
+        for count in self.counts:
+            if count and self.base + (self.first + drop) * self.width > start:
+                break
+            drop += 1
+        self.first += drop
+        del self.counts[:drop]
+
+    def window(self, now: float) -> tuple[float, int]:
+        """
+        :return: (start of window, number of acquired entries)
+        """
+        if not self.counts:
+            return now, 0
+        return self.base + self.first * self.width, sum(self.counts)
 
-class MemcachedStorage(Storage, SlidingWindowCounterSupport, TimestampedSlidingWindow):
+    def acquire(self, now: float, limit: int, amount: int = 1) -> bool:
+        """
+        Add :paramref:`amount` hits at :paramref:`now` if the window has
+        room for them
+        """
+        if sum(self.counts) + amount > limit:
+            return False
+        bucket = max(ceil((now - self.base) / self.width), self.first)
+        if not self.counts:
+            self.first = bucket
+        offset = bucket - self.first
+        if offset >= len(self.counts):
+            self.counts.extend([0] * (offset - len(self.counts) + 1))
+        self.counts[offset] += amount
+        return True
+
+    def release(self, amount: int = 1) -> None:
+        """
+        Remove :paramref:`amount` hits from the newest buckets
+        """
+        while amount > 0 and self.counts:
+            released = min(amount, self.counts[-1])
+            self.counts[-1] -= released
+            amount -= released
+            if not self.counts[-1]:
+                self.counts.pop()
+
+
+@versionchanged(
+    version="4.7",
+    reason="Added support for the :ref:`strategies:moving window` strategy"
+    " and the :paramref:`moving_window_buckets` & :paramref:`meta_protocol` arguments",
+)
+class MemcachedStorage(
+    Storage,
+    MovingWindowSupport,
+    SlidingWindowCounterSupport,
+    GCRASupport,
+    TimestampedSlidingWindow,
+):
     """
     Rate limit storage with memcached as backend.
 
@@ -40,6 +189,8 @@ class MemcachedStorage(Storage, SlidingWindowCounterSupport, TimestampedSlidingW
         self,
         uri: str,
         wrap_exceptions: bool = False,
+        moving_window_buckets: int = 60,
+        meta_protocol: bool = False,
         **options: str | Callable[[], MemcachedClientP],
     ) -> None:
         """
@@ -48,11 +199,23 @@ class MemcachedStorage(Storage, SlidingWindowCounterSupport, TimestampedSlidingW
          ``memcached:///var/tmp/path/to/sock``
         :param wrap_exceptions: Whether to wrap storage exceptions in
          :exc:`limits.errors.StorageError` before raising it.
+        :param moving_window_buckets: The number of buckets the hits of a
+         :ref:`strategies:moving window` are counted in. Each window is stored
+         as a single value holding the count of each bucket, so more buckets
+         make the window more precise at the cost of a larger value.
+        :param meta_protocol: Whether to use the meta protocol (which
+         requires memcached 1.6 or higher) to increment the counters. A
+         counter is then created (if it doesn't exist) and incremented in a
+         single round trip and its expiry is read from the counter itself
+         instead of being stored in a separate key. It can't be used with
+         more than one host.
         :param options: all remaining keyword arguments are passed
          directly to the constructor of :class:`pymemcache.client.base.PooledClient`
          or :class:`pymemcache.client.hash.HashClient` (if there are more than
          one hosts specified)
-        :raise ConfigurationError: when :pypi:`pymemcache` is not available
+        :raise ConfigurationError: when :pypi:`pymemcache` is not available,
+         :paramref:`moving_window_buckets` is not positive or
+         :paramref:`meta_protocol` is enabled with more than one host
         """
         parsed = urllib.parse.urlparse(uri)
         self.hosts = []
@@ -78,6 +241,19 @@ class MemcachedStorage(Storage, SlidingWindowCounterSupport, TimestampedSlidingW
             options.pop("client_getter", self.get_client),
         )
         self.options = options
+        if moving_window_buckets < 1:
+            raise ConfigurationError("moving_window_buckets must be positive")
+        self.moving_window_buckets = moving_window_buckets
+        if meta_protocol and len(self.hosts) > 1:
+            raise ConfigurationError(
+                "The meta protocol can't be used with more than one host"
+            )
+        self.meta_protocol = meta_protocol
+        self.cas_retries = 0
+        """
+        The number of ``gets``/``cas`` updates retried because the value
+        was updated concurrently
+        """
 
         if not get_dependency(self.library):
             raise ConfigurationError(
@@ -142,6 +318,18 @@ class MemcachedStorage(Storage, SlidingWindowCounterSupport, TimestampedSlidingW
 
         return cast(MemcachedClientP, self.local_storage.storage)
 
+    @versionadded(version="4.7")
+    def decr(self, key: str, amount: int = 1) -> int:
+        """
+        decrements the counter for a given rate limit key
+
+        :param key: the key to decrement
+        :param amount: the number to decrement by
+        """
+        return (
+            self.call_memcached_func(self.storage.decr, key, amount, noreply=False) or 0
+        )
+
     def get(self, key: str) -> int:
         """
         :param key: the key to get the counter value for
@@ -156,6 +344,15 @@ class MemcachedStorage(Storage, SlidingWindowCounterSupport, TimestampedSlidingW
         """
         return self.storage.get_many(keys)
 
+    def get_counts(self, keys: Sequence[str]) -> list[int]:
+        """
+        :param keys: the keys to get the counter values for
+        """
+        if not keys:
+            return []
+        result = self.get_many(keys)
+        return [int(result.get(key, 0)) for key in keys]
+
     def clear(self, key: str) -> None:
         """
         :param key: the key to clear rate limits for
@@ -178,6 +375,8 @@ class MemcachedStorage(Storage, SlidingWindowCounterSupport, TimestampedSlidingW
         :param amount: the number to increment by
         :param set_expiration_key: set the expiration key with the expiration time if needed. If set to False, the key will still expire, but memcached cannot provide the expiration time.
         """
+        if self.meta_protocol:
+            return self.incr_with_expiry(key, ceil(expiry), amount)[0]
         if (
             value := self.call_memcached_func(
                 self.storage.incr, key, amount, noreply=False
@@ -201,13 +400,89 @@ class MemcachedStorage(Storage, SlidingWindowCounterSupport, TimestampedSlidingW
 
             return amount
 
+    def incr_with_expiry(
+        self, key: str, expiry: int, amount: int = 1
+    ) -> tuple[int, float]:
+        """
+        increments the counter for a given rate limit key and returns it
+        along with the time at which it expires, in a single round trip with
+        the :paramref:`meta_protocol`
+
+        :param key: the key to increment
+        :param expiry: amount in seconds for the key to expire in
+        :param amount: the number to increment by
+        :return: (value of the counter after the increment, expiry time)
+        """
+        if not self.meta_protocol:
+            return super().incr_with_expiry(key, expiry, amount)
+        [(_, value, flags)] = self._meta_commands(
+            [self._meta_incr_command(key, expiry, amount)]
+        )
+        return int(value or amount), self._meta_expiry(flags)
+
     def get_expiry(self, key: str) -> float:
         """
         :param key: the key to get the expiry for
         """
+        if self.meta_protocol:
+            [(_, _, flags)] = self._meta_commands([f"mg {self._meta_key(key)} t"])
+            return self._meta_expiry(flags)
 
         return float(self.storage.get(self._expiration_key(key)) or time.time())
 
+    def _meta_incr_command(self, key: str, expiry: float, amount: int) -> str:
+        """
+        The meta arithmetic command incrementing :paramref:`key` (or creating
+        it with :paramref:`amount` as the initial value) and returning the
+        counter along with its remaining time to live
+        """
+        return f"ma {self._meta_key(key)} N{ceil(expiry)} J{amount} D{amount} v t"
+
+    def _meta_expiry(self, flags: dict[str, bytes]) -> float:
+        """
+        The expiry time of a key from the remaining time to live returned
+        by a meta command with the ``t`` flag
+        """
+        ttl = int(flags.get("t", -1))
+        return time.time() + max(ttl, 0)
+
+    def _meta_key(self, key: str) -> str:
+        """
+        :paramref:`key` validated and prefixed by the client like the keys
+        of the other commands, so that it can't inject flags or commands
+        into the meta commands
+        """
+        return self.storage.check_key(key).decode()
+
+    def _meta_commands(
+        self, commands: list[str]
+    ) -> list[tuple[bytes, bytes | None, dict[str, bytes]]]:
+        """
+        Send meta protocol :paramref:`commands` in a single round trip. The commands are
+        followed by a ``mn`` (no-op) command whose ``MN`` response marks the
+        end of the responses.
+
+        :return: (status, value, flags) for each command
+        """
+        response = self.storage.raw_command("\r\n".join([*commands, "mn"]), b"MN\r\n")
+        results = []
+        lines = iter(response.split(b"\r\n"))
+        for line in lines:
+            if not line:
+                continue
+            status, *flags = line.split(b" ")
+            value = None
+            if status == b"VA":
+                value, flags = next(lines), flags[1:]
+            elif status not in {b"HD", b"EN", b"NF", b"NS", b"EX"}:
+                raise self.dependency.MemcacheUnknownError(
+                    f"Received unexpected response: {line!r}"
+                )
+            results.append(
+                (status, value, {flag[:1].decode(): flag[1:] for flag in flags})
+            )
+        return results
+
     def _expiration_key(self, key: str) -> str:
         """
         Return the expiration key for the given counter key.
@@ -232,6 +507,164 @@ class MemcachedStorage(Storage, SlidingWindowCounterSupport, TimestampedSlidingW
     def reset(self) -> int | None:
         raise NotImplementedError
 
+    def acquire_gcra_entry(
+        self, key: str, limit: int, expiry: int, amount: int = 1
+    ) -> bool:
+        """
+        Memcached doesn't support conditional updates, so the theoretical
+        arrival time is read with ``gets`` and written back with ``cas``
+        (or ``add`` if the key doesn't exist yet), retrying until no
+        concurrent update came in between.
+
+        :param key: rate limit key to acquire an entry in
+        :param limit: amount of entries allowed
+        :param expiry: expiry of the entry
+        :param amount: the number of entries to acquire
+        """
+        interval = self.emission_interval(limit, expiry)
+        while True:
+            value, cas = self.storage.gets(key)
+            now = time.time_ns() // 1000
+            tat = max(int(value or now), now) + amount * interval
+            if tat - now > limit * interval:
+                return False
+            # entries given back (negative amount) can move the arrival time
+            # into the past and an expiry of 0 would never expire the key
+            expire = exptime_for(max(1, ceil((tat - now) / 1_000_000)))
+            stored: bool | None
+            if value is None:
+                stored = self.call_memcached_func(
+                    self.storage.add, key, tat, expire, noreply=False
+                )
+            else:
+                stored = self.call_memcached_func(
+                    self.storage.cas, key, tat, cas, expire, noreply=False
+                )
+            if stored:
+                return True
+            self.cas_retries += 1
+
+    def get_gcra_tat(self, key: str) -> int:
+        """
+        :param key: the rate limit key
+        :return: the theoretical arrival time of :paramref:`key` in
+         microseconds since the epoch or ``0`` if the key does not exist
+        """
+        return self.get(key)
+
+    def acquire_entry(self, key: str, limit: int, expiry: int, amount: int = 1) -> bool:
+        """
+        :param key: rate limit key to acquire an entry in
+        :param limit: amount of entries allowed
+        :param expiry: expiry of the entry
+        :param amount: the number of entries to acquire
+        """
+        return self.acquire_entry_with_window(key, limit, expiry, amount)[0]
+
+    def acquire_entry_with_window(
+        self, key: str, limit: int, expiry: int, amount: int = 1
+    ) -> tuple[bool, float, int]:
+        """
+        The window is read with ``gets`` and written back with ``cas``
+        (or ``add`` if the key doesn't exist yet), retrying until no
+        concurrent update came in between (refer to :class:`BucketRing`
+        for the layout of the value).
+
+        :param key: rate limit key to acquire an entry in
+        :param limit: amount of entries allowed
+        :param expiry: expiry of the entry
+        :param amount: the number of entries to acquire
+        :return: (whether the entries were acquired, start of window,
+         number of acquired entries)
+        """
+        width = expiry / self.moving_window_buckets
+        while True:
+            value, cas = self.storage.gets(key)
+            now = time.time()
+            window = BucketRing.load(value, width, now, expiry)
+            if amount > limit or not window.acquire(now, limit, amount):
+                return (False, *window.window(now))
+            stored: bool | None
+            if value is None:
+                stored = self.call_memcached_func(
+                    self.storage.add,
+                    key,
+                    window.dump(),
+                    exptime_for(expiry + width),
+                    noreply=False,
+                )
+            else:
+                stored = self.call_memcached_func(
+                    self.storage.cas,
+                    key,
+                    window.dump(),
+                    cas,
+                    exptime_for(expiry + width),
+                    noreply=False,
+                )
+            if stored:
+                return (True, *window.window(now))
+            self.cas_retries += 1
+
+    def release_entry(self, key: str, expiry: int, amount: int = 1) -> None:
+        """
+        The window is read with ``gets`` and written back with ``cas``,
+        retrying until no concurrent update came in between.
+
+        :param key: rate limit key to release the entries of
+        :param expiry: expiry of the entries
+        :param amount: the number of entries to release
+        """
+        width = expiry / self.moving_window_buckets
+        while True:
+            value, cas = self.storage.gets(key)
+            if value is None:
+                return
+            window = BucketRing.load(value, width, time.time(), expiry)
+            window.release(amount)
+            if (
+                self.call_memcached_func(
+                    self.storage.cas,
+                    key,
+                    window.dump(),
+                    cas,
+                    exptime_for(expiry + width),
+                    noreply=False,
+                )
+                is not False
+            ):
+                return
+            self.cas_retries += 1
+
+    def get_moving_window(self, key: str, limit: int, expiry: int) -> tuple[float, int]:
+        """
+        returns the starting point and the number of entries in the moving
+        window
+
+        :param key: rate limit key
+        :param expiry: expiry of entry
+        :return: (start of window, number of acquired entries)
+        """
+        return self.get_moving_windows([(key, limit, expiry)])[0]
+
+    def get_moving_windows(
+        self, entries: Sequence[tuple[str, int, int]]
+    ) -> list[tuple[float, int]]:
+        """
+        :param entries: ``(key, limit, expiry)`` tuples
+        :return: (start of window, number of acquired entries) for each entry
+        """
+        if not entries:
+            return []
+        now = time.time()
+        result = self.get_many({key for key, _, _ in entries})
+        return [
+            BucketRing.load(
+                result.get(key), expiry / self.moving_window_buckets, now, expiry
+            ).window(now)
+            for key, _, expiry in entries
+        ]
+
     def acquire_sliding_window_entry(
         self,
         key: str,
@@ -243,6 +676,10 @@ class MemcachedStorage(Storage, SlidingWindowCounterSupport, TimestampedSlidingW
             return False
         now = time.time()
         previous_key, current_key = self.sliding_window_keys(key, expiry, now)
+        if self.meta_protocol:
+            return self._acquire_sliding_window_entry_meta(
+                previous_key, current_key, limit, expiry, amount, now
+            )
         previous_count, previous_ttl, current_count, _ = self._get_sliding_window_info(
             previous_key, current_key, expiry, now=now
         )
@@ -273,6 +710,49 @@ class MemcachedStorage(Storage, SlidingWindowCounterSupport, TimestampedSlidingW
                 return False
             return True
 
+    def _acquire_sliding_window_entry_meta(
+        self,
+        previous_key: str,
+        current_key: str,
+        limit: int,
+        expiry: int,
+        amount: int,
+        now: float,
+    ) -> bool:
+        """
+        Read the previous counter and increment the current one in a single
+        round trip, reverting the increment if the weighted count exceeds
+        :paramref:`limit`
+        """
+        results = self._meta_commands(
+            [
+                f"mg {self._meta_key(previous_key)} v",
+                self._meta_incr_command(current_key, 2 * expiry, amount),
+            ]
+        )
+        previous_count, previous_ttl, current_count, _ = self._sliding_window_info(
+            {previous_key: results[0][1] or 0, current_key: results[1][1] or 0},
+            previous_key,
+            current_key,
+            expiry,
+            now,
+        )
+        if floor(previous_count * previous_ttl / expiry + current_count) > limit:
+            self._meta_commands([f"ma {self._meta_key(current_key)} MD D{amount} q"])
+            return False
+        return True
+
+    def release_sliding_window_entry(
+        self, key: str, expiry: int, amount: int = 1
+    ) -> None:
+        """
+        :param key: rate limit key to release the entries of
+        :param expiry: expiry of the entries
+        :param amount: the number of entries to release
+        """
+        _, current_key = self.sliding_window_keys(key, expiry, time.time())
+        self.decr(current_key, amount)
+
     def get_sliding_window(
         self, key: str, expiry: int
     ) -> tuple[int, float, int, float]:
@@ -280,10 +760,35 @@ class MemcachedStorage(Storage, SlidingWindowCounterSupport, TimestampedSlidingW
         previous_key, current_key = self.sliding_window_keys(key, expiry, now)
         return self._get_sliding_window_info(previous_key, current_key, expiry, now)
 
+    def get_sliding_windows(
+        self, entries: Sequence[tuple[str, int]]
+    ) -> list[tuple[int, float, int, float]]:
+        if not entries:
+            return []
+        now = time.time()
+        window_keys = [
+            self.sliding_window_keys(key, expiry, now) for key, expiry in entries
+        ]
+        result = self.get_many({key for keys in window_keys for key in keys})
+        return [
+            self._sliding_window_info(result, previous_key, current_key, expiry, now)
+            for (previous_key, current_key), (_, expiry) in zip(window_keys, entries)
+        ]
+
     def _get_sliding_window_info(
         self, previous_key: str, current_key: str, expiry: int, now: float
     ) -> tuple[int, float, int, float]:
         result = self.get_many([previous_key, current_key])
+        return self._sliding_window_info(result, previous_key, current_key, expiry, now)
+
+    def _sliding_window_info(  # type:ignore[explicit-any]
+        self,
+        result: dict[str, Any],
+        previous_key: str,
+        current_key: str,
+        expiry: int,
+        now: float,
+    ) -> tuple[int, float, int, float]:
         previous_count, current_count = (
             int(result.get(previous_key, 0)),
             int(result.get(current_key, 0)),
@@ -1,76 +1,351 @@
 from __future__ import annotations
 
+import heapq
 import threading
-import time
-from collections import Counter, defaultdict
+import urllib.parse
+import weakref
+from array import array
+from bisect import bisect_left
+from collections import Counter, OrderedDict
+from collections.abc import Iterable, Iterator
+from contextlib import ExitStack, contextmanager
+from itertools import repeat
 from math import floor
 
 import limits.typing
+from limits.errors import ConfigurationError
 from limits.storage.base import (
+    GCRASupport,
     MovingWindowSupport,
     SlidingWindowCounterSupport,
     Storage,
     TimestampedSlidingWindow,
 )
+from limits.util import Clock, SystemClock
 
 
-class Entry:
+def parse_option(uri: str | None, name: str, value: int | None) -> int | None:
+    """
+    Resolve a positive integer option of an in memory storage giving
+    precedence to the query parameter :paramref:`name` of :paramref:`uri`
+    (e.g. ``memory://?lock_stripes=128&max_keys=100000``)
+
+    :raise ConfigurationError: if the value is not a positive integer
+    """
+    query = urllib.parse.parse_qs(urllib.parse.urlparse(uri or "").query)
+    raw = query[name][-1] if name in query else value
+    if raw is None:
+        return None
+    try:
+        parsed = int(raw)
+    except ValueError:
+        parsed = 0
+    if parsed < 1:
+        raise ConfigurationError(f"{name} must be a positive integer")
+    return parsed
+
+
+class TimestampRing:
+    """
+    Compact, array backed log of the timestamps acquired in a single
+    moving window.
+
+    Timestamps are kept in ascending order in :attr:`timestamps` with
+    the live entries starting at :attr:`start`. Acquiring appends to
+    the end, expired (or surplus) entries are dropped by advancing
+    :attr:`start` and the array is compacted once more than half of it
+    is dead, which keeps every operation amortized ``O(1)`` apart from
+    the ``O(log n)`` window lookups.
+    """
+
+    __slots__ = ("expiry", "start", "timestamps")
+
     def __init__(self, expiry: float) -> None:
-        self.atime = time.time()
-        self.expiry = self.atime + expiry
+        self.expiry = expiry
+        self.start = 0
+        self.timestamps = array("d")
+
+    def __len__(self) -> int:
+        return len(self.timestamps) - self.start
+
+    @property
+    def newest(self) -> float:
+        return self.timestamps[-1]
+
+    @property
+    def oldest(self) -> float:
+        return self.timestamps[self.start]
+
+    def acquire(self, timestamp: float, limit: int, amount: int = 1) -> bool:
+        """
+        Add :paramref:`amount` entries at :paramref:`timestamp` if the
+        ``limit - amount`` newest entry is older than the window.
+
+        :return: ``True`` if the entries were added
+        """
+        if not self.admits(timestamp, limit, amount):
+            return False
+        if self.timestamps and timestamp < self.newest:
+            # keep the log sorted even if the wall clock moved backwards
+            timestamp = self.newest
+        self.timestamps.extend(repeat(timestamp, amount))
+        # entries beyond the newest ``limit`` can never be consulted again
+        self.start = max(self.start, len(self.timestamps) - limit)
+        self.compact()
+        return True
+
+    def release(self, amount: int = 1) -> None:
+        """
+        Drop the :paramref:`amount` newest entries
+        """
+        del self.timestamps[max(self.start, len(self.timestamps) - amount) :]
+        self.compact()
+
+    def admits(self, timestamp: float, limit: int, amount: int = 1) -> bool:
+        """
+        :return: ``True`` if :paramref:`amount` entries can be acquired
+         at :paramref:`timestamp`
+        """
+        if amount > limit:
+            return False
+        if len(self) > limit - amount:
+            entry = self.timestamps[len(self.timestamps) - 1 - (limit - amount)]
+            return entry < timestamp - self.expiry
+        return True
+
+    def window(self, since: float) -> tuple[float | None, int]:
+        """
+        :return: the oldest timestamp at or after :paramref:`since` and the
+         number of entries at or after :paramref:`since`
+        """
+        idx = bisect_left(self.timestamps, since, self.start)
+        count = len(self.timestamps) - idx
+        return (self.timestamps[idx] if count else None), count
+
+    def trim(self, before: float) -> None:
+        """
+        Drop all entries older than :paramref:`before`
+        """
+        self.start = bisect_left(self.timestamps, before, self.start)
+        self.compact()
+
+    def compact(self) -> None:
+        if self.start and self.start >= len(self.timestamps) // 2:
+            del self.timestamps[: self.start]
+            self.start = 0
 
 
 class MemoryStorage(
-    Storage, MovingWindowSupport, SlidingWindowCounterSupport, TimestampedSlidingWindow
+    Storage,
+    MovingWindowSupport,
+    SlidingWindowCounterSupport,
+    GCRASupport,
+    TimestampedSlidingWindow,
 ):
     """
     rate limit storage using :class:`collections.Counter`
     as an in memory storage for fixed and sliding window strategies,
-    and a simple list to implement moving window strategy.
+    a compact array of timestamps per key to implement the
+    moving window strategy and a single theoretical arrival time
+    per key for the gcra strategy.
 
     """
 
     STORAGE_SCHEME = ["memory"]
 
-    def __init__(self, uri: str | None = None, wrap_exceptions: bool = False, **_: str):
+    DEFAULT_LOCK_STRIPES = 64
+    """The default number of locks shared by all keys of the storage"""
+
+    def __init__(
+        self,
+        uri: str | None = None,
+        wrap_exceptions: bool = False,
+        lock_stripes: int = DEFAULT_LOCK_STRIPES,
+        max_keys: int | None = None,
+        clock: Clock | None = None,
+        **_: str,
+    ):
+        """
+        :param uri: ``memory://``, optionally with the ``lock_stripes`` and
+         ``max_keys`` query parameters (e.g. ``memory://?max_keys=100000``)
+        :param wrap_exceptions: Whether to wrap storage exceptions in
+         :exc:`limits.errors.StorageError` before raising it.
+        :param lock_stripes: The size of the fixed table of locks that keys
+         are mapped to by hash. A larger table reduces contention between
+         unrelated keys at the cost of memory.
+        :param max_keys: If set, the maximum number of rate limit keys
+         held by the storage. Once the limit is reached the least recently
+         used keys are evicted (and counted in :attr:`evictions`) to make
+         room for new ones.
+        :param clock: The source of the current time of the storage, which
+         defaults to the system time
+        :raise ConfigurationError: if :paramref:`lock_stripes` or
+         :paramref:`max_keys` are not positive integers
+        """
         self.storage: limits.typing.Counter[str] = Counter()
-        self.locks: defaultdict[str, threading.RLock] = defaultdict(threading.RLock)
+        self.lock_stripes = (
+            parse_option(uri, "lock_stripes", lock_stripes) or lock_stripes
+        )
+        self.max_keys = parse_option(uri, "max_keys", max_keys)
+        self.clock: Clock = clock or SystemClock()
+        self.evictions = 0
+        """The number of keys evicted because :attr:`max_keys` was reached"""
+        self._recency: OrderedDict[str, None] = OrderedDict()
+        self._recency_lock = threading.Lock()
+        self.locks: tuple[threading.RLock, ...] = tuple(
+            threading.RLock() for _ in range(self.lock_stripes)
+        )
         self.expirations: dict[str, float] = {}
-        self.events: dict[str, list[Entry]] = {}
-        self.timer: threading.Timer = threading.Timer(0.01, self.__expire_events)
-        self.timer.start()
+        self.events: dict[str, TimestampRing] = {}
+        self.tats: dict[str, int] = {}
+        self.__start_expiry_thread([])
         super().__init__(uri, wrap_exceptions=wrap_exceptions, **_)
 
     def __getstate__(self) -> dict[str, limits.typing.Any]:  # type: ignore[explicit-any]
         state = self.__dict__.copy()
         del state["timer"]
         del state["locks"]
+        del state["_expiry_condition"]
+        del state["_recency_lock"]
         return state
 
     def __setstate__(self, state: dict[str, limits.typing.Any]) -> None:  # type: ignore[explicit-any]
         self.__dict__.update(state)
-        self.locks = defaultdict(threading.RLock)
-        self.timer = threading.Timer(0.01, self.__expire_events)
+        self.locks = tuple(threading.RLock() for _ in range(self.lock_stripes))
+        self._recency_lock = threading.Lock()
+        self.__start_expiry_thread(self._expiry_heap)
+
+    def __start_expiry_thread(self, heap: list[tuple[float, str]]) -> None:
+        """
+        Start the background thread that drains :attr:`_expiry_heap`.
+
+        The thread only holds a weak reference to the storage so that it
+        exits once the storage is garbage collected.
+        """
+        self._expiry_heap = heap
+        self._expiry_condition = threading.Condition()
+        self.timer = threading.Thread(
+            target=self._expiry_loop,
+            args=(
+                weakref.ref(self),
+                self._expiry_heap,
+                self._expiry_condition,
+                self.clock,
+            ),
+            name="limits-memory-expiry",
+            daemon=True,
+        )
+        weakref.finalize(self, self._notify_expiry_thread, self._expiry_condition)
         self.timer.start()
 
+    @staticmethod
+    def _notify_expiry_thread(condition: threading.Condition) -> None:
+        with condition:
+            condition.notify()
+
+    @staticmethod
+    def _expiry_loop(
+        storage_ref: weakref.ReferenceType[MemoryStorage],
+        heap: list[tuple[float, str]],
+        condition: threading.Condition,
+        clock: Clock,
+    ) -> None:
+        while True:
+            with condition:
+                while storage_ref() is not None and (
+                    not heap or heap[0][0] > clock.time()
+                ):
+                    condition.wait(heap[0][0] - clock.time() if heap else None)
+            if not (storage := storage_ref()):
+                return
+            storage.__expire_events()
+            del storage
+
     def __expire_events(self) -> None:
-        for key in list(self.events.keys()):
-            with self.locks[key]:
-                for event in list(self.events[key]):
-                    if event.expiry <= time.time() and event in self.events[key]:
-                        self.events[key].remove(event)
-                if not self.events.get(key, None):
-                    self.locks.pop(key, None)
-        for key in list(self.expirations.keys()):
-            if self.expirations[key] <= time.time():
-                self.storage.pop(key, None)
-                self.expirations.pop(key, None)
-                self.locks.pop(key, None)
-
-    def __schedule_expiry(self) -> None:
-        if not self.timer.is_alive():
-            self.timer = threading.Timer(0.01, self.__expire_events)
-            self.timer.start()
+        now = self.clock.time()
+        expired: list[str] = []
+        with self._expiry_condition:
+            while self._expiry_heap and self._expiry_heap[0][0] <= now:
+                expired.append(heapq.heappop(self._expiry_heap)[1])
+        for key in expired:
+            with self._lock_for(key):
+                if key in self.events:
+                    events = self.events[key]
+                    events.trim(now - events.expiry)
+                    if events:
+                        self.__schedule_expiry(key, events.oldest + events.expiry)
+                    else:
+                        self.events.pop(key, None)
+                if self.expirations.get(key, now + 1) <= now:
+                    self.storage.pop(key, None)
+                    self.expirations.pop(key, None)
+                if key in self.tats:
+                    if self.tats[key] <= now * 1_000_000:
+                        self.tats.pop(key)
+                    else:
+                        self.__schedule_expiry(key, self.tats[key] / 1_000_000)
+                if (
+                    key not in self.events
+                    and key not in self.expirations
+                    and key not in self.tats
+                ):
+                    self.__untrack(key)
+
+    def __schedule_expiry(self, key: str, expiry: float) -> None:
+        """
+        Add :paramref:`key` to the expiry index so that it is revisited
+        by the expiry thread at :paramref:`expiry` (a timestamp)
+        """
+        entry = (expiry, key)
+        with self._expiry_condition:
+            heapq.heappush(self._expiry_heap, entry)
+            if self._expiry_heap[0] is entry:
+                self._expiry_condition.notify()
+
+    def _lock_for(self, key: str) -> threading.RLock:
+        return self.locks[hash(key) % self.lock_stripes]
+
+    @contextmanager
+    def _locks_for(self, keys: Iterable[str]) -> Iterator[None]:
+        """
+        Hold the locks of all of :paramref:`keys` at once. The stripes are
+        acquired in index order so that concurrent multi key operations
+        can't deadlock.
+        """
+        with ExitStack() as stack:
+            for stripe in sorted({hash(key) % self.lock_stripes for key in keys}):
+                stack.enter_context(self.locks[stripe])
+            yield
+
+    def __track(self, key: str) -> None:
+        """
+        Mark :paramref:`key` as the most recently used key and evict the
+        least recently used keys if there are more than :attr:`max_keys`.
+
+        Must not be called while holding a key lock.
+        """
+        if self.max_keys is None:
+            return
+        with self._recency_lock:
+            if key in self._recency:
+                self._recency.move_to_end(key)
+                return
+            self._recency[key] = None
+            victims = []
+            while len(self._recency) > self.max_keys:
+                victims.append(self._recency.popitem(last=False)[0])
+            self.evictions += len(victims)
+        for victim in victims:
+            with self._lock_for(victim):
+                self.storage.pop(victim, None)
+                self.expirations.pop(victim, None)
+                self.events.pop(victim, None)
+                self.tats.pop(victim, None)
+
+    def __untrack(self, key: str) -> None:
+        if self.max_keys is not None:
+            with self._recency_lock:
+                self._recency.pop(key, None)
 
     @property
     def base_exceptions(
@@ -87,13 +362,43 @@ class MemoryStorage(
         :param amount: the number to increment by
         """
         self.get(key)
-        self.__schedule_expiry()
-        with self.locks[key]:
-            self.storage[key] += amount
-            if self.storage[key] == amount:
-                self.expirations[key] = time.time() + expiry
+        self.__track(key)
+        with self._lock_for(key):
+            self.__incr(key, expiry, amount)
         return self.storage.get(key, 0)
 
+    def __incr(self, key: str, expiry: float, amount: int) -> None:
+        self.storage[key] += amount
+        if self.storage[key] == amount:
+            self.expirations[key] = self.clock.time() + expiry
+            self.__schedule_expiry(key, self.expirations[key])
+
+    def incr_all(
+        self, entries: limits.typing.Sequence[tuple[str, int, int]], amount: int = 1
+    ) -> bool:
+        """
+        increments the counters for multiple rate limit keys only if none
+        of them would exceed its limit, while holding the locks of all the
+        keys
+
+        :param entries: ``(key, limit, expiry)`` tuples
+        :param amount: the number to increment each counter by
+        :return: ``True`` if all the counters were incremented
+        """
+        with self._locks_for(key for key, _, _ in entries):
+            pending: limits.typing.Counter[str] = Counter()
+            for key, limit, _ in entries:
+                pending[key] += amount
+                if self.get(key) + pending[key] > limit:
+                    return False
+            for key, _, expiry in entries:
+                self.__incr(key, expiry, amount)
+        # evicting takes the victims' locks, so keys are only tracked
+        # once all the locks have been released
+        for key, _, _ in entries:
+            self.__track(key)
+        return True
+
     def decr(self, key: str, amount: int = 1) -> int:
         """
         decrements the counter for a given rate limit key
@@ -102,8 +407,7 @@ class MemoryStorage(
         :param amount: the number to decrement by
         """
         self.get(key)
-        self.__schedule_expiry()
-        with self.locks[key]:
+        with self._lock_for(key):
             self.storage[key] = max(self.storage[key] - amount, 0)
 
         return self.storage.get(key, 0)
@@ -113,10 +417,9 @@ class MemoryStorage(
         :param key: the key to get the counter value for
         """
 
-        if self.expirations.get(key, 0) <= time.time():
+        if self.expirations.get(key, 0) <= self.clock.time():
             self.storage.pop(key, None)
             self.expirations.pop(key, None)
-            self.locks.pop(key, None)
 
         return self.storage.get(key, 0)
 
@@ -127,7 +430,8 @@ class MemoryStorage(
         self.storage.pop(key, None)
         self.expirations.pop(key, None)
         self.events.pop(key, None)
-        self.locks.pop(key, None)
+        self.tats.pop(key, None)
+        self.__untrack(key)
 
     def acquire_entry(self, key: str, limit: int, expiry: int, amount: int = 1) -> bool:
         """
@@ -139,27 +443,60 @@ class MemoryStorage(
         if amount > limit:
             return False
 
-        self.__schedule_expiry()
-        with self.locks[key]:
-            self.events.setdefault(key, [])
-            timestamp = time.time()
-            try:
-                entry = self.events[key][limit - amount]
-            except IndexError:
-                entry = None
+        self.__track(key)
+        with self._lock_for(key):
+            if key not in self.events:
+                self.events[key] = TimestampRing(expiry)
+                self.__schedule_expiry(key, self.clock.time() + expiry)
+            return self.events[key].acquire(self.clock.time(), limit, amount)
 
-            if entry and entry.atime >= timestamp - expiry:
-                return False
-            else:
-                self.events[key][:0] = [Entry(expiry) for _ in range(amount)]
-                return True
+    def acquire_all_entries(
+        self, entries: limits.typing.Sequence[tuple[str, int, int]], amount: int = 1
+    ) -> bool:
+        """
+        Acquire :paramref:`amount` entries in multiple moving windows only
+        if all of them have room for them, while holding the locks of all
+        the keys
+
+        :param entries: ``(key, limit, expiry)`` tuples
+        :param amount: the number of entries to acquire in each window
+        :return: ``True`` if the entries were acquired in all the windows
+        """
+        with self._locks_for(key for key, _, _ in entries):
+            timestamp = self.clock.time()
+            pending: limits.typing.Counter[str] = Counter()
+            for key, limit, _ in entries:
+                pending[key] += amount
+                if pending[key] > limit or (
+                    key in self.events
+                    and not self.events[key].admits(timestamp, limit, pending[key])
+                ):
+                    return False
+            for key, limit, expiry in entries:
+                if key not in self.events:
+                    self.events[key] = TimestampRing(expiry)
+                    self.__schedule_expiry(key, timestamp + expiry)
+                self.events[key].acquire(timestamp, limit, amount)
+        for key, _, _ in entries:
+            self.__track(key)
+        return True
+
+    def release_entry(self, key: str, expiry: int, amount: int = 1) -> None:
+        """
+        :param key: rate limit key to release the entries of
+        :param expiry: expiry of the entries
+        :param amount: the number of entries to release
+        """
+        with self._lock_for(key):
+            if events := self.events.get(key):
+                events.release(amount)
 
     def get_expiry(self, key: str) -> float:
         """
         :param key: the key to get the expiry for
         """
 
-        return self.expirations.get(key, time.time())
+        return self.expirations.get(key, self.clock.time())
 
     def get_num_acquired(self, key: str, expiry: int) -> int:
         """
@@ -168,13 +505,9 @@ class MemoryStorage(
         :param key: rate limit key to acquire an entry in
         :param expiry: expiry of the entry
         """
-        timestamp = time.time()
-
-        return (
-            len([k for k in self.events.get(key, []) if k.atime >= timestamp - expiry])
-            if self.events.get(key)
-            else 0
-        )
+        if not (events := self.events.get(key)):
+            return 0
+        return events.window(self.clock.time() - expiry)[1]
 
     def get_moving_window(self, key: str, limit: int, expiry: int) -> tuple[float, int]:
         """
@@ -185,14 +518,13 @@ class MemoryStorage(
         :param expiry: expiry of entry
         :return: (start of window, number of acquired entries)
         """
-        timestamp = time.time()
-        acquired = self.get_num_acquired(key, expiry)
-
-        for item in self.events.get(key, [])[::-1]:
-            if item.atime >= timestamp - expiry:
-                return item.atime, acquired
+        timestamp = self.clock.time()
+        if events := self.events.get(key):
+            oldest, acquired = events.window(timestamp - expiry)
+            if oldest is not None:
+                return oldest, acquired
 
-        return timestamp, acquired
+        return timestamp, 0
 
     def acquire_sliding_window_entry(
         self,
@@ -203,7 +535,7 @@ class MemoryStorage(
     ) -> bool:
         if amount > limit:
             return False
-        now = time.time()
+        now = self.clock.time()
         previous_key, current_key = self.sliding_window_keys(key, expiry, now)
         (
             previous_count,
@@ -227,6 +559,56 @@ class MemoryStorage(
                 return False
             return True
 
+    def acquire_all_sliding_window_entries(
+        self, entries: limits.typing.Sequence[tuple[str, int, int]], amount: int = 1
+    ) -> bool:
+        """
+        Acquire :paramref:`amount` entries in multiple sliding windows only
+        if the weighted count of every window stays within its limit, while
+        holding the locks of all the keys
+
+        :param entries: ``(key, limit, expiry)`` tuples
+        :param amount: the number of entries to acquire in each window
+        :return: ``True`` if the entries were acquired in all the windows
+        """
+        now = self.clock.time()
+        window_keys = [
+            self.sliding_window_keys(key, expiry, now) for key, _, expiry in entries
+        ]
+        with self._locks_for(key for keys in window_keys for key in keys):
+            pending: limits.typing.Counter[str] = Counter()
+            for (previous_key, current_key), (_, limit, expiry) in zip(
+                window_keys, entries
+            ):
+                pending[current_key] += amount
+                (
+                    previous_count,
+                    previous_ttl,
+                    current_count,
+                    _,
+                ) = self._get_sliding_window_info(
+                    previous_key, current_key, expiry, now
+                )
+                weighted_count = previous_count * previous_ttl / expiry + current_count
+                if floor(weighted_count) + pending[current_key] > limit:
+                    return False
+            for (_, current_key), (_, _, expiry) in zip(window_keys, entries):
+                self.__incr(current_key, 2 * expiry, amount)
+        for _, current_key in window_keys:
+            self.__track(current_key)
+        return True
+
+    def release_sliding_window_entry(
+        self, key: str, expiry: int, amount: int = 1
+    ) -> None:
+        """
+        :param key: rate limit key to release the entries of
+        :param expiry: expiry of the entries
+        :param amount: the number of entries to release
+        """
+        _, current_key = self.sliding_window_keys(key, expiry, self.clock.time())
+        self.decr(current_key, amount)
+
     def _get_sliding_window_info(
         self,
         previous_key: str,
@@ -246,10 +628,87 @@ class MemoryStorage(
     def get_sliding_window(
         self, key: str, expiry: int
     ) -> tuple[int, float, int, float]:
-        now = time.time()
+        now = self.clock.time()
         previous_key, current_key = self.sliding_window_keys(key, expiry, now)
         return self._get_sliding_window_info(previous_key, current_key, expiry, now)
 
+    def acquire_gcra_entry(
+        self, key: str, limit: int, expiry: int, amount: int = 1
+    ) -> bool:
+        """
+        :param key: rate limit key to acquire an entry in
+        :param limit: amount of entries allowed
+        :param expiry: expiry of the entry
+        :param amount: the number of entries to acquire
+        """
+        acquired, _ = self.acquire_gcra_entry_with_tat(key, limit, expiry, amount)
+        return acquired
+
+    def acquire_gcra_entry_with_tat(
+        self, key: str, limit: int, expiry: int, amount: int = 1
+    ) -> tuple[bool, int]:
+        """
+        :param key: rate limit key to acquire an entry in
+        :param limit: amount of entries allowed
+        :param expiry: expiry of the entry
+        :param amount: the number of entries to acquire
+        :return: whether the entries were acquired and the theoretical
+         arrival time of :paramref:`key` after the attempt
+        """
+        interval = self.emission_interval(limit, expiry)
+        self.__track(key)
+        with self._lock_for(key):
+            now = int(self.clock.time() * 1_000_000)
+            tat = max(self.tats.get(key, now), now) + amount * interval
+            if tat - now > limit * interval:
+                return False, self.tats.get(key, 0)
+            self.__set_tat(key, tat)
+            return True, tat
+
+    def acquire_all_gcra_entries(
+        self, entries: limits.typing.Sequence[tuple[str, int, int]], amount: int = 1
+    ) -> bool:
+        """
+        Acquire :paramref:`amount` entries for multiple keys only if all of
+        them allow it, while holding the locks of all the keys
+
+        :param entries: ``(key, limit, expiry)`` tuples
+        :param amount: the number of entries to acquire for each key
+        :return: ``True`` if the entries were acquired for all the keys
+        """
+        with self._locks_for(key for key, _, _ in entries):
+            now = int(self.clock.time() * 1_000_000)
+            tats: dict[str, int] = {}
+            for key, limit, expiry in entries:
+                interval = self.emission_interval(limit, expiry)
+                tat = max(tats.get(key, self.tats.get(key, now)), now) + (
+                    amount * interval
+                )
+                if tat - now > limit * interval:
+                    return False
+                tats[key] = tat
+            for key, tat in tats.items():
+                self.__set_tat(key, tat)
+        for key in tats:
+            self.__track(key)
+        return True
+
+    def __set_tat(self, key: str, tat: int) -> None:
+        if key not in self.tats:
+            # the expiry thread reschedules the key if its arrival
+            # time has moved on by the time it is revisited
+            self.__schedule_expiry(key, tat / 1_000_000)
+        self.tats[key] = tat
+
+    def get_gcra_tat(self, key: str) -> int:
+        """
+        :param key: the rate limit key
+        :return: the theoretical arrival time of :paramref:`key` in
+         microseconds since the epoch or ``0`` if the key does not exist
+        """
+        tat = self.tats.get(key, 0)
+        return tat if tat > int(self.clock.time() * 1_000_000) else 0
+
     def check(self) -> bool:
         """
         check if storage is healthy
@@ -258,9 +717,13 @@ class MemoryStorage(
         return True
 
     def reset(self) -> int | None:
-        num_items = max(len(self.storage), len(self.events))
+        num_items = max(len(self.storage), len(self.events), len(self.tats))
         self.storage.clear()
         self.expirations.clear()
         self.events.clear()
-        self.locks.clear()
+        self.tats.clear()
+        with self._expiry_condition:
+            self._expiry_heap.clear()
+        with self._recency_lock:
+            self._recency.clear()
         return num_items
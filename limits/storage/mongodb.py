@@ -3,22 +3,37 @@ from __future__ import annotations
 import datetime
 import time
 from abc import ABC, abstractmethod
+from functools import cached_property
 
 from deprecated.sphinx import versionadded, versionchanged
 
+from limits.errors import ConfigurationError
 from limits.typing import (
+    Literal,
     MongoClient,
     MongoCollection,
     MongoDatabase,
+    Sequence,
+    TypeAlias,
     cast,
 )
 
 from ..util import get_dependency
-from .base import MovingWindowSupport, SlidingWindowCounterSupport, Storage
+from .base import (
+    GCRASupport,
+    MovingWindowSupport,
+    SlidingWindowCounterSupport,
+    Storage,
+)
+
+#: The filter & update of an ``updateOne`` command
+MongoOperation: TypeAlias = (
+    "tuple[dict[str, object], dict[str, object] | list[dict[str, object]]]"
+)
 
 
 class MongoDBStorageBase(
-    Storage, MovingWindowSupport, SlidingWindowCounterSupport, ABC
+    Storage, MovingWindowSupport, SlidingWindowCounterSupport, GCRASupport, ABC
 ):
     """
     Rate limit storage with MongoDB as backend.
@@ -35,6 +50,10 @@ class MongoDBStorageBase(
         counter_collection_name: str = "counters",
         window_collection_name: str = "windows",
         wrap_exceptions: bool = False,
+        moving_window_engine: Literal["array", "pairs"] = "array",
+        clock: Literal["client", "server"] = "client",
+        write_concern: dict[str, int | str | bool] | None = None,
+        read_preference: str | None = None,
         **options: int | str | bool,
     ) -> None:
         """
@@ -45,12 +64,43 @@ class MongoDBStorageBase(
         :param counter_collection_name: The collection name to use for individual counters
          used in fixed window strategies
         :param window_collection_name: The collection name to use for sliding & moving window
-         storage
+         and gcra storage
         :param wrap_exceptions: Whether to wrap storage exceptions in
          :exc:`limits.errors.StorageError` before raising it.
+        :param moving_window_engine: How the entries of the
+         :ref:`strategies:moving window` strategy are stored in the window
+         documents:
+
+         - ``array``: one array element per unit of cost, trimmed to the limit
+         - ``pairs``: one ``{t: timestamp, n: cost}`` element per hit, which
+           keeps the documents (and the aggregations reading them) small for
+           large limits and costs. Documents written by one engine can't be
+           read by the other.
+        :param clock: The clock used for the timestamps of the
+         :ref:`strategies:moving window` entries, the expiry of the counters
+         and the :ref:`strategies:gcra` arrival times. ``client`` (the default)
+         uses the time of the application while ``server`` uses the time of
+         the MongoDB server (``$$NOW``), which keeps limits shared by
+         several hosts consistent regardless of the drift between their clocks.
+        :param write_concern: The arguments of the
+         :class:`~pymongo.write_concern.WriteConcern` used by the updates of
+         the rate limit collections (e.g. ``{"w": 1, "j": False}``) instead of
+         the one of the client. The write concern must be acknowledged
+         (i.e. not ``{"w": 0}``) since the storage relies on the result of
+         the updates (e.g. the duplicate key error of a rejected upsert) to
+         enforce the limits.
+        :param read_preference: The name of the
+         :class:`~pymongo.read_preferences.ReadPreference` used by the queries
+         that don't update the rate limit collections (e.g.
+         ``secondaryPreferred``) instead of the one of the client. These
+         include the ones made by ``test`` & ``get_window_stats`` which may
+         then see counts that lag behind the primary.
         :param options: all remaining keyword arguments are passed to the
          constructor of :class:`~pymongo.mongo_client.MongoClient`
         :raise ConfigurationError: when the :pypi:`pymongo` library is not available
+         or :paramref:`moving_window_engine`, :paramref:`clock`,
+         :paramref:`write_concern` or :paramref:`read_preference` are not
+         supported
         """
 
         super().__init__(uri, wrap_exceptions=wrap_exceptions, **options)
@@ -64,6 +114,36 @@ class MongoDBStorageBase(
         self._storage_uri = uri
         self._storage_options = options
         self._storage: MongoClient | None = None
+        if moving_window_engine not in ("array", "pairs"):
+            raise ConfigurationError(
+                f"Unsupported moving window engine: {moving_window_engine}"
+            )
+        self.moving_window_engine = moving_window_engine
+        if clock not in ("client", "server"):
+            raise ConfigurationError(f"Unsupported clock: {clock}")
+        self.clock = clock
+        try:
+            self._write_concern = (
+                self.lib.WriteConcern(**write_concern) if write_concern else None
+            )
+        except (TypeError, ValueError, self.lib_errors.ConfigurationError) as err:
+            raise ConfigurationError(f"Unsupported write concern: {err}") from err
+        if self._write_concern is not None and not self._write_concern.acknowledged:
+            # the limits are enforced by the errors returned for the updates
+            raise ConfigurationError("Unacknowledged write concerns are not supported")
+        try:
+            self._read_preference = (
+                self.lib.read_preferences.make_read_preference(
+                    self.lib.read_preferences.read_pref_mode_from_name(read_preference),
+                    None,
+                )
+                if read_preference
+                else None
+            )
+        except ValueError as err:
+            raise ConfigurationError(
+                f"Unsupported read preference: {read_preference}"
+            ) from err
 
     @property
     def storage(self) -> MongoClient:
@@ -78,13 +158,25 @@ class MongoDBStorageBase(
     def _database(self) -> MongoDatabase:
         return self.storage[self._database_name]
 
-    @property
+    @cached_property
     def counters(self) -> MongoCollection:
-        return self._database[self._collection_mapping["counters"]]
+        return self._database.get_collection(
+            self._collection_mapping["counters"], write_concern=self._write_concern
+        )
 
-    @property
+    @cached_property
     def windows(self) -> MongoCollection:
-        return self._database[self._collection_mapping["windows"]]
+        return self._database.get_collection(
+            self._collection_mapping["windows"], write_concern=self._write_concern
+        )
+
+    @cached_property
+    def _counters_for_reads(self) -> MongoCollection:
+        return self.counters.with_options(read_preference=self._read_preference)
+
+    @cached_property
+    def _windows_for_reads(self) -> MongoCollection:
+        return self.windows.with_options(read_preference=self._read_preference)
 
     @abstractmethod
     def _init_mongo_client(
@@ -123,7 +215,7 @@ class MongoDBStorageBase(
         """
         :param key: the key to get the expiry for
         """
-        counter = self.counters.find_one({"_id": key})
+        counter = self._counters_for_reads.find_one({"_id": key})
         return (
             (counter["expireAt"] if counter else datetime.datetime.now())
             .replace(tzinfo=datetime.timezone.utc)
@@ -134,16 +226,63 @@ class MongoDBStorageBase(
         """
         :param key: the key to get the counter value for
         """
-        counter = self.counters.find_one(
+        counter = self._counters_for_reads.find_one(
             {
                 "_id": key,
-                "expireAt": {"$gte": datetime.datetime.now(datetime.timezone.utc)},
+                **self._unexpired(),
             },
             projection=["count"],
         )
 
         return counter and counter["count"] or 0
 
+    def get_counts(self, keys: Sequence[str]) -> list[int]:
+        """
+        :param keys: the keys to get the counter values for
+        """
+        counts = {
+            counter["_id"]: counter["count"]
+            for counter in self._counters_for_reads.find(
+                {
+                    "_id": {"$in": list(keys)},
+                    **self._unexpired(),
+                },
+                projection=["count"],
+            )
+        }
+        return [counts.get(key, 0) for key in keys]
+
+    def _unexpired(self) -> dict[str, object]:
+        """
+        The filter matching the counters that haven't expired
+        """
+        if self.clock == "server":
+            return {"$expr": {"$gte": ["$expireAt", "$$NOW"]}}
+        return {"expireAt": {"$gte": datetime.datetime.now(datetime.timezone.utc)}}
+
+    def _expiration(self, expiry: int) -> datetime.datetime | dict[str, object]:
+        """
+        The expiry time of a document written now (an aggregation
+        expression with the ``server`` :paramref:`clock`)
+        """
+        if self.clock == "server":
+            return {"$add": ["$$NOW", expiry * 1000]}
+        return datetime.datetime.now(datetime.timezone.utc) + datetime.timedelta(
+            seconds=expiry
+        )
+
+    def _timestamp(
+        self, timestamp: float, offset: float = 0
+    ) -> float | dict[str, object]:
+        """
+        :paramref:`timestamp` (in seconds) shifted by :paramref:`offset`, or an
+        aggregation expression evaluating to the time of the server shifted by
+        :paramref:`offset` with the ``server`` :paramref:`clock`
+        """
+        if self.clock == "server":
+            return {"$add": [{"$divide": [{"$toLong": "$$NOW"}, 1000]}, offset]}
+        return timestamp + offset
+
     def incr(self, key: str, expiry: int, amount: int = 1) -> int:
         """
         increments the counter for a given rate limit key
@@ -152,39 +291,79 @@ class MongoDBStorageBase(
         :param expiry: amount in seconds for the key to expire in
         :param amount: the number to increment by
         """
-        expiration = datetime.datetime.now(datetime.timezone.utc) + datetime.timedelta(
-            seconds=expiry
+        return self.incr_with_expiry(key, expiry, amount)[0]
+
+    def incr_with_expiry(
+        self, key: str, expiry: int, amount: int = 1
+    ) -> tuple[int, float]:
+        """
+        increments the counter for a given rate limit key and returns it
+        along with the time at which it expires, in a single
+        ``findOneAndUpdate`` command
+
+        :param key: the key to increment
+        :param expiry: amount in seconds for the key to expire in
+        :param amount: the number to increment by
+        :return: (value of the counter after the increment, expiry time)
+        """
+        counter = self.counters.find_one_and_update(
+            {"_id": key},
+            self._incr_update(expiry, amount),
+            upsert=True,
+            projection=["count", "expireAt"],
+            return_document=self.lib.ReturnDocument.AFTER,
         )
 
-        return int(
-            self.counters.find_one_and_update(
-                {"_id": key},
-                [
-                    {
-                        "$set": {
-                            "count": {
-                                "$cond": {
-                                    "if": {"$lt": ["$expireAt", "$$NOW"]},
-                                    "then": amount,
-                                    "else": {"$add": ["$count", amount]},
-                                }
-                            },
-                            "expireAt": {
-                                "$cond": {
-                                    "if": {"$lt": ["$expireAt", "$$NOW"]},
-                                    "then": expiration,
-                                    "else": "$expireAt",
-                                }
-                            },
+        return int(counter["count"]), counter["expireAt"].replace(
+            tzinfo=datetime.timezone.utc
+        ).timestamp()
+
+    def _incr_update(self, expiry: int, amount: int) -> list[dict[str, object]]:
+        """
+        The update pipeline incrementing a counter, or restarting it if it
+        has expired
+        """
+        expiration = self._expiration(expiry)
+        return [
+            {
+                "$set": {
+                    "count": {
+                        "$cond": {
+                            "if": {"$lt": ["$expireAt", "$$NOW"]},
+                            "then": amount,
+                            "else": {"$add": ["$count", amount]},
                         }
                     },
-                ],
-                upsert=True,
-                projection=["count"],
-                return_document=self.lib.ReturnDocument.AFTER,
-            )["count"]
+                    "expireAt": {
+                        "$cond": {
+                            "if": {"$lt": ["$expireAt", "$$NOW"]},
+                            "then": expiration,
+                            "else": "$expireAt",
+                        }
+                    },
+                }
+            },
+        ]
+
+    @versionadded(version="4.7")
+    def decr(self, key: str, amount: int = 1) -> int:
+        """
+        decrements the counter for a given rate limit key without going
+        below zero or changing its expiry. A counter that doesn't exist
+        or has expired is left as is.
+
+        :param key: the key to decrement
+        :param amount: the number to decrement by
+        """
+        counter = self.counters.find_one_and_update(
+            {"_id": key, **self._unexpired()},
+            [{"$set": {"count": {"$max": [0, {"$subtract": ["$count", amount]}]}}}],
+            projection=["count"],
+            return_document=self.lib.ReturnDocument.AFTER,
         )
 
+        return counter and counter["count"] or 0
+
     def check(self) -> bool:
         """
         Check if storage is healthy by calling :meth:`pymongo.mongo_client.MongoClient.server_info`
@@ -206,35 +385,36 @@ class MongoDBStorageBase(
         :return: (start of window, number of acquired entries)
         """
         timestamp = time.time()
-        result = list(
-            self.windows.aggregate(
-                [
-                    {"$match": {"_id": key}},
-                    {
-                        "$project": {
-                            "entries": {
-                                "$filter": {
-                                    "input": "$entries",
-                                    "as": "entry",
-                                    "cond": {"$gte": ["$$entry", timestamp - expiry]},
-                                }
-                            }
-                        }
-                    },
-                    {"$unwind": "$entries"},
-                    {
-                        "$group": {
-                            "_id": "$_id",
-                            "min": {"$min": "$entries"},
-                            "count": {"$sum": 1},
-                        }
-                    },
-                ]
-            )
+        start = self._timestamp(timestamp, -expiry)
+        if self.moving_window_engine == "pairs":
+            entries = {
+                "$filter": {
+                    "input": {"$ifNull": ["$entries", []]},
+                    "cond": {"$gte": ["$$this.t", start]},
+                }
+            }
+            window = {
+                "start": {"$min": "$$entries.t"},
+                "count": {"$sum": "$$entries.n"},
+            }
+        else:
+            entries = {
+                "$filter": {
+                    "input": {"$ifNull": ["$entries", []]},
+                    "cond": {"$gte": ["$$this", start]},
+                }
+            }
+            window = {"start": {"$min": "$$entries"}, "count": {"$size": "$$entries"}}
+        result = self._windows_for_reads.find_one(
+            {"_id": key},
+            projection={
+                "_id": False,
+                "window": {"$let": {"vars": {"entries": entries}, "in": window}},
+            },
         )
 
-        if result:
-            return result[0]["min"], result[0]["count"]
+        if result and result["window"]["count"]:
+            return result["window"]["start"], result["window"]["count"]
 
         return timestamp, 0
 
@@ -248,12 +428,142 @@ class MongoDBStorageBase(
         if amount > limit:
             return False
 
-        timestamp = time.time()
         try:
-            updates: dict[
-                str,
-                dict[str, datetime.datetime | dict[str, list[float] | int]],
-            ] = {
+            self.windows.update_one(
+                *self._acquire_entry_operation(key, limit, expiry, amount, time.time()),
+                upsert=True,
+            )
+
+            return True
+        except self.lib.errors.DuplicateKeyError:
+            return False
+
+    def acquire_entries(
+        self, entries: Sequence[tuple[str, int, int, int]]
+    ) -> list[bool]:
+        """
+        acquires the entries in multiple moving windows with a single
+        unordered ``bulkWrite`` command
+
+        :param entries: ``(key, limit, expiry, amount)`` tuples
+        :return: whether each entry was acquired
+        """
+        timestamp = time.time()
+        return self._bulk_acquire(
+            [
+                self._acquire_entry_operation(key, limit, expiry, amount, timestamp)
+                if amount <= limit
+                else None
+                for key, limit, expiry, amount in entries
+            ]
+        )
+
+    def _acquire_entry_operation(
+        self, key: str, limit: int, expiry: int, amount: int, timestamp: float
+    ) -> MongoOperation:
+        """
+        The update acquiring :paramref:`amount` entries in the window of
+        :paramref:`key`. Its filter doesn't match a window without room for
+        them, in which case the upsert is rejected with a duplicate key error.
+
+        With the ``array`` :paramref:`moving_window_engine` the entries are
+        prepended to the window (by an update pipeline with the ``server``
+        :paramref:`clock` since ``$$NOW`` can't be used with the update
+        operators). With the ``pairs`` engine a ``{t: timestamp, n: amount}``
+        pair is appended and the expired pairs are removed.
+        """
+        if self.moving_window_engine == "pairs":
+            start = self._timestamp(timestamp, -expiry)
+            return (
+                {
+                    "_id": key,
+                    "$expr": {
+                        "$lte": [
+                            {
+                                "$reduce": {
+                                    "input": {"$ifNull": ["$entries", []]},
+                                    "initialValue": amount,
+                                    "in": {
+                                        "$add": [
+                                            "$$value",
+                                            {
+                                                "$cond": {
+                                                    "if": {"$gte": ["$$this.t", start]},
+                                                    "then": "$$this.n",
+                                                    "else": 0,
+                                                }
+                                            },
+                                        ]
+                                    },
+                                }
+                            },
+                            limit,
+                        ]
+                    },
+                },
+                [
+                    {
+                        "$set": {
+                            "entries": {
+                                "$concatArrays": [
+                                    {
+                                        "$filter": {
+                                            "input": {"$ifNull": ["$entries", []]},
+                                            "as": "entry",
+                                            "cond": {"$gte": ["$$entry.t", start]},
+                                        }
+                                    },
+                                    [{"t": self._timestamp(timestamp), "n": amount}],
+                                ]
+                            },
+                            "expireAt": self._expiration(expiry),
+                        }
+                    }
+                ],
+            )
+        if self.clock == "server":
+            return (
+                {
+                    "_id": key,
+                    "$expr": {
+                        "$not": {
+                            "$gte": [
+                                {"$arrayElemAt": ["$entries", limit - amount]},
+                                self._timestamp(0, -expiry),
+                            ]
+                        }
+                    },
+                },
+                [
+                    {
+                        "$set": {
+                            "entries": {
+                                "$slice": [
+                                    {
+                                        "$concatArrays": [
+                                            {
+                                                "$map": {
+                                                    "input": {"$range": [0, amount]},
+                                                    "in": self._timestamp(0),
+                                                }
+                                            },
+                                            {"$ifNull": ["$entries", []]},
+                                        ]
+                                    },
+                                    limit,
+                                ]
+                            },
+                            "expireAt": self._expiration(expiry),
+                        }
+                    }
+                ],
+            )
+        return (
+            {
+                "_id": key,
+                f"entries.{limit - amount}": {"$not": {"$gte": timestamp - expiry}},
+            },
+            {
                 "$push": {
                     "entries": {
                         "$each": [timestamp] * amount,
@@ -261,20 +571,156 @@ class MongoDBStorageBase(
                         "$slice": limit,
                     }
                 },
-                "$set": {
-                    "expireAt": (
-                        datetime.datetime.now(datetime.timezone.utc)
-                        + datetime.timedelta(seconds=expiry)
-                    )
-                },
+                "$set": {"expireAt": self._expiration(expiry)},
+            },
+        )
+
+    def _bulk_acquire(self, operations: Sequence[MongoOperation | None]) -> list[bool]:
+        """
+        Execute the acquiring :paramref:`operations` (``None`` for an entry
+        that can't be acquired) with a single unordered ``bulkWrite`` command
+        and map the duplicate key errors of the rejected ones back to their
+        entries
+        """
+        requests = [
+            (index, operation)
+            for index, operation in enumerate(operations)
+            if operation is not None
+        ]
+        acquired = [operation is not None for operation in operations]
+        if not requests:
+            return acquired
+        try:
+            self.windows.bulk_write(
+                [
+                    self.lib.UpdateOne(*operation, upsert=True)
+                    for _, operation in requests
+                ],
+                ordered=False,
+            )
+        except self.lib.errors.BulkWriteError as error:
+            if error.details["writeConcernErrors"] or any(
+                write_error["code"] != 11000
+                for write_error in error.details["writeErrors"]
+            ):
+                raise
+            for write_error in error.details["writeErrors"]:
+                acquired[requests[write_error["index"]][0]] = False
+        return acquired
+
+    def release_entry(self, key: str, expiry: int, amount: int = 1) -> None:
+        """
+        Give back the :paramref:`amount` newest entries of a moving window.
+        With the ``pairs`` :paramref:`moving_window_engine` the counts of the
+        newest pairs are reduced (and the emptied pairs removed), with the
+        ``array`` engine the newest timestamps are sliced off the window.
+
+        :param key: rate limit key to release the entries of
+        :param expiry: expiry of the entries
+        :param amount: the number of entries to release
+        """
+        entries = {"$ifNull": ["$entries", []]}
+        if self.moving_window_engine == "pairs":
+            released: dict[str, object] = {
+                "$let": {
+                    "vars": {
+                        "released": {
+                            "$reduce": {
+                                "input": {"$reverseArray": entries},
+                                "initialValue": {"remaining": amount, "entries": []},
+                                "in": {
+                                    "remaining": {
+                                        "$max": [
+                                            0,
+                                            {
+                                                "$subtract": [
+                                                    "$$value.remaining",
+                                                    "$$this.n",
+                                                ]
+                                            },
+                                        ]
+                                    },
+                                    "entries": {
+                                        "$cond": {
+                                            "if": {
+                                                "$gt": ["$$this.n", "$$value.remaining"]
+                                            },
+                                            "then": {
+                                                "$concatArrays": [
+                                                    [
+                                                        {
+                                                            "t": "$$this.t",
+                                                            "n": {
+                                                                "$subtract": [
+                                                                    "$$this.n",
+                                                                    "$$value.remaining",
+                                                                ]
+                                                            },
+                                                        }
+                                                    ],
+                                                    "$$value.entries",
+                                                ]
+                                            },
+                                            "else": "$$value.entries",
+                                        }
+                                    },
+                                },
+                            }
+                        }
+                    },
+                    "in": "$$released.entries",
+                }
             }
+        else:
+            released = {"$slice": [entries, amount, {"$max": [1, {"$size": entries}]}]}
+        self.windows.update_one({"_id": key}, [{"$set": {"entries": released}}])
 
-            self.windows.update_one(
-                {
-                    "_id": key,
-                    f"entries.{limit - amount}": {"$not": {"$gte": timestamp - expiry}},
+    def acquire_gcra_entry(
+        self, key: str, limit: int, expiry: int, amount: int = 1
+    ) -> bool:
+        """
+        :param key: rate limit key to acquire an entry in
+        :param limit: amount of entries allowed
+        :param expiry: expiry of the entry
+        :param amount: the number of entries to acquire
+        """
+        if amount > limit:
+            return False
+
+        interval = self.emission_interval(limit, expiry)
+        now: int | dict[str, object]
+        if self.clock == "server":
+            now = {"$multiply": [{"$toLong": "$$NOW"}, 1000]}
+            query: dict[str, object] = {
+                "_id": key,
+                "$expr": {
+                    "$not": {
+                        "$gt": ["$tat", {"$add": [now, (limit - amount) * interval]}]
+                    }
                 },
-                updates,
+            }
+        else:
+            now = time.time_ns() // 1000
+            query = {
+                "_id": key,
+                "tat": {"$not": {"$gt": now + (limit - amount) * interval}},
+            }
+        try:
+            self.windows.update_one(
+                query,
+                [
+                    {
+                        "$set": {
+                            "tat": {
+                                "$add": [
+                                    {"$max": [{"$ifNull": ["$tat", now]}, now]},
+                                    amount * interval,
+                                ]
+                            }
+                        }
+                    },
+                    {"$set": {"expireAt": {"$toDate": {"$divide": ["$tat", 1000]}}}},
+                ],
                 upsert=True,
             )
 
@@ -282,6 +728,16 @@ class MongoDBStorageBase(
         except self.lib.errors.DuplicateKeyError:
             return False
 
+    def get_gcra_tat(self, key: str) -> int:
+        """
+        :param key: the rate limit key
+        :return: the theoretical arrival time of :paramref:`key` in
+         microseconds since the epoch or ``0`` if the key does not exist
+        """
+        window = self._windows_for_reads.find_one({"_id": key}, projection=["tat"])
+
+        return window and window.get("tat") or 0
+
     def get_sliding_window(
         self, key: str, expiry: int
     ) -> tuple[int, float, int, float]:
@@ -354,48 +810,110 @@ class MongoDBStorageBase(
     def acquire_sliding_window_entry(
         self, key: str, limit: int, expiry: int, amount: int = 1
     ) -> bool:
+        if amount > limit:
+            return False
+
+        try:
+            self.windows.update_one(
+                *self._acquire_sliding_window_operation(key, limit, expiry, amount),
+                upsert=True,
+            )
+
+            return True
+        except self.lib.errors.DuplicateKeyError:
+            return False
+
+    def acquire_sliding_window_entries(
+        self, entries: Sequence[tuple[str, int, int, int]]
+    ) -> list[bool]:
+        """
+        acquires the entries in multiple sliding windows with a single
+        unordered ``bulkWrite`` command
+
+        :param entries: ``(key, limit, expiry, amount)`` tuples
+        :return: whether each entry was acquired
+        """
+        return self._bulk_acquire(
+            [
+                self._acquire_sliding_window_operation(key, limit, expiry, amount)
+                if amount <= limit
+                else None
+                for key, limit, expiry, amount in entries
+            ]
+        )
+
+    def _acquire_sliding_window_operation(
+        self, key: str, limit: int, expiry: int, amount: int
+    ) -> MongoOperation:
+        """
+        The update adding :paramref:`amount` to the current window of
+        :paramref:`key` (shifting the windows first if the current one has
+        ended). Its filter doesn't match a window whose weighted count leaves
+        no room for :paramref:`amount`, in which case the upsert is rejected
+        with a duplicate key error.
+        """
         expiry_ms = expiry * 1000
-        result = self.windows.find_one_and_update(
-            {"_id": key},
+        ttl = {"$subtract": ["$expireAt", "$$NOW"]}
+        shift = {"$lte": [ttl, expiry_ms]}
+        weighted_count = {
+            "$floor": {
+                "$cond": {
+                    "if": shift,
+                    "then": {
+                        "$multiply": [
+                            {"$ifNull": ["$currentCount", 0]},
+                            {"$divide": [{"$max": [0, ttl]}, expiry_ms]},
+                        ]
+                    },
+                    "else": {
+                        "$add": [
+                            {
+                                "$multiply": [
+                                    {"$ifNull": ["$previousCount", 0]},
+                                    {
+                                        "$divide": [
+                                            {"$subtract": [ttl, expiry_ms]},
+                                            expiry_ms,
+                                        ]
+                                    },
+                                ]
+                            },
+                            {"$ifNull": ["$currentCount", 0]},
+                        ]
+                    },
+                }
+            }
+        }
+        return (
+            {
+                "_id": key,
+                "$expr": {"$lte": [{"$add": [weighted_count, amount]}, limit]},
+            },
             [
                 {
                     "$set": {
                         "previousCount": {
                             "$cond": {
-                                "if": {
-                                    "$lte": [
-                                        {"$subtract": ["$expireAt", "$$NOW"]},
-                                        expiry_ms,
-                                    ]
-                                },
+                                "if": shift,
                                 "then": {"$ifNull": ["$currentCount", 0]},
                                 "else": {"$ifNull": ["$previousCount", 0]},
                             }
                         },
-                    }
-                },
-                {
-                    "$set": {
                         "currentCount": {
-                            "$cond": {
-                                "if": {
-                                    "$lte": [
-                                        {"$subtract": ["$expireAt", "$$NOW"]},
-                                        expiry_ms,
-                                    ]
+                            "$add": [
+                                {
+                                    "$cond": {
+                                        "if": shift,
+                                        "then": 0,
+                                        "else": {"$ifNull": ["$currentCount", 0]},
+                                    }
                                 },
-                                "then": 0,
-                                "else": {"$ifNull": ["$currentCount", 0]},
-                            }
+                                amount,
+                            ]
                         },
                         "expireAt": {
                             "$cond": {
-                                "if": {
-                                    "$lte": [
-                                        {"$subtract": ["$expireAt", "$$NOW"]},
-                                        expiry_ms,
-                                    ]
-                                },
+                                "if": shift,
                                 "then": {
                                     "$cond": {
                                         "if": {"$gt": ["$expireAt", 0]},
@@ -408,76 +926,41 @@ class MongoDBStorageBase(
                         },
                     }
                 },
-                {
-                    "$set": {
-                        "curWeightedCount": {
-                            "$floor": {
-                                "$add": [
-                                    {
-                                        "$multiply": [
-                                            "$previousCount",
-                                            {
-                                                "$divide": [
-                                                    {
-                                                        "$max": [
-                                                            0,
-                                                            {
-                                                                "$subtract": [
-                                                                    "$expireAt",
-                                                                    {
-                                                                        "$add": [
-                                                                            "$$NOW",
-                                                                            expiry_ms,
-                                                                        ]
-                                                                    },
-                                                                ]
-                                                            },
-                                                        ]
-                                                    },
-                                                    expiry_ms,
-                                                ]
-                                            },
-                                        ]
-                                    },
-                                    "$currentCount",
-                                ]
-                            }
-                        }
-                    }
-                },
+            ],
+        )
+
+    def release_sliding_window_entry(
+        self, key: str, expiry: int, amount: int = 1
+    ) -> None:
+        """
+        :param key: rate limit key to release the entries of
+        :param expiry: expiry of the entries
+        :param amount: the number of entries to release
+        """
+        self.windows.update_one(
+            {"_id": key},
+            [
                 {
                     "$set": {
                         "currentCount": {
-                            "$cond": {
-                                "if": {
-                                    "$lte": [
-                                        {"$add": ["$curWeightedCount", amount]},
-                                        limit,
+                            "$max": [
+                                0,
+                                {
+                                    "$subtract": [
+                                        {"$ifNull": ["$currentCount", 0]},
+                                        amount,
                                     ]
                                 },
-                                "then": {"$add": ["$currentCount", amount]},
-                                "else": "$currentCount",
-                            }
-                        }
-                    }
-                },
-                {
-                    "$set": {
-                        "_acquired": {
-                            "$lte": [{"$add": ["$curWeightedCount", amount]}, limit]
+                            ]
                         }
                     }
-                },
-                {"$unset": ["curWeightedCount"]},
+                }
             ],
-            return_document=self.lib.ReturnDocument.AFTER,
-            upsert=True,
         )
-        return cast(bool, result["_acquired"])
 
     def __del__(self) -> None:
-        if self.storage:
-            self.storage.close()
+        if self._storage:
+            self._storage.close()
 
 
 @versionadded(version="2.1")
@@ -485,6 +968,13 @@ class MongoDBStorageBase(
     version="3.14.0",
     reason="Added option to select custom collection names for windows & counters",
 )
+@versionchanged(
+    version="4.7",
+    reason=(
+        "Added the :paramref:`moving_window_engine`, :paramref:`clock`,"
+        " :paramref:`write_concern` & :paramref:`read_preference` arguments"
+    ),
+)
 class MongoDBStorage(MongoDBStorageBase):
     STORAGE_SCHEME = ["mongodb", "mongodb+srv"]
 
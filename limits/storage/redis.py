@@ -1,20 +1,118 @@
 from __future__ import annotations
 
+import hashlib
 import time
-from typing import TYPE_CHECKING, cast
+from collections.abc import Iterator
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Generic, cast
 
-from deprecated.sphinx import versionchanged
+from deprecated.sphinx import versionadded, versionchanged
 from packaging.version import Version
 
-from limits.typing import Literal, RedisClient
+from limits.typing import Any, Callable, Literal, R, RedisClient, Sequence
 
-from ..util import get_package_data
-from .base import MovingWindowSupport, SlidingWindowCounterSupport, Storage
+from ..errors import ConfigurationError
+from ..util import (
+    RedisFunctionLibrary,
+    get_package_data,
+    get_redis_function_library,
+    get_replication_lag,
+)
+from .base import (
+    GCRASupport,
+    MovingWindowSupport,
+    SlidingWindowCounterSupport,
+    Storage,
+)
 
 if TYPE_CHECKING:
     import redis
 
 
+@versionadded(version="4.7")
+class PreloadedScript:
+    """
+    A lua script that is loaded into redis ahead of time by
+    :meth:`RedisStorage.load_scripts` and executed with ``EVALSHA``,
+    without the checks :class:`redis.commands.core.Script` does on
+    every call.
+    """
+
+    def __init__(self, storage: RedisStorage, script: bytes) -> None:
+        self.storage = storage
+        self.script = script
+        self.sha = hashlib.sha1(script).hexdigest()
+
+    #: Whether the script can be executed on a replica
+    readonly: bool = False
+
+    def __call__(  # type: ignore[explicit-any]
+        self,
+        keys: Sequence[str] = (),
+        args: Sequence[float] = (),
+        client: RedisClient | redis.client.Pipeline | None = None,
+    ) -> Any:
+        connection = cast(RedisClient, client or self.storage.get_connection())
+        try:
+            return self.execute(connection, keys, args)
+        except self.storage.no_script_error as error:
+            if not self.storage.is_missing_script(error):
+                raise
+            # the scripts were flushed, for example by a restart or a failover
+            self.storage.load_scripts()
+            return self.execute(connection, keys, args)
+
+    def execute(  # type: ignore[explicit-any]
+        self, connection: RedisClient, keys: Sequence[str], args: Sequence[float]
+    ) -> Any:
+        return connection.evalsha(self.sha, len(keys), *keys, *args)
+
+
+@versionadded(version="4.7")
+class RedisFunction(PreloadedScript):
+    """
+    A lua script installed as a function of the library loaded by
+    :meth:`RedisStorage.load_scripts` and executed with ``FCALL``, or
+    ``FCALL_RO`` if the script doesn't write any keys.
+    """
+
+    def __init__(
+        self, storage: RedisStorage, script: bytes, name: str, readonly: bool
+    ) -> None:
+        super().__init__(storage, script)
+        self.name = name
+        self.readonly = readonly
+
+    def execute(  # type: ignore[explicit-any]
+        self, connection: RedisClient, keys: Sequence[str], args: Sequence[float]
+    ) -> Any:
+        if self.readonly:
+            return connection.fcall_ro(self.name, len(keys), *keys, *args)
+        return connection.fcall(self.name, len(keys), *keys, *args)
+
+
+class PipelinedResult(Generic[R]):
+    """
+    The result of an operation queued in :meth:`RedisStorage.pipeline`,
+    available once the pipeline was executed
+    """
+
+    def __init__(self, transform: Callable[[object], R]) -> None:
+        self.transform = transform
+        self.executed = False
+        self._value: R | None = None
+
+    @property
+    def value(self) -> R:
+        if not self.executed:
+            raise RuntimeError("The pipeline hasn't been executed yet")
+        return cast(R, self._value)
+
+    def set(self, result: object) -> None:
+        self._value = self.transform(result)
+        self.executed = True
+
+
 @versionchanged(
     version="4.3",
     reason=(
@@ -22,7 +120,16 @@ if TYPE_CHECKING:
         " if :paramref:`uri` has the ``valkey://`` schema"
     ),
 )
-class RedisStorage(Storage, MovingWindowSupport, SlidingWindowCounterSupport):
+@versionchanged(
+    version="4.7",
+    reason=(
+        "Added the :paramref:`moving_window_engine`, :paramref:`preload_scripts`,"
+        " :paramref:`use_functions` & :paramref:`clock` arguments"
+    ),
+)
+class RedisStorage(
+    Storage, MovingWindowSupport, SlidingWindowCounterSupport, GCRASupport
+):
     """
     Rate limit storage with redis as backend.
 
@@ -48,27 +155,87 @@ class RedisStorage(Storage, MovingWindowSupport, SlidingWindowCounterSupport):
     SCRIPT_ACQUIRE_MOVING_WINDOW = get_package_data(
         f"{RES_DIR}/acquire_moving_window.lua"
     )
-    SCRIPT_CLEAR_KEYS = get_package_data(f"{RES_DIR}/clear_keys.lua")
     SCRIPT_INCR_EXPIRE = get_package_data(f"{RES_DIR}/incr_expire.lua")
 
     SCRIPT_SLIDING_WINDOW = get_package_data(f"{RES_DIR}/sliding_window.lua")
     SCRIPT_ACQUIRE_SLIDING_WINDOW = get_package_data(
         f"{RES_DIR}/acquire_sliding_window.lua"
     )
+    SCRIPT_INCR_EXPIRE_ALL = get_package_data(f"{RES_DIR}/incr_expire_all.lua")
+    SCRIPT_ACQUIRE_MOVING_WINDOW_ALL = get_package_data(
+        f"{RES_DIR}/acquire_moving_window_all.lua"
+    )
+    SCRIPT_RELEASE_MOVING_WINDOW = get_package_data(
+        f"{RES_DIR}/release_moving_window.lua"
+    )
+    SCRIPT_ACQUIRE_SLIDING_WINDOW_ALL = get_package_data(
+        f"{RES_DIR}/acquire_sliding_window_all.lua"
+    )
+    SCRIPT_MOVING_WINDOW_ZSET = get_package_data(f"{RES_DIR}/moving_window_zset.lua")
+    SCRIPT_ACQUIRE_MOVING_WINDOW_ZSET = get_package_data(
+        f"{RES_DIR}/acquire_moving_window_zset.lua"
+    )
+    SCRIPT_ACQUIRE_MOVING_WINDOW_ALL_ZSET = get_package_data(
+        f"{RES_DIR}/acquire_moving_window_all_zset.lua"
+    )
+    SCRIPT_RELEASE_MOVING_WINDOW_ZSET = get_package_data(
+        f"{RES_DIR}/release_moving_window_zset.lua"
+    )
+    SCRIPT_MOVING_WINDOW_PACKED = get_package_data(
+        f"{RES_DIR}/moving_window_packed.lua"
+    )
+    SCRIPT_ACQUIRE_MOVING_WINDOW_PACKED = get_package_data(
+        f"{RES_DIR}/acquire_moving_window_packed.lua"
+    )
+    SCRIPT_ACQUIRE_MOVING_WINDOW_ALL_PACKED = get_package_data(
+        f"{RES_DIR}/acquire_moving_window_all_packed.lua"
+    )
+    SCRIPT_RELEASE_MOVING_WINDOW_PACKED = get_package_data(
+        f"{RES_DIR}/release_moving_window_packed.lua"
+    )
+    SCRIPT_ACQUIRE_GCRA = get_package_data(f"{RES_DIR}/acquire_gcra.lua")
+    SCRIPT_ACQUIRE_GCRA_ALL = get_package_data(f"{RES_DIR}/acquire_gcra_all.lua")
+    SCRIPT_DECR = get_package_data(f"{RES_DIR}/decr.lua")
 
-    lua_moving_window: redis.commands.core.Script
-    lua_acquire_moving_window: redis.commands.core.Script
-    lua_sliding_window: redis.commands.core.Script
-    lua_acquire_sliding_window: redis.commands.core.Script
+    READONLY_SCRIPTS = (
+        "moving_window",
+        "moving_window_zset",
+        "moving_window_packed",
+    )
+    """The scripts that are registered as read only functions"""
+
+    lua_moving_window: redis.commands.core.Script | PreloadedScript
+    lua_acquire_moving_window: redis.commands.core.Script | PreloadedScript
+    lua_sliding_window: redis.commands.core.Script | PreloadedScript
+    lua_acquire_sliding_window: redis.commands.core.Script | PreloadedScript
+    lua_incr_expire_all: redis.commands.core.Script | PreloadedScript
+    lua_acquire_moving_window_all: redis.commands.core.Script | PreloadedScript
+    lua_acquire_sliding_window_all: redis.commands.core.Script | PreloadedScript
+    lua_release_moving_window: redis.commands.core.Script | PreloadedScript
+    lua_acquire_gcra: redis.commands.core.Script | PreloadedScript
+    lua_acquire_gcra_all: redis.commands.core.Script | PreloadedScript
+    lua_decr: redis.commands.core.Script | PreloadedScript
 
     PREFIX = "LIMITS"
     target_server: Literal["redis", "valkey"]
+    moving_window_engine: Literal["list", "zset", "packed"]
+    clock: Literal["client", "server"] = "client"
+    preload_scripts: bool = False
+    use_functions: bool = False
+    use_replicas: bool = False
+    max_replica_lag: float | None = None
+    _replica_lag_checked_at = float("-inf")
+    _replicas_in_sync = False
 
     def __init__(
         self,
         uri: str,
         connection_pool: redis.connection.ConnectionPool | None = None,
         wrap_exceptions: bool = False,
+        moving_window_engine: Literal["list", "zset", "packed"] = "list",
+        preload_scripts: bool = False,
+        use_functions: bool = False,
+        clock: Literal["client", "server"] = "client",
         **options: float | str | bool,
     ) -> None:
         """
@@ -84,11 +251,45 @@ class RedisStorage(Storage, MovingWindowSupport, SlidingWindowCounterSupport):
          the connection pool and any other params passed as :paramref:`options`
         :param wrap_exceptions: Whether to wrap storage exceptions in
          :exc:`limits.errors.StorageError` before raising it.
+        :param moving_window_engine: How the entries of the
+         :ref:`strategies:moving window` strategy are stored:
+
+         - ``list``: one list element per unit of cost, trimmed to the limit
+         - ``zset``: one sorted set member per hit scored by its timestamp,
+           which keeps large limits and costs cheap.
+         - ``packed``: a single string of fixed width pairs of millisecond
+           offsets (from a base timestamp stored with the key) and counts,
+           which takes 8 bytes per hit (or less if several hits happen in
+           the same millisecond) regardless of their cost.
+
+         Keys written by one engine can't be read by the others.
+        :param preload_scripts: Whether to load the lua scripts when the
+         storage is initialized and execute them with ``EVALSHA`` directly.
+         If redis reports a missing script (for example after a restart or
+         a failover) all the scripts are loaded again at once.
+        :param use_functions: Whether to install the lua scripts as a
+         versioned library of functions with ``FUNCTION LOAD`` (requires
+         redis 7 or higher) and execute them with ``FCALL``. Functions are
+         persisted and replicated by redis and survive ``SCRIPT FLUSH``.
+         The scripts that don't write any keys are executed with ``FCALL_RO``
+         on a replica if the storage is configured to read from replicas.
+        :param clock: Where the timestamps of the :ref:`strategies:moving window`
+         & :ref:`strategies:gcra` strategies are read from:
+
+         - ``client``: the clock of the host running the rate limiter
+         - ``server``: the clock of the redis server (with ``TIME`` in the
+           lua scripts), which keeps the windows consistent when the clocks
+           of the hosts sharing the rate limits are skewed
         :param options: all remaining keyword arguments are passed
          directly to the constructor of :class:`redis.Redis`
         :raise ConfigurationError: when the :pypi:`redis` library is not available
+         or :paramref:`moving_window_engine` or :paramref:`clock` are not supported
         """
         super().__init__(uri, wrap_exceptions=wrap_exceptions, **options)
+        self.moving_window_engine = moving_window_engine
+        self.preload_scripts = preload_scripts
+        self.use_functions = use_functions
+        self.clock = clock
         self.target_server = "valkey" if uri.startswith("valkey") else "redis"
         self.dependency = self.dependencies[self.target_server].module
 
@@ -118,28 +319,183 @@ class RedisStorage(Storage, MovingWindowSupport, SlidingWindowCounterSupport):
         )
 
     def initialize_storage(self, _uri: str) -> None:
-        self.lua_moving_window = self.get_connection().register_script(
-            self.SCRIPT_MOVING_WINDOW
-        )
-        self.lua_acquire_moving_window = self.get_connection().register_script(
-            self.SCRIPT_ACQUIRE_MOVING_WINDOW
+        if self.moving_window_engine not in ("list", "zset", "packed"):
+            raise ConfigurationError(
+                f"Unsupported moving window engine: {self.moving_window_engine}"
+            )
+        if self.clock not in ("client", "server"):
+            raise ConfigurationError(f"Unsupported clock: {self.clock}")
+        (
+            moving_window,
+            acquire_moving_window,
+            acquire_moving_window_all,
+            release_moving_window,
+        ) = self.moving_window_scripts
+        self.scripts: list[PreloadedScript] = []
+        self.lua_moving_window = self._register_script(moving_window)
+        self.lua_acquire_moving_window = self._register_script(acquire_moving_window)
+        self.lua_incr_expire = self._register_script(self.SCRIPT_INCR_EXPIRE)
+        self.lua_sliding_window = self._register_script(self.SCRIPT_SLIDING_WINDOW)
+        self.lua_acquire_sliding_window = self._register_script(
+            self.SCRIPT_ACQUIRE_SLIDING_WINDOW
         )
-        self.lua_clear_keys = self.get_connection().register_script(
-            self.SCRIPT_CLEAR_KEYS
+        self.lua_incr_expire_all = self._register_script(self.SCRIPT_INCR_EXPIRE_ALL)
+        self.lua_acquire_moving_window_all = self._register_script(
+            acquire_moving_window_all
         )
-        self.lua_incr_expire = self.get_connection().register_script(
-            self.SCRIPT_INCR_EXPIRE
+        self.lua_acquire_sliding_window_all = self._register_script(
+            self.SCRIPT_ACQUIRE_SLIDING_WINDOW_ALL
         )
-        self.lua_sliding_window = self.get_connection().register_script(
-            self.SCRIPT_SLIDING_WINDOW
+        self.lua_release_moving_window = self._register_script(release_moving_window)
+        self.lua_acquire_gcra = self._register_script(self.SCRIPT_ACQUIRE_GCRA)
+        self.lua_acquire_gcra_all = self._register_script(self.SCRIPT_ACQUIRE_GCRA_ALL)
+        self.lua_decr = self._register_script(self.SCRIPT_DECR)
+        if self.scripts:
+            exceptions = self.dependencies[self.target_server].module.exceptions
+            self.no_script_error: type[Exception] = (
+                exceptions.ResponseError
+                if self.use_functions
+                else exceptions.NoScriptError
+            )
+            self.load_scripts()
+
+    @property
+    def function_library(self) -> RedisFunctionLibrary:
+        """
+        The library of functions loaded with :paramref:`use_functions`
+        """
+        return get_redis_function_library(self.RES_DIR, self.READONLY_SCRIPTS)
+
+    def _register_script(
+        self, script: bytes
+    ) -> redis.commands.core.Script | PreloadedScript:
+        preloaded: PreloadedScript
+        if self.use_functions:
+            name = self.function_library.functions[script]
+            preloaded = RedisFunction(
+                self, script, name, name in self.function_library.readonly
+            )
+        elif self.preload_scripts:
+            preloaded = PreloadedScript(self, script)
+        else:
+            return self.get_connection().register_script(script)
+        self.scripts.append(preloaded)
+        return preloaded
+
+    def is_missing_script(self, error: object) -> bool:
+        """
+        Whether :paramref:`error` was raised because redis doesn't have
+        the script (or function) that was executed
+
+        :meta private:
+        """
+        return isinstance(error, self.no_script_error) and (
+            not self.use_functions or "function not found" in str(error).lower()
         )
-        self.lua_acquire_sliding_window = self.get_connection().register_script(
-            self.SCRIPT_ACQUIRE_SLIDING_WINDOW
+
+    @versionadded(version="4.7")
+    def load_scripts(self) -> None:
+        """
+        Load all the lua scripts used by the storage with ``SCRIPT LOAD``
+        in a single pipeline (only used with :paramref:`preload_scripts`),
+        or the library of functions with ``FUNCTION LOAD`` (only used with
+        :paramref:`use_functions`)
+        """
+        if self.use_functions:
+            self.get_connection().function_load(
+                self.function_library.code, replace=True
+            )
+            return
+        pipeline = self.get_connection().pipeline(transaction=False)
+        for script in self.scripts:
+            pipeline.script_load(script.script)
+        pipeline.execute()
+
+    @property
+    def moving_window_scripts(self) -> tuple[bytes, bytes, bytes, bytes]:
+        """
+        The moving window, acquire, acquire all and release scripts for the
+        configured :attr:`moving_window_engine`
+        """
+        if self.moving_window_engine == "zset":
+            return (
+                self.SCRIPT_MOVING_WINDOW_ZSET,
+                self.SCRIPT_ACQUIRE_MOVING_WINDOW_ZSET,
+                self.SCRIPT_ACQUIRE_MOVING_WINDOW_ALL_ZSET,
+                self.SCRIPT_RELEASE_MOVING_WINDOW_ZSET,
+            )
+        if self.moving_window_engine == "packed":
+            return (
+                self.SCRIPT_MOVING_WINDOW_PACKED,
+                self.SCRIPT_ACQUIRE_MOVING_WINDOW_PACKED,
+                self.SCRIPT_ACQUIRE_MOVING_WINDOW_ALL_PACKED,
+                self.SCRIPT_RELEASE_MOVING_WINDOW_PACKED,
+            )
+        return (
+            self.SCRIPT_MOVING_WINDOW,
+            self.SCRIPT_ACQUIRE_MOVING_WINDOW,
+            self.SCRIPT_ACQUIRE_MOVING_WINDOW_ALL,
+            self.SCRIPT_RELEASE_MOVING_WINDOW,
         )
 
+    def _script_timestamp(
+        self, timestamp: float | None = None, microseconds: bool = False
+    ) -> float:
+        """
+        The current time passed to the lua scripts (in seconds, or in
+        microseconds for the gcra strategy), or ``0`` if the scripts read
+        it from the clock of the server
+
+        :param timestamp: the current time if it was already read
+        """
+        if self.clock == "server":
+            return 0
+        if microseconds:
+            return time.time_ns() // 1000
+        return time.time() if timestamp is None else timestamp
+
     def get_connection(self, readonly: bool = False) -> RedisClient:
         return cast(RedisClient, self.storage)
 
+    @versionadded(version="4.7")
+    def reads_from_replicas(self) -> bool:
+        """
+        Whether read only operations are currently sent to replicas, which is
+        the case if :attr:`use_replicas` is set and, if :attr:`max_replica_lag`
+        is set, none of the replicas lag behind their primary by more than
+        :attr:`max_replica_lag` seconds. The lag is checked at most once a
+        second and read only operations are sent to the primary if it can't
+        be determined.
+        """
+        if not self.use_replicas:
+            return False
+        if self.max_replica_lag is None:
+            return True
+        if time.monotonic() - self._replica_lag_checked_at >= 1:
+            self._replica_lag_checked_at = time.monotonic()
+            try:
+                self._replicas_in_sync = (
+                    max(get_replication_lag(info) for info in self._replication_info())
+                    <= self.max_replica_lag
+                )
+            except self.base_exceptions:
+                self._replicas_in_sync = False
+        return self._replicas_in_sync
+
+    def _reads_windows_from_replicas(self) -> bool:
+        """
+        Whether the moving & sliding window reads are sent to replicas as
+        well, which is only the case if their staleness is bounded by
+        :attr:`max_replica_lag`
+        """
+        return self.max_replica_lag is not None and self.reads_from_replicas()
+
+    def _replication_info(self) -> list[dict[str, Any]]:  # type: ignore[explicit-any]
+        """
+        The replication section of ``INFO`` of each primary
+        """
+        return [self.storage.info("replication")]
+
     def _current_window_key(self, key: str) -> str:
         """
         Return the current window's storage key (Sliding window strategy)
@@ -167,6 +523,96 @@ class RedisStorage(Storage, MovingWindowSupport, SlidingWindowCounterSupport):
     def prefixed_key(self, key: str) -> str:
         return f"{self.PREFIX}:{key}"
 
+    def _prefixed_window_keys(self, key: str) -> tuple[str, str]:
+        """
+        The prefixed keys of the previous and the current window of
+        :paramref:`key` (Sliding window strategy), built with a single
+        formatting of :paramref:`key`
+        """
+        current_key = f"{self.PREFIX}:{{{key}}}"
+        return f"{current_key}/-1", current_key
+
+    def _run_script_batch(  # type: ignore[explicit-any]
+        self,
+        script: redis.commands.core.Script | PreloadedScript,
+        calls: Sequence[tuple[list[str], list[float]]],
+        readonly: bool = False,
+    ) -> list[Any]:
+        """
+        Run :paramref:`script` once for each ``(keys, args)`` pair in
+        :paramref:`calls` using a single non transactional pipeline
+        """
+        return self._run_scripts(
+            [(script, keys, args) for keys, args in calls], readonly
+        )
+
+    def _run_scripts(  # type: ignore[explicit-any]
+        self,
+        calls: Sequence[
+            tuple[redis.commands.core.Script | PreloadedScript, list[str], list[float]]
+        ],
+        readonly: bool = False,
+    ) -> list[Any]:
+        """
+        Run each ``(script, keys, args)`` call in :paramref:`calls` using a
+        single non transactional pipeline (on a replica if :paramref:`readonly`
+        is set and none of the scripts write)
+        """
+        pipeline = self.get_connection(readonly).pipeline(transaction=False)
+        for script, keys, args in calls:
+            script(keys, args, client=pipeline)
+        if not self.scripts:
+            return pipeline.execute()
+        results = pipeline.execute(raise_on_error=False)
+        if missing := [
+            idx for idx, result in enumerate(results) if self.is_missing_script(result)
+        ]:
+            # reload all the scripts at once and only retry the calls
+            # that weren't executed
+            self.load_scripts()
+            for idx, result in zip(
+                missing, self._run_scripts([calls[idx] for idx in missing], readonly)
+            ):
+                results[idx] = result
+        for result in results:
+            if isinstance(result, Exception):
+                raise result
+        return results
+
+    def _run_readonly_script(  # type: ignore[explicit-any]
+        self,
+        script: redis.commands.core.Script | PreloadedScript,
+        keys: list[str],
+        args: list[float],
+    ) -> Any:
+        """
+        Run :paramref:`script`, which only reads a window, on a replica if
+        the window reads are sent to the replicas
+        """
+        return script(
+            keys,
+            args,
+            client=self.get_connection(self._reads_windows_from_replicas()),  # type: ignore[arg-type]
+        )
+
+    @versionadded(version="4.7")
+    @contextmanager
+    def pipeline(self) -> Iterator[RedisPipeline]:
+        """
+        Queue rate limit operations and execute them in a single round
+        trip when the context exits. The result of each operation is
+        available through the :attr:`PipelinedResult.value` of the object
+        returned when it was queued::
+
+            with storage.pipeline() as pipeline:
+                counter = pipeline.incr(key, 60)
+                acquired = pipeline.acquire_entry(other_key, 10, 60)
+            print(counter.value, acquired.value)
+        """
+        pipeline = RedisPipeline(self)
+        yield pipeline
+        pipeline.execute()
+
     def get_moving_window(self, key: str, limit: int, expiry: int) -> tuple[float, int]:
         """
         returns the starting point and the number of entries in the moving
@@ -178,7 +624,11 @@ class RedisStorage(Storage, MovingWindowSupport, SlidingWindowCounterSupport):
         """
         key = self.prefixed_key(key)
         timestamp = time.time()
-        if window := self.lua_moving_window([key], [timestamp - expiry, limit]):
+        if window := self._run_readonly_script(
+            self.lua_moving_window,
+            [key],
+            [self._script_timestamp(timestamp), limit, expiry],
+        ):
             return float(window[0]), window[1]
 
         return timestamp, 0
@@ -186,8 +636,9 @@ class RedisStorage(Storage, MovingWindowSupport, SlidingWindowCounterSupport):
     def get_sliding_window(
         self, key: str, expiry: int
     ) -> tuple[int, float, int, float]:
-        previous_key = self.prefixed_key(self._previous_window_key(key))
-        current_key = self.prefixed_key(self._current_window_key(key))
+        previous_key, current_key = self._prefixed_window_keys(key)
+        if self._reads_windows_from_replicas():
+            return self._read_sliding_windows([(previous_key, current_key, expiry)])[0]
         if window := self.lua_sliding_window([previous_key, current_key], [expiry]):
             return (
                 int(window[0] or 0),
@@ -197,6 +648,99 @@ class RedisStorage(Storage, MovingWindowSupport, SlidingWindowCounterSupport):
             )
         return 0, 0.0, 0, 0.0
 
+    def get_moving_windows(
+        self, entries: Sequence[tuple[str, int, int]]
+    ) -> list[tuple[float, int]]:
+        """
+        :param entries: ``(key, limit, expiry)`` tuples
+        :return: (start of window, number of acquired entries) for each entry
+        """
+        timestamp = time.time()
+        windows = self._run_script_batch(
+            self.lua_moving_window,
+            [
+                (
+                    [self.prefixed_key(key)],
+                    [self._script_timestamp(timestamp), limit, expiry],
+                )
+                for key, limit, expiry in entries
+            ],
+            readonly=self._reads_windows_from_replicas(),
+        )
+        return [
+            (float(window[0]), window[1]) if window else (timestamp, 0)
+            for window in windows
+        ]
+
+    def get_sliding_windows(
+        self, entries: Sequence[tuple[str, int]]
+    ) -> list[tuple[int, float, int, float]]:
+        if self._reads_windows_from_replicas():
+            return self._read_sliding_windows(
+                [
+                    (
+                        *self._prefixed_window_keys(key),
+                        expiry,
+                    )
+                    for key, expiry in entries
+                ]
+            )
+        windows = self._run_script_batch(
+            self.lua_sliding_window,
+            [
+                (
+                    list(self._prefixed_window_keys(key)),
+                    [expiry],
+                )
+                for key, expiry in entries
+            ],
+        )
+        return [
+            (
+                int(window[0] or 0),
+                max(0, float(window[1] or 0)) / 1000,
+                int(window[2] or 0),
+                max(0, float(window[3] or 0)) / 1000,
+            )
+            if window
+            else (0, 0.0, 0, 0.0)
+            for window in windows
+        ]
+
+    def _read_sliding_windows(
+        self, entries: Sequence[tuple[str, str, int]]
+    ) -> list[tuple[int, float, int, float]]:
+        """
+        Read the sliding windows of ``(previous key, current key, expiry)``
+        entries with read only commands, so that they can be served by a
+        replica. Contrary to the lua script, a current window that has
+        expired is only shifted in the result and not in redis.
+        """
+        pipeline = self.get_connection(readonly=True).pipeline(transaction=False)
+        for previous_key, current_key, _ in entries:
+            pipeline.get(previous_key)
+            pipeline.pttl(previous_key)
+            pipeline.get(current_key)
+            pipeline.pttl(current_key)
+        results = pipeline.execute()
+        windows = []
+        for idx, (_, _, expiry) in enumerate(entries):
+            previous_count, previous_ttl, current_count, current_ttl = results[
+                idx * 4 : idx * 4 + 4
+            ]
+            if 0 < current_ttl < expiry * 1000:
+                previous_count, previous_ttl = current_count, current_ttl
+                current_count, current_ttl = 0, current_ttl + expiry * 1000
+            windows.append(
+                (
+                    int(previous_count or 0),
+                    max(0, previous_ttl) / 1000,
+                    int(current_count or 0),
+                    max(0, current_ttl) / 1000,
+                )
+            )
+        return windows
+
     def incr(
         self,
         key: str,
@@ -212,7 +756,76 @@ class RedisStorage(Storage, MovingWindowSupport, SlidingWindowCounterSupport):
         :param amount: the number to increment by
         """
         key = self.prefixed_key(key)
-        return int(self.lua_incr_expire([key], [expiry, amount]))
+        return int(self.lua_incr_expire([key], [expiry, amount])[0])
+
+    def incr_with_expiry(
+        self, key: str, expiry: int, amount: int = 1
+    ) -> tuple[int, float]:
+        """
+        increments the counter for a given rate limit key and returns it
+        along with the time at which it expires, in a single lua script
+
+        :param key: the key to increment
+        :param expiry: amount in seconds for the key to expire in
+        :param amount: the number to increment by
+        :return: (value of the counter after the increment, expiry time)
+        """
+        key = self.prefixed_key(key)
+        value, ttl = self.lua_incr_expire([key], [expiry, amount])
+        return int(value), max(int(ttl), 0) / 1000 + time.time()
+
+    def incr_many(self, entries: Sequence[tuple[str, int, int]]) -> list[int]:
+        """
+        increments the counters for multiple rate limit keys in a single
+        pipeline
+
+        :param entries: ``(key, expiry, amount)`` tuples
+        """
+        return [
+            int(value)
+            for value, _ in self._run_script_batch(
+                self.lua_incr_expire,
+                [
+                    ([self.prefixed_key(key)], [expiry, amount])
+                    for key, expiry, amount in entries
+                ],
+            )
+        ]
+
+    def incr_all(
+        self, entries: Sequence[tuple[str, int, int]], amount: int = 1
+    ) -> bool:
+        """
+        increments the counters for multiple rate limit keys only if none
+        of them would exceed its limit, in a single lua script
+
+        :param entries: ``(key, limit, expiry)`` tuples
+        :param amount: the number to increment each counter by
+        :return: ``True`` if all the counters were incremented
+        """
+        if not entries:
+            return True
+        args: list[float] = [amount]
+        for _, limit, expiry in entries:
+            args.extend((limit, expiry))
+        return bool(
+            self.lua_incr_expire_all(
+                [self.prefixed_key(key) for key, _, _ in entries], args
+            )
+        )
+
+    @versionadded(version="4.7")
+    def decr(self, key: str, amount: int = 1) -> int:
+        """
+        decrements the counter for a given rate limit key without going
+        below zero or changing its expiry. A key that doesn't exist is
+        left as is.
+
+        :param key: the key to decrement
+        :param amount: the number to decrement by
+        """
+        key = self.prefixed_key(key)
+        return int(self.lua_decr([key], [amount]))
 
     def get(self, key: str) -> int:
         """
@@ -223,6 +836,17 @@ class RedisStorage(Storage, MovingWindowSupport, SlidingWindowCounterSupport):
         key = self.prefixed_key(key)
         return int(self.get_connection(True).get(key) or 0)
 
+    def get_counts(self, keys: Sequence[str]) -> list[int]:
+        """
+        :param keys: the keys to get the counter values for
+        """
+        if not keys:
+            return []
+        values = self.get_connection(True).mget(
+            [self.prefixed_key(key) for key in keys]
+        )
+        return [int(value or 0) for value in values]
+
     def clear(self, key: str) -> None:
         """
         :param key: the key to clear rate limits for
@@ -245,13 +869,78 @@ class RedisStorage(Storage, MovingWindowSupport, SlidingWindowCounterSupport):
         :param amount: the number of entries to acquire
         """
         key = self.prefixed_key(key)
-        timestamp = time.time()
         acquired = self.lua_acquire_moving_window(
-            [key], [timestamp, limit, expiry, amount]
+            [key], [self._script_timestamp(), limit, expiry, amount]
         )
 
         return bool(acquired)
 
+    def acquire_entry_with_window(
+        self, key: str, limit: int, expiry: int, amount: int = 1
+    ) -> tuple[bool, float, int]:
+        """
+        :param key: rate limit key to acquire an entry in
+        :param limit: amount of entries allowed
+        :param expiry: expiry of the entry
+        :param amount: the number of entries to acquire
+        :return: (whether the entries were acquired, start of window,
+         number of acquired entries)
+        """
+        key = self.prefixed_key(key)
+        acquired, window_start, window_items = self.lua_acquire_moving_window(
+            [key], [self._script_timestamp(), limit, expiry, amount, 1]
+        )
+        return bool(acquired), float(window_start), int(window_items)
+
+    def acquire_entries(
+        self, entries: Sequence[tuple[str, int, int, int]]
+    ) -> list[bool]:
+        """
+        :param entries: ``(key, limit, expiry, amount)`` tuples
+        :return: whether each entry was acquired
+        """
+        timestamp = self._script_timestamp()
+        return [
+            bool(acquired)
+            for acquired in self._run_script_batch(
+                self.lua_acquire_moving_window,
+                [
+                    ([self.prefixed_key(key)], [timestamp, limit, expiry, amount])
+                    for key, limit, expiry, amount in entries
+                ],
+            )
+        ]
+
+    def acquire_all_entries(
+        self, entries: Sequence[tuple[str, int, int]], amount: int = 1
+    ) -> bool:
+        """
+        Acquire :paramref:`amount` entries in multiple moving windows only
+        if all of them have room for them, in a single lua script
+
+        :param entries: ``(key, limit, expiry)`` tuples
+        :param amount: the number of entries to acquire in each window
+        :return: ``True`` if the entries were acquired in all the windows
+        """
+        if not entries:
+            return True
+        args: list[float] = [self._script_timestamp(), amount]
+        for _, limit, expiry in entries:
+            args.extend((limit, expiry))
+        return bool(
+            self.lua_acquire_moving_window_all(
+                [self.prefixed_key(key) for key, _, _ in entries], args
+            )
+        )
+
+    def release_entry(self, key: str, expiry: int, amount: int = 1) -> None:
+        """
+        :param key: rate limit key to release the entries of
+        :param expiry: expiry of the entries
+        :param amount: the number of entries to release
+        """
+        self.lua_release_moving_window([self.prefixed_key(key)], [amount])
+
     def acquire_sliding_window_entry(
         self,
         key: str,
@@ -267,13 +956,180 @@ class RedisStorage(Storage, MovingWindowSupport, SlidingWindowCounterSupport):
         :param expiry: expiry of the entry
         :param amount: the number of entries to acquire
         """
-        previous_key = self.prefixed_key(self._previous_window_key(key))
-        current_key = self.prefixed_key(self._current_window_key(key))
-        acquired = self.lua_acquire_sliding_window(
+        previous_key, current_key = self._prefixed_window_keys(key)
+        acquired, *_ = self.lua_acquire_sliding_window(
             [previous_key, current_key], [limit, expiry, amount]
         )
         return bool(acquired)
 
+    def acquire_sliding_window_entry_with_window(
+        self, key: str, limit: int, expiry: int, amount: int = 1
+    ) -> tuple[bool, int, float, int, float]:
+        """
+        Acquire an entry and return the state of the previous and current
+        windows, in a single lua script
+
+        :param key: rate limit key to acquire an entry in
+        :param limit: amount of entries allowed
+        :param expiry: expiry of the entry
+        :param amount: the number of entries to acquire
+        """
+        previous_key, current_key = self._prefixed_window_keys(key)
+        acquired, *window = self.lua_acquire_sliding_window(
+            [previous_key, current_key], [limit, expiry, amount]
+        )
+        return (
+            bool(acquired),
+            int(window[0] or 0),
+            max(0, float(window[1] or 0)) / 1000,
+            int(window[2] or 0),
+            max(0, float(window[3] or 0)) / 1000,
+        )
+
+    def acquire_sliding_window_entries(
+        self, entries: Sequence[tuple[str, int, int, int]]
+    ) -> list[bool]:
+        """
+        :param entries: ``(key, limit, expiry, amount)`` tuples
+        :return: whether each entry was acquired
+        """
+        return [
+            bool(acquired)
+            for acquired, *_ in self._run_script_batch(
+                self.lua_acquire_sliding_window,
+                [
+                    (
+                        list(self._prefixed_window_keys(key)),
+                        [limit, expiry, amount],
+                    )
+                    for key, limit, expiry, amount in entries
+                ],
+            )
+        ]
+
+    def acquire_all_sliding_window_entries(
+        self, entries: Sequence[tuple[str, int, int]], amount: int = 1
+    ) -> bool:
+        """
+        Acquire :paramref:`amount` entries in multiple sliding windows only
+        if the weighted count of every window stays within its limit, in a
+        single lua script
+
+        :param entries: ``(key, limit, expiry)`` tuples
+        :param amount: the number of entries to acquire in each window
+        :return: ``True`` if the entries were acquired in all the windows
+        """
+        if not entries:
+            return True
+        keys: list[str] = []
+        args: list[float] = [amount]
+        for key, limit, expiry in entries:
+            keys.extend(self._prefixed_window_keys(key))
+            args.extend((limit, expiry))
+        return bool(self.lua_acquire_sliding_window_all(keys, args))
+
+    def release_sliding_window_entry(
+        self, key: str, expiry: int, amount: int = 1
+    ) -> None:
+        """
+        :param key: rate limit key to release the entries of
+        :param expiry: expiry of the entries
+        :param amount: the number of entries to release
+        """
+        self.lua_decr([self._prefixed_window_keys(key)[1]], [amount])
+
+    def acquire_gcra_entry(
+        self, key: str, limit: int, expiry: int, amount: int = 1
+    ) -> bool:
+        """
+        :param key: rate limit key to acquire an entry in
+        :param limit: amount of entries allowed
+        :param expiry: expiry of the entry
+        :param amount: the number of entries to acquire
+        """
+        acquired, _ = self.acquire_gcra_entry_with_tat(key, limit, expiry, amount)
+        return acquired
+
+    def acquire_gcra_entry_with_tat(
+        self, key: str, limit: int, expiry: int, amount: int = 1
+    ) -> tuple[bool, int]:
+        """
+        Acquire entries and return the theoretical arrival time of
+        :paramref:`key` after the attempt, in a single lua script
+
+        :param key: rate limit key to acquire an entry in
+        :param limit: amount of entries allowed
+        :param expiry: expiry of the entry
+        :param amount: the number of entries to acquire
+        """
+        acquired, tat = self.lua_acquire_gcra(
+            [self.prefixed_key(key)],
+            [
+                self._script_timestamp(microseconds=True),
+                limit,
+                self.emission_interval(limit, expiry),
+                amount,
+            ],
+        )
+        return bool(acquired), int(tat)
+
+    def acquire_gcra_entries(
+        self, entries: Sequence[tuple[str, int, int, int]]
+    ) -> list[bool]:
+        """
+        :param entries: ``(key, limit, expiry, amount)`` tuples
+        :return: whether each entry was acquired
+        """
+        timestamp = self._script_timestamp(microseconds=True)
+        return [
+            bool(acquired)
+            for acquired, _ in self._run_script_batch(
+                self.lua_acquire_gcra,
+                [
+                    (
+                        [self.prefixed_key(key)],
+                        [
+                            timestamp,
+                            limit,
+                            self.emission_interval(limit, expiry),
+                            amount,
+                        ],
+                    )
+                    for key, limit, expiry, amount in entries
+                ],
+            )
+        ]
+
+    def acquire_all_gcra_entries(
+        self, entries: Sequence[tuple[str, int, int]], amount: int = 1
+    ) -> bool:
+        """
+        Acquire :paramref:`amount` entries for multiple keys only if all of
+        them allow it, in a single lua script
+
+        :param entries: ``(key, limit, expiry)`` tuples
+        :param amount: the number of entries to acquire for each key
+        :return: ``True`` if the entries were acquired for all the keys
+        """
+        if not entries:
+            return True
+        args: list[float] = [self._script_timestamp(microseconds=True), amount]
+        for _, limit, expiry in entries:
+            args.extend((limit, self.emission_interval(limit, expiry)))
+        return bool(
+            self.lua_acquire_gcra_all(
+                [self.prefixed_key(key) for key, _, _ in entries], args
+            )
+        )
+
+    def get_gcra_tat(self, key: str) -> int:
+        """
+        :param key: the rate limit key
+        :return: the theoretical arrival time of :paramref:`key` in
+         microseconds since the epoch or ``0`` if the key does not exist
+        """
+        return self.get(key)
+
     def get_expiry(self, key: str) -> float:
         """
         :param key: the key to get the expiry for
@@ -292,17 +1148,136 @@ class RedisStorage(Storage, MovingWindowSupport, SlidingWindowCounterSupport):
         except:  # noqa
             return False
 
+    @versionchanged(
+        version="4.7",
+        reason="Keys are iterated over with ``SCAN`` instead of ``KEYS``",
+    )
     def reset(self) -> int | None:
         """
-        This function calls a Lua Script to delete keys prefixed with
-        ``self.PREFIX`` in blocks of 5000.
+        Deletes the keys prefixed with ``self.PREFIX``
+        (see :meth:`reset_iter`)
+        """
 
-        .. warning::
-           This operation was designed to be fast, but was not tested
-           on a large production based system. Be careful with its usage as it
-           could be slow on very large data sets.
+        return sum(self.reset_iter())
 
+    @versionadded(version="4.7")
+    def reset_iter(self, count: int = 1000) -> Iterator[int]:
         """
+        Deletes the keys prefixed with ``self.PREFIX`` incrementally,
+        iterating over them with ``SCAN`` and deleting each batch with
+        ``UNLINK`` so that the server is never blocked for long, even with a
+        very large number of keys.
 
+        :param count: the ``COUNT`` hint passed to ``SCAN`` (the approximate
+         number of keys inspected per batch)
+        :return: an iterator over the number of keys deleted by each batch
+        """
+        connection = self.get_connection()
         prefix = self.prefixed_key("*")
-        return int(self.lua_clear_keys([prefix]))
+        cursor = 0
+        while True:
+            cursor, keys = connection.scan(cursor, match=prefix, count=count)
+            if keys:
+                yield connection.unlink(*keys)
+            if not cursor:
+                break
+
+
+@versionadded(version="4.7")
+class RedisPipeline:
+    """
+    Rate limit operations queued with :meth:`RedisStorage.pipeline`
+    """
+
+    def __init__(self, storage: RedisStorage) -> None:
+        self.storage = storage
+        self.calls: list[
+            tuple[redis.commands.core.Script | PreloadedScript, list[str], list[float]]
+        ] = []
+        self.results: list[PipelinedResult[int] | PipelinedResult[bool]] = []
+
+    def incr(self, key: str, expiry: int, amount: int = 1) -> PipelinedResult[int]:
+        """
+        Queue the increment of the counter for a given rate limit key
+        (see :meth:`RedisStorage.incr`)
+        """
+        result = PipelinedResult(lambda value: int(cast(list[int], value)[0]))
+        self.calls.append(
+            (
+                self.storage.lua_incr_expire,
+                [self.storage.prefixed_key(key)],
+                [expiry, amount],
+            )
+        )
+        self.results.append(result)
+        return result
+
+    def acquire_entry(
+        self, key: str, limit: int, expiry: int, amount: int = 1
+    ) -> PipelinedResult[bool]:
+        """
+        Queue the acquisition of entries in a moving window
+        (see :meth:`RedisStorage.acquire_entry`)
+        """
+        result = PipelinedResult(bool)
+        self.calls.append(
+            (
+                self.storage.lua_acquire_moving_window,
+                [self.storage.prefixed_key(key)],
+                [self.storage._script_timestamp(), limit, expiry, amount],
+            )
+        )
+        self.results.append(result)
+        return result
+
+    def acquire_sliding_window_entry(
+        self, key: str, limit: int, expiry: int, amount: int = 1
+    ) -> PipelinedResult[bool]:
+        """
+        Queue the acquisition of entries in a sliding window
+        (see :meth:`RedisStorage.acquire_sliding_window_entry`)
+        """
+        result = PipelinedResult(lambda value: bool(cast(list[int], value)[0]))
+        self.calls.append(
+            (
+                self.storage.lua_acquire_sliding_window,
+                list(self.storage._prefixed_window_keys(key)),
+                [limit, expiry, amount],
+            )
+        )
+        self.results.append(result)
+        return result
+
+    def acquire_gcra_entry(
+        self, key: str, limit: int, expiry: int, amount: int = 1
+    ) -> PipelinedResult[bool]:
+        """
+        Queue the acquisition of entries with the gcra strategy
+        (see :meth:`RedisStorage.acquire_gcra_entry`)
+        """
+        result = PipelinedResult(lambda value: bool(cast(list[int], value)[0]))
+        self.calls.append(
+            (
+                self.storage.lua_acquire_gcra,
+                [self.storage.prefixed_key(key)],
+                [
+                    self.storage._script_timestamp(microseconds=True),
+                    limit,
+                    self.storage.emission_interval(limit, expiry),
+                    amount,
+                ],
+            )
+        )
+        self.results.append(result)
+        return result
+
+    def execute(self) -> None:
+        """
+        Execute the queued operations
+        """
+        if self.calls:
+            for result, value in zip(
+                self.results, self.storage._run_scripts(self.calls)
+            ):
+                result.set(value)
+            self.calls, self.results = [], []
@@ -1,11 +1,22 @@
 from __future__ import annotations
 
 import urllib
+from collections.abc import Iterator
 
 from deprecated.sphinx import versionchanged
 from packaging.version import Version
 
-from limits.storage.redis import RedisStorage
+from limits.storage.base import (
+    GCRASupport,
+    MovingWindowSupport,
+    SlidingWindowCounterSupport,
+    Storage,
+)
+from limits.storage.redis import PreloadedScript, RedisFunction, RedisStorage
+from limits.typing import TYPE_CHECKING, Any, Literal, RedisClient, Sequence, cast
+
+if TYPE_CHECKING:
+    import redis
 
 
 @versionchanged(
@@ -32,6 +43,14 @@ will fallback to trying to use :class:`rediscluster.RedisCluster`.
         " if :paramref:`uri` has the ``valkey+cluster://`` schema"
     ),
 )
+@versionchanged(
+    version="4.7",
+    reason=(
+        "Added the :paramref:`moving_window_engine`, :paramref:`preload_scripts`"
+        ", :paramref:`use_functions`, :paramref:`use_replicas`,"
+        " :paramref:`max_replica_lag` & :paramref:`clock` arguments"
+    ),
+)
 class RedisClusterStorage(RedisStorage):
     """
     Rate limit storage with redis cluster as backend
@@ -57,6 +76,12 @@ class RedisClusterStorage(RedisStorage):
         self,
         uri: str,
         wrap_exceptions: bool = False,
+        moving_window_engine: Literal["list", "zset", "packed"] = "list",
+        preload_scripts: bool = False,
+        use_functions: bool = False,
+        use_replicas: bool = False,
+        max_replica_lag: float | None = None,
+        clock: Literal["client", "server"] = "client",
         **options: float | str | bool,
     ) -> None:
         """
@@ -67,6 +92,26 @@ class RedisClusterStorage(RedisStorage):
          :pypi:`valkey`.
         :param wrap_exceptions: Whether to wrap storage exceptions in
          :exc:`limits.errors.StorageError` before raising it.
+        :param moving_window_engine: How the entries of the
+         :ref:`strategies:moving window` strategy are stored, either ``list``,
+         ``zset`` or ``packed`` (refer to :class:`~limits.storage.RedisStorage`)
+        :param preload_scripts: Whether to load the lua scripts ahead of time
+         and execute them with ``EVALSHA`` directly
+         (refer to :class:`~limits.storage.RedisStorage`)
+        :param use_functions: Whether to install the lua scripts as a library
+         of functions and execute them with ``FCALL``
+         (refer to :class:`~limits.storage.RedisStorage`)
+        :param use_replicas: Whether to send read only operations to the
+         replicas of the cluster (in ``READONLY`` mode) through a second
+         :class:`~redis.cluster.RedisCluster` client
+        :param max_replica_lag: If set (along with :paramref:`use_replicas`),
+         the moving & sliding window reads are sent to the replicas as well,
+         and read only operations are sent to the primaries instead of the
+         replicas while any replica lags behind its primary by more than this
+         many seconds
+        :param clock: Where the timestamps of the :ref:`strategies:moving window`
+         & :ref:`strategies:gcra` strategies are read from, either ``client``
+         or ``server`` (refer to :class:`~limits.storage.RedisStorage`)
         :param options: all remaining keyword arguments are passed
          directly to the constructor of :class:`redis.cluster.RedisCluster`
         :raise ConfigurationError: when the :pypi:`redis` library is not
@@ -91,35 +136,211 @@ class RedisClusterStorage(RedisStorage):
         merged_options = {**self.DEFAULT_OPTIONS, **parsed_auth, **options}
         self.dependency = self.dependencies[self.target_server].module
         startup_nodes = [self.dependency.cluster.ClusterNode(*c) for c in cluster_hosts]
-        if self.target_server == "redis":
-            self.storage = self.dependency.cluster.RedisCluster(
-                startup_nodes=startup_nodes, **merged_options
-            )
-        else:
-            self.storage = self.dependency.cluster.ValkeyCluster(
+        cluster_class = (
+            self.dependency.cluster.RedisCluster
+            if self.target_server == "redis"
+            else self.dependency.cluster.ValkeyCluster
+        )
+        self.storage = cluster_class(startup_nodes=startup_nodes, **merged_options)
+        if use_replicas:
+            if hasattr(self.dependency.cluster, "LoadBalancingStrategy"):
+                merged_options["load_balancing_strategy"] = (
+                    self.dependency.cluster.LoadBalancingStrategy.ROUND_ROBIN_REPLICAS
+                )
+            else:
+                merged_options["read_from_replicas"] = True
+            self.storage_replica = cluster_class(
                 startup_nodes=startup_nodes, **merged_options
             )
 
         assert self.storage
+        self.use_replicas = use_replicas
+        self.max_replica_lag = max_replica_lag
+        self.moving_window_engine = moving_window_engine
+        self.preload_scripts = preload_scripts
+        self.use_functions = use_functions
+        self.clock = clock
         self.initialize_storage(uri)
         super(RedisStorage, self).__init__(uri, wrap_exceptions, **options)
 
-    def reset(self) -> int | None:
+    def get_connection(self, readonly: bool = False) -> RedisClient:
+        return cast(
+            RedisClient,
+            self.storage_replica
+            if readonly and self.reads_from_replicas()
+            else self.storage,
+        )
+
+    def _replication_info(self) -> list[dict[str, Any]]:  # type: ignore[explicit-any]
+        return [
+            self.storage.info("replication", target_nodes=primary)
+            for primary in self.storage.get_primaries()
+        ]
+
+    def _run_scripts(  # type: ignore[explicit-any]
+        self,
+        calls: Sequence[
+            tuple[redis.commands.core.Script | PreloadedScript, list[str], list[float]]
+        ],
+        readonly: bool = False,
+    ) -> list[Any]:
+        """
+        Run the calls with a cluster pipeline, which groups them by the
+        primary owning the slot of their keys and sends one pipeline to each
+        of those nodes. Cluster pipelines can't load scripts, so the scripts
+        reported missing are loaded on all the primaries and only the calls
+        that weren't executed are retried.
+        """
+        if readonly and self.reads_from_replicas():
+            return [
+                self._run_readonly_script(script, keys, args)
+                for script, keys, args in calls
+            ]
+        pipeline = self.storage.pipeline()
+        for script, keys, args in calls:
+            command = (
+                ("FCALL_RO" if script.readonly else "FCALL", script.name)
+                if isinstance(script, RedisFunction)
+                else ("EVALSHA", script.sha)
+            )
+            pipeline.execute_command(
+                *command,
+                len(keys),
+                *keys,
+                *args,
+                target_nodes=self.storage.get_node_from_key(keys[0]),
+            )
+        results = list(pipeline.execute(raise_on_error=False))
+        if missing := [
+            idx
+            for idx, result in enumerate(results)
+            if isinstance(result, self.dependency.exceptions.NoScriptError)
+            or (self.use_functions and self.is_missing_script(result))
+        ]:
+            if self.scripts:
+                self.load_scripts()
+            else:
+                for script in {calls[idx][0] for idx in missing}:
+                    self.storage.script_load(script.script)
+            for idx, result in zip(
+                missing, self._run_scripts([calls[idx] for idx in missing])
+            ):
+                results[idx] = result
+        for result in results:
+            if isinstance(result, Exception):
+                raise result
+        return results
+
+    def _run_readonly_script(  # type: ignore[explicit-any]
+        self,
+        script: redis.commands.core.Script | PreloadedScript,
+        keys: list[str],
+        args: list[float],
+    ) -> Any:
+        """
+        Only ``EVALSHA_RO`` & ``EVAL_RO`` (redis 7 or higher) are sent to
+        replicas by the cluster client. The script cache of the replicas is
+        separate from the one of their primary, so the script is sent in
+        full if the replica doesn't know it yet.
+        """
+        if not self._reads_windows_from_replicas():
+            return script(keys, args)
+        try:
+            return self.storage_replica.evalsha_ro(script.sha, len(keys), *keys, *args)
+        except self.dependency.exceptions.NoScriptError:
+            return self.storage_replica.eval_ro(script.script, len(keys), *keys, *args)
+
+    def load_scripts(self) -> None:
+        """
+        Load all the lua scripts (or the library of functions) used by the
+        storage on all the primaries of the cluster (only used with
+        :paramref:`preload_scripts` or :paramref:`use_functions`)
+        """
+        if self.use_functions:
+            self.storage.function_load(self.function_library.code, replace=True)
+            return
+        for script in self.scripts:
+            self.storage.script_load(script.script)
+
+    def get_counts(self, keys: Sequence[str]) -> list[int]:
+        """
+        :param keys: the keys to get the counter values for
+        """
+        if not keys:
+            return []
+        connection = (
+            self.storage_replica if self.reads_from_replicas() else self.storage
+        )
+        values = connection.mget_nonatomic([self.prefixed_key(key) for key in keys])
+        return [int(value or 0) for value in values]
+
+    def incr_all(
+        self, entries: Sequence[tuple[str, int, int]], amount: int = 1
+    ) -> bool:
+        """
+        The keys of different limits are usually owned by different nodes
+        and can't be updated by a single lua script, so this check and
+        increment is not atomic (see :meth:`limits.storage.Storage.incr_all`)
         """
-        Redis Clusters are sharded and deleting across shards
-        can't be done atomically. Because of this, this reset loops over all
-        keys that are prefixed with ``self.PREFIX`` and calls delete on them,
-        one at a time.
+        return Storage.incr_all(self, entries, amount)
 
-        .. warning::
-         This operation was not tested with extremely large data sets.
-         On a large production based system, care should be taken with its
-         usage as it could be slow on very large data sets"""
+    def acquire_all_entries(
+        self, entries: Sequence[tuple[str, int, int]], amount: int = 1
+    ) -> bool:
+        """
+        Not atomic in a cluster
+        (see :meth:`limits.storage.MovingWindowSupport.acquire_all_entries`)
+        """
+        return MovingWindowSupport.acquire_all_entries(self, entries, amount)
 
+    def acquire_all_sliding_window_entries(
+        self, entries: Sequence[tuple[str, int, int]], amount: int = 1
+    ) -> bool:
+        """
+        Not atomic in a cluster (see
+        :meth:`limits.storage.SlidingWindowCounterSupport.acquire_all_sliding_window_entries`)
+        """
+        return SlidingWindowCounterSupport.acquire_all_sliding_window_entries(
+            self, entries, amount
+        )
+
+    def acquire_all_gcra_entries(
+        self, entries: Sequence[tuple[str, int, int]], amount: int = 1
+    ) -> bool:
+        """
+        Not atomic in a cluster
+        (see :meth:`limits.storage.GCRASupport.acquire_all_gcra_entries`)
+        """
+        return GCRASupport.acquire_all_gcra_entries(self, entries, amount)
+
+    def reset_iter(self, count: int = 1000) -> Iterator[int]:
+        """
+        Deletes the keys prefixed with ``self.PREFIX`` incrementally. Each
+        batch scans the next ``SCAN`` page of every primary and deletes the
+        keys found with one pipeline of ``UNLINK`` commands (keys in
+        different slots can't be deleted by the same command).
+
+        :param count: the ``COUNT`` hint passed to ``SCAN`` on each primary
+        :return: an iterator over the number of keys deleted by each batch
+        """
         prefix = self.prefixed_key("*")
-        count = 0
-        for primary in self.storage.get_primaries():
-            node = self.storage.get_redis_connection(primary)
-            keys = node.keys(prefix)
-            count += sum([node.delete(k.decode("utf-8")) for k in keys])
-        return count
+        cursors = {primary.name: 0 for primary in self.storage.get_primaries()}
+        while cursors:
+            keys = []
+            for name, cursor in list(cursors.items()):
+                next_cursors, found = self.storage.scan(
+                    cursor,
+                    match=prefix,
+                    count=count,
+                    target_nodes=self.storage.get_node(node_name=name),
+                )
+                keys.extend(found)
+                if next_cursors[name]:
+                    cursors[name] = next_cursors[name]
+                else:
+                    cursors.pop(name)
+            if keys:
+                pipeline = self.storage.pipeline()
+                for key in keys:
+                    pipeline.unlink(key)
+                yield sum(pipeline.execute())
@@ -8,7 +8,7 @@ from packaging.version import Version
 
 from limits.errors import ConfigurationError
 from limits.storage.redis import RedisStorage
-from limits.typing import RedisClient
+from limits.typing import Literal, RedisClient
 
 if TYPE_CHECKING:
     pass
@@ -21,6 +21,14 @@ if TYPE_CHECKING:
         " if :paramref:`uri` has the ``valkey+sentinel://`` schema"
     ),
 )
+@versionchanged(
+    version="4.7",
+    reason=(
+        "Added the :paramref:`moving_window_engine`, :paramref:`preload_scripts`"
+        ", :paramref:`use_functions`, :paramref:`max_replica_lag` &"
+        " :paramref:`clock` arguments"
+    ),
+)
 class RedisSentinelStorage(RedisStorage):
     """
     Rate limit storage with redis sentinel as backend
@@ -46,6 +54,11 @@ class RedisSentinelStorage(RedisStorage):
         use_replicas: bool = True,
         sentinel_kwargs: dict[str, float | str | bool] | None = None,
         wrap_exceptions: bool = False,
+        moving_window_engine: Literal["list", "zset", "packed"] = "list",
+        preload_scripts: bool = False,
+        use_functions: bool = False,
+        max_replica_lag: float | None = None,
+        clock: Literal["client", "server"] = "client",
         **options: float | str | bool,
     ) -> None:
         """
@@ -61,6 +74,23 @@ class RedisSentinelStorage(RedisStorage):
          :attr:`sentinel_kwargs` to :class:`redis.sentinel.Sentinel`
         :param wrap_exceptions: Whether to wrap storage exceptions in
          :exc:`limits.errors.StorageError` before raising it.
+        :param moving_window_engine: How the entries of the
+         :ref:`strategies:moving window` strategy are stored, either ``list``,
+         ``zset`` or ``packed`` (refer to :class:`~limits.storage.RedisStorage`)
+        :param preload_scripts: Whether to load the lua scripts ahead of time
+         and execute them with ``EVALSHA`` directly
+         (refer to :class:`~limits.storage.RedisStorage`)
+        :param use_functions: Whether to install the lua scripts as a library
+         of functions and execute them with ``FCALL``
+         (refer to :class:`~limits.storage.RedisStorage`)
+        :param max_replica_lag: If set (along with :paramref:`use_replicas`),
+         the moving & sliding window reads are sent to the replicas as well,
+         and read only operations are sent to the primary instead of the
+         replicas while any replica lags behind the primary by more than this
+         many seconds
+        :param clock: Where the timestamps of the :ref:`strategies:moving window`
+         & :ref:`strategies:gcra` strategies are read from, either ``client``
+         or ``server`` (refer to :class:`~limits.storage.RedisStorage`)
         :param options: all remaining keyword arguments are passed
          directly to the constructor of :class:`redis.sentinel.Sentinel`
         :raise ConfigurationError: when the redis library is not available
@@ -104,6 +134,11 @@ class RedisSentinelStorage(RedisStorage):
         self.storage: RedisClient = self.sentinel.master_for(self.service_name)
         self.storage_slave: RedisClient = self.sentinel.slave_for(self.service_name)
         self.use_replicas = use_replicas
+        self.max_replica_lag = max_replica_lag
+        self.moving_window_engine = moving_window_engine
+        self.preload_scripts = preload_scripts
+        self.use_functions = use_functions
+        self.clock = clock
         self.initialize_storage(uri)
 
     @property
@@ -117,4 +152,8 @@ class RedisSentinelStorage(RedisStorage):
         )
 
     def get_connection(self, readonly: bool = False) -> RedisClient:
-        return self.storage_slave if (readonly and self.use_replicas) else self.storage
+        return (
+            self.storage_slave
+            if (readonly and self.reads_from_replicas())
+            else self.storage
+        )
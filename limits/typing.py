@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from collections import Counter
-from collections.abc import Awaitable, Callable, Iterable
+from collections.abc import Awaitable, Callable, Iterable, Sequence
 from typing import (
     TYPE_CHECKING,
     Any,
@@ -53,6 +53,17 @@ class EmcacheClientP(Protocol):
 
     async def gets(self, key: bytes, return_flags: bool = False) -> ItemP | None: ...
 
+    async def cas(
+        self,
+        key: bytes,
+        value: bytes,
+        cas: int,
+        *,
+        flags: int = 0,
+        exptime: int = 0,
+        noreply: bool = False,
+    ) -> None: ...
+
     async def increment(
         self, key: bytes, value: int, *, noreply: bool = False
     ) -> int | None: ...
@@ -92,6 +103,18 @@ class MemcachedClientP(Protocol):
 
     def get_many(self, keys: Iterable[str]) -> dict[str, Any]: ...  # type:ignore[explicit-any]
 
+    def gets(self, key: str) -> tuple[bytes | None, bytes | None]: ...
+
+    def cas(
+        self,
+        key: str,
+        value: Serializable,
+        cas: bytes | None,
+        expire: int = 0,
+        noreply: bool | None = False,
+        flags: int | None = None,
+    ) -> bool | None: ...
+
     def incr(
         self, key: str, value: int, noreply: bool | None = False
     ) -> int | None: ...
@@ -118,25 +141,62 @@ class MemcachedClientP(Protocol):
         self, key: str, expire: int | None = 0, noreply: bool | None = None
     ) -> bool: ...
 
+    def raw_command(
+        self, command: str | bytes, end_tokens: str | bytes = "\r\n"
+    ) -> bytes: ...
+
+    def check_key(self, key: str) -> bytes: ...
+
 
 class RedisClientP(Protocol):
     def incrby(self, key: str, amount: int) -> int: ...
     def get(self, key: str) -> bytes | None: ...
+    def mget(self, keys: Sequence[str]) -> list[bytes | None]: ...
     def delete(self, key: str) -> int: ...
+    def unlink(self, *keys: str | bytes) -> int: ...
+    def scan(
+        self, cursor: int = 0, match: str | None = None, count: int | None = None
+    ) -> tuple[int, list[bytes]]: ...
     def ttl(self, key: str) -> int: ...
     def expire(self, key: str, seconds: int) -> bool: ...
     def ping(self) -> bool: ...
+    def info(self, section: str) -> dict[str, Any]: ...  # type: ignore[explicit-any]
     def register_script(self, script: bytes) -> redis.commands.core.Script: ...
+    def script_load(self, script: bytes) -> str: ...
+    def evalsha(  # type: ignore[explicit-any]
+        self, sha: str, numkeys: int, *keys_and_args: str | float
+    ) -> Any: ...
+    def function_load(self, code: str, replace: bool = False) -> str: ...
+    def fcall(  # type: ignore[explicit-any]
+        self, function: str, numkeys: int, *keys_and_args: str | float
+    ) -> Any: ...
+    def fcall_ro(  # type: ignore[explicit-any]
+        self, function: str, numkeys: int, *keys_and_args: str | float
+    ) -> Any: ...
+    def pipeline(self, transaction: bool = True) -> redis.client.Pipeline: ...
 
 
 class AsyncRedisClientP(Protocol):
     async def incrby(self, key: str, amount: int) -> int: ...
     async def get(self, key: str) -> bytes | None: ...
+    async def mget(self, keys: Sequence[str]) -> list[bytes | None]: ...
     async def delete(self, key: str) -> int: ...
+    async def unlink(self, *keys: str | bytes) -> int: ...
+    async def scan(
+        self, cursor: int = 0, match: str | None = None, count: int | None = None
+    ) -> tuple[int, list[bytes]]: ...
     async def ttl(self, key: str) -> int: ...
     async def expire(self, key: str, seconds: int) -> bool: ...
     async def ping(self) -> bool: ...
     def register_script(self, script: bytes) -> redis.commands.core.Script: ...
+    async def function_load(self, code: str, replace: bool = False) -> str: ...
+    async def fcall(  # type: ignore[explicit-any]
+        self, function: str, numkeys: int, *keys_and_args: str | float
+    ) -> Any: ...
+    async def fcall_ro(  # type: ignore[explicit-any]
+        self, function: str, numkeys: int, *keys_and_args: str | float
+    ) -> Any: ...
+    def pipeline(self, transaction: bool = True) -> redis.asyncio.client.Pipeline: ...
 
 
 RedisClient: TypeAlias = RedisClientP
@@ -169,6 +229,7 @@ __all__ = [
     "R",
     "R_co",
     "RedisClient",
+    "Sequence",
     "Serializable",
     "TypeAlias",
     "TypeVar",
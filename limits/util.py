@@ -3,16 +3,20 @@
 from __future__ import annotations
 
 import dataclasses
+import functools
+import hashlib
 import importlib.resources
 import re
 import sys
+import time
 from collections import UserDict
 from types import ModuleType
 from typing import TYPE_CHECKING
 
+from deprecated.sphinx import versionadded, versionchanged
 from packaging.version import Version
 
-from limits.typing import NamedTuple
+from limits.typing import Any, NamedTuple, Protocol
 
 from .errors import ConfigurationError
 from .limits import GRANULARITIES, RateLimitItem
@@ -43,6 +47,47 @@ class WindowStats(NamedTuple):
     remaining: int
 
 
+@versionadded(version="4.7")
+class Clock(Protocol):
+    """
+    Source of the current time of the rate limiters and the in memory
+    storages, which can be replaced (for example in tests or benchmarks)
+    to control the passage of time
+    """
+
+    def time(self) -> float:
+        """
+        :return: the current time as seconds since the Epoch. The returned
+         values should never go backwards.
+        """
+        ...
+
+
+class SystemClock:
+    """
+    The default :class:`Clock` which reads the system time
+    """
+
+    def time(self) -> float:
+        return time.time()
+
+
+class RedisFunctionLibrary(NamedTuple):
+    """
+    lua scripts bundled as a redis functions library
+    """
+
+    #: Name of the library, which is fixed so that loading the library
+    #: replaces the one loaded by other versions of the scripts
+    name: str
+    #: Code of the library passed to ``FUNCTION LOAD``
+    code: str
+    #: Mapping of the source of each script to the name of its function
+    functions: dict[bytes, str]
+    #: Names of the functions that can be called with ``FCALL_RO``
+    readonly: frozenset[str]
+
+
 @dataclasses.dataclass
 class Dependency:
     name: str
@@ -154,44 +199,138 @@ def get_package_data(path: str) -> bytes:
     return importlib.resources.files("limits").joinpath(path).read_bytes()
 
 
+def get_replication_lag(info: dict[str, Any]) -> float:  # type: ignore[explicit-any]
+    """
+    The lag (in seconds) of the most lagging replica described by the
+    replication section of ``INFO`` of a redis primary, or infinity if the
+    primary has no replicas
+    """
+    lags = [
+        float(value["lag"])
+        for key, value in info.items()
+        if re.fullmatch("slave[0-9]+", str(key)) and isinstance(value, dict)
+    ]
+    return max(lags, default=float("inf"))
+
+
+@functools.cache
+def get_redis_function_library(
+    path: str, readonly: tuple[str, ...] = ()
+) -> RedisFunctionLibrary:
+    """
+    Bundle the lua scripts in :paramref:`path` as a redis functions library
+    with one function per script
+
+    :param path: the package directory containing the ``.lua`` scripts
+    :param readonly: the names (without extension) of the scripts that don't
+     write any keys
+    """
+    scripts = {
+        resource.name.removesuffix(".lua"): resource.read_bytes()
+        for resource in sorted(
+            importlib.resources.files("limits").joinpath(path).iterdir(),
+            key=lambda resource: resource.name,
+        )
+        if resource.name.endswith(".lua")
+    }
+    name = "limits"
+    # the functions are named after the code of the library so that a client
+    # using different scripts reloads its own version instead of calling these
+    prefix = f"{name}_{hashlib.sha1(b''.join(scripts.values())).hexdigest()[:12]}"
+    code = [f"#!lua name={name}"]
+    for stem, script in scripts.items():
+        flags = "{'no-writes'}" if stem in readonly else "{}"
+        code.append(
+            f"redis.register_function{{function_name='{prefix}_{stem}',"
+            f" flags={flags}, callback=function(KEYS, ARGV)\n"
+            f"{script.decode()}\nend}}"
+        )
+    return RedisFunctionLibrary(
+        name,
+        "\n".join(code),
+        {script: f"{prefix}_{stem}" for stem, script in scripts.items()},
+        frozenset(f"{prefix}_{stem}" for stem in readonly),
+    )
+
+
+@versionchanged(
+    version="4.7",
+    reason="The parsing of the most recently used strings is cached",
+)
 def parse_many(limit_string: str) -> list[RateLimitItem]:
     """
     parses rate limits in string notation containing multiple rate limits
     (e.g. ``1/second; 5/minute``)
 
+    The parsing of the most recently used strings is cached, but every
+    call returns new :class:`~limits.RateLimitItem` instances.
+
     :param limit_string: rate limit string using :ref:`ratelimit-string`
     :raise ValueError: if the string notation is invalid.
 
     """
 
-    if not (isinstance(limit_string, str) and EXPR.match(limit_string)):
-        raise ValueError(f"couldn't parse rate limit string '{limit_string}'")
-    limits = []
-
-    for limit in SEPARATORS.split(limit_string):
-        match = SINGLE_EXPR.match(limit)
-
-        if match:
-            amount, _, multiples, granularity_string = match.groups()
-            granularity = granularity_from_string(granularity_string)
-            limits.append(
-                granularity(int(amount), multiples and int(multiples) or None)
-            )
+    if not isinstance(limit_string, str):
+        raise ValueError(  # noqa: TRY004
+            f"couldn't parse rate limit string '{limit_string}'"
+        )
 
-    return limits
+    return [
+        granularity(amount, multiples)
+        for granularity, amount, multiples in _parse_many(limit_string)
+    ]
 
 
+@versionchanged(
+    version="4.7",
+    reason="The parsing of the most recently used strings is cached",
+)
 def parse(limit_string: str) -> RateLimitItem:
     """
     parses a single rate limit in string notation
     (e.g. ``1/second`` or ``1 per second``)
 
+    The parsing is cached like for :func:`parse_many`.
+
     :param limit_string: rate limit string using :ref:`ratelimit-string`
     :raise ValueError: if the string notation is invalid.
 
     """
 
-    return list(parse_many(limit_string))[0]
+    if not isinstance(limit_string, str):
+        raise ValueError(  # noqa: TRY004
+            f"couldn't parse rate limit string '{limit_string}'"
+        )
+
+    granularity, amount, multiples = _parse_many(limit_string)[0]
+
+    return granularity(amount, multiples)
+
+
+@functools.lru_cache(maxsize=1024)
+def _parse_many(
+    limit_string: str,
+) -> tuple[tuple[type[RateLimitItem], int, int | None], ...]:
+    """
+    The granularity, amount and multiples of each rate limit in
+    :paramref:`limit_string`, cached as plain values so that the callers
+    build their own :class:`~limits.RateLimitItem` instances
+    """
+    if not EXPR.match(limit_string):
+        raise ValueError(f"couldn't parse rate limit string '{limit_string}'")
+    limits = []
+
+    for limit in SEPARATORS.split(limit_string):
+        match = SINGLE_EXPR.match(limit)
+
+        if match:
+            amount, _, multiples, granularity_string = match.groups()
+            granularity = GRANULARITIES[granularity_string.lower()]
+            limits.append(
+                (granularity, int(amount), multiples and int(multiples) or None)
+            )
+
+    return tuple(limits)
 
 
 def granularity_from_string(granularity_string: str) -> type[RateLimitItem]:
@@ -201,6 +340,8 @@ def granularity_from_string(granularity_string: str) -> type[RateLimitItem]:
     :raise ValueError:
     """
 
+    if granularity := GRANULARITIES.get(granularity_string.lower()):
+        return granularity
     for granularity in GRANULARITIES.values():
         if granularity.check_granularity_string(granularity_string):
             return granularity
@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from limits.aio.storage.coalescer import Coalescer
+from limits.errors import ConfigurationError
+
+
+class TestCoalescer:
+    async def test_concurrent_entries_batched(self):
+        batches = []
+
+        async def double(entries):
+            batches.append(entries)
+            return [entry * 2 for entry in entries]
+
+        coalescer = Coalescer()
+        assert await asyncio.gather(
+            *(coalescer.submit(double, i) for i in range(5))
+        ) == [
+            0,
+            2,
+            4,
+            6,
+            8,
+        ]
+        assert await coalescer.submit(double, 5) == 10
+        assert batches == [[0, 1, 2, 3, 4], [5]]
+
+    async def test_window(self):
+        batches = []
+
+        async def echo(entries):
+            batches.append(entries)
+            return entries
+
+        async def submit(entry, delay):
+            await asyncio.sleep(delay)
+            return await coalescer.submit(echo, entry)
+
+        coalescer = Coalescer(window=0.1)
+        assert await asyncio.gather(submit(1, 0), submit(2, 0.05), submit(3, 0.2)) == [
+            1,
+            2,
+            3,
+        ]
+        assert batches == [[1, 2], [3]]
+
+    async def test_max_batch_size(self):
+        batches = []
+
+        async def echo(entries):
+            batches.append(entries)
+            return entries
+
+        coalescer = Coalescer(window=60, max_batch_size=2)
+        assert await asyncio.gather(*(coalescer.submit(echo, i) for i in range(4))) == [
+            0,
+            1,
+            2,
+            3,
+        ]
+        assert batches == [[0, 1], [2, 3]]
+
+    async def test_exception(self):
+        async def fail(entries):
+            raise ValueError("failed")
+
+        coalescer = Coalescer()
+        results = await asyncio.gather(
+            coalescer.submit(fail, 1), coalescer.submit(fail, 2), return_exceptions=True
+        )
+        assert all(isinstance(result, ValueError) for result in results)
+
+    async def test_missing_results(self):
+        async def truncate(entries):
+            return entries[:1]
+
+        coalescer = Coalescer()
+        results = await asyncio.wait_for(
+            asyncio.gather(
+                coalescer.submit(truncate, 1),
+                coalescer.submit(truncate, 2),
+                return_exceptions=True,
+            ),
+            timeout=1,
+        )
+        assert all(isinstance(result, ValueError) for result in results)
+
+    @pytest.mark.parametrize("window, max_batch_size", [(-1, 1000), (0, 0)])
+    async def test_invalid(self, window, max_batch_size):
+        with pytest.raises(ConfigurationError):
+            Coalescer(window, max_batch_size)
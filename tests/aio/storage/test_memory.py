@@ -1,8 +1,10 @@
 from __future__ import annotations
 
+import asyncio
 import pickle
 
 from limits.aio.storage import MemoryStorage
+from limits.storage import storage_from_string
 
 
 class TestSerialization:
@@ -15,3 +17,29 @@ class TestSerialization:
         assert 2 == await restored.incr("test", 60)
         assert await restored.acquire_entry("moving_test", 2, 60)
         assert not await restored.acquire_entry("moving_test", 2, 60)
+
+
+class TestExpiry:
+    async def test_expired_keys_are_evicted(self):
+        storage = MemoryStorage()
+        await storage.incr("short", 0.1)
+        await storage.incr("long", 60)
+        await storage.acquire_entry("window", 10, 0.1)
+        await asyncio.sleep(0.2)
+        assert "short" not in storage.storage
+        assert "window" not in storage.events
+        assert storage.storage["long"] == 1
+        assert [key for _, key in storage._expiry_heap] == ["long"]
+
+
+class TestMaxKeys:
+    async def test_least_recently_used_evicted(self):
+        storage = storage_from_string("async+memory://?max_keys=10")
+        for i in range(10):
+            await storage.incr(f"key/{i}", 60)
+        await storage.incr("key/0", 60)
+        assert await storage.acquire_entry("window", 10, 60)
+        assert storage.evictions == 1
+        assert await storage.get("key/1") == 0
+        assert await storage.get("key/0") == 2
+        assert await storage.get_num_acquired("window", 60) == 1
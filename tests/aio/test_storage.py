@@ -1,8 +1,10 @@
 from __future__ import annotations
 
+import asyncio
 import time
 
 import pytest
+from packaging.version import Version
 from pytest_lazy_fixtures import lf
 
 from limits import RateLimitItemPerMinute, RateLimitItemPerSecond
@@ -23,7 +25,11 @@ from limits.aio.strategies import (
 )
 from limits.errors import StorageError
 from limits.storage import storage_from_string
-from tests.utils import async_fixed_start
+from tests.utils import (
+    async_fixed_start,
+    async_moving_window_storage,
+    async_sliding_window_counter_storage,
+)
 
 
 @pytest.mark.asyncio
@@ -316,6 +322,17 @@ class TestConcreteStorages:
             await storage.incr(limit2.key_for(str(i)), limit2.get_expiry())
         assert await storage.reset() == 20
 
+    async def test_storage_reset_iter(self, uri, args, expected_instance, fixture):
+        storage = storage_from_string(uri, **args)
+        if not isinstance(storage, RedisStorage):
+            pytest.skip("Incremental reset only supported for redis")
+        for i in range(250):
+            await storage.incr(f"key/{i}", 60)
+        batches = [deleted async for deleted in storage.reset_iter(count=50)]
+        assert len(batches) > 1
+        assert sum(batches) == 250
+        assert await storage.get("key/0") == 0
+
     async def test_storage_clear(self, uri, args, expected_instance, fixture):
         limit = RateLimitItemPerMinute(10)
         storage = storage_from_string(uri, **args)
@@ -446,3 +463,151 @@ class TestStorageErrors:
             )
 
         self.assert_exception(exc.value, wrap_exceptions)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "uri, args, fixture",
+    [
+        pytest.param(
+            "async+redis://localhost:7379",
+            {},
+            lf("redis_basic"),
+            marks=pytest.mark.redis,
+            id="redis",
+        ),
+        pytest.param(
+            "async+redis://localhost:7379",
+            {"implementation": "redispy"},
+            lf("redis_basic"),
+            marks=pytest.mark.redis,
+            id="redispy",
+        ),
+        pytest.param(
+            "async+memcached://localhost:22122",
+            {},
+            lf("memcached"),
+            marks=pytest.mark.memcached,
+            id="memcached",
+        ),
+        pytest.param(
+            "async+mongodb://localhost:37017/",
+            {},
+            lf("mongodb"),
+            marks=pytest.mark.mongodb,
+            id="mongodb",
+        ),
+    ],
+)
+class TestCoalescing:
+    async def test_coalesced_counters(self, uri, args, fixture):
+        storage = storage_from_string(uri, coalesce_window=0, **args)
+        counts = await asyncio.gather(*(storage.incr("counter", 60) for _ in range(10)))
+        assert sorted(counts) == list(range(1, 11))
+        assert await asyncio.gather(storage.get("counter"), storage.get("other")) == [
+            10,
+            0,
+        ]
+
+    async def test_coalesced_sliding_window(self, uri, args, fixture):
+        storage = storage_from_string(uri, coalesce_window=0.01, **args)
+        limiter = SlidingWindowCounterRateLimiter(storage)
+        limit = RateLimitItemPerMinute(5)
+        hits = await asyncio.gather(*(limiter.hit(limit, "key") for _ in range(10)))
+        assert hits.count(True) == 5
+        assert (await limiter.get_window_stats(limit, "key")).remaining == 0
+
+    async def test_coalesced_moving_window(self, uri, args, fixture):
+        storage = storage_from_string(uri, coalesce_window=0, **args)
+        if not isinstance(storage, MovingWindowSupport):
+            pytest.skip("storage doesn't support the moving window strategy")
+        limiter = MovingWindowRateLimiter(storage)
+        limit = RateLimitItemPerMinute(5)
+        hits = await asyncio.gather(*(limiter.hit(limit, "key") for _ in range(10)))
+        assert hits.count(True) == 5
+
+
+@pytest.mark.asyncio
+class TestRelease:
+    @async_moving_window_storage
+    async def test_release_entry(self, uri, args, fixture):
+        storage = storage_from_string(uri, **args)
+        assert await storage.acquire_entry("key", 10, 60, amount=3)
+        assert await storage.acquire_entry("key", 10, 60, amount=4)
+        await storage.release_entry("key", 60, amount=5)
+        assert (await storage.get_moving_window("key", 10, 60))[1] == 2
+        assert await storage.acquire_entry("key", 10, 60, amount=8)
+        await storage.release_entry("key", 60, amount=20)
+        assert (await storage.get_moving_window("key", 10, 60))[1] == 0
+        await storage.release_entry("missing", 60)
+
+    @async_sliding_window_counter_storage
+    async def test_release_sliding_window_entry(self, uri, args, fixture):
+        storage = storage_from_string(uri, **args)
+        assert await storage.acquire_sliding_window_entry("key", 10, 60, amount=7)
+        await storage.release_sliding_window_entry("key", 60, amount=5)
+        assert (await storage.get_sliding_window("key", 60))[2] == 2
+        await storage.release_sliding_window_entry("key", 60, amount=5)
+        assert (await storage.get_sliding_window("key", 60))[2] == 0
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "args",
+    [
+        pytest.param({}, marks=pytest.mark.redis, id="redis"),
+        pytest.param(
+            {"implementation": "redispy"}, marks=pytest.mark.redis, id="redispy"
+        ),
+    ],
+)
+class TestRedisFunctions:
+    @pytest.fixture(autouse=True)
+    async def functions_supported(self, redis_basic):
+        connection = RedisStorage(
+            "async+redis://localhost:7379"
+        ).bridge.get_connection()
+        if Version((await connection.info())["redis_version"]) < Version("7.0"):
+            pytest.skip("redis functions require redis 7 or higher")
+
+    async def test_library_loaded(self, args):
+        storage = RedisStorage(
+            "async+redis://localhost:7379", use_functions=True, **args
+        )
+        assert await storage.incr("counter", 60) == 1
+        await storage.bridge.get_connection().function_flush()
+        assert await storage.incr_many([("counter", 60, 1)] * 2) == [2, 3]
+        await storage.bridge.get_connection().script_flush()
+        assert await storage.incr("counter", 60) == 4
+
+    async def test_moving_window(self, args):
+        storage = RedisStorage(
+            "async+redis://localhost:7379", use_functions=True, **args
+        )
+        limiter = MovingWindowRateLimiter(storage)
+        limit = RateLimitItemPerMinute(2)
+        assert storage.bridge.lua_moving_window.readonly
+        assert await limiter.hit(limit, "key")
+        await storage.bridge.get_connection().function_flush()
+        assert (await limiter.get_window_stats(limit, "key")).remaining == 1
+        assert await limiter.hit_many([(limit, ["key"], 1)] * 2) == [True, False]
+
+
+@pytest.mark.asyncio
+@pytest.mark.redis_cluster
+@pytest.mark.parametrize("implementation", ("coredis", "redispy"))
+class TestRedisClusterBatches:
+    async def test_scripts_reloaded(self, redis_cluster, implementation):
+        storage = RedisClusterStorage(
+            "async+redis+cluster://localhost:7001", implementation=implementation
+        )
+        entries = [(f"key/{i}", 60, 1) for i in range(20)]
+        assert await storage.incr_many(entries) == [1] * 20
+        redis_cluster.script_flush()
+        assert await storage.incr_many(entries) == [2] * 20
+        assert (
+            await storage.acquire_entries(
+                [(f"window/{i}", 1, 60, 1) for i in range(20)]
+            )
+            == [True] * 20
+        )
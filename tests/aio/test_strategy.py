@@ -7,9 +7,12 @@ import pytest
 
 from limits.aio.strategies import (
     FixedWindowRateLimiter,
+    GCRARateLimiter,
+    LeasingRateLimiter,
     MovingWindowRateLimiter,
     SlidingWindowCounterRateLimiter,
 )
+from limits.errors import ConfigurationError
 from limits.limits import (
     RateLimitItemPerHour,
     RateLimitItemPerMinute,
@@ -18,6 +21,7 @@ from limits.limits import (
 from limits.storage import storage_from_string
 from limits.storage.base import TimestampedSlidingWindow
 from tests.utils import (
+    ManualClock,
     async_all_storage,
     async_fixed_start,
     async_moving_window_storage,
@@ -64,6 +68,66 @@ class TestAsyncFixedWindow:
         assert not await limiter.test(limit, "k2", cost=6)
         assert not await limiter.hit(limit, "k2", cost=6)
 
+    @async_fixed_start
+    async def test_fixed_window_hit_many(self, uri, args, fixture):
+        storage = storage_from_string(uri, **args)
+        limiter = FixedWindowRateLimiter(storage)
+        per_minute = RateLimitItemPerMinute(10)
+        per_hour = RateLimitItemPerHour(5)
+        assert await limiter.hit_many([]) == []
+        assert await limiter.hit_many(
+            [
+                (per_minute, ["k1"], 5),
+                (per_hour, ["k1"], 6),
+                (per_minute, ["k1"], 5),
+                (per_minute, ["k1"], 1),
+                (per_hour, (), 1),
+            ]
+        ) == [True, False, True, False, True]
+        assert await limiter.test_many(
+            [
+                (per_minute, ["k1"], 1),
+                (per_hour, ["k1"], 1),
+                (per_hour, ["k2"], 5),
+                (per_hour, (), 4),
+                (per_hour, (), 5),
+            ]
+        ) == [False, False, True, True, False]
+        assert (await limiter.get_window_stats(per_minute, "k1")).remaining == 0
+
+    @async_fixed_start
+    async def test_fixed_window_hit_all(self, uri, args, fixture):
+        storage = storage_from_string(uri, **args)
+        limiter = FixedWindowRateLimiter(storage)
+        per_minute = RateLimitItemPerMinute(2)
+        per_hour = RateLimitItemPerHour(3)
+        assert await limiter.hit_all([], "k1")
+        assert await limiter.hit_all([per_minute, per_hour], "k1")
+        assert await limiter.hit_all([per_minute, per_hour], "k1")
+        assert not await limiter.hit_all([per_minute, per_hour], "k1")
+        assert (await limiter.get_window_stats(per_hour, "k1")).remaining == 1
+        assert not await limiter.hit_all([per_minute, per_hour], "k2", cost=3)
+        assert (await limiter.get_window_stats(per_hour, "k2")).remaining == 3
+
+    @async_fixed_start
+    async def test_fixed_window_hit_with_stats(self, uri, args, fixture):
+        storage = storage_from_string(uri, **args)
+        limiter = FixedWindowRateLimiter(storage)
+        limit = RateLimitItemPerMinute(2)
+        for remaining in [1, 0]:
+            allowed, stats = await limiter.hit_with_stats(limit, "k1")
+            assert allowed
+            assert stats.remaining == remaining
+            assert stats.reset_time == pytest.approx(
+                (await limiter.get_window_stats(limit, "k1")).reset_time, abs=1
+            )
+        allowed, stats = await limiter.hit_with_stats(limit, "k1")
+        assert not allowed
+        assert stats.remaining == 0
+        allowed, stats = await limiter.hit_with_stats(limit, "k2", cost=3)
+        assert not allowed
+        assert stats.remaining == 0
+
     @async_fixed_start
     @pytest.mark.flaky
     async def test_test_fixed_window(self, uri, args, fixture):
@@ -156,6 +220,56 @@ class TestAsyncMovingWindow:
         await limiter.clear(many_per_min)
         assert await limiter.hit(many_per_min)
 
+    async def test_moving_window_hit_many(self, uri, args, fixture):
+        storage = storage_from_string(uri, **args)
+        limiter = MovingWindowRateLimiter(storage)
+        limit = RateLimitItemPerMinute(5)
+        assert await limiter.hit_many([]) == []
+        assert await limiter.hit_many(
+            [
+                (limit, ["k1"], 3),
+                (limit, ["k1"], 3),
+                (limit, ["k1"], 2),
+                (limit, ["k2"], 6),
+            ]
+        ) == [True, False, True, False]
+        assert await limiter.test_many([(limit, ["k1"], 1), (limit, ["k2"], 5)]) == [
+            False,
+            True,
+        ]
+        assert (await limiter.get_window_stats(limit, "k1")).remaining == 0
+
+    async def test_moving_window_hit_all(self, uri, args, fixture):
+        storage = storage_from_string(uri, **args)
+        limiter = MovingWindowRateLimiter(storage)
+        per_minute = RateLimitItemPerMinute(2)
+        per_hour = RateLimitItemPerHour(3)
+        assert await limiter.hit_all([], "k1")
+        assert await limiter.hit_all([per_minute, per_hour], "k1")
+        assert await limiter.hit_all([per_minute, per_hour], "k1")
+        assert not await limiter.hit_all([per_minute, per_hour], "k1")
+        assert (await limiter.get_window_stats(per_hour, "k1")).remaining == 1
+        assert not await limiter.hit_all([per_minute, per_hour], "k2", cost=3)
+        assert (await limiter.get_window_stats(per_hour, "k2")).remaining == 3
+
+    async def test_moving_window_hit_with_stats(self, uri, args, fixture):
+        storage = storage_from_string(uri, **args)
+        limiter = MovingWindowRateLimiter(storage)
+        limit = RateLimitItemPerMinute(2)
+        for remaining in [1, 0]:
+            allowed, stats = await limiter.hit_with_stats(limit, "k1")
+            assert allowed
+            assert stats.remaining == remaining
+            assert stats.reset_time == pytest.approx(
+                (await limiter.get_window_stats(limit, "k1")).reset_time, abs=1
+            )
+        allowed, stats = await limiter.hit_with_stats(limit, "k1")
+        assert not allowed
+        assert stats.remaining == 0
+        allowed, stats = await limiter.hit_with_stats(limit, "k2", cost=3)
+        assert not allowed
+        assert stats.remaining == 2
+
     async def test_test_moving_window(self, uri, args, fixture):
         storage = storage_from_string(uri, **args)
         limit = RateLimitItemPerHour(2, 1)
@@ -344,6 +458,74 @@ class TestAsyncSlidingWindow:
         assert not await limiter.test(limit, "k2", cost=6)
         assert not await limiter.hit(limit, "k2", cost=6)
 
+    @async_fixed_start
+    async def test_sliding_window_counter_hit_many(self, uri, args, fixture):
+        storage = storage_from_string(uri, **args)
+        limiter = SlidingWindowCounterRateLimiter(storage)
+        limit = RateLimitItemPerMinute(10, 2)
+        if isinstance(storage, TimestampedSlidingWindow):
+            # Avoid testing the behaviour when the window is about to be reset
+            ttl = timestamp_based_key_ttl(limit)
+            if ttl < 0.5:
+                time.sleep(ttl)
+        assert await limiter.hit_many([]) == []
+        assert await limiter.hit_many(
+            [
+                (limit, ["k1"], 5),
+                (limit, ["k1"], 5),
+                (limit, ["k1"], 1),
+                (limit, ["k2"], 11),
+            ]
+        ) == [True, True, False, False]
+        assert await limiter.test_many([(limit, ["k1"], 1), (limit, ["k2"], 10)]) == [
+            False,
+            True,
+        ]
+        assert (await limiter.get_window_stats(limit, "k1")).remaining == 0
+
+    @async_fixed_start
+    async def test_sliding_window_counter_hit_all(self, uri, args, fixture):
+        storage = storage_from_string(uri, **args)
+        limiter = SlidingWindowCounterRateLimiter(storage)
+        per_minute = RateLimitItemPerMinute(2)
+        per_hour = RateLimitItemPerHour(3)
+        if isinstance(storage, TimestampedSlidingWindow):
+            # Avoid testing the behaviour when the window is about to be reset
+            ttl = timestamp_based_key_ttl(per_minute)
+            if ttl < 0.5:
+                time.sleep(ttl)
+        assert await limiter.hit_all([], "k1")
+        assert await limiter.hit_all([per_minute, per_hour], "k1")
+        assert await limiter.hit_all([per_minute, per_hour], "k1")
+        assert not await limiter.hit_all([per_minute, per_hour], "k1")
+        assert (await limiter.get_window_stats(per_hour, "k1")).remaining == 1
+        assert not await limiter.hit_all([per_minute, per_hour], "k2", cost=3)
+        assert (await limiter.get_window_stats(per_hour, "k2")).remaining == 3
+
+    @async_fixed_start
+    async def test_sliding_window_counter_hit_with_stats(self, uri, args, fixture):
+        storage = storage_from_string(uri, **args)
+        limiter = SlidingWindowCounterRateLimiter(storage)
+        limit = RateLimitItemPerMinute(2)
+        if isinstance(storage, TimestampedSlidingWindow):
+            # Avoid testing the behaviour when the window is about to be reset
+            ttl = timestamp_based_key_ttl(limit)
+            if ttl < 0.5:
+                time.sleep(ttl)
+        for remaining in [1, 0]:
+            allowed, stats = await limiter.hit_with_stats(limit, "k1")
+            assert allowed
+            assert stats.remaining == remaining
+            assert stats.reset_time == pytest.approx(
+                (await limiter.get_window_stats(limit, "k1")).reset_time, abs=1
+            )
+        allowed, stats = await limiter.hit_with_stats(limit, "k1")
+        assert not allowed
+        assert stats.remaining == 0
+        allowed, stats = await limiter.hit_with_stats(limit, "k2", cost=3)
+        assert not allowed
+        assert stats.remaining == 2
+
     async def test_test_sliding_window_counter(self, uri, args, fixture):
         storage = storage_from_string(uri, **args)
         limit = RateLimitItemPerHour(2, 1)
@@ -353,3 +535,239 @@ class TestAsyncSlidingWindow:
         assert await limiter.hit(limit)
         assert not await limiter.test(limit)
         assert not await limiter.hit(limit)
+
+
+@pytest.mark.asyncio
+@async_all_storage
+class TestAsyncGCRA:
+    async def test_gcra_empty_stats(self, uri, args, fixture):
+        storage = storage_from_string(uri, **args)
+        limiter = GCRARateLimiter(storage)
+        limit = RateLimitItemPerSecond(10, 2)
+        assert (await limiter.get_window_stats(limit)).remaining == 10
+        assert (await limiter.get_window_stats(limit)).reset_time == pytest.approx(
+            time.time(), 1e-2
+        )
+
+    async def test_gcra_stats(self, uri, args, fixture):
+        storage = storage_from_string(uri, **args)
+        limiter = GCRARateLimiter(storage)
+        limit = RateLimitItemPerMinute(2)
+        assert await limiter.hit(limit, "key")
+        assert (await limiter.get_window_stats(limit, "key")).remaining == 1
+        assert (
+            await limiter.get_window_stats(limit, "key")
+        ).reset_time - time.time() == pytest.approx(30, 1e-2)
+        assert await limiter.hit(limit, "key")
+        assert not await limiter.hit(limit, "key")
+        assert (await limiter.get_window_stats(limit, "key")).remaining == 0
+        assert (
+            await limiter.get_window_stats(limit, "key")
+        ).reset_time - time.time() == pytest.approx(30, 1e-2)
+
+    async def test_gcra(self, uri, args, fixture):
+        storage = storage_from_string(uri, **args)
+        limiter = GCRARateLimiter(storage)
+        limit = RateLimitItemPerSecond(10, 2)
+
+        assert all([await limiter.hit(limit) for _ in range(10)])
+        assert not await limiter.hit(limit)
+        # one entry becomes available every 200ms
+        time.sleep(0.25)
+        assert await limiter.hit(limit)
+        assert not await limiter.hit(limit)
+
+    async def test_gcra_multiple_cost(self, uri, args, fixture):
+        storage = storage_from_string(uri, **args)
+        limiter = GCRARateLimiter(storage)
+        limit = RateLimitItemPerSecond(10, 2)
+
+        assert not await limiter.hit(limit, "k1", cost=11)
+        assert await limiter.hit(limit, "k2", cost=5)
+        assert not await limiter.test(limit, "k2", cost=6)
+        assert not await limiter.hit(limit, "k2", cost=6)
+        assert await limiter.hit(limit, "k2", cost=5)
+        assert (await limiter.get_window_stats(limit, "k2")).remaining == 0
+        time.sleep(0.45)
+        assert (await limiter.get_window_stats(limit, "k2")).remaining == 2
+        assert await limiter.hit(limit, "k2", cost=2)
+        assert not await limiter.hit(limit, "k2")
+
+    async def test_gcra_hit_many(self, uri, args, fixture):
+        storage = storage_from_string(uri, **args)
+        limiter = GCRARateLimiter(storage)
+        limit = RateLimitItemPerMinute(5)
+        assert await limiter.hit_many(
+            [
+                (limit, ["k1"], 3),
+                (limit, ["k1"], 3),
+                (limit, ["k1"], 2),
+                (limit, ["k2"], 6),
+            ]
+        ) == [True, False, True, False]
+        assert await limiter.test_many([(limit, ["k1"], 1), (limit, ["k2"], 5)]) == [
+            False,
+            True,
+        ]
+        assert await limiter.hit_all([limit, RateLimitItemPerHour(3)], "k3", cost=3)
+        assert not await limiter.hit_all([limit, RateLimitItemPerHour(3)], "k3")
+        assert (await limiter.get_window_stats(limit, "k3")).remaining == 2
+
+    async def test_gcra_hit_all(self, uri, args, fixture):
+        storage = storage_from_string(uri, **args)
+        limiter = GCRARateLimiter(storage)
+        per_minute = RateLimitItemPerMinute(2)
+        per_hour = RateLimitItemPerHour(3)
+        assert await limiter.hit_all([], "k1")
+        assert await limiter.hit_all([per_hour, per_minute], "k1")
+        assert await limiter.hit_all([per_hour, per_minute], "k1")
+        assert not await limiter.hit_all([per_hour, per_minute], "k1")
+        assert (await limiter.get_window_stats(per_hour, "k1")).remaining == 1
+        assert not await limiter.hit_all([per_hour, per_minute], "k2", cost=3)
+        assert (await limiter.get_window_stats(per_hour, "k2")).remaining == 3
+        assert not await limiter.hit_all([per_minute, per_minute], "k3", cost=2)
+        assert (await limiter.get_window_stats(per_minute, "k3")).remaining == 2
+
+    async def test_gcra_hit_with_stats(self, uri, args, fixture):
+        storage = storage_from_string(uri, **args)
+        limiter = GCRARateLimiter(storage)
+        limit = RateLimitItemPerMinute(2)
+        for remaining in [1, 0]:
+            allowed, stats = await limiter.hit_with_stats(limit, "k1")
+            assert allowed
+            assert stats.remaining == remaining
+            assert stats.reset_time == pytest.approx(
+                (await limiter.get_window_stats(limit, "k1")).reset_time, abs=1
+            )
+        allowed, stats = await limiter.hit_with_stats(limit, "k1")
+        assert not allowed
+        assert stats.remaining == 0
+        allowed, stats = await limiter.hit_with_stats(limit, "k2", cost=3)
+        assert not allowed
+        assert stats.remaining == 2
+
+    async def test_test_gcra(self, uri, args, fixture):
+        storage = storage_from_string(uri, **args)
+        limit = RateLimitItemPerHour(2, 1)
+        limiter = GCRARateLimiter(storage)
+        assert await limiter.hit(limit)
+        assert await limiter.test(limit)
+        assert await limiter.hit(limit)
+        assert not await limiter.test(limit)
+        assert not await limiter.hit(limit)
+
+
+@pytest.mark.asyncio
+class TestAsyncLeasing:
+    @async_all_storage
+    async def test_leasing_fixed_window(self, uri, args, fixture):
+        storage = storage_from_string(uri, **args)
+        limiter = LeasingRateLimiter(
+            FixedWindowRateLimiter(storage), lease_duration=60, max_lease_ratio=0.1
+        )
+        limit = RateLimitItemPerMinute(100)
+        assert [await limiter.hit(limit, "key") for _ in range(150)].count(True) == 100
+        assert not await limiter.test(limit, "key")
+        assert (await limiter.get_window_stats(limit, "key")).remaining == 0
+        await limiter.clear(limit, "key")
+        assert await limiter.hit(limit, "key")
+
+    @async_all_storage
+    async def test_leasing_release(self, uri, args, fixture):
+        storage = storage_from_string(uri, **args)
+        if not hasattr(storage, "decr"):
+            pytest.skip("storage can't return leased entries")
+        limiter = LeasingRateLimiter(FixedWindowRateLimiter(storage), 60, 0.1)
+        limit = RateLimitItemPerMinute(100)
+        assert all([await limiter.hit(limit, "key") for _ in range(4)])
+        # leases of 1, 2 & 4 entries
+        assert await storage.get(limit.key_for("key")) == 7
+        assert (await limiter.get_window_stats(limit, "key")).remaining == 96
+        await limiter.release()
+        assert await storage.get(limit.key_for("key")) == 4
+        assert (await limiter.get_window_stats(limit, "key")).remaining == 96
+
+    @async_sliding_window_counter_storage
+    async def test_leasing_sliding_window(self, uri, args, fixture):
+        storage = storage_from_string(uri, **args)
+        limiter = LeasingRateLimiter(
+            SlidingWindowCounterRateLimiter(storage), max_lease_ratio=1
+        )
+        limit = RateLimitItemPerMinute(10)
+        assert [await limiter.hit(limit, "key") for _ in range(20)].count(True) == 10
+        assert not await limiter.hit(limit, "key", cost=2)
+        assert not await limiter.test(limit, "key")
+
+    @async_sliding_window_counter_storage
+    async def test_leasing_sliding_window_release(self, uri, args, fixture):
+        storage = storage_from_string(uri, **args)
+        limiter = LeasingRateLimiter(SlidingWindowCounterRateLimiter(storage), 60, 0.1)
+        limit = RateLimitItemPerHour(100)
+        assert all([await limiter.hit(limit, "key") for _ in range(4)])
+        # leases of 1, 2 & 4 entries
+        assert (await storage.get_sliding_window(limit.key_for("key"), 3600))[2] == 7
+        await limiter.release()
+        assert (await storage.get_sliding_window(limit.key_for("key"), 3600))[2] == 4
+
+    async def test_leasing_partial_lease_released(self):
+        storage = storage_from_string("async+memory://")
+        limiter = LeasingRateLimiter(FixedWindowRateLimiter(storage), 60, 0.01)
+        limit = RateLimitItemPerMinute(100)
+        assert all([await limiter.limiter.hit(limit, "key") for _ in range(95)])
+        assert await limiter.hit(limit, "key")
+        # only 4 of the 8 leased entries are granted
+        assert not await limiter.hit(limit, "key", cost=8)
+        assert await storage.get(limit.key_for("key")) == 100
+        await limiter.release()
+        assert await storage.get(limit.key_for("key")) == 96
+        assert await limiter.limiter.hit(limit, "key", cost=4)
+
+    async def test_leasing_hit_all_refunded(self, monkeypatch):
+        storage = storage_from_string("async+memory://")
+        limiter = LeasingRateLimiter(FixedWindowRateLimiter(storage), 60, 1)
+        per_minute, per_hour = RateLimitItemPerMinute(10), RateLimitItemPerHour(1)
+        assert await limiter.hit(per_hour, "key")
+
+        async def test_many(requests):
+            return [True] * len(requests)
+
+        # the hourly limit is exhausted between the checks and the hits
+        monkeypatch.setattr(limiter, "test_many", test_many)
+        assert not await limiter.hit_all([per_minute, per_hour], "key")
+        assert (await limiter.get_window_stats(per_minute, "key")).remaining == 10
+        assert await storage.get(per_minute.key_for("key")) == 1
+
+    async def test_leasing_invalid(self):
+        storage = storage_from_string("async+memory://")
+        with pytest.raises(ConfigurationError):
+            LeasingRateLimiter(FixedWindowRateLimiter(storage), lease_duration=0)
+        with pytest.raises(ConfigurationError):
+            LeasingRateLimiter(FixedWindowRateLimiter(storage), max_lease_ratio=0)
+        with pytest.raises(NotImplementedError):
+            LeasingRateLimiter(MovingWindowRateLimiter(storage))
+
+
+class TestAsyncClock:
+    @pytest.mark.parametrize(
+        "limiter_cls",
+        [
+            FixedWindowRateLimiter,
+            MovingWindowRateLimiter,
+            SlidingWindowCounterRateLimiter,
+            GCRARateLimiter,
+        ],
+    )
+    async def test_manual_clock(self, limiter_cls):
+        clock = ManualClock()
+        storage = storage_from_string("async+memory://", clock=clock)
+        limiter = limiter_cls(storage, clock=clock)
+        limit = RateLimitItemPerMinute(2)
+        assert await limiter.hit(limit, "key")
+        assert await limiter.hit(limit, "key")
+        assert not await limiter.hit(limit, "key")
+        stats = await limiter.get_window_stats(limit, "key")
+        assert stats.remaining == 0
+        assert clock.now < stats.reset_time <= clock.now + 60
+        clock.advance(120)
+        assert (await limiter.get_window_stats(limit, "key")).remaining == 2
+        assert await limiter.hit(limit, "key")
@@ -40,7 +40,7 @@ benchmark_moving_window_storages = pytest.mark.parametrize(
     [
         storage
         for name, storage in ALL_STORAGES.items()
-        if name in {"memory", "redis", "mongodb"}
+        if name in {"memory", "redis", "memcached", "mongodb"}
     ],
 )
 benchmark_all_async_storages = pytest.mark.parametrize(
@@ -56,7 +56,7 @@ benchmark_moving_window_async_storages = pytest.mark.parametrize(
     [
         storage
         for name, storage in ALL_STORAGES_ASYNC.items()
-        if name in {"memory", "redis", "mongodb"}
+        if name in {"memory", "redis", "memcached", "mongodb"}
     ],
 )
 
@@ -159,6 +159,19 @@ def test_test(benchmark, strategy, uri, args, limit, fixture):
     benchmark(functools.partial(call_test, strategy, storage, limit))
 
 
+@benchmark_moving_window_storages
+@benchmark_limits
+@pytest.mark.parametrize("strategy", [MovingWindowRateLimiter], ids=["moving-window"])
+@pytest.mark.benchmark(group="full-moving-window")
+def test_get_window_stats_full_moving_window(
+    benchmark, strategy, uri, args, limit, fixture
+):
+    storage = storage_from_string(uri, **args)
+    limiter = strategy(storage)
+    assert limiter.hit(limit, cost=limit.amount)
+    benchmark(limiter.get_window_stats, limit)
+
+
 @benchmark_all_async_storages
 @benchmark_limits
 @pytest.mark.parametrize(
@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+import time
+
+from limits.storage.memcached import MAX_RELATIVE_EXPTIME, BucketRing, exptime_for
+
+
+class TestBucketRing:
+    def test_acquire(self):
+        ring = BucketRing.load(None, 1, 100, 10)
+        assert ring.acquire(100, 5, 3)
+        assert ring.acquire(101.5, 5, 2)
+        assert not ring.acquire(102, 5)
+        assert ring.counts == [3, 0, 2]
+        assert ring.window(102) == (100, 5)
+
+    def test_dump_and_load(self):
+        ring = BucketRing.load(None, 1, 100.25, 10)
+        assert ring.acquire(100.25, 10, 3)
+        assert ring.acquire(103, 10)
+        value = ring.dump()
+        assert value == "100.25:0:3,,,1"
+        loaded = BucketRing.load(value.encode(), 1, 105, 10)
+        assert loaded.window(105) == (100.25, 4)
+        assert loaded.dump() == value
+
+    def test_expired_buckets(self):
+        ring = BucketRing.load(None, 1, 100, 10)
+        assert ring.acquire(100, 5, 3)
+        assert ring.acquire(104.5, 5, 2)
+        # the first bucket only holds the hits at the start of the window
+        loaded = BucketRing.load(ring.dump(), 1, 110, 10)
+        assert loaded.window(110) == (105, 2)
+        assert loaded.acquire(110, 5, 3)
+        # the bucket of the second hit is counted until its end leaves the window
+        assert BucketRing.load(ring.dump(), 1, 114.9, 10).window(114.9) == (105, 2)
+        empty = BucketRing.load(ring.dump(), 1, 115, 10)
+        assert empty.window(115) == (115, 0)
+        assert empty.base == 115
+
+    def test_clock_moving_backwards(self):
+        ring = BucketRing.load(None, 1, 100, 10)
+        assert ring.acquire(103, 10)
+        assert ring.acquire(99, 10)
+        assert ring.first == 3
+        assert ring.counts == [2]
+
+    def test_release(self):
+        ring = BucketRing.load(None, 1, 100, 10)
+        assert ring.acquire(100, 10, 3)
+        assert ring.acquire(102, 10, 2)
+        ring.release(3)
+        assert ring.counts == [2]
+        assert ring.window(102) == (100, 2)
+        ring.release(5)
+        assert ring.window(102) == (102, 0)
+
+
+def test_exptime_for():
+    assert exptime_for(59.5) == 60
+    assert exptime_for(MAX_RELATIVE_EXPTIME) == MAX_RELATIVE_EXPTIME
+    # a monthly limit
+    assert exptime_for(2635200) >= time.time() + 2635200 - 1
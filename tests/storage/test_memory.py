@@ -1,8 +1,20 @@
 from __future__ import annotations
 
 import pickle
+import threading
+import time
 
-from limits.storage import MemoryStorage
+import pytest
+
+from limits.errors import ConfigurationError
+from limits.storage import (
+    MemoryStorage,
+    MovingWindowSupport,
+    SlidingWindowCounterSupport,
+    Storage,
+    storage_from_string,
+)
+from limits.storage.memory import TimestampRing
 
 
 class TestSerialization:
@@ -15,3 +27,206 @@ class TestSerialization:
         assert 2 == restored.incr("test", 60)
         assert restored.acquire_entry("moving_test", 2, 60)
         assert not restored.acquire_entry("moving_test", 2, 60)
+
+
+class TestExpiry:
+    def test_single_expiry_thread(self):
+        storage = MemoryStorage()
+        threads = threading.active_count()
+        for i in range(100):
+            storage.incr(f"counter/{i}", 1)
+            storage.acquire_entry(f"window/{i}", 10, 1)
+        assert threading.active_count() == threads
+        assert len(storage._expiry_heap) == 200
+
+    def test_expired_keys_are_evicted(self):
+        storage = MemoryStorage()
+        storage.incr("short", 0.1)
+        storage.incr("long", 60)
+        storage.acquire_entry("window", 10, 0.1)
+        time.sleep(0.2)
+        assert "short" not in storage.storage
+        assert "window" not in storage.events
+        assert storage.storage["long"] == 1
+        assert [key for _, key in storage._expiry_heap] == ["long"]
+
+    def test_gcra_expiry_rescheduled(self):
+        storage = MemoryStorage()
+        for _ in range(5):
+            assert storage.acquire_gcra_entry("gcra", 10, 1)
+        assert len(storage._expiry_heap) == 1
+        time.sleep(0.2)
+        assert "gcra" in storage.tats
+        time.sleep(0.5)
+        assert "gcra" not in storage.tats
+        assert not storage._expiry_heap
+
+
+class TestTimestampRing:
+    def test_acquire(self):
+        ring = TimestampRing(10)
+        assert ring.acquire(100, 5, 3)
+        assert ring.acquire(101, 5, 2)
+        assert not ring.acquire(102, 5)
+        assert ring.window(95) == (100, 5)
+        assert ring.window(100.5) == (101, 2)
+        assert ring.acquire(110.5, 5, 3)
+        assert len(ring) == 5
+        assert ring.window(100.5) == (101, 5)
+
+    def test_trim_and_compact(self):
+        ring = TimestampRing(10)
+        for timestamp in range(100):
+            assert ring.acquire(timestamp, 1000)
+        ring.trim(90)
+        assert len(ring) == 10
+        assert ring.oldest == 90
+        assert len(ring.timestamps) == 10
+        assert ring.window(95) == (95, 5)
+        ring.trim(100)
+        assert not ring
+        assert ring.window(0) == (None, 0)
+
+    def test_admits(self):
+        ring = TimestampRing(10)
+        assert ring.admits(100, 5, 5)
+        assert not ring.admits(100, 5, 6)
+        assert ring.acquire(100, 5, 4)
+        assert ring.admits(105, 5)
+        assert not ring.admits(105, 5, 2)
+        assert ring.admits(110.5, 5, 5)
+        assert len(ring) == 4
+
+    def test_release(self):
+        ring = TimestampRing(10)
+        assert ring.acquire(100, 5, 2)
+        assert ring.acquire(101, 5, 2)
+        ring.release(3)
+        assert list(ring.timestamps) == [100]
+        ring.release(3)
+        assert not ring
+
+    def test_clock_moving_backwards(self):
+        ring = TimestampRing(10)
+        assert ring.acquire(100, 5)
+        assert ring.acquire(99, 5)
+        assert list(ring.timestamps) == [100, 100]
+
+
+class TestLockStripes:
+    def test_default(self):
+        storage = MemoryStorage()
+        for i in range(1000):
+            storage.incr(f"key/{i}", 60)
+        assert len(storage.locks) == MemoryStorage.DEFAULT_LOCK_STRIPES
+        assert storage._lock_for("key/1") is storage._lock_for("key/1")
+
+    @pytest.mark.parametrize(
+        "uri, options, expected",
+        [
+            ("memory://", {"lock_stripes": 8}, 8),
+            ("memory://?lock_stripes=16", {}, 16),
+            ("memory://?lock_stripes=16", {"lock_stripes": 8}, 16),
+        ],
+    )
+    def test_configured(self, uri, options, expected):
+        assert len(storage_from_string(uri, **options).locks) == expected
+
+    @pytest.mark.parametrize(
+        "uri", ["memory://?lock_stripes=0", "memory://?lock_stripes=many"]
+    )
+    def test_invalid(self, uri):
+        with pytest.raises(ConfigurationError):
+            storage_from_string(uri)
+
+
+class TestMaxKeys:
+    def test_unbounded(self):
+        storage = MemoryStorage()
+        for i in range(100):
+            storage.incr(f"key/{i}", 60)
+        assert len(storage.storage) == 100
+        assert storage.evictions == 0
+
+    @pytest.mark.parametrize(
+        "uri, options",
+        [("memory://", {"max_keys": 10}), ("memory://?max_keys=10", {})],
+    )
+    def test_least_recently_used_evicted(self, uri, options):
+        storage = storage_from_string(uri, **options)
+        for i in range(10):
+            storage.incr(f"key/{i}", 60)
+        storage.incr("key/0", 60)
+        storage.acquire_entry("window", 10, 60)
+        assert storage.evictions == 1
+        assert storage.get("key/1") == 0
+        assert storage.get("key/0") == 2
+        assert storage.get_num_acquired("window", 60) == 1
+        for i in range(10):
+            storage.incr(f"other/{i}", 60)
+        assert storage.evictions == 11
+        assert len(storage.storage) + len(storage.events) == 10
+
+    def test_expired_keys_untracked(self):
+        storage = MemoryStorage(max_keys=2)
+        storage.incr("short", 0.1)
+        storage.incr("long", 60)
+        time.sleep(0.2)
+        storage.incr("new", 60)
+        assert storage.evictions == 0
+        assert storage.get("long") == 1
+
+    def test_invalid(self):
+        with pytest.raises(ConfigurationError):
+            storage_from_string("memory://?max_keys=0")
+
+
+class TestAcquireAll:
+    def test_concurrent_incr_all(self):
+        storage = MemoryStorage(lock_stripes=4)
+        entries = [(f"key/{i}", 10 + i, 60) for i in range(8)]
+        results = []
+
+        def hit():
+            results.append(storage.incr_all(entries))
+
+        threads = [threading.Thread(target=hit) for _ in range(50)]
+        [t.start() for t in threads]
+        [t.join() for t in threads]
+        assert results.count(True) == 10
+        assert [storage.get(key) for key, *_ in entries] == [10] * 8
+
+    def test_duplicate_keys(self):
+        storage = MemoryStorage()
+        assert not storage.incr_all([("key", 3, 60), ("key", 3, 60)], 2)
+        assert storage.get("key") == 0
+        assert storage.incr_all([("key", 3, 60), ("key", 3, 60)])
+        assert storage.get("key") == 2
+
+    def test_fallback_rolled_back(self, monkeypatch):
+        storage = MemoryStorage()
+        storage.incr("full", 60, 3)
+        assert storage.acquire_entry("full", 1, 60)
+        assert storage.acquire_sliding_window_entry("full", 1, 60)
+        # the limits are exhausted between the checks and the hits
+        monkeypatch.setattr(storage, "get_counts", lambda keys: [0] * len(keys))
+        monkeypatch.setattr(
+            storage,
+            "get_moving_windows",
+            lambda entries: [(time.time(), 0)] * len(entries),
+        )
+        monkeypatch.setattr(
+            storage,
+            "get_sliding_windows",
+            lambda entries: [(0, 0.0, 0, 0.0)] * len(entries),
+        )
+        entries = [("key", 3, 60), ("full", 1, 60)]
+        assert not Storage.incr_all(storage, entries)
+        assert not MovingWindowSupport.acquire_all_entries(storage, entries)
+        assert not SlidingWindowCounterSupport.acquire_all_sliding_window_entries(
+            storage, entries
+        )
+        assert storage.get("key") == 0
+        assert storage.get("full") == 3
+        assert storage.get_moving_window("key", 3, 60)[1] == 0
+        assert storage.get_sliding_window("key", 60)[2] == 0
@@ -28,6 +28,28 @@ class TestLimits:
         item = self.FakeLimit(1, 1)
         assert item.key_for(b"a", "b") == "LIMITER/a/b/1/1/fake"
 
+    def test_key_with_hash_tag(self):
+        item = self.FakeLimit(1, 1)
+        assert item.key_for("a", "b", hash_tag=True) == "LIMITER/{a/b}/1/1/fake"
+        assert item.key_for(hash_tag=True) == "LIMITER/{}/1/1/fake"
+        assert item.key_for() == "LIMITER/1/1/fake"
+
+    def test_key_single_identifier_custom_namespace(self):
+        item = self.FakeLimit(2, 3, namespace="NS")
+        assert item.key_for("a") == "NS/a/2/3/fake"
+        assert item.key_for(1) == "NS/1/2/3/fake"
+        assert item.key_for(b"a") == "NS/a/2/3/fake"
+
+    def test_key_after_update(self):
+        item = self.FakeLimit(2, 3, namespace="NS")
+        item.amount = 5
+        assert item.key_for("a") == "NS/a/5/3/fake"
+        item.multiples = None
+        assert item.key_for("a") == "NS/a/5/1/fake"
+        assert item.get_expiry() == 1
+        item.namespace = "OTHER"
+        assert item.key_for("a") == "OTHER/a/5/1/fake"
+
     def test_equality(self):
         item = self.FakeLimit(1, 1)
         assert item == self.FakeLimit(1, 1)
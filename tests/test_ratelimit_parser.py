@@ -43,6 +43,34 @@ class TestRatelimitParser:
         assert parsed[0].get_expiry() == 3 * 60 * 60
         assert parsed[1].get_expiry() == 1
 
+    def test_cached(self):
+        assert parse("1 per 3 hour") == parse("1 per 3 hour")
+        assert parse("1 per 3 hour") is not parse("1 per 3 hour")
+        assert parse_many("1/second; 5/minute") == parse_many("1/second; 5/minute")
+        assert (
+            parse_many("1/second; 5/minute")[1]
+            is not parse_many("1/second; 5/minute")[1]
+        )
+
+    def test_cached_items_not_shared(self):
+        item = parse("1 per 3 hour")
+        item.namespace = "OTHER"
+        item.amount = 5
+        assert parse("1 per 3 hour").namespace == "LIMITER"
+        assert parse("1 per 3 hour").amount == 1
+        assert parse_many("1 per 3 hour")[0].key_for() == "LIMITER/1/3/hour"
+
+    @pytest.mark.parametrize(
+        "value, granularity",
+        [
+            ("hour", limits.RateLimitItemPerHour),
+            ("MINUTE", limits.RateLimitItemPerMinute),
+            ("sec", limits.RateLimitItemPerSecond),
+        ],
+    )
+    def test_granularity(self, value, granularity):
+        assert granularity_from_string(value) is granularity
+
     @pytest.mark.parametrize("value", [None, "1 per millenium", "meow"])
     def test_invalid_string_parse(self, value):
         with pytest.raises(ValueError):
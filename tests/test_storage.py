@@ -1,11 +1,18 @@
 from __future__ import annotations
 
+import threading
 import time
 
 import pytest
+from packaging.version import Version
+from pymemcache.exceptions import MemcacheIllegalInputError
 from pytest_lazy_fixtures import lf
 
-from limits import RateLimitItemPerMinute, RateLimitItemPerSecond
+from limits import (
+    RateLimitItemPerMinute,
+    RateLimitItemPerMonth,
+    RateLimitItemPerSecond,
+)
 from limits.errors import ConfigurationError, StorageError
 from limits.storage import (
     MemcachedStorage,
@@ -19,13 +26,38 @@ from limits.storage import (
     Storage,
     storage_from_string,
 )
-from limits.strategies import MovingWindowRateLimiter, SlidingWindowCounterRateLimiter
-from tests.utils import fixed_start
+from limits.strategies import (
+    GCRARateLimiter,
+    MovingWindowRateLimiter,
+    SlidingWindowCounterRateLimiter,
+)
+from tests.utils import (
+    fixed_start,
+    moving_window_storage,
+    sliding_window_counter_storage,
+)
 
 
 class TestBaseStorage:
     @pytest.mark.parametrize(
-        "uri, args", [("blah://", {}), ("redis+sentinel://localhost:26379", {})]
+        "uri, args",
+        [
+            ("blah://", {}),
+            ("redis+sentinel://localhost:26379", {}),
+            ("redis://localhost:7379", {"moving_window_engine": "btree"}),
+            ("mongodb://localhost:37017", {"moving_window_engine": "btree"}),
+            ("redis://localhost:7379", {"clock": "ntp"}),
+            ("mongodb://localhost:37017", {"clock": "ntp"}),
+            ("memcached://localhost:22122", {"moving_window_buckets": 0}),
+            (
+                "memcached://localhost:22122,localhost:22123",
+                {"meta_protocol": True},
+            ),
+            ("mongodb://localhost:37017", {"write_concern": {"durable": True}}),
+            ("mongodb://localhost:37017", {"write_concern": {"j": "no"}}),
+            ("mongodb://localhost:37017", {"write_concern": {"w": 0}}),
+            ("mongodb://localhost:37017", {"read_preference": "closest"}),
+        ],
     )
     def test_invalid_storage_string(self, uri, args):
         with pytest.raises(ConfigurationError):
@@ -153,6 +185,22 @@ class TestBaseStorage:
             marks=pytest.mark.redis,
             id="redis",
         ),
+        pytest.param(
+            "redis://localhost:7379",
+            {"moving_window_engine": "zset"},
+            RedisStorage,
+            lf("redis_basic"),
+            marks=pytest.mark.redis,
+            id="redis-zset",
+        ),
+        pytest.param(
+            "redis://localhost:7379",
+            {"moving_window_engine": "packed"},
+            RedisStorage,
+            lf("redis_basic"),
+            marks=pytest.mark.redis,
+            id="redis-packed",
+        ),
         pytest.param(
             "redis+unix:///tmp/limits.redis.sock",
             {},
@@ -177,6 +225,14 @@ class TestBaseStorage:
             marks=pytest.mark.memcached,
             id="memcached",
         ),
+        pytest.param(
+            "memcached://localhost:22122",
+            {"meta_protocol": True},
+            MemcachedStorage,
+            lf("memcached"),
+            marks=pytest.mark.memcached,
+            id="memcached-meta",
+        ),
         pytest.param(
             "memcached://localhost:22122,localhost:22123",
             {},
@@ -315,6 +371,17 @@ class TestConcreteStorages:
             storage.incr(limit2.key_for(str(i)), limit2.get_expiry())
         assert storage.reset() == 20
 
+    def test_storage_reset_iter(self, uri, args, expected_instance, fixture):
+        storage = storage_from_string(uri, **args)
+        if not isinstance(storage, RedisStorage):
+            pytest.skip("Incremental reset only supported for redis")
+        for i in range(250):
+            storage.incr(f"key/{i}", 60)
+        batches = list(storage.reset_iter(count=50))
+        assert len(batches) > 1
+        assert sum(batches) == 250
+        assert storage.get("key/0") == 0
+
     def test_storage_clear(self, uri, args, expected_instance, fixture):
         limit = RateLimitItemPerMinute(10)
         storage = storage_from_string(uri, **args)
@@ -324,6 +391,478 @@ class TestConcreteStorages:
         assert 0 == storage.get(limit.key_for())
 
 
+class TestRelease:
+    @moving_window_storage
+    def test_release_entry(self, uri, args, fixture):
+        storage = storage_from_string(uri, **args)
+        assert storage.acquire_entry("key", 10, 60, amount=3)
+        assert storage.acquire_entry("key", 10, 60, amount=4)
+        storage.release_entry("key", 60, amount=5)
+        assert storage.get_moving_window("key", 10, 60)[1] == 2
+        assert storage.acquire_entry("key", 10, 60, amount=8)
+        storage.release_entry("key", 60, amount=20)
+        assert storage.get_moving_window("key", 10, 60)[1] == 0
+        storage.release_entry("missing", 60)
+
+    @sliding_window_counter_storage
+    def test_release_sliding_window_entry(self, uri, args, fixture):
+        storage = storage_from_string(uri, **args)
+        assert storage.acquire_sliding_window_entry("key", 10, 60, amount=7)
+        storage.release_sliding_window_entry("key", 60, amount=5)
+        assert storage.get_sliding_window("key", 60)[2] == 2
+        storage.release_sliding_window_entry("key", 60, amount=5)
+        assert storage.get_sliding_window("key", 60)[2] == 0
+
+
+@pytest.mark.redis
+class TestRedisMovingWindowEngine:
+    def test_zset_member_per_hit(self, redis_basic):
+        storage = RedisStorage("redis://localhost:7379", moving_window_engine="zset")
+        limiter = MovingWindowRateLimiter(storage)
+        limit = RateLimitItemPerMinute(1000)
+        assert limiter.hit(limit, cost=500)
+        assert limiter.hit(limit, cost=499)
+        assert not limiter.hit(limit, cost=2)
+        assert limiter.hit(limit)
+        assert (
+            storage.get_connection().zcard(storage.prefixed_key(limit.key_for())) == 3
+        )
+        assert limiter.get_window_stats(limit).remaining == 0
+
+    def test_zset_expired_members(self, redis_basic):
+        storage = RedisStorage("redis://localhost:7379", moving_window_engine="zset")
+        limiter = MovingWindowRateLimiter(storage)
+        limit = RateLimitItemPerSecond(10)
+        assert limiter.hit(limit, cost=6)
+        time.sleep(0.5)
+        assert limiter.hit(limit, cost=4)
+        assert not limiter.hit(limit)
+        time.sleep(0.6)
+        assert limiter.get_window_stats(limit).remaining == 6
+        assert limiter.hit(limit, cost=6)
+        assert not limiter.test(limit)
+        assert (
+            storage.get_connection().zcard(storage.prefixed_key(limit.key_for())) == 2
+        )
+
+    def test_packed_pair_per_hit(self, redis_basic):
+        storage = RedisStorage("redis://localhost:7379", moving_window_engine="packed")
+        limiter = MovingWindowRateLimiter(storage)
+        limit = RateLimitItemPerMinute(1000)
+        assert limiter.hit(limit, cost=500)
+        time.sleep(0.01)
+        assert limiter.hit(limit, cost=499)
+        assert not limiter.hit(limit, cost=2)
+        time.sleep(0.01)
+        assert limiter.hit(limit)
+        assert (
+            storage.get_connection().strlen(storage.prefixed_key(limit.key_for()))
+            == 6 + 3 * 8
+        )
+        assert limiter.get_window_stats(limit).remaining == 0
+
+    def test_packed_expired_pairs(self, redis_basic):
+        storage = RedisStorage("redis://localhost:7379", moving_window_engine="packed")
+        limiter = MovingWindowRateLimiter(storage)
+        limit = RateLimitItemPerSecond(10)
+        assert limiter.hit(limit, cost=6)
+        time.sleep(0.5)
+        assert limiter.hit(limit, cost=4)
+        assert not limiter.hit(limit)
+        time.sleep(0.6)
+        assert limiter.get_window_stats(limit).remaining == 6
+        assert limiter.hit(limit, cost=6)
+        assert not limiter.test(limit)
+        assert (
+            storage.get_connection().strlen(storage.prefixed_key(limit.key_for()))
+            == 6 + 2 * 8
+        )
+
+    def test_packed_large_cost(self, redis_basic):
+        storage = RedisStorage("redis://localhost:7379", moving_window_engine="packed")
+        limiter = MovingWindowRateLimiter(storage)
+        limit = RateLimitItemPerMinute(50_000_000)
+        assert limiter.hit(limit, cost=20_000_000)
+        assert limiter.hit(limit, cost=30_000_000)
+        assert not limiter.hit(limit)
+        assert limiter.get_window_stats(limit).remaining == 0
+
+
+@pytest.mark.redis
+class TestRedisServerClock:
+    @pytest.mark.parametrize("moving_window_engine", ["list", "zset", "packed"])
+    def test_moving_window(self, redis_basic, moving_window_engine):
+        storage = RedisStorage(
+            "redis://localhost:7379",
+            moving_window_engine=moving_window_engine,
+            clock="server",
+        )
+        limiter = MovingWindowRateLimiter(storage)
+        limit = RateLimitItemPerSecond(10)
+        assert limiter.hit(limit, cost=6)
+        time.sleep(0.5)
+        assert limiter.hit(limit, cost=4)
+        assert not limiter.hit(limit)
+        start, remaining = limiter.get_window_stats(limit)
+        assert remaining == 0
+        assert abs(start - (time.time() + 0.5)) < 0.2
+        time.sleep(0.6)
+        assert limiter.get_window_stats(limit).remaining == 6
+        assert limiter.hit(limit, cost=6)
+        assert not limiter.test(limit)
+
+    def test_gcra(self, redis_basic):
+        storage = RedisStorage("redis://localhost:7379", clock="server")
+        limiter = GCRARateLimiter(storage)
+        limit = RateLimitItemPerSecond(5)
+        assert all(limiter.hit(limit) for _ in range(5))
+        assert not limiter.hit(limit)
+        assert limiter.get_window_stats(limit).remaining == 0
+        time.sleep(0.25)
+        assert limiter.hit(limit)
+
+
+@pytest.mark.memcached
+class TestMemcachedMovingWindow:
+    def test_concurrent_acquire(self, memcached):
+        storage = MemcachedStorage("memcached://localhost:22122")
+        limiter = MovingWindowRateLimiter(storage)
+        limit = RateLimitItemPerMinute(50)
+        results = []
+
+        def hit():
+            results.extend(limiter.hit(limit) for _ in range(10))
+
+        threads = [threading.Thread(target=hit) for _ in range(10)]
+        [t.start() for t in threads]
+        [t.join() for t in threads]
+        assert results.count(True) == 50
+        assert limiter.get_window_stats(limit).remaining == 0
+        assert storage.cas_retries >= 0
+
+    def test_buckets(self, memcached):
+        storage = MemcachedStorage(
+            "memcached://localhost:22122", moving_window_buckets=2
+        )
+        limiter = MovingWindowRateLimiter(storage)
+        limit = RateLimitItemPerSecond(10)
+        assert limiter.hit(limit, cost=6)
+        time.sleep(0.6)
+        assert limiter.hit(limit, cost=4)
+        assert not limiter.hit(limit)
+        assert storage.storage.get(limit.key_for()).endswith(b":0:6,,4")
+        time.sleep(0.5)
+        assert limiter.get_window_stats(limit).remaining == 6
+
+    def test_monthly_limit(self, memcached):
+        storage = MemcachedStorage("memcached://localhost:22122")
+        limiter = MovingWindowRateLimiter(storage)
+        limit = RateLimitItemPerMonth(2)
+        assert limiter.hit(limit)
+        assert limiter.hit(limit)
+        assert not limiter.hit(limit)
+        assert limiter.get_window_stats(limit).remaining == 0
+
+
+@pytest.mark.memcached
+class TestMemcachedMetaProtocol:
+    def test_incr_without_expiration_key(self, memcached):
+        storage = MemcachedStorage("memcached://localhost:22122", meta_protocol=True)
+        assert storage.incr("counter", 30) == 1
+        assert storage.incr("counter", 30, amount=2) == 3
+        count, expires_at = storage.incr_with_expiry("counter", 30)
+        assert count == 4
+        assert expires_at - time.time() == pytest.approx(30, abs=1)
+        assert storage.get_expiry("counter") == pytest.approx(expires_at, abs=1)
+        assert storage.get("counter") == 4
+        assert storage.storage.get("counter/expires") is None
+
+    def test_sliding_window_reverted(self, memcached):
+        storage = MemcachedStorage("memcached://localhost:22122", meta_protocol=True)
+        limiter = SlidingWindowCounterRateLimiter(storage)
+        limit = RateLimitItemPerMinute(5)
+        assert limiter.hit(limit, cost=3)
+        assert not limiter.hit(limit, cost=3)
+        assert limiter.get_window_stats(limit).remaining == 2
+        assert limiter.hit(limit, cost=2)
+
+    @pytest.mark.parametrize(
+        "key", ["counter 1", "counter\r\nflush_all", "counter N0", "ß" * 200]
+    )
+    def test_invalid_keys_rejected(self, memcached, key):
+        storage = MemcachedStorage("memcached://localhost:22122", meta_protocol=True)
+        with pytest.raises(MemcacheIllegalInputError):
+            storage.incr(key, 30)
+        with pytest.raises(MemcacheIllegalInputError):
+            storage.get_expiry(key)
+
+    def test_key_prefix(self, memcached):
+        storage = MemcachedStorage(
+            "memcached://localhost:22122", meta_protocol=True, key_prefix="prefix/"
+        )
+        assert storage.incr("counter", 30) == 1
+        assert storage.get("counter") == 1
+        assert MemcachedStorage("memcached://localhost:22122").get("counter") == 0
+
+
+@pytest.mark.mongodb
+class TestMongoDBMovingWindowEngine:
+    def test_pairs_element_per_hit(self, mongodb):
+        storage = MongoDBStorage(
+            "mongodb://localhost:37017", moving_window_engine="pairs"
+        )
+        limiter = MovingWindowRateLimiter(storage)
+        limit = RateLimitItemPerMinute(1000)
+        assert limiter.hit(limit, cost=500)
+        assert limiter.hit(limit, cost=499)
+        assert not limiter.hit(limit, cost=2)
+        assert limiter.hit(limit)
+        assert len(storage.windows.find_one({"_id": limit.key_for()})["entries"]) == 3
+        assert limiter.get_window_stats(limit).remaining == 0
+
+    def test_pairs_expired(self, mongodb):
+        storage = MongoDBStorage(
+            "mongodb://localhost:37017", moving_window_engine="pairs"
+        )
+        limiter = MovingWindowRateLimiter(storage)
+        limit = RateLimitItemPerSecond(10)
+        assert limiter.hit(limit, cost=6)
+        time.sleep(0.5)
+        assert limiter.hit(limit, cost=4)
+        assert not limiter.hit(limit)
+        time.sleep(0.6)
+        assert limiter.get_window_stats(limit).remaining == 6
+        assert limiter.hit(limit, cost=6)
+        assert not limiter.test(limit)
+        assert len(storage.windows.find_one({"_id": limit.key_for()})["entries"]) == 2
+
+
+@pytest.mark.mongodb
+class TestMongoDBBulkWrite:
+    def test_incr_many(self, mongodb):
+        storage = MongoDBStorage("mongodb://localhost:37017")
+        assert storage.incr_many(
+            [("a", 60, 1), ("b", 60, 2), ("a", 60, 3), ("a", 60, 1)]
+        ) == [1, 2, 4, 5]
+        assert storage.get_counts(["a", "b"]) == [5, 2]
+
+    @pytest.mark.parametrize(
+        "options",
+        [
+            {},
+            {"moving_window_engine": "pairs"},
+            {"clock": "server"},
+        ],
+    )
+    def test_rejections_mapped_to_entries(self, mongodb, options):
+        storage = MongoDBStorage("mongodb://localhost:37017", **options)
+        limiter = MovingWindowRateLimiter(storage)
+        limit = RateLimitItemPerMinute(2)
+        assert limiter.hit(limit, "a", cost=2)
+        assert limiter.hit_many(
+            [(limit, ["a"], 1), (limit, ["b"], 1), (limit, ["a"], 1), (limit, ["c"], 3)]
+        ) == [False, True, False, False]
+        assert limiter.get_window_stats(limit, "a").remaining == 0
+        assert limiter.get_window_stats(limit, "b").remaining == 1
+
+    def test_sliding_window_rejections_mapped_to_entries(self, mongodb):
+        storage = MongoDBStorage("mongodb://localhost:37017")
+        limiter = SlidingWindowCounterRateLimiter(storage)
+        limit = RateLimitItemPerMinute(3)
+        assert limiter.hit(limit, "a", cost=2)
+        assert limiter.hit_many(
+            [(limit, ["a"], 2), (limit, ["b"], 1), (limit, ["a"], 2)]
+        ) == [False, True, False]
+        assert limiter.get_window_stats(limit, "a").remaining == 1
+        assert limiter.get_window_stats(limit, "b").remaining == 2
+
+
+@pytest.mark.mongodb
+class TestMongoDBCollectionOptions:
+    def test_defaults(self, mongodb):
+        storage = MongoDBStorage("mongodb://localhost:37017")
+        assert storage.counters is storage.counters
+        assert storage.windows.write_concern == storage.storage.write_concern
+        assert storage._windows_for_reads.read_preference == (
+            storage.storage.read_preference
+        )
+
+    def test_configured(self, mongodb):
+        storage = MongoDBStorage(
+            "mongodb://localhost:37017",
+            write_concern={"w": 1, "j": False},
+            read_preference="secondaryPreferred",
+        )
+        limiter = MovingWindowRateLimiter(storage)
+        limit = RateLimitItemPerMinute(2)
+        for collection in (storage.counters, storage.windows):
+            assert collection.write_concern.document == {"w": 1, "j": False}
+        for collection in (storage._counters_for_reads, storage._windows_for_reads):
+            assert collection.read_preference.mongos_mode == "secondaryPreferred"
+        assert storage.counters.read_preference == storage.storage.read_preference
+        assert limiter.hit(limit)
+        assert limiter.test(limit)
+        assert storage.incr("counter", 60) == 1
+        assert storage.get("counter") == 1
+
+    @pytest.mark.parametrize("write_concern", ({"w": 0}, {"w": 0, "j": False}))
+    def test_unacknowledged_write_concern(self, mongodb, write_concern):
+        with pytest.raises(ConfigurationError, match="Unacknowledged"):
+            MongoDBStorage("mongodb://localhost:37017", write_concern=write_concern)
+
+
+@pytest.mark.redis
+class TestRedisPreloadedScripts:
+    def test_scripts_reloaded(self, redis_basic):
+        storage = RedisStorage("redis://localhost:7379", preload_scripts=True)
+        assert all(
+            storage.get_connection().script_exists(*[s.sha for s in storage.scripts])
+        )
+        assert storage.incr("counter", 60) == 1
+        storage.get_connection().script_flush()
+        assert storage.incr("counter", 60) == 2
+        assert all(
+            storage.get_connection().script_exists(*[s.sha for s in storage.scripts])
+        )
+
+    def test_batch_scripts_reloaded(self, redis_basic):
+        storage = RedisStorage("redis://localhost:7379", preload_scripts=True)
+        limiter = MovingWindowRateLimiter(storage)
+        limit = RateLimitItemPerMinute(2)
+        storage.get_connection().script_flush()
+        assert limiter.hit_many([(limit, ["key"], 1)] * 3) == [True, True, False]
+
+    @pytest.mark.parametrize("preload_scripts", (True, False))
+    def test_pipeline(self, redis_basic, preload_scripts):
+        storage = RedisStorage(
+            "redis://localhost:7379", preload_scripts=preload_scripts
+        )
+        storage.get_connection().script_flush()
+        with storage.pipeline() as pipeline:
+            counter = pipeline.incr("counter", 60, 2)
+            moving = [pipeline.acquire_entry("moving", 1, 60) for _ in range(2)]
+            sliding = pipeline.acquire_sliding_window_entry("sliding", 1, 60)
+            gcra = pipeline.acquire_gcra_entry("gcra", 1, 60)
+            with pytest.raises(RuntimeError, match="hasn't been executed"):
+                assert counter.value
+        assert counter.value == 2
+        assert [result.value for result in moving] == [True, False]
+        assert sliding.value
+        assert gcra.value
+        assert storage.get("counter") == 2
+
+
+@pytest.mark.redis
+class TestRedisFunctions:
+    @pytest.fixture(autouse=True)
+    def functions_supported(self, redis_basic):
+        connection = RedisStorage("redis://localhost:7379").get_connection()
+        if Version(connection.info()["redis_version"]) < Version("7.0"):
+            pytest.skip("redis functions require redis 7 or higher")
+
+    def test_library_loaded(self):
+        storage = RedisStorage("redis://localhost:7379", use_functions=True)
+        library = storage.function_library
+        assert [
+            entry[b"library_name"].decode()
+            for entry in storage.get_connection().function_list(library.name)
+        ] == [library.name]
+        assert storage.incr("counter", 60) == 1
+        storage.get_connection().script_flush()
+        assert storage.incr("counter", 60) == 2
+
+    def test_library_reloaded(self):
+        storage = RedisStorage("redis://localhost:7379", use_functions=True)
+        limiter = MovingWindowRateLimiter(storage)
+        limit = RateLimitItemPerMinute(2)
+        assert limiter.hit(limit, "key")
+        storage.get_connection().function_flush()
+        assert limiter.get_window_stats(limit, "key").remaining == 1
+        storage.get_connection().function_flush()
+        assert limiter.hit_many([(limit, ["key"], 1)] * 2) == [True, False]
+
+    def test_library_replaced(self):
+        storage = RedisStorage("redis://localhost:7379", use_functions=True)
+        connection = storage.get_connection()
+        connection.function_load(
+            "#!lua name=limits\n"
+            "redis.register_function('limits_stale_incr', function() return 0 end)",
+            replace=True,
+        )
+        assert storage.incr("counter", 60) == 1
+        [library] = connection.function_list("limits")
+        assert library[b"library_name"] == b"limits"
+        assert b"limits_stale_incr" not in {
+            function[b"name"] for function in library[b"functions"]
+        }
+
+    @pytest.mark.parametrize("moving_window_engine", ("list", "zset", "packed"))
+    def test_readonly_functions(self, moving_window_engine):
+        storage = RedisStorage(
+            "redis://localhost:7379",
+            use_functions=True,
+            moving_window_engine=moving_window_engine,
+        )
+        assert storage.lua_moving_window.readonly
+        assert not storage.lua_sliding_window.readonly
+        assert storage.acquire_entry("moving", 5, 60, 3)
+        assert storage.get_moving_window("moving", 5, 60)[1] == 3
+
+
+@pytest.mark.redis_cluster
+class TestRedisClusterBatches:
+    @pytest.mark.parametrize("preload_scripts", (True, False))
+    def test_scripts_reloaded(self, redis_cluster, preload_scripts):
+        storage = RedisClusterStorage(
+            "redis+cluster://localhost:7001", preload_scripts=preload_scripts
+        )
+        entries = [(f"key/{i}", 60, 1) for i in range(20)]
+        assert storage.incr_many(entries) == [1] * 20
+        redis_cluster.script_flush()
+        assert storage.incr_many(entries) == [2] * 20
+        assert (
+            storage.acquire_entries([(f"window/{i}", 1, 60, 1) for i in range(20)])
+            == [True] * 20
+        )
+
+    def test_hash_tag(self, redis_cluster):
+        storage = RedisClusterStorage("redis+cluster://localhost:7001")
+        keys = [
+            storage.prefixed_key(limit.key_for("user", "1", hash_tag=True))
+            for limit in (RateLimitItemPerSecond(1), RateLimitItemPerMinute(10))
+        ]
+        assert len({redis_cluster.keyslot(key) for key in keys}) == 1
+
+
+@pytest.mark.redis_sentinel
+class TestRedisReplicaReads:
+    def test_replica_reads(self, redis_sentinel):
+        storage = RedisSentinelStorage(
+            "redis+sentinel://localhost:26379/mymaster", max_replica_lag=10
+        )
+        limiter = SlidingWindowCounterRateLimiter(storage)
+        limit = RateLimitItemPerMinute(2)
+        assert limiter.hit(limit, "key")
+        storage.get_connection().wait(1, 1000)
+        assert storage.reads_from_replicas()
+        assert storage.get_connection(readonly=True) is storage.storage_slave
+        assert limiter.get_window_stats(limit, "key").remaining == 1
+        assert storage.get_moving_window("key", 2, 60)[1] == 0
+        assert storage._reads_windows_from_replicas()
+
+    def test_window_reads_from_primary(self, redis_sentinel):
+        storage = RedisSentinelStorage("redis+sentinel://localhost:26379/mymaster")
+        assert storage.reads_from_replicas()
+        assert not storage._reads_windows_from_replicas()
+
+    def test_stale_replicas(self, redis_sentinel):
+        storage = RedisSentinelStorage(
+            "redis+sentinel://localhost:26379/mymaster", max_replica_lag=-1
+        )
+        assert not storage.reads_from_replicas()
+        assert storage.get_connection(readonly=True) is storage.storage
+
+
 @pytest.mark.parametrize("wrap_exceptions", (True, False))
 class TestStorageErrors:
     class MyStorage(Storage, MovingWindowSupport, SlidingWindowCounterSupport):
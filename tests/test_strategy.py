@@ -5,6 +5,7 @@ from math import ceil
 
 import pytest
 
+from limits.errors import ConfigurationError
 from limits.limits import (
     RateLimitItemPerHour,
     RateLimitItemPerMinute,
@@ -14,10 +15,13 @@ from limits.storage import storage_from_string
 from limits.storage.base import TimestampedSlidingWindow
 from limits.strategies import (
     FixedWindowRateLimiter,
+    GCRARateLimiter,
+    LeasingRateLimiter,
     MovingWindowRateLimiter,
     SlidingWindowCounterRateLimiter,
 )
 from tests.utils import (
+    ManualClock,
     all_storage,
     fixed_start,
     moving_window_storage,
@@ -63,6 +67,66 @@ class TestFixedWindow:
         assert not limiter.test(limit, "k2", cost=6)
         assert not limiter.hit(limit, "k2", cost=6)
 
+    @fixed_start
+    def test_fixed_window_hit_many(self, uri, args, fixture):
+        storage = storage_from_string(uri, **args)
+        limiter = FixedWindowRateLimiter(storage)
+        per_minute = RateLimitItemPerMinute(10)
+        per_hour = RateLimitItemPerHour(5)
+        assert limiter.hit_many([]) == []
+        assert limiter.hit_many(
+            [
+                (per_minute, ["k1"], 5),
+                (per_hour, ["k1"], 6),
+                (per_minute, ["k1"], 5),
+                (per_minute, ["k1"], 1),
+                (per_hour, (), 1),
+            ]
+        ) == [True, False, True, False, True]
+        assert limiter.test_many(
+            [
+                (per_minute, ["k1"], 1),
+                (per_hour, ["k1"], 1),
+                (per_hour, ["k2"], 5),
+                (per_hour, (), 4),
+                (per_hour, (), 5),
+            ]
+        ) == [False, False, True, True, False]
+        assert limiter.get_window_stats(per_minute, "k1").remaining == 0
+
+    @fixed_start
+    def test_fixed_window_hit_all(self, uri, args, fixture):
+        storage = storage_from_string(uri, **args)
+        limiter = FixedWindowRateLimiter(storage)
+        per_minute = RateLimitItemPerMinute(2)
+        per_hour = RateLimitItemPerHour(3)
+        assert limiter.hit_all([], "k1")
+        assert limiter.hit_all([per_minute, per_hour], "k1")
+        assert limiter.hit_all([per_minute, per_hour], "k1")
+        assert not limiter.hit_all([per_minute, per_hour], "k1")
+        assert limiter.get_window_stats(per_hour, "k1").remaining == 1
+        assert not limiter.hit_all([per_minute, per_hour], "k2", cost=3)
+        assert limiter.get_window_stats(per_hour, "k2").remaining == 3
+
+    @fixed_start
+    def test_fixed_window_hit_with_stats(self, uri, args, fixture):
+        storage = storage_from_string(uri, **args)
+        limiter = FixedWindowRateLimiter(storage)
+        limit = RateLimitItemPerMinute(2)
+        for remaining in [1, 0]:
+            allowed, stats = limiter.hit_with_stats(limit, "k1")
+            assert allowed
+            assert stats.remaining == remaining
+            assert stats.reset_time == pytest.approx(
+                limiter.get_window_stats(limit, "k1").reset_time, abs=1
+            )
+        allowed, stats = limiter.hit_with_stats(limit, "k1")
+        assert not allowed
+        assert stats.remaining == 0
+        allowed, stats = limiter.hit_with_stats(limit, "k2", cost=3)
+        assert not allowed
+        assert stats.remaining == 0
+
     @fixed_start
     @pytest.mark.flaky
     def test_test_fixed_window(self, uri, args, fixture):
@@ -235,6 +299,74 @@ class TestSlidingWindow:
         assert not limiter.test(limit, "k2", cost=6)
         assert not limiter.hit(limit, "k2", cost=6)
 
+    @fixed_start
+    def test_sliding_window_counter_hit_many(self, uri, args, fixture):
+        storage = storage_from_string(uri, **args)
+        limiter = SlidingWindowCounterRateLimiter(storage)
+        limit = RateLimitItemPerMinute(10, 2)
+        if isinstance(storage, TimestampedSlidingWindow):
+            # Avoid testing the behaviour when the window is about to be reset
+            ttl = timestamp_based_key_ttl(limit)
+            if ttl < 0.5:
+                time.sleep(ttl)
+        assert limiter.hit_many([]) == []
+        assert limiter.hit_many(
+            [
+                (limit, ["k1"], 5),
+                (limit, ["k1"], 5),
+                (limit, ["k1"], 1),
+                (limit, ["k2"], 11),
+            ]
+        ) == [True, True, False, False]
+        assert limiter.test_many([(limit, ["k1"], 1), (limit, ["k2"], 10)]) == [
+            False,
+            True,
+        ]
+        assert limiter.get_window_stats(limit, "k1").remaining == 0
+
+    @fixed_start
+    def test_sliding_window_counter_hit_all(self, uri, args, fixture):
+        storage = storage_from_string(uri, **args)
+        limiter = SlidingWindowCounterRateLimiter(storage)
+        per_minute = RateLimitItemPerMinute(2)
+        per_hour = RateLimitItemPerHour(3)
+        if isinstance(storage, TimestampedSlidingWindow):
+            # Avoid testing the behaviour when the window is about to be reset
+            ttl = timestamp_based_key_ttl(per_minute)
+            if ttl < 0.5:
+                time.sleep(ttl)
+        assert limiter.hit_all([], "k1")
+        assert limiter.hit_all([per_minute, per_hour], "k1")
+        assert limiter.hit_all([per_minute, per_hour], "k1")
+        assert not limiter.hit_all([per_minute, per_hour], "k1")
+        assert limiter.get_window_stats(per_hour, "k1").remaining == 1
+        assert not limiter.hit_all([per_minute, per_hour], "k2", cost=3)
+        assert limiter.get_window_stats(per_hour, "k2").remaining == 3
+
+    @fixed_start
+    def test_sliding_window_counter_hit_with_stats(self, uri, args, fixture):
+        storage = storage_from_string(uri, **args)
+        limiter = SlidingWindowCounterRateLimiter(storage)
+        limit = RateLimitItemPerMinute(2)
+        if isinstance(storage, TimestampedSlidingWindow):
+            # Avoid testing the behaviour when the window is about to be reset
+            ttl = timestamp_based_key_ttl(limit)
+            if ttl < 0.5:
+                time.sleep(ttl)
+        for remaining in [1, 0]:
+            allowed, stats = limiter.hit_with_stats(limit, "k1")
+            assert allowed
+            assert stats.remaining == remaining
+            assert stats.reset_time == pytest.approx(
+                limiter.get_window_stats(limit, "k1").reset_time, abs=1
+            )
+        allowed, stats = limiter.hit_with_stats(limit, "k1")
+        assert not allowed
+        assert stats.remaining == 0
+        allowed, stats = limiter.hit_with_stats(limit, "k2", cost=3)
+        assert not allowed
+        assert stats.remaining == 2
+
     @fixed_start
     @pytest.mark.flaky
     def test_test_sliding_window_counter(self, uri, args, fixture):
@@ -326,6 +458,56 @@ class TestMovingWindow:
         limiter.clear(many_per_min)
         assert limiter.hit(many_per_min)
 
+    def test_moving_window_hit_many(self, uri, args, fixture):
+        storage = storage_from_string(uri, **args)
+        limiter = MovingWindowRateLimiter(storage)
+        limit = RateLimitItemPerMinute(5)
+        assert limiter.hit_many([]) == []
+        assert limiter.hit_many(
+            [
+                (limit, ["k1"], 3),
+                (limit, ["k1"], 3),
+                (limit, ["k1"], 2),
+                (limit, ["k2"], 6),
+            ]
+        ) == [True, False, True, False]
+        assert limiter.test_many([(limit, ["k1"], 1), (limit, ["k2"], 5)]) == [
+            False,
+            True,
+        ]
+        assert limiter.get_window_stats(limit, "k1").remaining == 0
+
+    def test_moving_window_hit_all(self, uri, args, fixture):
+        storage = storage_from_string(uri, **args)
+        limiter = MovingWindowRateLimiter(storage)
+        per_minute = RateLimitItemPerMinute(2)
+        per_hour = RateLimitItemPerHour(3)
+        assert limiter.hit_all([], "k1")
+        assert limiter.hit_all([per_minute, per_hour], "k1")
+        assert limiter.hit_all([per_minute, per_hour], "k1")
+        assert not limiter.hit_all([per_minute, per_hour], "k1")
+        assert limiter.get_window_stats(per_hour, "k1").remaining == 1
+        assert not limiter.hit_all([per_minute, per_hour], "k2", cost=3)
+        assert limiter.get_window_stats(per_hour, "k2").remaining == 3
+
+    def test_moving_window_hit_with_stats(self, uri, args, fixture):
+        storage = storage_from_string(uri, **args)
+        limiter = MovingWindowRateLimiter(storage)
+        limit = RateLimitItemPerMinute(2)
+        for remaining in [1, 0]:
+            allowed, stats = limiter.hit_with_stats(limit, "k1")
+            assert allowed
+            assert stats.remaining == remaining
+            assert stats.reset_time == pytest.approx(
+                limiter.get_window_stats(limit, "k1").reset_time, abs=1
+            )
+        allowed, stats = limiter.hit_with_stats(limit, "k1")
+        assert not allowed
+        assert stats.remaining == 0
+        allowed, stats = limiter.hit_with_stats(limit, "k2", cost=3)
+        assert not allowed
+        assert stats.remaining == 2
+
     def test_test_moving_window(self, uri, args, fixture):
         storage = storage_from_string(uri, **args)
         limit = RateLimitItemPerHour(2, 1)
@@ -335,3 +517,251 @@ class TestMovingWindow:
         assert limiter.hit(limit)
         assert not limiter.test(limit)
         assert not limiter.hit(limit)
+
+
+@all_storage
+class TestGCRA:
+    def test_gcra_empty_stats(self, uri, args, fixture):
+        storage = storage_from_string(uri, **args)
+        limiter = GCRARateLimiter(storage)
+        limit = RateLimitItemPerSecond(10, 2)
+        assert limiter.get_window_stats(limit).remaining == 10
+        assert limiter.get_window_stats(limit).reset_time == pytest.approx(
+            time.time(), 1e-2
+        )
+
+    def test_gcra_stats(self, uri, args, fixture):
+        storage = storage_from_string(uri, **args)
+        limiter = GCRARateLimiter(storage)
+        limit = RateLimitItemPerMinute(2)
+        assert limiter.hit(limit, "key")
+        assert limiter.get_window_stats(limit, "key").remaining == 1
+        assert limiter.get_window_stats(
+            limit, "key"
+        ).reset_time - time.time() == pytest.approx(30, 1e-2)
+        assert limiter.hit(limit, "key")
+        assert not limiter.hit(limit, "key")
+        assert limiter.get_window_stats(limit, "key").remaining == 0
+        assert limiter.get_window_stats(
+            limit, "key"
+        ).reset_time - time.time() == pytest.approx(30, 1e-2)
+
+    def test_gcra(self, uri, args, fixture):
+        storage = storage_from_string(uri, **args)
+        limiter = GCRARateLimiter(storage)
+        limit = RateLimitItemPerSecond(10, 2)
+
+        assert all(limiter.hit(limit) for _ in range(10))
+        assert not limiter.hit(limit)
+        # one entry becomes available every 200ms
+        time.sleep(0.25)
+        assert limiter.hit(limit)
+        assert not limiter.hit(limit)
+
+    def test_gcra_multiple_cost(self, uri, args, fixture):
+        storage = storage_from_string(uri, **args)
+        limiter = GCRARateLimiter(storage)
+        limit = RateLimitItemPerSecond(10, 2)
+
+        assert not limiter.hit(limit, "k1", cost=11)
+        assert limiter.hit(limit, "k2", cost=5)
+        assert not limiter.test(limit, "k2", cost=6)
+        assert not limiter.hit(limit, "k2", cost=6)
+        assert limiter.hit(limit, "k2", cost=5)
+        assert limiter.get_window_stats(limit, "k2").remaining == 0
+        time.sleep(0.45)
+        assert limiter.get_window_stats(limit, "k2").remaining == 2
+        assert limiter.hit(limit, "k2", cost=2)
+        assert not limiter.hit(limit, "k2")
+
+    def test_gcra_hit_many(self, uri, args, fixture):
+        storage = storage_from_string(uri, **args)
+        limiter = GCRARateLimiter(storage)
+        limit = RateLimitItemPerMinute(5)
+        assert limiter.hit_many(
+            [
+                (limit, ["k1"], 3),
+                (limit, ["k1"], 3),
+                (limit, ["k1"], 2),
+                (limit, ["k2"], 6),
+            ]
+        ) == [True, False, True, False]
+        assert limiter.test_many([(limit, ["k1"], 1), (limit, ["k2"], 5)]) == [
+            False,
+            True,
+        ]
+        assert limiter.hit_all([limit, RateLimitItemPerHour(3)], "k3", cost=3)
+        assert not limiter.hit_all([limit, RateLimitItemPerHour(3)], "k3")
+        assert limiter.get_window_stats(limit, "k3").remaining == 2
+
+    def test_gcra_hit_all(self, uri, args, fixture):
+        storage = storage_from_string(uri, **args)
+        limiter = GCRARateLimiter(storage)
+        per_minute = RateLimitItemPerMinute(2)
+        per_hour = RateLimitItemPerHour(3)
+        assert limiter.hit_all([], "k1")
+        assert limiter.hit_all([per_hour, per_minute], "k1")
+        assert limiter.hit_all([per_hour, per_minute], "k1")
+        assert not limiter.hit_all([per_hour, per_minute], "k1")
+        assert limiter.get_window_stats(per_hour, "k1").remaining == 1
+        assert not limiter.hit_all([per_hour, per_minute], "k2", cost=3)
+        assert limiter.get_window_stats(per_hour, "k2").remaining == 3
+        assert not limiter.hit_all([per_minute, per_minute], "k3", cost=2)
+        assert limiter.get_window_stats(per_minute, "k3").remaining == 2
+
+    def test_gcra_hit_with_stats(self, uri, args, fixture):
+        storage = storage_from_string(uri, **args)
+        limiter = GCRARateLimiter(storage)
+        limit = RateLimitItemPerMinute(2)
+        for remaining in [1, 0]:
+            allowed, stats = limiter.hit_with_stats(limit, "k1")
+            assert allowed
+            assert stats.remaining == remaining
+            assert stats.reset_time == pytest.approx(
+                limiter.get_window_stats(limit, "k1").reset_time, abs=1
+            )
+        allowed, stats = limiter.hit_with_stats(limit, "k1")
+        assert not allowed
+        assert stats.remaining == 0
+        allowed, stats = limiter.hit_with_stats(limit, "k2", cost=3)
+        assert not allowed
+        assert stats.remaining == 2
+
+    def test_test_gcra(self, uri, args, fixture):
+        storage = storage_from_string(uri, **args)
+        limit = RateLimitItemPerHour(2, 1)
+        limiter = GCRARateLimiter(storage)
+        assert limiter.hit(limit)
+        assert limiter.test(limit)
+        assert limiter.hit(limit)
+        assert not limiter.test(limit)
+        assert not limiter.hit(limit)
+
+
+class TestLeasing:
+    @all_storage
+    def test_leasing_fixed_window(self, uri, args, fixture):
+        storage = storage_from_string(uri, **args)
+        limiter = LeasingRateLimiter(
+            FixedWindowRateLimiter(storage), lease_duration=60, max_lease_ratio=0.1
+        )
+        limit = RateLimitItemPerMinute(100)
+        assert [limiter.hit(limit, "key") for _ in range(150)].count(True) == 100
+        assert not limiter.test(limit, "key")
+        assert limiter.get_window_stats(limit, "key").remaining == 0
+        limiter.clear(limit, "key")
+        assert limiter.hit(limit, "key")
+
+    @all_storage
+    def test_leasing_release(self, uri, args, fixture):
+        storage = storage_from_string(uri, **args)
+        if not hasattr(storage, "decr"):
+            pytest.skip("storage can't return leased entries")
+        limiter = LeasingRateLimiter(FixedWindowRateLimiter(storage), 60, 0.1)
+        limit = RateLimitItemPerMinute(100)
+        assert all(limiter.hit(limit, "key") for _ in range(4))
+        # leases of 1, 2 & 4 entries
+        assert storage.get(limit.key_for("key")) == 7
+        assert limiter.get_window_stats(limit, "key").remaining == 96
+        limiter.release()
+        assert storage.get(limit.key_for("key")) == 4
+        assert limiter.get_window_stats(limit, "key").remaining == 96
+
+    @sliding_window_counter_storage
+    def test_leasing_sliding_window(self, uri, args, fixture):
+        storage = storage_from_string(uri, **args)
+        limiter = LeasingRateLimiter(
+            SlidingWindowCounterRateLimiter(storage), max_lease_ratio=1
+        )
+        limit = RateLimitItemPerMinute(10)
+        assert [limiter.hit(limit, "key") for _ in range(20)].count(True) == 10
+        assert not limiter.hit(limit, "key", cost=2)
+        assert not limiter.test(limit, "key")
+
+    @sliding_window_counter_storage
+    def test_leasing_sliding_window_release(self, uri, args, fixture):
+        storage = storage_from_string(uri, **args)
+        limiter = LeasingRateLimiter(SlidingWindowCounterRateLimiter(storage), 60, 0.1)
+        limit = RateLimitItemPerHour(100)
+        assert all(limiter.hit(limit, "key") for _ in range(4))
+        # leases of 1, 2 & 4 entries
+        assert storage.get_sliding_window(limit.key_for("key"), 3600)[2] == 7
+        limiter.release()
+        assert storage.get_sliding_window(limit.key_for("key"), 3600)[2] == 4
+
+    def test_leasing_partial_lease_released(self):
+        storage = storage_from_string("memory://")
+        limiter = LeasingRateLimiter(FixedWindowRateLimiter(storage), 60, 0.01)
+        limit = RateLimitItemPerMinute(100)
+        assert all(limiter.limiter.hit(limit, "key") for _ in range(95))
+        assert limiter.hit(limit, "key")
+        # only 4 of the 8 leased entries are granted
+        assert not limiter.hit(limit, "key", cost=8)
+        assert storage.get(limit.key_for("key")) == 100
+        limiter.release()
+        assert storage.get(limit.key_for("key")) == 96
+        assert limiter.limiter.hit(limit, "key", cost=4)
+
+    def test_leasing_lease_expiry(self):
+        storage = storage_from_string("memory://")
+        limiter = LeasingRateLimiter(FixedWindowRateLimiter(storage), 0.1, 1)
+        limit = RateLimitItemPerMinute(10)
+        assert all(limiter.hit(limit, "key") for _ in range(2))
+        assert storage.get(limit.key_for("key")) == 3
+        time.sleep(0.15)
+        # the unused entry of the expired lease is returned
+        assert limiter.hit(limit, "key")
+        assert storage.get(limit.key_for("key")) == 4
+
+    def test_leasing_hit_all_refunded(self, monkeypatch):
+        storage = storage_from_string("memory://")
+        limiter = LeasingRateLimiter(FixedWindowRateLimiter(storage), 60, 1)
+        per_minute, per_hour = RateLimitItemPerMinute(10), RateLimitItemPerHour(1)
+        assert limiter.hit(per_hour, "key")
+        # the hourly limit is exhausted between the checks and the hits
+        monkeypatch.setattr(limiter, "test_many", lambda requests: [True] * 2)
+        assert not limiter.hit_all([per_minute, per_hour], "key")
+        assert limiter.get_window_stats(per_minute, "key").remaining == 10
+        assert storage.get(per_minute.key_for("key")) == 1
+
+    def test_leasing_invalid(self):
+        storage = storage_from_string("memory://")
+        with pytest.raises(ConfigurationError):
+            LeasingRateLimiter(FixedWindowRateLimiter(storage), lease_duration=0)
+        with pytest.raises(ConfigurationError):
+            LeasingRateLimiter(FixedWindowRateLimiter(storage), max_lease_ratio=2)
+        with pytest.raises(NotImplementedError):
+            LeasingRateLimiter(MovingWindowRateLimiter(storage))
+
+
+class TestClock:
+    @pytest.mark.parametrize(
+        "limiter_cls",
+        [
+            FixedWindowRateLimiter,
+            MovingWindowRateLimiter,
+            SlidingWindowCounterRateLimiter,
+            GCRARateLimiter,
+        ],
+    )
+    def test_manual_clock(self, limiter_cls):
+        clock = ManualClock()
+        storage = storage_from_string("memory://", clock=clock)
+        limiter = limiter_cls(storage, clock=clock)
+        limit = RateLimitItemPerMinute(2)
+        assert limiter.hit(limit, "key")
+        assert limiter.hit(limit, "key")
+        assert not limiter.hit(limit, "key")
+        stats = limiter.get_window_stats(limit, "key")
+        assert stats.remaining == 0
+        assert clock.now < stats.reset_time <= clock.now + 60
+        clock.advance(120)
+        assert limiter.get_window_stats(limit, "key").remaining == 2
+        assert limiter.hit(limit, "key")
+
+    def test_leasing_clock(self):
+        clock = ManualClock()
+        limiter = LeasingRateLimiter(
+            FixedWindowRateLimiter(storage_from_string("memory://"), clock=clock)
+        )
+        assert limiter.clock is clock
@@ -4,7 +4,12 @@ import pytest
 from packaging.version import Version
 
 from limits.errors import ConfigurationError
-from limits.util import LazyDependency
+from limits.storage import RedisStorage
+from limits.util import (
+    LazyDependency,
+    get_redis_function_library,
+    get_replication_lag,
+)
 
 
 def test_lazy_dependency_found():
@@ -32,3 +37,39 @@ def test_lazy_dependency_version_low():
         ConfigurationError, match="'maythisneverexist' prerequisite not available"
     ):
         assert d.dependencies["maythisneverexist"].version_found
+
+
+def test_redis_function_library():
+    library = get_redis_function_library(
+        RedisStorage.RES_DIR, RedisStorage.READONLY_SCRIPTS
+    )
+    prefix = library.functions[RedisStorage.SCRIPT_INCR_EXPIRE].removesuffix(
+        "_incr_expire"
+    )
+    assert library.name == "limits"
+    assert library.code.startswith("#!lua name=limits\n")
+    assert prefix.startswith("limits_")
+    assert library.readonly == {
+        f"{prefix}_moving_window",
+        f"{prefix}_moving_window_zset",
+        f"{prefix}_moving_window_packed",
+    }
+    assert library.code.count("redis.register_function") == len(library.functions)
+    assert library.code.count("flags={'no-writes'}") == 3
+
+
+def test_replication_lag():
+    assert get_replication_lag({"role": "master", "connected_slaves": 0}) == float(
+        "inf"
+    )
+    assert (
+        get_replication_lag(
+            {
+                "role": "master",
+                "slave0": {"ip": "10.0.0.1", "state": "online", "lag": 0},
+                "slave1": {"ip": "10.0.0.2", "state": "online", "lag": 3},
+                "slave_read_repl_offset": 42,
+            }
+        )
+        == 3
+    )
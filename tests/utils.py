@@ -43,6 +43,17 @@ def timestamp_based_key_ttl(item: RateLimitItem, now: float | None = None) -> fl
     return item.get_expiry() - (now % item.get_expiry())
 
 
+class ManualClock:
+    def __init__(self, now: float = 1_000_000.0) -> None:
+        self.now = now
+
+    def time(self) -> float:
+        return self.now
+
+    def advance(self, seconds: float) -> None:
+        self.now += seconds
+
+
 def async_fixed_start(fn):
     @functools.wraps(fn)
     async def __inner(*a, **k):
@@ -101,6 +112,13 @@ ALL_STORAGES = {
         marks=[pytest.mark.memcached, pytest.mark.flaky],
         id="memcached",
     ),
+    "memcached-meta": pytest.param(
+        "memcached://localhost:22122",
+        {"meta_protocol": True},
+        lf("memcached"),
+        marks=[pytest.mark.memcached, pytest.mark.flaky],
+        id="memcached-meta",
+    ),
     "memcached-cluster": pytest.param(
         "memcached://localhost:22122,localhost:22123",
         {},
@@ -260,10 +278,29 @@ all_storage = pytest.mark.parametrize("uri, args, fixture", ALL_STORAGES.values(
 
 moving_window_storage = pytest.mark.parametrize(
     "uri, args, fixture",
-    [
-        storage
-        for name, storage in ALL_STORAGES.items()
-        if not name.startswith("memcached")
+    list(ALL_STORAGES.values())
+    + [
+        pytest.param(
+            "redis://localhost:7379",
+            {"moving_window_engine": "zset"},
+            lf("redis_basic"),
+            marks=pytest.mark.redis,
+            id="redis_basic-zset",
+        ),
+        pytest.param(
+            "redis://localhost:7379",
+            {"moving_window_engine": "packed"},
+            lf("redis_basic"),
+            marks=pytest.mark.redis,
+            id="redis_basic-packed",
+        ),
+        pytest.param(
+            "mongodb://localhost:37017/",
+            {"moving_window_engine": "pairs"},
+            lf("mongodb"),
+            marks=pytest.mark.mongodb,
+            id="mongodb-pairs",
+        ),
     ],
 )
 
@@ -277,10 +314,35 @@ async_all_storage = pytest.mark.parametrize(
 
 async_moving_window_storage = pytest.mark.parametrize(
     "uri, args, fixture",
-    [
-        storage
-        for name, storage in ALL_STORAGES_ASYNC.items()
-        if not name.startswith("memcached")
+    list(ALL_STORAGES_ASYNC.values())
+    + [
+        pytest.param(
+            "async+redis://localhost:7379",
+            {
+                "implementation": ASYNC_REDIS_IMPLEMENTATION,
+                "moving_window_engine": "zset",
+            },
+            lf("redis_basic"),
+            marks=pytest.mark.redis,
+            id="redis-zset",
+        ),
+        pytest.param(
+            "async+redis://localhost:7379",
+            {
+                "implementation": ASYNC_REDIS_IMPLEMENTATION,
+                "moving_window_engine": "packed",
+            },
+            lf("redis_basic"),
+            marks=pytest.mark.redis,
+            id="redis-packed",
+        ),
+        pytest.param(
+            "async+mongodb://localhost:37017/",
+            {"moving_window_engine": "pairs"},
+            lf("mongodb"),
+            marks=pytest.mark.mongodb,
+            id="mongodb-pairs",
+        ),
     ],
 )
 